@@ -0,0 +1,158 @@
+"""Per-call LLM usage accounting: prompt size, output size, latency and estimated spend"""
+import logging
+import math
+from datetime import datetime
+from typing import Any, Dict, Hashable, Optional
+from sqlalchemy import case, delete, func, insert, select
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import SQLAlchemyError
+from ..config import LLM_INPUT_COST_PER_1K_TOKENS, LLM_OUTPUT_COST_PER_1K_TOKENS, LLM_USAGE_RECENT_CALLS
+from ..database import engine
+from ..models import LLMUsage
+from .prompts import prompt_name
+
+logger = logging.getLogger(__name__)
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count (~4 characters per token)"""
+    return max(1, math.ceil(len(text) / 4))
+
+def _empty_totals() -> Dict[str, Any]:
+    return {
+        "calls": 0,
+        "failed_calls": 0,
+        "hedge_calls": 0,
+        "input_tokens": 0,
+        "output_tokens": 0,
+        "input_chars": 0,
+        "output_chars": 0,
+        "latency_seconds": 0.0,
+        "cost": 0.0
+    }
+
+_SUMMED = ("input_tokens", "output_tokens", "input_chars", "output_chars", "latency_seconds", "cost")
+
+def _workspace_filter(workspace_id: Hashable):
+    return LLMUsage.workspace_id.is_(None) if workspace_id is None else LLMUsage.workspace_id == workspace_id
+
+class UsageLedger:
+    """Usage totals per workspace and per prompt template, kept in the llm_usage table.
+
+    Every request sent to the model is one row, including the duplicate of a
+    hedged call, so totals survive restarts and add up across worker
+    processes. Token counts are estimated from character length, and spend
+    uses the configured per-1K-token prices. Calls made outside a workspace
+    (such as assistant chat) are recorded under workspace None.
+    """
+
+    def __init__(
+        self,
+        input_cost_per_1k: float = LLM_INPUT_COST_PER_1K_TOKENS,
+        output_cost_per_1k: float = LLM_OUTPUT_COST_PER_1K_TOKENS,
+        recent_calls: int = LLM_USAGE_RECENT_CALLS,
+        bind: Engine = engine
+    ):
+        self.input_cost_per_1k = input_cost_per_1k
+        self.output_cost_per_1k = output_cost_per_1k
+        self.recent_calls = recent_calls
+        self.bind = bind
+
+    def record(
+        self,
+        prompt: str,
+        output: Optional[str],
+        latency_seconds: float,
+        model: str,
+        workspace_id: Hashable = None,
+        hedge: bool = False
+    ) -> Dict[str, Any]:
+        """Record one model request. output is None when it failed or was cancelled.
+
+        The row is written in its own short transaction; a failed write is
+        logged rather than failing the model call it accounts for.
+        """
+        input_tokens = estimate_tokens(prompt)
+        output_tokens = estimate_tokens(output) if output else 0
+        cost = (input_tokens * self.input_cost_per_1k + output_tokens * self.output_cost_per_1k) / 1000
+        entry = {
+            "workspace_id": workspace_id,
+            "prompt": prompt_name(prompt),
+            "model": model,
+            "input_chars": len(prompt),
+            "output_chars": len(output) if output else 0,
+            "input_tokens": input_tokens,
+            "output_tokens": output_tokens,
+            "latency_seconds": round(latency_seconds, 4),
+            "cost": cost,
+            "ok": output is not None,
+            "hedge": hedge,
+            "created_at": datetime.utcnow()
+        }
+        try:
+            with self.bind.begin() as connection:
+                connection.execute(insert(LLMUsage), entry)
+        except SQLAlchemyError as e:
+            logger.warning(f"Could not record LLM usage: {e!r}")
+        return entry
+
+    def _grouped(self, *where) -> Dict[Hashable, Dict[str, Dict[str, Any]]]:
+        """Totals keyed by workspace, then prompt template"""
+        query = (
+            select(
+                LLMUsage.workspace_id,
+                LLMUsage.prompt,
+                func.count().label("calls"),
+                func.sum(case((LLMUsage.ok.is_(False), 1), else_=0)).label("failed_calls"),
+                func.sum(case((LLMUsage.hedge.is_(True), 1), else_=0)).label("hedge_calls"),
+                *(func.sum(getattr(LLMUsage, field)).label(field) for field in _SUMMED)
+            )
+            .where(*where)
+            .group_by(LLMUsage.workspace_id, LLMUsage.prompt)
+            .order_by(LLMUsage.workspace_id, LLMUsage.prompt)
+        )
+        grouped: Dict[Hashable, Dict[str, Dict[str, Any]]] = {}
+        with self.bind.connect() as connection:
+            for row in connection.execute(query).mappings():
+                totals = _empty_totals()
+                totals.update({field: row[field] or 0 for field in totals})
+                grouped.setdefault(row["workspace_id"], {})[row["prompt"]] = totals
+        return grouped
+
+    @staticmethod
+    def _usage(workspace_id: Hashable, by_prompt: Dict[str, Dict[str, Any]]) -> Dict[str, Any]:
+        overall = _empty_totals()
+        for totals in by_prompt.values():
+            for field, value in totals.items():
+                overall[field] += value
+        overall["avg_latency_seconds"] = round(overall["latency_seconds"] / overall["calls"], 4) if overall["calls"] else None
+        for totals in [overall, *by_prompt.values()]:
+            totals["cost"] = round(totals["cost"], 6)
+            totals["latency_seconds"] = round(totals["latency_seconds"], 4)
+        return {"workspace_id": workspace_id, "totals": overall, "by_prompt": by_prompt}
+
+    def workspace_usage(self, workspace_id: Hashable = None) -> Dict[str, Any]:
+        """Totals for one workspace, overall and broken down by prompt template"""
+        grouped = self._grouped(_workspace_filter(workspace_id))
+        return self._usage(workspace_id, grouped.get(workspace_id, {}))
+
+    def summary(self) -> Dict[str, Any]:
+        """Spend per workspace across every workspace recorded"""
+        return {"workspaces": [self._usage(workspace_id, by_prompt) for workspace_id, by_prompt in self._grouped().items()]}
+
+    def recent(self, workspace_id: Hashable = None, limit: int = 50) -> list:
+        """Latest requests, oldest first, capped at recent_calls. None returns every workspace's."""
+        query = select(LLMUsage.__table__).order_by(LLMUsage.id.desc()).limit(min(limit, self.recent_calls))
+        if workspace_id is not None:
+            query = query.where(LLMUsage.workspace_id == workspace_id)
+        with self.bind.connect() as connection:
+            rows = connection.execute(query).mappings().all()
+        return [
+            {**{key: value for key, value in row.items() if key not in ("id", "created_at")}, "at": row["created_at"].isoformat()}
+            for row in reversed(rows)
+        ]
+
+    def clear(self) -> None:
+        with self.bind.begin() as connection:
+            connection.execute(delete(LLMUsage))
+
+usage_ledger = UsageLedger()
@@ -0,0 +1,150 @@
+"""Disk-backed LRU cache for validated Gemini responses"""
+import hashlib
+import json
+import logging
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Optional
+from ..config import (
+    GEMINI_MODEL,
+    LLM_CACHE_ENABLED,
+    LLM_CACHE_PATH,
+    LLM_CACHE_TTL_SECONDS,
+    LLM_CACHE_MAX_ENTRIES,
+    LLM_CACHE_TOUCH_SECONDS
+)
+from .prompts import PROMPT_VERSION
+
+logger = logging.getLogger(__name__)
+
+def cache_key(prompt: str, model: str = GEMINI_MODEL, version: str = PROMPT_VERSION) -> str:
+    """Content address for a prompt: hash of model, template version and prompt text"""
+    digest = hashlib.sha256()
+    for part in (model, version, prompt):
+        digest.update(part.encode("utf-8"))
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+class LLMCache:
+    """SQLite-backed LRU cache with TTL and an entry cap.
+
+    Values are stored as JSON so parsed task lists, dependency objects and
+    plain summaries round-trip unchanged. The database file is opened lazily
+    on first use.
+
+    Recency is kept to touch_seconds: a hit writes the entry's access time
+    only when the stored one is older than that, so repeated hits on a hot
+    prompt are reads. Eviction order is exact up to that resolution.
+    """
+
+    def __init__(
+        self,
+        path: str = LLM_CACHE_PATH,
+        ttl_seconds: int = LLM_CACHE_TTL_SECONDS,
+        max_entries: int = LLM_CACHE_MAX_ENTRIES,
+        enabled: bool = LLM_CACHE_ENABLED,
+        touch_seconds: float = LLM_CACHE_TOUCH_SECONDS
+    ):
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.enabled = enabled
+        self.touch_seconds = touch_seconds
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self._conn = sqlite3.connect(self.path, check_same_thread=False)
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS llm_cache ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, "
+                "created_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+            )
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS ix_llm_cache_accessed_at ON llm_cache (accessed_at)"
+            )
+            self._conn.commit()
+        return self._conn
+
+    def get(self, prompt: str, model: str = GEMINI_MODEL) -> Optional[Any]:
+        """Return the cached value of a model's reply to a prompt, or None on miss/expiry"""
+        if not self.enabled:
+            return None
+        key = cache_key(prompt, model)
+        now = time.time()
+        with self._lock:
+            conn = self._connection()
+            row = conn.execute(
+                "SELECT value, created_at, accessed_at FROM llm_cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            value, created_at, accessed_at = row
+            if self.ttl_seconds and now - created_at > self.ttl_seconds:
+                conn.execute("DELETE FROM llm_cache WHERE key = ?", (key,))
+                conn.commit()
+                self.misses += 1
+                self.evictions += 1
+                return None
+            if now - accessed_at >= self.touch_seconds:
+                conn.execute("UPDATE llm_cache SET accessed_at = ? WHERE key = ?", (now, key))
+                conn.commit()
+            self.hits += 1
+        return json.loads(value)
+
+    def set(self, prompt: str, value: Any, model: str = GEMINI_MODEL) -> None:
+        """Store a model's reply and evict least recently used entries over the cap"""
+        if not self.enabled:
+            return
+        key = cache_key(prompt, model)
+        now = time.time()
+        with self._lock:
+            conn = self._connection()
+            conn.execute(
+                "INSERT OR REPLACE INTO llm_cache (key, value, created_at, accessed_at) VALUES (?, ?, ?, ?)",
+                (key, json.dumps(value), now, now)
+            )
+            overflow = conn.execute("SELECT COUNT(*) FROM llm_cache").fetchone()[0] - self.max_entries
+            if overflow > 0:
+                conn.execute(
+                    "DELETE FROM llm_cache WHERE key IN "
+                    "(SELECT key FROM llm_cache ORDER BY accessed_at ASC LIMIT ?)",
+                    (overflow,)
+                )
+                self.evictions += overflow
+            conn.commit()
+
+    def clear(self) -> None:
+        """Drop every cached entry and reset counters"""
+        with self._lock:
+            if self.enabled:
+                conn = self._connection()
+                conn.execute("DELETE FROM llm_cache")
+                conn.commit()
+            self.hits = self.misses = self.evictions = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters and current size"""
+        size = 0
+        if self.enabled:
+            with self._lock:
+                size = self._connection().execute("SELECT COUNT(*) FROM llm_cache").fetchone()[0]
+        lookups = self.hits + self.misses
+        return {
+            "enabled": self.enabled,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+            "entries": size,
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl_seconds
+        }
+
+llm_cache = LLMCache()
@@ -0,0 +1,115 @@
+"""Map-reduce helpers for extracting tasks from long transcripts"""
+import re
+from typing import List, Dict, Any
+from ..config import TRANSCRIPT_CHUNK_CHARS, TRANSCRIPT_CHUNK_OVERLAP_TURNS
+from .compaction import NOT_A_SPEAKER
+
+# "Priya: ...", "[10:02] Dev1: ...", "QA Lead - ..." style speaker prefixes, but not "Action: ..." and other labels
+SPEAKER_TURN_RE = re.compile(
+    r"^\s*(?:\[?\d{1,2}:\d{2}(?::\d{2})?\]?\s*)?" + NOT_A_SPEAKER + r"[A-Za-z][\w .'\-]{0,40}:\s",
+    re.IGNORECASE
+)
+
+def split_speaker_turns(transcript: str) -> List[str]:
+    """Split a transcript into speaker turns. Continuation lines stay with their turn."""
+    turns: List[str] = []
+    current: List[str] = []
+    for line in transcript.split('\n'):
+        if SPEAKER_TURN_RE.match(line) and current:
+            turns.append('\n'.join(current))
+            current = []
+        current.append(line)
+    if current:
+        turns.append('\n'.join(current))
+    return [turn for turn in turns if turn.strip()]
+
+def _hard_split(turn: str, max_chars: int) -> List[str]:
+    """Split a single oversized turn on line, then character, boundaries"""
+    pieces: List[str] = []
+    buffer = ""
+    for line in turn.split('\n'):
+        while len(line) > max_chars:
+            if buffer:
+                pieces.append(buffer)
+                buffer = ""
+            pieces.append(line[:max_chars])
+            line = line[max_chars:]
+        if buffer and len(buffer) + len(line) + 1 > max_chars:
+            pieces.append(buffer)
+            buffer = line
+        else:
+            buffer = f"{buffer}\n{line}" if buffer else line
+    if buffer:
+        pieces.append(buffer)
+    return pieces
+
+def chunk_transcript(
+    transcript: str,
+    max_chars: int = TRANSCRIPT_CHUNK_CHARS,
+    overlap_turns: int = TRANSCRIPT_CHUNK_OVERLAP_TURNS
+) -> List[str]:
+    """Group speaker turns into chunks of at most max_chars.
+
+    Each chunk after the first repeats the last ``overlap_turns`` turns of the
+    previous chunk so action items that span a boundary keep their context.
+    """
+    if len(transcript) <= max_chars:
+        return [transcript]
+
+    turns: List[str] = []
+    for turn in split_speaker_turns(transcript):
+        turns.extend(_hard_split(turn, max_chars) if len(turn) > max_chars else [turn])
+
+    chunks: List[str] = []
+    current: List[str] = []
+    size = 0
+    new_turns = 0
+    for turn in turns:
+        if current and size + len(turn) + 1 > max_chars:
+            chunks.append('\n'.join(current))
+            current = current[-overlap_turns:] if overlap_turns > 0 else []
+            size = sum(len(t) + 1 for t in current)
+            # Drop overlap that would leave no room for the next turn
+            while current and size + len(turn) + 1 > max_chars:
+                size -= len(current.pop(0)) + 1
+            new_turns = 0
+        current.append(turn)
+        size += len(turn) + 1
+        new_turns += 1
+    if current and new_turns:
+        chunks.append('\n'.join(current))
+    return chunks
+
+def _tokens(text: str) -> set:
+    return set(re.findall(r"[a-z0-9]+", text.lower()))
+
+def is_duplicate_candidate(a: Dict[str, Any], b: Dict[str, Any], threshold: float = 0.8) -> bool:
+    """True when two candidates describe the same action item"""
+    tokens_a = _tokens(a["description"])
+    tokens_b = _tokens(b["description"])
+    if not tokens_a or not tokens_b:
+        return tokens_a == tokens_b
+    overlap = len(tokens_a & tokens_b) / len(tokens_a | tokens_b)
+    return overlap >= threshold
+
+def merge_candidates(candidate_lists: List[List[Dict[str, Any]]], threshold: float = 0.8) -> List[Dict[str, Any]]:
+    """Reduce step: merge per-chunk candidates and drop near-duplicates.
+
+    When two chunks report the same action item the higher-confidence one wins
+    and any fields it left empty are filled in from the other.
+    """
+    merged: List[Dict[str, Any]] = []
+    for candidates in candidate_lists:
+        for candidate in candidates:
+            for i, existing in enumerate(merged):
+                if is_duplicate_candidate(existing, candidate, threshold):
+                    keep, other = (candidate, existing) if candidate["confidence"] > existing["confidence"] else (existing, candidate)
+                    combined = dict(keep)
+                    for field, value in other.items():
+                        if combined.get(field) is None and value is not None:
+                            combined[field] = value
+                    merged[i] = combined
+                    break
+            else:
+                merged.append(dict(candidate))
+    return merged
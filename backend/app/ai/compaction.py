@@ -0,0 +1,52 @@
+"""Transcript compaction before LLM calls
+
+Removes what costs tokens but carries no action items: timestamps, pure
+disfluencies (um, uh), greeting and small-talk lines, and speaker tags
+repeated on back-to-back lines by the same person. Line breaks are kept, so
+rule-based fallbacks that read one line at a time see the same lines, and
+every line stays attributed to the speaker of its turn.
+"""
+import re
+from typing import List, Optional, Tuple
+
+TIMESTAMP_RE = re.compile(r"^\s*\[?\(?\d{1,2}:\d{2}(?::\d{2})?(?:\s*[AaPp][Mm])?\)?\]?\s*[-–]?\s*")
+# Labels that head a line like a speaker name does but are part of what was said
+NOT_A_SPEAKER = r"(?!(?:action(?: items?)?|todo|to ?do|notes?|decisions?|follow[ -]?ups?|next steps?|agenda|summary|fyi|ps|re)\s*:)"
+SPEAKER_RE = re.compile(r"^" + NOT_A_SPEAKER + r"([A-Za-z][\w .'\-]{0,40}):\s*(.*)$", re.IGNORECASE)
+# Only sounds with no meaning of their own; "kind of", "I mean" and the like can change a sentence
+FILLER_RE = re.compile(r",?\s*\b(?:u+m+|u+h+|e+r+m+|a+h+|h+m+|mm+)\b[,.]?(?=\s|$)", re.IGNORECASE)
+# Lines made only of greetings and sign-offs; short answers like "yes" or "sure" are kept
+# because they can be someone accepting a task
+SMALL_TALK_RE = re.compile(
+    r"^(?:(?:hi|hey|hello|morning|good (?:morning|afternoon|evening)|thanks?|thank you|cheers|bye|"
+    r"goodbye|see you|see ya|talk soon|everyone|all|folks|team|guys)[\s,.!?]*)+$",
+    re.IGNORECASE
+)
+WHITESPACE_RE = re.compile(r"[ \t]+")
+
+def _split_speaker(line: str) -> Tuple[Optional[str], str]:
+    match = SPEAKER_RE.match(line)
+    if match:
+        return match.group(1).strip(), match.group(2)
+    return None, line
+
+def compact_transcript(transcript: str) -> str:
+    """Return a shorter transcript with the same lines, speakers and action content.
+
+    A line by the speaker of the line before it loses its tag, as does a
+    line that had none; both read as continuing that speaker's turn.
+    """
+    lines: List[str] = []
+    current: Optional[str] = None
+    for raw_line in transcript.split('\n'):
+        line = TIMESTAMP_RE.sub("", raw_line)
+        speaker, text = _split_speaker(line)
+        text = WHITESPACE_RE.sub(" ", FILLER_RE.sub("", text)).strip(" ,")
+        if not text or SMALL_TALK_RE.match(text):
+            continue
+        if speaker is None or speaker == current:
+            lines.append(text)
+        else:
+            lines.append(f"{speaker}: {text}")
+            current = speaker
+    return '\n'.join(lines)
@@ -0,0 +1,89 @@
+"""Fair asyncio concurrency limiter for outbound LLM calls"""
+import asyncio
+from collections import defaultdict, deque
+from contextlib import asynccontextmanager
+from typing import Any, Deque, Dict, Hashable
+from ..config import LLM_MAX_CONCURRENCY, LLM_MAX_CONCURRENCY_PER_WORKSPACE
+
+class FairLimiter:
+    """Global semaphore that hands out free slots fairly across workspaces.
+
+    At most ``limit`` calls run at once and a single workspace never holds more
+    than ``per_key_limit`` of them, so one team uploading a backlog of meetings
+    cannot starve everyone else's requests.
+    """
+
+    def __init__(self, limit: int = LLM_MAX_CONCURRENCY, per_key_limit: int = LLM_MAX_CONCURRENCY_PER_WORKSPACE):
+        self.limit = max(1, limit)
+        self.per_key_limit = max(1, min(per_key_limit, self.limit))
+        self._active = 0
+        self._active_by_key: Dict[Hashable, int] = defaultdict(int)
+        self._waiters: Dict[Hashable, Deque[asyncio.Future]] = {}
+        self._last_served: Dict[Hashable, int] = {}
+        self._served = 0
+
+    def _can_run(self, key: Hashable) -> bool:
+        return self._active < self.limit and self._active_by_key[key] < self.per_key_limit
+
+    def _grant(self, key: Hashable) -> None:
+        self._active += 1
+        self._active_by_key[key] += 1
+        self._served += 1
+        self._last_served[key] = self._served
+
+    def _dispatch(self) -> None:
+        """Wake waiters while slots are free, least recently served workspace first"""
+        while self._active < self.limit:
+            for key in [k for k, q in self._waiters.items() if not q]:
+                del self._waiters[key]
+            runnable = [k for k in self._waiters if self._can_run(k)]
+            if not runnable:
+                return
+            key = min(runnable, key=lambda k: (self._active_by_key[k], self._last_served.get(k, -1)))
+            future = self._waiters[key].popleft()
+            if future.done():
+                continue
+            self._grant(key)
+            future.set_result(None)
+
+    async def acquire(self, key: Hashable = None) -> None:
+        if not self._waiters and self._can_run(key):
+            self._grant(key)
+            return
+        future = asyncio.get_running_loop().create_future()
+        self._waiters.setdefault(key, deque()).append(future)
+        self._dispatch()
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # Slot was granted just before cancellation - hand it back
+                self.release(key)
+            raise
+
+    def release(self, key: Hashable = None) -> None:
+        self._active -= 1
+        self._active_by_key[key] -= 1
+        if self._active_by_key[key] <= 0:
+            del self._active_by_key[key]
+            if key not in self._waiters:
+                self._last_served.pop(key, None)
+        self._dispatch()
+
+    @asynccontextmanager
+    async def slot(self, key: Hashable = None):
+        await self.acquire(key)
+        try:
+            yield
+        finally:
+            self.release(key)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "limit": self.limit,
+            "per_workspace_limit": self.per_key_limit,
+            "active": self._active,
+            "waiting": sum(len(q) for q in self._waiters.values())
+        }
+
+llm_limiter = FairLimiter()
@@ -0,0 +1,61 @@
+"""HTTP client for the fake Gemini server, shaped like genai.GenerativeModel"""
+import asyncio
+import json
+import weakref
+from typing import AsyncIterator, Optional
+import httpx
+
+class FakeResponse:
+    def __init__(self, text: str):
+        self.text = text
+
+class FakeGenerativeModel:
+    """Drop-in replacement for genai.GenerativeModel used when AI_MODE=fake.
+
+    Supports the calls gemini_client makes: generate_content, and
+    generate_content_async with or without stream=True. HTTP errors are raised
+    so they take the same failure path as SDK exceptions.
+    """
+
+    def __init__(self, base_url: str, timeout: float):
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+        self._client: Optional[httpx.Client] = None
+        self._async_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient]" = weakref.WeakKeyDictionary()
+
+    def _sync(self) -> httpx.Client:
+        if self._client is None:
+            self._client = httpx.Client(base_url=self.base_url, timeout=self.timeout)
+        return self._client
+
+    def _async(self) -> httpx.AsyncClient:
+        """The running loop's client. Pooled connections belong to the loop that
+        opened them, so each loop (the API's, every asyncio.run) gets its own."""
+        loop = asyncio.get_running_loop()
+        client = self._async_clients.get(loop)
+        if client is None:
+            client = self._async_clients[loop] = httpx.AsyncClient(
+                base_url=self.base_url,
+                timeout=self.timeout,
+                limits=httpx.Limits(max_connections=None, max_keepalive_connections=100)
+            )
+        return client
+
+    def generate_content(self, prompt: str) -> FakeResponse:
+        response = self._sync().post("/generate", json={"prompt": prompt})
+        response.raise_for_status()
+        return FakeResponse(response.json()["text"])
+
+    async def generate_content_async(self, prompt: str, stream: bool = False):
+        if stream:
+            return self._stream(prompt)
+        response = await self._async().post("/generate", json={"prompt": prompt})
+        response.raise_for_status()
+        return FakeResponse(response.json()["text"])
+
+    async def _stream(self, prompt: str) -> AsyncIterator[FakeResponse]:
+        async with self._async().stream("POST", "/generate", json={"prompt": prompt, "stream": True}) as response:
+            response.raise_for_status()
+            async for line in response.aiter_lines():
+                if line:
+                    yield FakeResponse(json.loads(line)["text"])
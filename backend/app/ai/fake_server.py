@@ -0,0 +1,188 @@
+"""Local fake Gemini server for offline load testing
+
+Answers prompts with the canned mock responses, but behaves like a remote
+model: configurable latency distribution, error rate, truncated replies and
+token-rate limits. Point the backend at it with AI_MODE=fake (and usually
+LLM_CACHE_ENABLED=false so every request reaches the server).
+
+    python -m app.ai.fake_server --port 8765 --latency lognormal:800,0.5 \
+        --error-rate 0.05 --truncate-rate 0.1 --output-tps 80 --tpm-limit 200000
+
+Protocol:
+    POST /generate  {"prompt": "...", "stream": false} -> {"text": "...", "usage": {...}}
+    POST /generate  {"prompt": "...", "stream": true}  -> NDJSON lines {"text": "<piece>"}
+    GET  /stats     request/error/truncation counters
+"""
+import argparse
+import json
+import logging
+import math
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, Any
+from .mock import mock_response
+from .accounting import estimate_tokens
+
+logger = logging.getLogger(__name__)
+
+def parse_latency(spec: str) -> Callable[[], float]:
+    """Build a sampler returning seconds from 'fixed:MS', 'uniform:MIN,MAX', 'normal:MEAN,STD',
+    'lognormal:MEDIAN,SIGMA' or 'exp:MEAN' (all times in milliseconds)"""
+    kind, _, args = spec.partition(":")
+    values = [float(v) for v in args.split(",") if v]
+    samplers = {
+        "fixed": lambda: values[0],
+        "uniform": lambda: random.uniform(values[0], values[1]),
+        "normal": lambda: random.gauss(values[0], values[1]),
+        "lognormal": lambda: random.lognormvariate(math.log(values[0]), values[1]),
+        "exp": lambda: random.expovariate(1 / values[0])
+    }
+    if kind not in samplers:
+        raise ValueError(f"Unknown latency distribution: {spec}")
+    sampler = samplers[kind]
+    return lambda: max(0.0, sampler()) / 1000
+
+class TokenBucket:
+    """Tokens-per-minute quota shared by all requests"""
+
+    def __init__(self, tokens_per_minute: int):
+        self.capacity = tokens_per_minute
+        self.tokens = float(tokens_per_minute)
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def consume(self, amount: int) -> bool:
+        if not self.capacity:
+            return True
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.capacity / 60)
+            self.updated = now
+            if self.tokens < amount:
+                return False
+            self.tokens -= amount
+            return True
+
+class FakeModelConfig:
+    def __init__(
+        self,
+        latency: str = "fixed:0",
+        error_rate: float = 0.0,
+        truncate_rate: float = 0.0,
+        output_tps: float = 0.0,
+        tpm_limit: int = 0
+    ):
+        self.sample_latency = parse_latency(latency)
+        self.error_rate = error_rate
+        self.truncate_rate = truncate_rate
+        self.output_tps = output_tps
+        self.bucket = TokenBucket(tpm_limit)
+        self.stats: Dict[str, int] = {"requests": 0, "errors": 0, "rate_limited": 0, "truncated": 0}
+        self.stats_lock = threading.Lock()
+
+    def count(self, name: str) -> None:
+        with self.stats_lock:
+            self.stats[name] += 1
+
+def make_handler(config: FakeModelConfig):
+    class FakeGeminiHandler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, format, *args):
+            logger.debug(format % args)
+
+        def _send_json(self, status: int, body: Dict[str, Any]) -> None:
+            payload = json.dumps(body).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def do_GET(self):
+            if self.path == "/stats":
+                with config.stats_lock:
+                    self._send_json(200, dict(config.stats))
+            else:
+                self._send_json(404, {"error": "not found"})
+
+        def do_POST(self):
+            if self.path != "/generate":
+                self._send_json(404, {"error": "not found"})
+                return
+            body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+            prompt = body.get("prompt", "")
+            config.count("requests")
+
+            text = mock_response(prompt)
+            input_tokens = estimate_tokens(prompt)
+            output_tokens = estimate_tokens(text)
+            if not config.bucket.consume(input_tokens + output_tokens):
+                config.count("rate_limited")
+                self._send_json(429, {"error": "token rate limit exceeded"})
+                return
+
+            time.sleep(config.sample_latency())
+            if random.random() < config.error_rate:
+                config.count("errors")
+                self._send_json(random.choice([500, 503]), {"error": "injected failure"})
+                return
+            if random.random() < config.truncate_rate:
+                config.count("truncated")
+                text = text[:int(len(text) * random.uniform(0.3, 0.9))]
+
+            if body.get("stream"):
+                self._stream(text)
+                return
+            if config.output_tps:
+                time.sleep(estimate_tokens(text) / config.output_tps)
+            self._send_json(200, {
+                "text": text,
+                "usage": {"input_tokens": input_tokens, "output_tokens": estimate_tokens(text)}
+            })
+
+        def _stream(self, text: str) -> None:
+            self.send_response(200)
+            self.send_header("Content-Type", "application/x-ndjson")
+            self.send_header("Transfer-Encoding", "chunked")
+            self.end_headers()
+            piece_chars = 16
+            for start in range(0, len(text), piece_chars):
+                piece = text[start:start + piece_chars]
+                if config.output_tps:
+                    time.sleep(estimate_tokens(piece) / config.output_tps)
+                line = (json.dumps({"text": piece}) + "\n").encode("utf-8")
+                self.wfile.write(f"{len(line):X}\r\n".encode() + line + b"\r\n")
+                self.wfile.flush()
+            self.wfile.write(b"0\r\n\r\n")
+
+    return FakeGeminiHandler
+
+def create_server(host: str = "127.0.0.1", port: int = 8765, config: FakeModelConfig = None) -> ThreadingHTTPServer:
+    server = ThreadingHTTPServer((host, port), make_handler(config or FakeModelConfig()))
+    server.daemon_threads = True
+    return server
+
+def main():
+    parser = argparse.ArgumentParser(description="Fake Gemini server for load testing")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", default="lognormal:800,0.5", help="time-to-first-token distribution in ms")
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--truncate-rate", type=float, default=0.0)
+    parser.add_argument("--output-tps", type=float, default=0.0, help="output tokens per second per request (0 = instant)")
+    parser.add_argument("--tpm-limit", type=int, default=0, help="tokens per minute across all requests (0 = unlimited)")
+    args = parser.parse_args()
+
+    config = FakeModelConfig(args.latency, args.error_rate, args.truncate_rate, args.output_tps, args.tpm_limit)
+    server = create_server(args.host, args.port, config)
+    print(f"Fake Gemini server listening on http://{args.host}:{args.port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        server.shutdown()
+
+if __name__ == "__main__":
+    main()
@@ -1,116 +1,630 @@
 """Centralized Gemini API client with mock mode support"""
+import asyncio
 import logging
-from typing import List, Dict, Any, Optional
-from ..config import GEMINI_API_KEY, AI_MODE
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Any, Optional, AsyncIterator, Callable, Tuple
+from ..config import (
+    GEMINI_API_KEY,
+    AI_MODE,
+    GEMINI_MODEL,
+    FAKE_LLM_URL,
+    FAKE_LLM_TIMEOUT_SECONDS,
+    TRANSCRIPT_CHUNK_PARALLELISM,
+    LLM_REPROMPT_TRUNCATED,
+    LLM_CALL_TIMEOUT_SECONDS,
+    LLM_HEDGE_ENABLED,
+    LLM_HEDGE_PERCENTILE,
+    TRANSCRIPT_COMPACTION_ENABLED,
+    RICE_BATCH_MAX_ITEMS,
+    RICE_BATCH_MAX_CHARS
+)
 from .prompts import (
     TASK_EXTRACTION_PROMPT,
+    TASK_CONTINUATION_PROMPT,
     DEPENDENCY_DETECTION_PROMPT,
     RICE_SCORING_PROMPT,
+    RICE_BATCH_PROMPT,
     ASSISTANT_CHAT_PROMPT,
-    MEETING_SUMMARY_PROMPT
+    MEETING_SUMMARY_PROMPT,
+    MEETING_ANALYSIS_PROMPT
 )
 from .parser import (
     parse_and_validate,
+    parse_and_validate_sections,
+    recover_partial_array,
+    PartialArray,
+    validate_item,
+    IncrementalArrayParser,
     fallback_task_extractor,
     fallback_dependencies,
     fallback_rice,
     fallback_assistant_action,
+    fallback_summary,
     TASK_CANDIDATE_SCHEMA,
     DEPENDENCY_SCHEMA,
     RICE_SCHEMA,
-    ASSISTANT_ACTION_SCHEMA
+    RICE_BATCH_SCHEMA,
+    ASSISTANT_ACTION_SCHEMA,
+    MEETING_ANALYSIS_SCHEMA
 )
+from .cache import llm_cache
+from .mock import mock_response as _mock_response
+from .concurrency import llm_limiter
+from .resilience import AbandonedCallsFull, llm_abandoned, llm_breaker, llm_latency, run_hedged, run_hedged_async
+from .accounting import usage_ledger
+from .compaction import compact_transcript
+from .chunking import chunk_transcript, merge_candidates, is_duplicate_candidate
 
 logger = logging.getLogger(__name__)
 
-# Initialize Gemini client if API key is present
+# Gemini SDK (or the fake server client in AI_MODE=fake) is set up lazily on first use (or by warm_up).
+# Only the SDK is deferred; this module and its other imports load with the routers.
 gemini_model = None
-if AI_MODE == "gemini" and GEMINI_API_KEY:
+_gemini_init_attempted = False
+_gemini_init_lock = threading.Lock()
+
+def _get_model():
+    """Import and configure google.generativeai the first time a live model is needed"""
+    global gemini_model, _gemini_init_attempted
+    if _gemini_init_attempted or AI_MODE == "mock":
+        return gemini_model
+    
+    with _gemini_init_lock:
+        if not _gemini_init_attempted and AI_MODE == "fake":
+            from .fake_client import FakeGenerativeModel
+            gemini_model = FakeGenerativeModel(FAKE_LLM_URL, FAKE_LLM_TIMEOUT_SECONDS)
+            logger.info(f"Using fake model server at {FAKE_LLM_URL}")
+            _gemini_init_attempted = True
+        if not _gemini_init_attempted:
+            try:
+                import google.generativeai as genai
+                genai.configure(api_key=GEMINI_API_KEY)
+                gemini_model = genai.GenerativeModel(GEMINI_MODEL)
+                logger.info("Gemini API initialized successfully")
+            except Exception as e:
+                logger.error(f"Failed to initialize Gemini: {e}")
+                gemini_model = None
+            _gemini_init_attempted = True
+    return gemini_model
+
+def warm_up() -> Dict[str, Any]:
+    """Load the LLM SDK ahead of the first request. Safe to call more than once."""
+    start = time.perf_counter()
+    model = _get_model()
+    return {
+        "mode": AI_MODE,
+        "model_loaded": model is not None,
+        "seconds": round(time.perf_counter() - start, 3)
+    }
+
+def _model_available() -> bool:
+    return AI_MODE != "mock" and _get_model() is not None
+
+# Outcome counters for live calls, exposed through llm_metrics()
+_call_counters = {"calls": 0, "failures": 0, "timeouts": 0, "hedged": 0, "short_circuited": 0}
+_counters_lock = threading.Lock()
+
+def _count(name: str) -> None:
+    with _counters_lock:
+        _call_counters[name] += 1
+
+def _hedge_after() -> Optional[float]:
+    """Start a duplicate request once a call runs past the configured latency percentile"""
+    return llm_latency.percentile(LLM_HEDGE_PERCENTILE) if LLM_HEDGE_ENABLED else None
+
+def _model_name() -> str:
+    return GEMINI_MODEL if AI_MODE == "gemini" else AI_MODE
+
+def _record_outcome(start: float, error: Optional[BaseException] = None, hedged: bool = False) -> None:
+    """Count a call's outcome and feed it to the breaker and latency tracker. Usage is billed per attempt."""
+    _count("calls")
+    if hedged:
+        _count("hedged")
+    if error is None:
+        llm_breaker.record_success()
+        llm_latency.record(time.perf_counter() - start)
+        return
+    _count("failures")
+    if isinstance(error, (TimeoutError, asyncio.TimeoutError)):
+        _count("timeouts")
+    llm_breaker.record_failure()
+
+def _bill_attempts(prompt: str, workspace_id: Optional[int]) -> Callable[[Optional[str], float, bool], None]:
+    """Record each request a call sends as it finishes, including a hedged duplicate
+    and attempts abandoned at the deadline: each one costs tokens even if its reply goes unused"""
+    def bill(text: Optional[str], seconds: float, duplicate: bool) -> None:
+        usage_ledger.record(prompt, text, seconds, _model_name(), workspace_id, hedge=duplicate)
+    return bill
+
+def _call_model(prompt: str, workspace_id: Optional[int] = None) -> Optional[str]:
+    """Call Gemini with a deadline. Returns None when the model is unavailable,
+    the circuit breaker is open, too many abandoned calls are still running,
+    or the call errors or times out."""
+    if not _model_available():
+        return None
+    if not llm_breaker.allow():
+        _count("short_circuited")
+        return None
+    
+    start = time.perf_counter()
     try:
-        import google.generativeai as genai
-        genai.configure(api_key=GEMINI_API_KEY)
-        gemini_model = genai.GenerativeModel('gemini-pro')
-        logger.info("Gemini API initialized successfully")
+        text, hedged = run_hedged(
+            lambda: gemini_model.generate_content(prompt).text,
+            LLM_CALL_TIMEOUT_SECONDS,
+            _hedge_after(),
+            _bill_attempts(prompt, workspace_id)
+        )
+    except AbandonedCallsFull as e:
+        # Nothing was sent, so this says nothing about the model
+        logger.warning(f"Gemini call refused: {e}")
+        llm_breaker.abandon()
+        _count("short_circuited")
+        return None
     except Exception as e:
-        logger.error(f"Failed to initialize Gemini: {e}")
-        gemini_model = None
+        logger.error(f"Gemini API error: {e!r}")
+        _record_outcome(start, e)
+        return None
+    except BaseException:
+        llm_breaker.abandon()
+        raise
+    _record_outcome(start, hedged=hedged)
+    return text
+
+async def _call_model_async(prompt: str, workspace_id: Optional[int] = None) -> Optional[str]:
+    """Async Gemini call bounded by the shared fair limiter. Returns None when
+    unavailable, short-circuited, or on error or timeout. A hedged duplicate
+    shares the caller's limiter slot."""
+    if not _model_available():
+        return None
+    
+    async with llm_limiter.slot(workspace_id):
+        if not llm_breaker.allow():
+            _count("short_circuited")
+            return None
+        
+        async def attempt() -> str:
+            response = await gemini_model.generate_content_async(prompt)
+            return response.text
+        
+        start = time.perf_counter()
+        try:
+            text, hedged = await run_hedged_async(
+                attempt,
+                LLM_CALL_TIMEOUT_SECONDS,
+                _hedge_after(),
+                _bill_attempts(prompt, workspace_id)
+            )
+        except Exception as e:
+            logger.error(f"Gemini API error: {e!r}")
+            _record_outcome(start, e)
+            return None
+        except BaseException:
+            # Cancelled (shutdown, wait_for, gather): no outcome, but a half-open probe must not stay taken
+            llm_breaker.abandon()
+            raise
+        _record_outcome(start, hedged=hedged)
+        return text
 
-def _call_gemini(prompt: str) -> str:
-    """Internal method to call Gemini or return mock response"""
-    if AI_MODE == "mock" or not gemini_model:
+async def _stream_model_async(prompt: str, workspace_id: Optional[int] = None) -> AsyncIterator[str]:
+    """Yield text as Gemini streams it. In mock mode the mock response is replayed in slices.
+    
+    The deadline applies to the wait for each chunk; an open breaker yields nothing.
+    """
+    if not _model_available():
+        raw_response = _mock_response(prompt)
+        for start in range(0, len(raw_response), 64):
+            yield raw_response[start:start + 64]
+            await asyncio.sleep(0)
+        return
+    
+    async with llm_limiter.slot(workspace_id):
+        if not llm_breaker.allow():
+            _count("short_circuited")
+            return
+        
+        start = time.perf_counter()
+        pieces = []
+        try:
+            response = await asyncio.wait_for(
+                gemini_model.generate_content_async(prompt, stream=True), LLM_CALL_TIMEOUT_SECONDS
+            )
+            chunks = response.__aiter__()
+            while True:
+                try:
+                    chunk = await asyncio.wait_for(chunks.__anext__(), LLM_CALL_TIMEOUT_SECONDS)
+                except StopAsyncIteration:
+                    break
+                pieces.append(chunk.text)
+                yield chunk.text
+        except Exception as e:
+            logger.error(f"Gemini streaming error: {e!r}")
+            usage_ledger.record(prompt, None, time.perf_counter() - start, _model_name(), workspace_id)
+            _record_outcome(start, e)
+            return
+        except BaseException:
+            # Cancelled, or the consumer closed the stream early (GeneratorExit at a yield)
+            llm_breaker.abandon()
+            raise
+        usage_ledger.record(prompt, "".join(pieces), time.perf_counter() - start, _model_name(), workspace_id)
+        _record_outcome(start)
+
+def _call_gemini(prompt: str, workspace_id: Optional[int] = None) -> Optional[str]:
+    """Call Gemini, or return the mock response in mock mode.
+    
+    Returns None when a live call fails so callers use their rule-based fallback.
+    """
+    if not _model_available():
         logger.info("Using mock AI mode")
         return _mock_response(prompt)
+    return _call_model(prompt, workspace_id)
+
+def _cached_generate(
+    prompt: str,
+    schema: Optional[dict],
+    workspace_id: Optional[int] = None,
+    recover: bool = False
+) -> Optional[Any]:
+    """Return the validated model output for a prompt, going through the response cache.
     
-    try:
-        response = gemini_model.generate_content(prompt)
-        return response.text
-    except Exception as e:
-        logger.error(f"Gemini API error: {e}")
-        return _mock_response(prompt)
+    Only live, schema-valid responses are stored, so mock fallbacks and malformed
+    replies are never served from the cache. With no schema the raw text is returned.
+    A failed or short-circuited live call returns None so the caller can use its
+    rule-based fallback.
+    With recover=True an array response that fails validation is salvaged item by
+    item into a PartialArray instead of returning None.
+    """
+    live = _model_available()
+    if live:
+        cached = llm_cache.get(prompt, _model_name())
+        if cached is not None:
+            return cached
+    
+    raw_response = _call_model(prompt, workspace_id) if live else _mock_response(prompt)
+    if raw_response is None:
+        return None
+    
+    parsed = parse_and_validate(raw_response, schema) if schema else raw_response
+    if parsed is None and recover:
+        return recover_partial_array(raw_response, schema)
+    if parsed is not None and live:
+        llm_cache.set(prompt, parsed, _model_name())
+    return parsed
 
-def _mock_response(prompt: str) -> str:
-    """Deterministic mock responses for development"""
-    if "extract action items" in prompt.lower():
-        return '''[
-            {"assignee":"dev1","description":"Implement user authentication","due_date":"2025-02-15","priority":9,"effort_tag":"large","confidence":0.92,"is_blocked":false,"blocker_reason":null},
-            {"assignee":"qa1","description":"Write test cases for login flow","due_date":"2025-02-20","priority":7,"effort_tag":"medium","confidence":0.85,"is_blocked":false,"blocker_reason":null}
-        ]'''
-    elif "dependency relationships" in prompt.lower():
-        return '{"dependencies":[{"from":"Write test cases for login flow","depends_on":"Implement user authentication"}]}'
-    elif "estimate RICE" in prompt.lower():
-        return '{"reach":500,"impact":8,"confidence":0.8,"effort":40}'
-    elif "Nova, the project assistant" in prompt.lower():
-        return '{"action":"none","explanation":"I can help you with tasks, sprints, and project queries."}'
-    elif "Summarize this meeting" in prompt.lower():
-        return "Team discussed authentication implementation and testing strategy. Dev1 will implement OAuth2 login by Feb 15. QA1 will prepare test cases."
-    return '{"action":"none","explanation":"Mock response"}'
-
-def generate_tasks_from_transcript(transcript: str) -> List[Dict[str, Any]]:
-    """Extract tasks from meeting transcript"""
-    prompt = TASK_EXTRACTION_PROMPT.format(transcript=transcript)
-    raw_response = _call_gemini(prompt)
+async def _cached_generate_async(
+    prompt: str,
+    schema: Optional[dict],
+    workspace_id: Optional[int] = None,
+    recover: bool = False
+) -> Optional[Any]:
+    """Async counterpart of _cached_generate"""
+    live = _model_available()
+    if live:
+        cached = llm_cache.get(prompt, _model_name())
+        if cached is not None:
+            return cached
+    
+    raw_response = await _call_model_async(prompt, workspace_id) if live else _mock_response(prompt)
+    if raw_response is None:
+        return None
+    
+    parsed = parse_and_validate(raw_response, schema) if schema else raw_response
+    if parsed is None and recover:
+        return recover_partial_array(raw_response, schema)
+    if parsed is not None and live:
+        llm_cache.set(prompt, parsed, _model_name())
+    return parsed
+
+def _continuation_prompt(transcript: str, extracted: List[Dict[str, Any]]) -> str:
+    """Prompt asking only for the action items missing from a cut-off response"""
+    listed = "\n".join(f"- {candidate['description']}" for candidate in extracted)
+    return TASK_CONTINUATION_PROMPT.format(extracted=listed, transcript=transcript)
+
+def _compact(transcript: str) -> str:
+    """Drop filler before the transcript is put into a prompt"""
+    return compact_transcript(transcript) if TRANSCRIPT_COMPACTION_ENABLED else transcript
+
+async def _compact_async(transcript: str) -> str:
+    """_compact in a worker thread, so a long transcript does not stall the event loop"""
+    return await asyncio.to_thread(_compact, transcript)
+
+async def _compact_and_chunk_async(transcript: str) -> Tuple[str, List[str]]:
+    """The compacted transcript and its prompt-sized chunks, prepared in a worker thread"""
+    def prepare() -> Tuple[str, List[str]]:
+        compacted = _compact(transcript)
+        return compacted, chunk_transcript(compacted)
+    return await asyncio.to_thread(prepare)
+
+def _needs_continuation(parsed: Any) -> bool:
+    return LLM_REPROMPT_TRUNCATED and isinstance(parsed, PartialArray) and parsed.truncated
+
+def _extract_chunk(transcript: str, workspace_id: Optional[int] = None) -> List[Dict[str, Any]]:
+    """Extract tasks from a transcript that fits in a single prompt.
     
-    parsed = parse_and_validate(raw_response, TASK_CANDIDATE_SCHEMA)
+    Valid items are salvaged from a broken response. If it was cut off, only
+    the missing tail is requested again.
+    """
+    prompt = TASK_EXTRACTION_PROMPT.format(transcript=transcript)
+    parsed = _cached_generate(prompt, TASK_CANDIDATE_SCHEMA, workspace_id, recover=True)
     if parsed is None:
         logger.warning("Task extraction failed, using fallback")
         return fallback_task_extractor(transcript)
     
-    return parsed
+    if _needs_continuation(parsed):
+        tail = _cached_generate(_continuation_prompt(transcript, parsed), TASK_CANDIDATE_SCHEMA, workspace_id, recover=True)
+        if tail:
+            return merge_candidates([parsed, tail])
+    return list(parsed)
+
+async def _cached_generate_sections_async(prompt: str, schema: dict, workspace_id: Optional[int] = None) -> Dict[str, Optional[Any]]:
+    """Like _cached_generate_async for multi-section prompts. Cached only when every section is valid."""
+    live = _model_available()
+    if live:
+        cached = llm_cache.get(prompt, _model_name())
+        if cached is not None:
+            return cached
+    
+    raw_response = await _call_model_async(prompt, workspace_id) if live else _mock_response(prompt)
+    if raw_response is None:
+        return {name: None for name in schema["properties"]}
+    
+    sections = parse_and_validate_sections(raw_response, schema)
+    if live and all(value is not None for value in sections.values()):
+        llm_cache.set(prompt, sections, _model_name())
+    return sections
+
+def generate_tasks_from_transcript(transcript: str, workspace_id: Optional[int] = None) -> List[Dict[str, Any]]:
+    """Extract tasks from meeting transcript, map-reducing over chunks when it is long"""
+    transcript = _compact(transcript)
+    chunks = chunk_transcript(transcript)
+    if len(chunks) == 1:
+        return _extract_chunk(transcript, workspace_id)
+    
+    with ThreadPoolExecutor(max_workers=TRANSCRIPT_CHUNK_PARALLELISM) as pool:
+        results = list(pool.map(lambda chunk: _extract_chunk(chunk, workspace_id), chunks))
+    return merge_candidates(results)
 
-def detect_dependencies(transcript: str) -> Dict[str, List]:
+def detect_dependencies(transcript: str, workspace_id: Optional[int] = None) -> Dict[str, List]:
     """Detect task dependencies from transcript"""
+    transcript = _compact(transcript)
     prompt = DEPENDENCY_DETECTION_PROMPT.format(transcript=transcript)
-    raw_response = _call_gemini(prompt)
-    
-    parsed = parse_and_validate(raw_response, DEPENDENCY_SCHEMA)
+    parsed = _cached_generate(prompt, DEPENDENCY_SCHEMA, workspace_id)
     if parsed is None:
         return fallback_dependencies()
     
     return parsed
 
-def score_rice(description: str) -> Dict[str, Any]:
+def score_rice(description: str, workspace_id: Optional[int] = None) -> Dict[str, Any]:
     """Estimate RICE score for a task"""
     prompt = RICE_SCORING_PROMPT.format(description=description)
-    raw_response = _call_gemini(prompt)
-    
-    parsed = parse_and_validate(raw_response, RICE_SCHEMA)
+    parsed = _cached_generate(prompt, RICE_SCHEMA, workspace_id)
     if parsed is None:
         return fallback_rice()
     
     return parsed
 
-def assistant_chat(message: str, context: str = "") -> Dict[str, Any]:
+def assistant_chat(message: str, context: str = "", workspace_id: Optional[int] = None) -> Dict[str, Any]:
     """Nova assistant chat"""
     prompt = ASSISTANT_CHAT_PROMPT.format(message=message, context=context)
-    raw_response = _call_gemini(prompt)
+    raw_response = _call_gemini(prompt, workspace_id)
     
-    parsed = parse_and_validate(raw_response, ASSISTANT_ACTION_SCHEMA)
+    parsed = parse_and_validate(raw_response, ASSISTANT_ACTION_SCHEMA) if raw_response is not None else None
     if parsed is None:
         return fallback_assistant_action(message)
     
     return parsed
 
-def summarize_meeting(transcript: str) -> str:
+def summarize_meeting(transcript: str, workspace_id: Optional[int] = None) -> str:
     """Generate meeting summary"""
+    transcript = _compact(transcript)
+    prompt = MEETING_SUMMARY_PROMPT.format(transcript=transcript)
+    return _cached_generate(prompt, None, workspace_id) or fallback_summary(transcript)
+
+async def _extract_chunk_async(transcript: str, workspace_id: Optional[int] = None) -> List[Dict[str, Any]]:
+    """Async counterpart of _extract_chunk"""
+    prompt = TASK_EXTRACTION_PROMPT.format(transcript=transcript)
+    parsed = await _cached_generate_async(prompt, TASK_CANDIDATE_SCHEMA, workspace_id, recover=True)
+    if parsed is None:
+        logger.warning("Task extraction failed, using fallback")
+        return fallback_task_extractor(transcript)
+    
+    if _needs_continuation(parsed):
+        tail = await _cached_generate_async(
+            _continuation_prompt(transcript, parsed), TASK_CANDIDATE_SCHEMA, workspace_id, recover=True
+        )
+        if tail:
+            return merge_candidates([parsed, tail])
+    return list(parsed)
+
+async def generate_tasks_from_transcript_async(transcript: str, workspace_id: Optional[int] = None) -> List[Dict[str, Any]]:
+    """Async task extraction with chunks extracted in parallel"""
+    transcript, chunks = await _compact_and_chunk_async(transcript)
+    if len(chunks) == 1:
+        return await _extract_chunk_async(transcript, workspace_id)
+    
+    semaphore = asyncio.Semaphore(TRANSCRIPT_CHUNK_PARALLELISM)
+    
+    async def extract(chunk: str) -> List[Dict[str, Any]]:
+        async with semaphore:
+            return await _extract_chunk_async(chunk, workspace_id)
+    
+    results = await asyncio.gather(*(extract(chunk) for chunk in chunks))
+    return merge_candidates(results)
+
+async def stream_tasks_from_transcript(transcript: str, workspace_id: Optional[int] = None) -> AsyncIterator[Dict[str, Any]]:
+    """Yield validated task candidates as soon as each object in the streamed reply is complete.
+    
+    Long transcripts are streamed chunk by chunk; candidates that duplicate one
+    already emitted are skipped. A chunk that yields nothing falls back to the
+    rule-based extractor.
+    """
+    transcript, chunks = await _compact_and_chunk_async(transcript)
+    emitted: List[Dict[str, Any]] = []
+    
+    def is_new(candidate: Dict[str, Any]) -> bool:
+        return not any(is_duplicate_candidate(existing, candidate) for existing in emitted)
+    
+    for chunk in chunks:
+        prompt = TASK_EXTRACTION_PROMPT.format(transcript=chunk)
+        live = _model_available()
+        cached = llm_cache.get(prompt, _model_name()) if live else None
+        if cached is not None:
+            for candidate in cached:
+                if is_new(candidate):
+                    emitted.append(candidate)
+                    yield candidate
+            continue
+        
+        parser = IncrementalArrayParser()
+        chunk_candidates = []
+        rejected = 0
+        async for piece in _stream_model_async(prompt, workspace_id):
+            for item in parser.feed(piece):
+                if not validate_item(item, TASK_CANDIDATE_SCHEMA):
+                    rejected += 1
+                    continue
+                chunk_candidates.append(item)
+                if is_new(item):
+                    emitted.append(item)
+                    yield item
+        
+        if live and parser.finished and not rejected:
+            llm_cache.set(prompt, chunk_candidates, _model_name())
+        if not chunk_candidates:
+            logger.warning("Streamed extraction produced no candidates, using fallback")
+            for candidate in fallback_task_extractor(chunk):
+                if is_new(candidate):
+                    emitted.append(candidate)
+                    yield candidate
+
+async def detect_dependencies_async(transcript: str, workspace_id: Optional[int] = None) -> Dict[str, List]:
+    """Async dependency detection"""
+    transcript = await _compact_async(transcript)
+    prompt = DEPENDENCY_DETECTION_PROMPT.format(transcript=transcript)
+    parsed = await _cached_generate_async(prompt, DEPENDENCY_SCHEMA, workspace_id)
+    if parsed is None:
+        return fallback_dependencies()
+    
+    return parsed
+
+async def summarize_meeting_async(transcript: str, workspace_id: Optional[int] = None) -> str:
+    """Async meeting summary"""
+    transcript = await _compact_async(transcript)
     prompt = MEETING_SUMMARY_PROMPT.format(transcript=transcript)
-    return _call_gemini(prompt)
+    return await _cached_generate_async(prompt, None, workspace_id) or fallback_summary(transcript)
+
+async def analyze_meeting_async(transcript: str, workspace_id: Optional[int] = None) -> Dict[str, Any]:
+    """Extract tasks, dependencies and a summary for one meeting.
+    
+    Transcripts that fit in one prompt use the combined analysis prompt, so the
+    transcript is sent once. Any section that comes back missing or invalid is
+    re-requested with its dedicated prompt. Long transcripts run the three
+    dedicated calls concurrently, with chunked task extraction.
+    """
+    transcript, chunks = await _compact_and_chunk_async(transcript)
+    sections = {"tasks": None, "dependencies": None, "summary": None}
+    if len(chunks) == 1:
+        prompt = MEETING_ANALYSIS_PROMPT.format(transcript=transcript)
+        sections = await _cached_generate_sections_async(prompt, MEETING_ANALYSIS_SCHEMA, workspace_id)
+    
+    async def dependencies_section() -> List[Dict[str, str]]:
+        return (await detect_dependencies_async(transcript, workspace_id))["dependencies"]
+    
+    fallbacks = {
+        "tasks": lambda: generate_tasks_from_transcript_async(transcript, workspace_id),
+        "dependencies": dependencies_section,
+        "summary": lambda: summarize_meeting_async(transcript, workspace_id)
+    }
+    missing = [name for name, value in sections.items() if value is None]
+    if missing:
+        logger.warning(f"Meeting analysis sections {missing} unavailable, using dedicated prompts")
+        results = await asyncio.gather(*(fallbacks[name]() for name in missing))
+        sections = {**sections, **dict(zip(missing, results))}
+    
+    return {
+        "candidates": sections["tasks"],
+        "dependencies": sections["dependencies"],
+        "summary": sections["summary"]
+    }
+
+def _rice_batches(
+    tasks: Dict[int, str],
+    max_items: int = RICE_BATCH_MAX_ITEMS,
+    max_chars: int = RICE_BATCH_MAX_CHARS
+) -> List[Dict[int, str]]:
+    """Split tasks into prompt-sized batches by item count and total description length"""
+    batches: List[Dict[int, str]] = []
+    current: Dict[int, str] = {}
+    size = 0
+    for task_id, description in tasks.items():
+        line_size = len(description) + 12
+        if current and (len(current) >= max_items or size + line_size > max_chars):
+            batches.append(current)
+            current, size = {}, 0
+        current[task_id] = description
+        size += line_size
+    if current:
+        batches.append(current)
+    return batches
+
+async def _score_rice_batch(batch: Dict[int, str], workspace_id: Optional[int]) -> Dict[int, Dict[str, Any]]:
+    """Score one batch; ids the model left out or got wrong are simply absent"""
+    lines = "\n".join(f"[{task_id}] {' '.join(description.split())}" for task_id, description in batch.items())
+    parsed = await _cached_generate_async(RICE_BATCH_PROMPT.format(tasks=lines), RICE_BATCH_SCHEMA, workspace_id, recover=True)
+    scores = {}
+    for item in parsed or []:
+        if item["id"] in batch:
+            scores[item["id"]] = {field: item[field] for field in RICE_SCHEMA["required"]}
+    return scores
+
+async def score_rice_batch_async(tasks: Dict[int, str], workspace_id: Optional[int] = None) -> Dict[int, Dict[str, Any]]:
+    """Estimate RICE fields for many tasks, several per prompt.
+    
+    tasks maps task id to description. Batches run concurrently under the
+    shared limiter. Ids missing from a batch reply are retried once in a fresh
+    batch, then get the conservative fallback. Each result has a "source" of
+    "model" or "fallback".
+    """
+    results: Dict[int, Dict[str, Any]] = {}
+    pending = dict(tasks)
+    for _ in range(2):
+        if not pending:
+            break
+        batch_scores = await asyncio.gather(*(_score_rice_batch(batch, workspace_id) for batch in _rice_batches(pending)))
+        for scores in batch_scores:
+            for task_id, fields in scores.items():
+                results[task_id] = {**fields, "source": "model"}
+        pending = {task_id: description for task_id, description in pending.items() if task_id not in results}
+    
+    if pending:
+        logger.warning(f"RICE batch scoring missed {len(pending)} tasks, using fallback")
+    for task_id in pending:
+        results[task_id] = {**fallback_rice(), "source": "fallback"}
+    return results
+
+def cache_stats() -> Dict[str, Any]:
+    """Hit/miss counters for the Gemini response cache"""
+    return llm_cache.stats()
+
+def llm_metrics() -> Dict[str, Any]:
+    """Circuit breaker state, call latency percentiles and outcome counters"""
+    with _counters_lock:
+        counters = dict(_call_counters)
+    return {
+        "breaker": llm_breaker.stats(),
+        "latency_seconds": llm_latency.stats(),
+        "calls": counters,
+        "hedge_enabled": LLM_HEDGE_ENABLED,
+        "hedge_after_seconds": _hedge_after(),
+        "abandoned_calls": llm_abandoned.stats(),
+        "limiter": llm_limiter.stats()
+    }
+
+def llm_usage(workspace_id: Optional[int] = None, recent: int = 20) -> Dict[str, Any]:
+    """Estimated token spend per workspace, or for every workspace when none is given"""
+    if workspace_id is None:
+        return usage_ledger.summary()
+    usage = usage_ledger.workspace_usage(workspace_id)
+    usage["recent_calls"] = usage_ledger.recent(workspace_id, recent)
+    return usage
@@ -0,0 +1,107 @@
+"""Keyword table shared by the rule-based heuristics
+
+The fallback extractor, auto-mapping and meeting insights all look for the
+same kinds of phrases (action verbs, urgency, blockers, deadlines, sentiment).
+They used to lowercase the text again for every keyword list, sometimes once
+per keyword, and to walk every line or sentence in Python to test it.
+
+A KeywordTable keeps every family of keywords in one place. It is a lookup
+table, not a single-pass matcher: each check still searches once per keyword.
+
+* lower() lowercases a piece of text once, and every family check on it
+  reuses that copy.
+* matching_pieces() finds the lines or sentences of a whole transcript that
+  contain a family's keywords. It searches the full text with str.find per
+  keyword and jumps to the next piece after each hit, so pieces without a hit
+  never enter a Python loop.
+
+Each search is a C-level substring scan. In CPython, these per-keyword scans
+beat both a combined alternation regex and an Aho-Corasick automaton on
+multi-megabyte transcripts (see benchmarks/bench_keywords.py).
+"""
+from typing import Dict, Iterable, List, Optional, Tuple
+
+class LoweredText:
+    """One lowercased piece of text, checked against families of a KeywordTable"""
+
+    __slots__ = ("_families", "text")
+
+    def __init__(self, families: Dict[str, List[str]], text: str):
+        self._families = families
+        self.text = text.lower()
+
+    def has(self, family: str) -> bool:
+        text = self.text
+        for keyword in self._families[family]:
+            if keyword in text:
+                return True
+        return False
+
+    def count(self, family: str) -> int:
+        """Total occurrences of the family's keywords, each counted like str.count"""
+        text = self.text
+        return sum(text.count(keyword) for keyword in self._families[family])
+
+    def first_of(self, family: str) -> Optional[Tuple[str, int]]:
+        """First keyword of the family, in family order, that occurs, with its position"""
+        text = self.text
+        for keyword in self._families[family]:
+            position = text.find(keyword)
+            if position >= 0:
+                return keyword, position
+        return None
+
+class KeywordTable:
+    """Named families of lowercase keywords, each matched as a substring of lowercased text"""
+
+    def __init__(self, families: Dict[str, Iterable[str]]):
+        self.families: Dict[str, List[str]] = {name: list(keywords) for name, keywords in families.items()}
+
+    def lower(self, text: str) -> LoweredText:
+        return LoweredText(self.families, text)
+
+    def matching_pieces(self, text: str, separator: str, family: str) -> List[str]:
+        """The pieces of text.split(separator) that contain one of the family's keywords, in order.
+
+        Keywords must not contain the separator.
+        """
+        lowered = text.lower()
+        starts = set()
+        for keyword in self.families[family]:
+            position = lowered.find(keyword)
+            while position >= 0:
+                previous_separator = lowered.rfind(separator, 0, position)
+                starts.add(previous_separator + len(separator) if previous_separator >= 0 else 0)
+                end = lowered.find(separator, position + len(keyword))
+                if end < 0:
+                    break
+                position = lowered.find(keyword, end + len(separator))
+        if not starts:
+            return []
+
+        pieces = text.split(separator)
+        indexes = []
+        index = 0
+        previous = 0
+        for start in sorted(starts):
+            index += lowered.count(separator, previous, start)
+            indexes.append(index)
+            previous = start
+        return [pieces[i] for i in indexes]
+
+# Keyword families used by the rule-based extractors and meeting heuristics
+HEURISTIC_KEYWORDS = {
+    "explicit_action": ["i will", "i'll", "action:", "todo:", "task:"],
+    "action": ["will", "should", "need to", "must", "going to", "has to"],
+    "strong_action": ["will", "must", "need to"],
+    "density_action": ["will", "should", "need to", "must", "going to"],
+    "owner": ["i will", "john", "sarah", "dev", "qa"],
+    "deadline": ["by", "today", "tomorrow", "friday", "next week"],
+    "blocker": ["blocked by", "waiting for", "pending", "stuck on", "need approval"],
+    "high_urgency": ["urgent", "critical", "asap", "immediately", "emergency"],
+    "medium_urgency": ["important", "soon", "priority", "should"],
+    "positive": ["great", "excellent", "good", "progress", "completed", "success"],
+    "negative": ["blocked", "issue", "problem", "delayed", "concern", "risk"]
+}
+
+heuristic_keywords = KeywordTable(HEURISTIC_KEYWORDS)
@@ -0,0 +1,65 @@
+"""MinHash fingerprints and LSH band keys for near-duplicate transcript detection
+
+Signatures use one-permutation MinHash: each shingle is hashed once and
+lands in one of ``num_perm`` bins, and each bin keeps its minimum. Empty bins
+are filled from the next non-empty bin, so signatures are always complete.
+That makes fingerprinting a single pass over the shingles instead of
+``num_perm`` passes. Hashes come from blake2b, so signatures are stable across
+processes and can be stored.
+"""
+import hashlib
+import re
+from typing import List, Optional
+from ..config import MEETING_MINHASH_PERMUTATIONS, MEETING_LSH_BANDS, MEETING_SHINGLE_WORDS
+
+_WORD_RE = re.compile(r"[a-z0-9']+")
+_MAX_HASH = (1 << 64) - 1
+
+def shingles(text: str, size: int = MEETING_SHINGLE_WORDS) -> set:
+    """Overlapping word n-grams of the normalized text"""
+    words = _WORD_RE.findall(text.lower())
+    if len(words) <= size:
+        return {" ".join(words)} if words else set()
+    return {" ".join(words[i:i + size]) for i in range(len(words) - size + 1)}
+
+def _hash(shingle: str) -> int:
+    return int.from_bytes(hashlib.blake2b(shingle.encode("utf-8"), digest_size=8).digest(), "big")
+
+def minhash_signature(text: str, num_perm: int = MEETING_MINHASH_PERMUTATIONS) -> Optional[List[int]]:
+    """One-permutation MinHash signature, or None for text with no words"""
+    items = shingles(text)
+    if not items:
+        return None
+    bins = [_MAX_HASH] * num_perm
+    for shingle in items:
+        value = _hash(shingle)
+        index = value % num_perm
+        if value < bins[index]:
+            bins[index] = value
+    # Densify: empty bins borrow the value of the next filled bin (rotating)
+    filled = [i for i, value in enumerate(bins) if value != _MAX_HASH]
+    if len(filled) < num_perm:
+        source = {}
+        next_filled = filled[0] + num_perm
+        for i in reversed(range(num_perm)):
+            if bins[i] != _MAX_HASH:
+                next_filled = i
+            source[i] = next_filled % num_perm
+        bins = [bins[source[i]] for i in range(num_perm)]
+    return bins
+
+def estimated_similarity(a: List[int], b: List[int]) -> float:
+    """Estimated Jaccard similarity of the shingle sets behind two signatures"""
+    if not a or not b or len(a) != len(b):
+        return 0.0
+    return sum(1 for x, y in zip(a, b) if x == y) / len(a)
+
+def band_keys(signature: List[int], bands: int = MEETING_LSH_BANDS) -> List[str]:
+    """LSH bucket key per band. Two signatures sharing any key are duplicate candidates."""
+    rows = len(signature) // bands
+    keys = []
+    for band in range(bands):
+        chunk = signature[band * rows:(band + 1) * rows]
+        digest = hashlib.blake2b(",".join(map(str, chunk)).encode("ascii"), digest_size=8).hexdigest()
+        keys.append(digest)
+    return keys
@@ -0,0 +1,40 @@
+"""Deterministic canned responses used in mock mode and by the fake model server"""
+import json
+import re
+
+BATCH_TASK_ID_RE = re.compile(r"^\[(\d+)\]", re.MULTILINE)
+
+def mock_response(prompt: str) -> str:
+    """Deterministic mock responses for development"""
+    prompt_lower = prompt.lower()
+    if "analyze this meeting transcript" in prompt_lower:
+        return '''{
+            "tasks": [
+                {"assignee":"dev1","description":"Implement user authentication","due_date":"2025-02-15","priority":9,"effort_tag":"large","confidence":0.92,"is_blocked":false,"blocker_reason":null},
+                {"assignee":"qa1","description":"Write test cases for login flow","due_date":"2025-02-20","priority":7,"effort_tag":"medium","confidence":0.85,"is_blocked":false,"blocker_reason":null}
+            ],
+            "dependencies": [{"from":"Write test cases for login flow","depends_on":"Implement user authentication"}],
+            "summary": "Team discussed authentication implementation and testing strategy. Dev1 will implement OAuth2 login by Feb 15. QA1 will prepare test cases."
+        }'''
+    elif "a previous answer for this transcript was cut off" in prompt_lower:
+        # Continuation of a truncated extraction: the canned items are all in the first answer
+        return "[]"
+    elif "return only a json array of task objects" in prompt_lower:
+        return '''[
+            {"assignee":"dev1","description":"Implement user authentication","due_date":"2025-02-15","priority":9,"effort_tag":"large","confidence":0.92,"is_blocked":false,"blocker_reason":null},
+            {"assignee":"qa1","description":"Write test cases for login flow","due_date":"2025-02-20","priority":7,"effort_tag":"medium","confidence":0.85,"is_blocked":false,"blocker_reason":null}
+        ]'''
+    elif "dependency relationships" in prompt_lower:
+        return '{"dependencies":[{"from":"Write test cases for login flow","depends_on":"Implement user authentication"}]}'
+    elif "estimate rice fields for each task" in prompt_lower:
+        return json.dumps([
+            {"id": int(task_id), "reach": 500, "impact": 8, "confidence": 0.8, "effort": 40}
+            for task_id in BATCH_TASK_ID_RE.findall(prompt)
+        ])
+    elif "estimate rice" in prompt_lower:
+        return '{"reach":500,"impact":8,"confidence":0.8,"effort":40}'
+    elif "nova, the project assistant" in prompt_lower:
+        return '{"action":"none","explanation":"I can help you with tasks, sprints, and project queries."}'
+    elif "summarize this meeting" in prompt_lower:
+        return "Team discussed authentication implementation and testing strategy. Dev1 will implement OAuth2 login by Feb 15. QA1 will prepare test cases."
+    return '{"action":"none","explanation":"Mock response"}'
@@ -1,8 +1,10 @@
 """JSON schema validation for Gemini responses with fallback"""
 import json
 import logging
-from jsonschema import validate, ValidationError
-from typing import List, Dict, Any, Optional
+from jsonschema import ValidationError
+from jsonschema.validators import validator_for
+from typing import List, Dict, Any, Optional, Callable, Tuple
+from .keywords import heuristic_keywords
 
 logger = logging.getLogger(__name__)
 
@@ -53,6 +55,15 @@ RICE_SCHEMA = {
     "required": ["reach", "impact", "confidence", "effort"]
 }
 
+RICE_BATCH_SCHEMA = {
+    "type": "array",
+    "items": {
+        "type": "object",
+        "properties": {"id": {"type": "integer"}, **RICE_SCHEMA["properties"]},
+        "required": ["id", *RICE_SCHEMA["required"]]
+    }
+}
+
 ASSISTANT_ACTION_SCHEMA = {
     "type": "object",
     "properties": {
@@ -64,46 +75,290 @@ ASSISTANT_ACTION_SCHEMA = {
     "required": ["action", "explanation"]
 }
 
+MEETING_ANALYSIS_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "tasks": TASK_CANDIDATE_SCHEMA,
+        "dependencies": DEPENDENCY_SCHEMA["properties"]["dependencies"],
+        "summary": {"type": "string", "minLength": 1}
+    },
+    "required": ["tasks", "dependencies", "summary"]
+}
+
+_TYPE_CHECKS: Dict[str, Callable[[Any], bool]] = {
+    "string": lambda v: type(v) is str,
+    "integer": lambda v: type(v) is int,
+    "number": lambda v: type(v) is int or type(v) is float,
+    "boolean": lambda v: type(v) is bool,
+    "null": lambda v: v is None,
+    "object": lambda v: type(v) is dict,
+    "array": lambda v: type(v) is list
+}
+
+_FAST_KEYWORDS = {"type", "properties", "required", "items", "enum", "minimum", "maximum", "minLength"}
+
+def _compile_fast_check(schema: dict) -> Optional[Callable[[Any], bool]]:
+    """Compile a strict structural check for the subset of JSON Schema our schemas use.
+    
+    The check never accepts an instance the full validator would reject; it may
+    reject valid edge cases (e.g. 1.0 for an integer), which then go through full
+    validation. Returns None if the schema uses keywords outside the subset.
+    """
+    if set(schema) - _FAST_KEYWORDS:
+        return None
+    checks: List[Callable[[Any], bool]] = []
+    
+    if "type" in schema:
+        names = [schema["type"]] if isinstance(schema["type"], str) else list(schema["type"])
+        if any(name not in _TYPE_CHECKS for name in names):
+            return None
+        type_checks = [_TYPE_CHECKS[name] for name in names]
+        checks.append(lambda v: any(check(v) for check in type_checks))
+    if "enum" in schema:
+        allowed = list(schema["enum"])
+        checks.append(lambda v: any(v == a and type(v) is type(a) for a in allowed))
+    if "minimum" in schema:
+        minimum = schema["minimum"]
+        checks.append(lambda v: not _TYPE_CHECKS["number"](v) or v >= minimum)
+    if "maximum" in schema:
+        maximum = schema["maximum"]
+        checks.append(lambda v: not _TYPE_CHECKS["number"](v) or v <= maximum)
+    if "minLength" in schema:
+        min_length = schema["minLength"]
+        checks.append(lambda v: type(v) is not str or len(v) >= min_length)
+    if "required" in schema:
+        required = list(schema["required"])
+        checks.append(lambda v: type(v) is not dict or all(name in v for name in required))
+    if "properties" in schema:
+        properties = []
+        for name, subschema in schema["properties"].items():
+            subcheck = _compile_fast_check(subschema)
+            if subcheck is None:
+                return None
+            properties.append((name, subcheck))
+        checks.append(lambda v: type(v) is not dict or all(name not in v or check(v[name]) for name, check in properties))
+    if "items" in schema:
+        item_check = _compile_fast_check(schema["items"])
+        if item_check is None:
+            return None
+        checks.append(lambda v: type(v) is not list or all(item_check(item) for item in v))
+    
+    return lambda v: all(check(v) for check in checks)
+
+# id(schema) -> (schema, validator, fast check); the schema is kept so its id stays unique
+_COMPILED: Dict[int, Tuple[dict, Any, Optional[Callable[[Any], bool]]]] = {}
+
+def _compiled(schema: dict) -> Tuple[dict, Any, Optional[Callable[[Any], bool]]]:
+    entry = _COMPILED.get(id(schema))
+    if entry is None:
+        cls = validator_for(schema)
+        cls.check_schema(schema)
+        entry = (schema, cls(schema), _compile_fast_check(schema))
+        _COMPILED[id(schema)] = entry
+    return entry
+
+def validate_instance(instance: Any, schema: dict) -> None:
+    """Validate with a prebuilt validator, skipping it when the fast structural check passes.
+    
+    Raises ValidationError like jsonschema.validate.
+    """
+    _, validator, fast_check = _compiled(schema)
+    if fast_check is not None and fast_check(instance):
+        return
+    validator.validate(instance)
+
+def _strip_code_fences(raw_response: str) -> str:
+    """Remove markdown code blocks if present"""
+    cleaned = raw_response.strip()
+    start, end = 0, len(cleaned)
+    if cleaned.startswith("```json"):
+        start = 7
+    elif cleaned.startswith("```"):
+        start = 3
+    if end - start >= 3 and cleaned.endswith("```"):
+        end -= 3
+    return cleaned[start:end].strip() if start or end != len(cleaned) else cleaned
+
 def parse_and_validate(raw_response: str, schema: dict) -> Optional[Any]:
     """Parse JSON and validate against schema. Returns None on failure."""
     try:
-        # Clean response - remove markdown code blocks if present
-        cleaned = raw_response.strip()
-        if cleaned.startswith("```json"):
-            cleaned = cleaned[7:]
-        if cleaned.startswith("```"):
-            cleaned = cleaned[3:]
-        if cleaned.endswith("```"):
-            cleaned = cleaned[:-3]
-        cleaned = cleaned.strip()
-        
+        cleaned = _strip_code_fences(raw_response)
         data = json.loads(cleaned)
-        validate(instance=data, schema=schema)
+        validate_instance(data, schema)
         return data
     except (json.JSONDecodeError, ValidationError) as e:
         logger.error(f"Parse/validation error: {e}")
         logger.error(f"Raw response: {raw_response}")
         return None
 
+def parse_and_validate_sections(raw_response: str, schema: dict) -> Dict[str, Optional[Any]]:
+    """Parse a JSON object and validate each top-level section on its own.
+    
+    Returns a dict with every property of the object schema; sections that are
+    missing or invalid are None so callers can fall back per section.
+    """
+    sections = {name: None for name in schema["properties"]}
+    try:
+        data = json.loads(_strip_code_fences(raw_response))
+    except json.JSONDecodeError as e:
+        logger.error(f"Parse error: {e}")
+        logger.error(f"Raw response: {raw_response}")
+        return sections
+    if not isinstance(data, dict):
+        logger.error(f"Expected a JSON object, got {type(data).__name__}")
+        return sections
+    
+    for name, section_schema in schema["properties"].items():
+        if name not in data:
+            logger.error(f"Section '{name}' missing from response")
+            continue
+        try:
+            validate_instance(data[name], section_schema)
+            sections[name] = data[name]
+        except ValidationError as e:
+            logger.error(f"Section '{name}' failed validation: {e.message}")
+    return sections
+
+class IncrementalArrayParser:
+    """Incrementally parse a streamed JSON array, yielding each object once it is complete.
+    
+    Tracks string/escape state and brace depth so only the characters of the
+    in-progress object are buffered. Leading markdown fences and prose before
+    the opening bracket are ignored.
+    """
+    
+    def __init__(self):
+        self._started = False
+        self._finished = False
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._item: List[str] = []
+        self._index = 0
+        self.failed_indices: List[int] = []
+    
+    def feed(self, text: str) -> List[Any]:
+        """Consume the next piece of streamed text and return newly completed items"""
+        return [item for _, item in self.feed_indexed(text)]
+    
+    def feed_indexed(self, text: str) -> List[Tuple[int, Any]]:
+        """Like feed, but pairs each item with its position in the array"""
+        completed = []
+        for ch in text:
+            if self._finished:
+                break
+            if not self._started:
+                if ch == "[":
+                    self._started = True
+                continue
+            if self._depth == 0:
+                if ch == "{":
+                    self._depth = 1
+                    self._item = [ch]
+                elif ch == "]":
+                    self._finished = True
+                continue
+            
+            self._item.append(ch)
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif ch == "\\":
+                    self._escape = True
+                elif ch == '"':
+                    self._in_string = False
+            elif ch == '"':
+                self._in_string = True
+            elif ch in "{[":
+                self._depth += 1
+            elif ch in "}]":
+                self._depth -= 1
+                if self._depth == 0:
+                    raw_item = "".join(self._item)
+                    self._item = []
+                    index = self._index
+                    self._index += 1
+                    try:
+                        completed.append((index, json.loads(raw_item)))
+                    except json.JSONDecodeError as e:
+                        self.failed_indices.append(index)
+                        logger.error(f"Skipping malformed streamed item {index}: {e}")
+        return completed
+    
+    @property
+    def finished(self) -> bool:
+        return self._finished
+
+class PartialArray(list):
+    """Items salvaged from a broken array response.
+    
+    Behaves as a plain list of the valid items; ``failed_indices`` lists the
+    positions that were malformed or failed validation and ``truncated`` is True
+    when the array was cut off before its closing bracket.
+    """
+    
+    def __init__(self, items: List[Any], failed_indices: List[int], truncated: bool):
+        super().__init__(items)
+        self.failed_indices = failed_indices
+        self.truncated = truncated
+
+def recover_partial_array(raw_response: str, schema: dict) -> Optional[PartialArray]:
+    """Salvage every complete, schema-valid item from a truncated or partly broken array.
+    
+    Returns None when nothing could be recovered.
+    """
+    parser = IncrementalArrayParser()
+    items = []
+    failed = []
+    for index, item in parser.feed_indexed(raw_response):
+        if validate_item(item, schema):
+            items.append(item)
+        else:
+            failed.append(index)
+    failed = sorted(failed + parser.failed_indices)
+    if not items:
+        return None
+    
+    truncated = not parser.finished
+    logger.warning(
+        f"Recovered {len(items)} items from broken response "
+        f"(failed indices: {failed}, truncated: {truncated})"
+    )
+    return PartialArray(items, failed, truncated)
+
+def validate_item(item: Any, schema: dict) -> bool:
+    """Validate one element against the items schema of an array schema"""
+    try:
+        validate_instance(item, schema["items"])
+        return True
+    except ValidationError as e:
+        logger.error(f"Array item failed validation: {e.message}")
+        return False
+
+# Build validators for every response schema once at import time
+for _schema in (TASK_CANDIDATE_SCHEMA, DEPENDENCY_SCHEMA, RICE_SCHEMA, RICE_BATCH_SCHEMA, ASSISTANT_ACTION_SCHEMA, MEETING_ANALYSIS_SCHEMA):
+    _compiled(_schema)
+    for _section in _schema.get("properties", {}).values():
+        _compiled(_section)
+_compiled(TASK_CANDIDATE_SCHEMA["items"])
+_compiled(RICE_BATCH_SCHEMA["items"])
+
 def fallback_task_extractor(transcript: str) -> List[Dict[str, Any]]:
     """Rule-based fallback when Gemini fails"""
     logger.warning("Using fallback task extractor")
     tasks = []
-    lines = transcript.split('\n')
-    
-    for line in lines:
-        line_lower = line.lower()
-        if any(keyword in line_lower for keyword in ["i will", "i'll", "action:", "todo:", "task:"]):
-            tasks.append({
-                "assignee": None,
-                "description": line.strip(),
-                "due_date": None,
-                "priority": 5,
-                "effort_tag": "medium",
-                "confidence": 0.5,
-                "is_blocked": False,
-                "blocker_reason": None
-            })
+    
+    for line in heuristic_keywords.matching_pieces(transcript, '\n', "explicit_action"):
+        tasks.append({
+            "assignee": None,
+            "description": line.strip(),
+            "due_date": None,
+            "priority": 5,
+            "effort_tag": "medium",
+            "confidence": 0.5,
+            "is_blocked": False,
+            "blocker_reason": None
+        })
     
     return tasks if tasks else []
 
@@ -111,6 +366,12 @@ def fallback_dependencies() -> Dict[str, List]:
     """Safe empty fallback for dependencies"""
     return {"dependencies": []}
 
+def fallback_summary(transcript: str) -> str:
+    """Fallback summary: the opening lines of the transcript"""
+    lines = [line.strip() for line in transcript.split('\n') if line.strip()]
+    summary = " ".join(lines[:3])
+    return summary[:500] if summary else "No summary available."
+
 def fallback_rice() -> Dict[str, Any]:
     """Conservative RICE fallback"""
     return {"reach": 100, "impact": 5, "confidence": 0.5, "effort": 8}
@@ -1,5 +1,8 @@
 """Centralized Gemini prompt templates - versioned and easy to tweak"""
 
+# Bump whenever a template changes so cached responses from the old wording are not reused
+PROMPT_VERSION = "3"
+
 TASK_EXTRACTION_PROMPT = """You are an assistant that extracts action items from meeting transcripts.
 Input: a meeting transcript and the workspace timezone.
 Output: Return ONLY a JSON array of task objects. Each task object must have:
@@ -15,7 +18,7 @@ Output: Return ONLY a JSON array of task objects. Each task object must have:
 
 Example:
 [
-{"assignee":"Priya","description":"Implement OAuth2 login","due_date":"2025-10-10","priority":9,"effort_tag":"large","confidence":0.92,"is_blocked":false,"blocker_reason":null}
+{{"assignee":"Priya","description":"Implement OAuth2 login","due_date":"2025-10-10","priority":9,"effort_tag":"large","confidence":0.92,"is_blocked":false,"blocker_reason":null}}
 ]
 
 Transcript: \"\"\"
@@ -25,6 +28,22 @@ Transcript: \"\"\"
 Return ONLY the JSON array, no other text.
 """
 
+TASK_CONTINUATION_PROMPT = """You are an assistant that extracts action items from meeting transcripts.
+A previous answer for this transcript was cut off. These action items were already extracted:
+{extracted}
+
+Output: Return ONLY a JSON array of the remaining task objects that are NOT listed above, or [] if there are none.
+Each task object must have: assignee (string or null), description (string), due_date ("YYYY-MM-DD" or null),
+priority (integer 1-10 or null), effort_tag ("small" | "medium" | "large" | null), confidence (float 0.0-1.0),
+is_blocked (boolean), blocker_reason (string or null).
+
+Transcript: \"\"\"
+{transcript}
+\"\"\"
+
+Return ONLY the JSON array, no other text.
+"""
+
 DEPENDENCY_DETECTION_PROMPT = """Detect task dependency relationships from the transcript. Return ONLY JSON:
 {{"dependencies":[{{"from":"Finish API endpoints","depends_on":"DB migration complete"}}, ...]}}
 
@@ -43,6 +62,15 @@ Task: {description}
 Return ONLY the JSON object, no other text.
 """
 
+RICE_BATCH_PROMPT = """Given these tasks, estimate RICE fields for each task. Return ONLY a JSON array with one object per task:
+[{{"id":<task id>, "reach":<int>, "impact":<1-10>, "confidence":<0.0-1.0>, "effort":<hours-int>}}, ...]
+
+Tasks (one per line, "[id] description"):
+{tasks}
+
+Return ONLY the JSON array, covering every id listed, no other text.
+"""
+
 ASSISTANT_CHAT_PROMPT = """You are Nova, the project assistant. Respond concisely. If user asks a change (e.g., create task), return a JSON action suggestion:
 {{"action":"create_task","payload":{{"title":"...","assignee":"...","due_date":"YYYY-MM-DD or null","effort_tag":"small|medium|large","priority":1-10}},"confidence":0.95,"explanation":"one-liner"}}
 If you cannot parse, return {{"action":"none","explanation":"reason"}}
@@ -62,3 +90,50 @@ Transcript: \"\"\"
 
 Return ONLY the summary text.
 """
+
+MEETING_ANALYSIS_PROMPT = """Analyze this meeting transcript and return action items, task dependencies and a summary in one response.
+Output: Return ONLY a JSON object with exactly these keys:
+
+* tasks: array of task objects, each with
+  assignee (string or null), description (string), due_date ("YYYY-MM-DD" or null),
+  priority (integer 1-10 or null), effort_tag ("small" | "medium" | "large" | null),
+  confidence (float 0.0-1.0), is_blocked (boolean), blocker_reason (string or null)
+* dependencies: array of {{"from": "<task description>", "depends_on": "<task description>"}}
+* summary: 2-3 sentence summary of the meeting
+
+Example:
+{{"tasks":[{{"assignee":"Priya","description":"Implement OAuth2 login","due_date":"2025-10-10","priority":9,"effort_tag":"large","confidence":0.92,"is_blocked":false,"blocker_reason":null}}],
+"dependencies":[{{"from":"Write login test cases","depends_on":"Implement OAuth2 login"}}],
+"summary":"The team planned the OAuth2 login work. Priya owns the implementation."}}
+
+Transcript: \"\"\"
+{transcript}
+\"\"\"
+
+Return ONLY the JSON object, no other text.
+"""
+
+PROMPT_NAMES = {
+    "task_extraction": TASK_EXTRACTION_PROMPT,
+    "task_continuation": TASK_CONTINUATION_PROMPT,
+    "dependency_detection": DEPENDENCY_DETECTION_PROMPT,
+    "rice_scoring": RICE_SCORING_PROMPT,
+    "rice_batch": RICE_BATCH_PROMPT,
+    "assistant_chat": ASSISTANT_CHAT_PROMPT,
+    "meeting_summary": MEETING_SUMMARY_PROMPT,
+    "meeting_analysis": MEETING_ANALYSIS_PROMPT
+}
+
+# Literal text before each template's first placeholder, longest first so the most specific template wins
+_PROMPT_PREFIXES = sorted(
+    ((template.split("{")[0], name) for name, template in PROMPT_NAMES.items()),
+    key=lambda item: len(item[0]),
+    reverse=True
+)
+
+def prompt_name(prompt: str) -> str:
+    """Name of the template a formatted prompt was built from, or 'other'"""
+    for prefix, name in _PROMPT_PREFIXES:
+        if prompt.startswith(prefix):
+            return name
+    return "other"
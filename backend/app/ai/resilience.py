@@ -0,0 +1,301 @@
+"""Circuit breaker, deadlines and hedged requests for outbound LLM calls"""
+import asyncio
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor, FIRST_COMPLETED, wait
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional, Tuple
+from ..config import (
+    LLM_BREAKER_FAILURE_RATE,
+    LLM_BREAKER_WINDOW,
+    LLM_BREAKER_MIN_CALLS,
+    LLM_BREAKER_COOLDOWN_SECONDS,
+    LLM_MAX_ABANDONED_CALLS
+)
+
+class CircuitBreaker:
+    """Fail fast while the model is erroring.
+
+    The breaker opens when at least ``failure_rate`` of the last ``window``
+    calls failed (once ``min_calls`` have been seen). While open every call is
+    refused until ``cooldown_seconds`` pass; then a single probe is let through
+    (half-open) and its outcome closes or re-opens the breaker.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(
+        self,
+        failure_rate: float = LLM_BREAKER_FAILURE_RATE,
+        window: int = LLM_BREAKER_WINDOW,
+        min_calls: int = LLM_BREAKER_MIN_CALLS,
+        cooldown_seconds: float = LLM_BREAKER_COOLDOWN_SECONDS,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        self.failure_rate = failure_rate
+        self.min_calls = max(1, min_calls)
+        self.cooldown_seconds = cooldown_seconds
+        self._clock = clock
+        self._outcomes: Deque[bool] = deque(maxlen=max(1, window))
+        self._state = self.CLOSED
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+        self._lock = threading.Lock()
+        self.rejected = 0
+        self.times_opened = 0
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            self._maybe_half_open()
+            return self._state
+
+    def _maybe_half_open(self) -> None:
+        if self._state == self.OPEN and self._clock() - self._opened_at >= self.cooldown_seconds:
+            self._state = self.HALF_OPEN
+            self._probe_in_flight = False
+
+    def _open(self) -> None:
+        self._state = self.OPEN
+        self._opened_at = self._clock()
+        self._probe_in_flight = False
+        self.times_opened += 1
+
+    def allow(self) -> bool:
+        """True if a call may go out now"""
+        with self._lock:
+            self._maybe_half_open()
+            if self._state == self.CLOSED:
+                return True
+            if self._state == self.HALF_OPEN and not self._probe_in_flight:
+                self._probe_in_flight = True
+                return True
+            self.rejected += 1
+            return False
+
+    def abandon(self) -> None:
+        """Give back a call that ended without an outcome (cancelled, or its consumer went away).
+
+        Cancellation says nothing about the model, so nothing is recorded; a
+        half-open probe is released so the next call can probe instead.
+        """
+        with self._lock:
+            if self._state == self.HALF_OPEN:
+                self._probe_in_flight = False
+
+    def record_success(self) -> None:
+        with self._lock:
+            if self._state == self.HALF_OPEN:
+                self._state = self.CLOSED
+                self._outcomes.clear()
+                self._probe_in_flight = False
+            self._outcomes.append(True)
+
+    def record_failure(self) -> None:
+        with self._lock:
+            if self._state == self.HALF_OPEN:
+                self._open()
+                return
+            self._outcomes.append(False)
+            failures = self._outcomes.count(False)
+            if (self._state == self.CLOSED and len(self._outcomes) >= self.min_calls
+                    and failures / len(self._outcomes) >= self.failure_rate):
+                self._open()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            self._maybe_half_open()
+            calls = len(self._outcomes)
+            failures = self._outcomes.count(False)
+            return {
+                "state": self._state,
+                "window_calls": calls,
+                "window_failures": failures,
+                "failure_rate": round(failures / calls, 3) if calls else 0.0,
+                "times_opened": self.times_opened,
+                "rejected": self.rejected
+            }
+
+class LatencyTracker:
+    """Rolling window of recent call latencies (seconds)"""
+
+    def __init__(self, window: int = 200, min_samples: int = 20):
+        self._samples: Deque[float] = deque(maxlen=window)
+        self.min_samples = min_samples
+        self._lock = threading.Lock()
+
+    def record(self, seconds: float) -> None:
+        with self._lock:
+            self._samples.append(seconds)
+
+    def percentile(self, p: float) -> Optional[float]:
+        """p-th percentile, or None until enough samples have been seen"""
+        with self._lock:
+            if len(self._samples) < self.min_samples:
+                return None
+            ordered = sorted(self._samples)
+        index = min(len(ordered) - 1, max(0, int(round(p / 100 * len(ordered))) - 1))
+        return ordered[index]
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            samples = len(self._samples)
+        return {
+            "samples": samples,
+            "p50": self.percentile(50),
+            "p95": self.percentile(95),
+            "p99": self.percentile(99)
+        }
+
+class AbandonedCallsFull(RuntimeError):
+    """Too many abandoned sync LLM attempts are still running to start another"""
+
+class AbandonedCalls:
+    """Sync attempts still running after run_hedged stopped waiting for them.
+
+    A thread cannot be cancelled. An attempt abandoned at its deadline, or the
+    slower half of a hedged pair, runs until the SDK call returns, holding an
+    executor thread and spending quota. At ``limit`` of them, run_hedged
+    refuses new calls and hedges until some finish.
+    """
+
+    def __init__(self, limit: int = LLM_MAX_ABANDONED_CALLS):
+        self.limit = max(1, limit)
+        self._running = 0
+        self._lock = threading.Lock()
+
+    def full(self) -> bool:
+        with self._lock:
+            return self._running >= self.limit
+
+    def track(self, future: Future) -> None:
+        with self._lock:
+            self._running += 1
+        future.add_done_callback(self._finished)
+
+    def _finished(self, future: Future) -> None:
+        with self._lock:
+            self._running -= 1
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"running": self._running, "limit": self.limit}
+
+llm_abandoned = AbandonedCalls()
+
+# Sync calls run here so a hung SDK call can be abandoned at its deadline
+_executor = ThreadPoolExecutor(max_workers=32, thread_name_prefix="llm-call")
+
+AttemptCallback = Callable[[Optional[Any], float, bool], None]
+
+def _report_attempts(attempts: List[Tuple[Any, float]], clock: Callable[[], float], on_attempt_done: Optional[AttemptCallback]) -> None:
+    """Call on_attempt_done(result, seconds, duplicate) as each attempt finishes; result is None if it raised or was cancelled"""
+    if on_attempt_done is None:
+        return
+    for number, (attempt, started) in enumerate(attempts):
+        def report(attempt, started=started, duplicate=number > 0) -> None:
+            result = None if attempt.cancelled() or attempt.exception() is not None else attempt.result()
+            on_attempt_done(result, clock() - started, duplicate)
+        attempt.add_done_callback(report)
+
+def run_hedged(
+    fn: Callable[[], Any],
+    deadline: float,
+    hedge_after: Optional[float] = None,
+    on_attempt_done: Optional[AttemptCallback] = None,
+    abandoned: AbandonedCalls = llm_abandoned
+) -> Tuple[Any, bool]:
+    """Run fn with a deadline, starting one duplicate if it is still running after hedge_after.
+
+    Returns (result, hedged) from whichever attempt finishes first. If the
+    first finished attempt raised, the other one (if any) is still awaited.
+    Raises TimeoutError at the deadline.
+
+    Threads cannot be cancelled: an attempt still running when this returns
+    (the loser of a hedge, or every attempt at the deadline) keeps running in
+    the background and spends quota, and its result is discarded. Such
+    attempts are counted in ``abandoned``. While it is full, AbandonedCallsFull
+    is raised instead of starting a call, and no duplicate is started.
+    on_attempt_done is called for every attempt, abandoned ones included,
+    when it finishes, so each request sent can be billed.
+    """
+    if abandoned.full():
+        raise AbandonedCallsFull(f"{abandoned.limit} abandoned LLM calls are still running")
+    start = time.monotonic()
+    attempts = [(_executor.submit(fn), start)]
+    pending = {attempts[0][0]}
+    hedged = False
+    error: Optional[BaseException] = None
+    try:
+        while pending:
+            remaining = deadline - (time.monotonic() - start)
+            if remaining <= 0:
+                break
+            timeout = remaining
+            if hedge_after is not None and not hedged:
+                timeout = max(0.0, min(remaining, hedge_after - (time.monotonic() - start)))
+            done, pending = wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is None:
+                    return future.result(), hedged
+                error = future.exception()
+            if not done and hedge_after is not None and not hedged:
+                if abandoned.full():
+                    hedge_after = None
+                    continue
+                attempts.append((_executor.submit(fn), time.monotonic()))
+                pending.add(attempts[-1][0])
+                hedged = True
+            elif not pending and error is not None:
+                raise error
+        if error is not None and not pending:
+            raise error
+        raise TimeoutError(f"LLM call exceeded {deadline}s deadline")
+    finally:
+        for attempt, _ in attempts:
+            if not attempt.done():
+                abandoned.track(attempt)
+        _report_attempts(attempts, time.monotonic, on_attempt_done)
+
+async def run_hedged_async(
+    make_call: Callable[[], Awaitable[Any]],
+    deadline: float,
+    hedge_after: Optional[float] = None,
+    on_attempt_done: Optional[AttemptCallback] = None
+) -> Tuple[Any, bool]:
+    """Async counterpart of run_hedged. Losing attempts are cancelled, so none is left running."""
+    loop = asyncio.get_running_loop()
+    start = loop.time()
+    attempts = [(asyncio.ensure_future(make_call()), start)]
+    pending = {attempts[0][0]}
+    hedged = False
+    error: Optional[BaseException] = None
+    try:
+        while pending:
+            remaining = deadline - (loop.time() - start)
+            if remaining <= 0:
+                break
+            timeout = remaining
+            if hedge_after is not None and not hedged:
+                timeout = max(0.0, min(remaining, hedge_after - (loop.time() - start)))
+            done, pending = await asyncio.wait(pending, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if task.exception() is None:
+                    return task.result(), hedged
+                error = task.exception()
+            if not done and hedge_after is not None and not hedged:
+                attempts.append((asyncio.ensure_future(make_call()), loop.time()))
+                pending.add(attempts[-1][0])
+                hedged = True
+        if error is not None and not pending:
+            raise error
+        raise asyncio.TimeoutError(f"LLM call exceeded {deadline}s deadline")
+    finally:
+        for task in pending:
+            task.cancel()
+        _report_attempts(attempts, loop.time, on_attempt_done)
+
+llm_breaker = CircuitBreaker()
+llm_latency = LatencyTracker()
@@ -0,0 +1,202 @@
+"""In-process TF-IDF similarity index over task text, one per workspace
+
+Documents are task titles and descriptions, plus pending create_task
+suggestions. Scoring is cosine similarity of sublinear-TF x IDF vectors. It
+runs over an inverted index, so a query only touches documents sharing a
+term with it. Very common terms (in more than ``max_df`` of the workspace) are
+skipped at query time because they carry almost no weight.
+
+Query terms are scored rarest first. A term may admit new documents only
+while the candidate set stays within ``max_candidates``. After that, the
+remaining (more common) terms only add to documents that already have a
+score. That is the usual
+accumulator limit for inverted-index ranking. It keeps a query on a
+100k-document workspace to a few milliseconds, and the top results almost
+never change, because common terms contribute little weight.
+
+Document norms depend on IDF, which drifts as documents are added. Norms
+are recomputed in one sweep once the corpus has grown or shrunk by
+``renormalize_ratio`` since the last sweep.
+"""
+import heapq
+import math
+import re
+import threading
+from collections import defaultdict
+from typing import Dict, Hashable, Iterable, List, Optional, Tuple
+from ..config import SIMILARITY_MAX_DF
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+STOPWORDS = frozenset("""
+a an and are as at be by for from has have i in is it its of on or our so that the their this to
+we will with you your can should need needs must going get got do does done also just into up
+""".split())
+
+def tokenize(text: str) -> List[str]:
+    return [token for token in _TOKEN_RE.findall(text.lower()) if token not in STOPWORDS and len(token) > 1]
+
+class SimilarityIndex:
+    """Incrementally updated TF-IDF cosine index"""
+
+    def __init__(self, max_df: float = SIMILARITY_MAX_DF, renormalize_ratio: float = 0.25, max_candidates: int = 2000):
+        self.max_df = max_df
+        self.max_candidates = max_candidates
+        self.renormalize_ratio = renormalize_ratio
+        self._postings: Dict[str, Dict[Hashable, float]] = defaultdict(dict)
+        self._docs: Dict[Hashable, Dict[str, float]] = {}
+        self._norms: Dict[Hashable, float] = {}
+        self._normalized_size = 0
+        self._lock = threading.RLock()
+
+    def __len__(self) -> int:
+        return len(self._docs)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._docs
+
+    def _idf(self, token: str) -> float:
+        return math.log((1 + len(self._docs)) / (1 + len(self._postings.get(token, ())))) + 1
+
+    def _norm(self, weights: Dict[str, float]) -> float:
+        return math.sqrt(sum((weight * self._idf(token)) ** 2 for token, weight in weights.items())) or 1.0
+
+    @staticmethod
+    def _term_weights(text: str) -> Dict[str, float]:
+        counts: Dict[str, int] = defaultdict(int)
+        for token in tokenize(text):
+            counts[token] += 1
+        return {token: 1 + math.log(count) for token, count in counts.items()}
+
+    def add(self, key: Hashable, text: str) -> None:
+        """Index or re-index a document"""
+        with self._lock:
+            self._discard(key)
+            weights = self._term_weights(text)
+            if not weights:
+                return
+            self._docs[key] = weights
+            for token, weight in weights.items():
+                self._postings[token][key] = weight
+            self._norms[key] = self._norm(weights)
+            self._maybe_renormalize()
+
+    def add_many(self, documents: Iterable[Tuple[Hashable, str]]) -> None:
+        """Bulk load: index everything, then compute norms once"""
+        with self._lock:
+            for key, text in documents:
+                self._discard(key)
+                weights = self._term_weights(text)
+                if weights:
+                    self._docs[key] = weights
+                    for token, weight in weights.items():
+                        self._postings[token][key] = weight
+            self._renormalize()
+
+    def discard(self, key: Hashable) -> None:
+        with self._lock:
+            self._discard(key)
+            self._maybe_renormalize()
+
+    def _discard(self, key: Hashable) -> None:
+        weights = self._docs.pop(key, None)
+        if weights is None:
+            return
+        self._norms.pop(key, None)
+        for token in weights:
+            postings = self._postings[token]
+            postings.pop(key, None)
+            if not postings:
+                del self._postings[token]
+
+    def _renormalize(self) -> None:
+        self._norms = {key: self._norm(weights) for key, weights in self._docs.items()}
+        self._normalized_size = len(self._docs)
+
+    def _maybe_renormalize(self) -> None:
+        drift = abs(len(self._docs) - self._normalized_size)
+        if drift > self.renormalize_ratio * max(self._normalized_size, 8):
+            self._renormalize()
+
+    def query(self, text: str, k: int = 5, min_score: float = 0.0) -> List[Tuple[Hashable, float]]:
+        """Top-k (key, cosine score) for text, best first"""
+        query_weights = self._term_weights(text)
+        if not query_weights:
+            return []
+        with self._lock:
+            size = len(self._docs)
+            if not size:
+                return []
+            max_postings = max(self.max_df * size, 1)
+            scores: Dict[Hashable, float] = defaultdict(float)
+            query_norm = 0.0
+            terms = sorted(((self._idf(token), token, weight) for token, weight in query_weights.items()), reverse=True)
+            for idf, token, query_weight in terms:
+                weighted = query_weight * idf
+                query_norm += weighted * weighted
+                postings = self._postings.get(token)
+                if not postings or (len(postings) > max_postings and size > 20):
+                    continue
+                factor = weighted * idf
+                if not scores or len(scores) + len(postings) <= self.max_candidates:
+                    for key, weight in postings.items():
+                        scores[key] += factor * weight
+                else:
+                    # Accumulator limit reached: only refine documents already scored
+                    if len(postings) < len(scores):
+                        for key, weight in postings.items():
+                            if key in scores:
+                                scores[key] += factor * weight
+                    else:
+                        for key in scores:
+                            weight = postings.get(key)
+                            if weight:
+                                scores[key] += factor * weight
+            query_norm = math.sqrt(query_norm) or 1.0
+            norms = self._norms
+            best = heapq.nlargest(k, ((score / (query_norm * norms[key]), key) for key, score in scores.items()))
+        return [(key, round(min(score, 1.0), 4)) for score, key in best if score >= min_score]
+
+class SimilarityIndexRegistry:
+    """One SimilarityIndex per workspace, with bookkeeping for incremental database sync"""
+
+    def __init__(self):
+        self._indexes: Dict[int, SimilarityIndex] = {}
+        self.synced_ids: Dict[Tuple[int, str], int] = {}
+        self.versions: Dict[int, int] = {}
+        self._lock = threading.Lock()
+
+    def get(self, workspace_id: int, version: Optional[int] = None) -> SimilarityIndex:
+        """The workspace's index. Given the workspace's change version, an index
+        synced at another version is replaced by an empty one, so changes made
+        by other processes are not missed."""
+        with self._lock:
+            index = self._indexes.get(workspace_id)
+            if index is None or (version is not None and self.versions.get(workspace_id) != version):
+                index = self._indexes[workspace_id] = SimilarityIndex()
+                self.synced_ids.pop((workspace_id, "task"), None)
+                self.synced_ids.pop((workspace_id, "suggestion"), None)
+            if version is not None:
+                self.versions[workspace_id] = version
+            return index
+
+    def peek(self, workspace_id: int) -> Optional[SimilarityIndex]:
+        return self._indexes.get(workspace_id)
+
+    def update(self, workspace_id: int, key: Hashable, text: str) -> None:
+        """Re-index a document if the workspace index is loaded (otherwise the next sync picks it up)"""
+        index = self.peek(workspace_id)
+        if index is not None:
+            index.add(key, text)
+
+    def forget(self, workspace_id: int, key: Hashable) -> None:
+        index = self.peek(workspace_id)
+        if index is not None:
+            index.discard(key)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._indexes.clear()
+            self.synced_ids.clear()
+            self.versions.clear()
+
+task_indexes = SimilarityIndexRegistry()
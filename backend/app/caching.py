@@ -0,0 +1,57 @@
+"""Conditional GETs for polled read endpoints, keyed on the workspace version"""
+import hashlib
+import time
+from typing import Optional
+from fastapi import Depends, HTTPException, Request, Response
+from sqlalchemy.orm import Session
+from .database import get_db
+from .models import WorkspaceVersion
+from .config import ETAG_CLOCK_SECONDS
+
+def get_workspace_version(db: Session, workspace_id: int) -> int:
+    """Current change version of a workspace (0 before its first write)"""
+    version = db.query(WorkspaceVersion.version).filter(WorkspaceVersion.workspace_id == workspace_id).scalar()
+    return version or 0
+
+def make_etag(workspace_id: int, version: int, query: str = "", clock: Optional[int] = None) -> str:
+    """Weak ETag for one view of a workspace at a version.
+
+    The query string is part of the tag, so each filter, page and field
+    selection is cached separately. It is weak because only the JSON's
+    meaning is promised, not its bytes.
+    """
+    view = hashlib.sha1(query.encode()).hexdigest()[:12]
+    tag = f"ws{workspace_id}-v{version}-{view}"
+    if clock is not None:
+        tag += f"-t{clock}"
+    return f'W/"{tag}"'
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Whether an If-None-Match header names etag (weak comparison)"""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    return any(candidate.strip().removeprefix("W/") == etag.removeprefix("W/") for candidate in if_none_match.split(","))
+
+def workspace_etag(clock: bool = False):
+    """Dependency tagging a workspace read endpoint with an ETag.
+
+    A request whose If-None-Match matches gets 304 after one primary key
+    lookup, before the endpoint runs. clock=True is for views that depend on
+    the current time; their tag also changes every ETAG_CLOCK_SECONDS.
+    """
+    def dependency(workspace_id: int, request: Request, response: Response, db: Session = Depends(get_db)):
+        query = "&".join(sorted(request.url.query.split("&")))
+        etag = make_etag(
+            workspace_id,
+            get_workspace_version(db, workspace_id),
+            query,
+            int(time.time() // ETAG_CLOCK_SECONDS) if clock else None
+        )
+        if etag_matches(request.headers.get("if-none-match"), etag):
+            raise HTTPException(status_code=304, headers={"ETag": etag, "Cache-Control": "no-cache"})
+        response.headers["ETag"] = etag
+        # Clients may keep the body but must revalidate before each use
+        response.headers["Cache-Control"] = "no-cache"
+    return dependency
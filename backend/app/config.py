@@ -2,7 +2,94 @@ import os
 from typing import Literal
 
 GEMINI_API_KEY = os.getenv("GEMINI_API_KEY", "")
-AI_MODE: Literal["gemini", "mock"] = "mock" if not GEMINI_API_KEY else os.getenv("AI_MODE", "gemini")
+# "fake" talks to the local fake model server (python -m app.ai.fake_server) for load testing
+AI_MODE: Literal["gemini", "mock", "fake"] = os.getenv("AI_MODE", "gemini" if GEMINI_API_KEY else "mock")
+if AI_MODE not in ("mock", "fake") and not GEMINI_API_KEY:
+    AI_MODE = "mock"
+FAKE_LLM_URL = os.getenv("FAKE_LLM_URL", "http://127.0.0.1:8765")
+FAKE_LLM_TIMEOUT_SECONDS = float(os.getenv("FAKE_LLM_TIMEOUT_SECONDS", "60"))
+GEMINI_MODEL = os.getenv("GEMINI_MODEL", "gemini-pro")
 DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./novito.db")
 AGENT_AUTO_CONFIDENCE = float(os.getenv("AGENT_AUTO_CONFIDENCE", "0.85"))
 SECRET_KEY = os.getenv("SECRET_KEY", "demo-secret-key-not-for-production")
+
+# LLM response cache
+LLM_CACHE_ENABLED = os.getenv("LLM_CACHE_ENABLED", "true").lower() == "true"
+LLM_CACHE_PATH = os.getenv("LLM_CACHE_PATH", "./llm_cache.db")
+LLM_CACHE_TTL_SECONDS = int(os.getenv("LLM_CACHE_TTL_SECONDS", str(7 * 24 * 3600)))
+LLM_CACHE_MAX_ENTRIES = int(os.getenv("LLM_CACHE_MAX_ENTRIES", "5000"))
+# A hit only rewrites an entry's access time (one write and commit) when it is older than this
+LLM_CACHE_TOUCH_SECONDS = float(os.getenv("LLM_CACHE_TOUCH_SECONDS", "300"))
+
+# Async LLM client concurrency
+LLM_MAX_CONCURRENCY = int(os.getenv("LLM_MAX_CONCURRENCY", "8"))
+LLM_MAX_CONCURRENCY_PER_WORKSPACE = int(os.getenv("LLM_MAX_CONCURRENCY_PER_WORKSPACE", "4"))
+
+# Long transcript map-reduce extraction
+TRANSCRIPT_CHUNK_CHARS = int(os.getenv("TRANSCRIPT_CHUNK_CHARS", "8000"))
+TRANSCRIPT_CHUNK_OVERLAP_TURNS = int(os.getenv("TRANSCRIPT_CHUNK_OVERLAP_TURNS", "2"))
+TRANSCRIPT_CHUNK_PARALLELISM = int(os.getenv("TRANSCRIPT_CHUNK_PARALLELISM", "4"))
+
+# Re-prompt only for the missing tail when an extraction response is cut off
+LLM_REPROMPT_TRUNCATED = os.getenv("LLM_REPROMPT_TRUNCATED", "true").lower() == "true"
+
+# Load the LLM SDK in a background thread at startup instead of on the first request
+LLM_WARMUP_ON_STARTUP = os.getenv("LLM_WARMUP_ON_STARTUP", "true").lower() == "true"
+
+# LLM call deadlines, circuit breaker and hedged requests
+LLM_CALL_TIMEOUT_SECONDS = float(os.getenv("LLM_CALL_TIMEOUT_SECONDS", "30"))
+LLM_BREAKER_FAILURE_RATE = float(os.getenv("LLM_BREAKER_FAILURE_RATE", "0.5"))
+LLM_BREAKER_WINDOW = int(os.getenv("LLM_BREAKER_WINDOW", "20"))
+LLM_BREAKER_MIN_CALLS = int(os.getenv("LLM_BREAKER_MIN_CALLS", "5"))
+LLM_BREAKER_COOLDOWN_SECONDS = float(os.getenv("LLM_BREAKER_COOLDOWN_SECONDS", "30"))
+LLM_HEDGE_ENABLED = os.getenv("LLM_HEDGE_ENABLED", "false").lower() == "true"
+LLM_HEDGE_PERCENTILE = float(os.getenv("LLM_HEDGE_PERCENTILE", "95"))
+# Sync attempts left running past their deadline, or as the losing half of a hedge, before new ones are refused
+LLM_MAX_ABANDONED_CALLS = int(os.getenv("LLM_MAX_ABANDONED_CALLS", "8"))
+
+# Transcript compaction and LLM usage accounting
+TRANSCRIPT_COMPACTION_ENABLED = os.getenv("TRANSCRIPT_COMPACTION_ENABLED", "true").lower() == "true"
+LLM_INPUT_COST_PER_1K_TOKENS = float(os.getenv("LLM_INPUT_COST_PER_1K_TOKENS", "0.000125"))
+LLM_OUTPUT_COST_PER_1K_TOKENS = float(os.getenv("LLM_OUTPUT_COST_PER_1K_TOKENS", "0.000375"))
+LLM_USAGE_RECENT_CALLS = int(os.getenv("LLM_USAGE_RECENT_CALLS", "500"))
+
+# Batch RICE scoring: tasks packed into one prompt, split when a batch gets too large
+RICE_BATCH_MAX_ITEMS = int(os.getenv("RICE_BATCH_MAX_ITEMS", "25"))
+RICE_BATCH_MAX_CHARS = int(os.getenv("RICE_BATCH_MAX_CHARS", "6000"))
+
+# Near-duplicate meeting detection (MinHash/LSH over transcripts)
+MEETING_DEDUP_ENABLED = os.getenv("MEETING_DEDUP_ENABLED", "true").lower() == "true"
+MEETING_MINHASH_PERMUTATIONS = int(os.getenv("MEETING_MINHASH_PERMUTATIONS", "128"))
+MEETING_LSH_BANDS = int(os.getenv("MEETING_LSH_BANDS", "32"))
+MEETING_SHINGLE_WORDS = int(os.getenv("MEETING_SHINGLE_WORDS", "5"))
+MEETING_DUPLICATE_THRESHOLD = float(os.getenv("MEETING_DUPLICATE_THRESHOLD", "0.85"))
+
+# Candidate deduplication against existing tasks and pending suggestions
+TASK_DEDUP_MODE = os.getenv("TASK_DEDUP_MODE", "merge")  # merge | flag | off
+TASK_DUPLICATE_THRESHOLD = float(os.getenv("TASK_DUPLICATE_THRESHOLD", "0.75"))
+SIMILARITY_MAX_DF = float(os.getenv("SIMILARITY_MAX_DF", "0.5"))
+
+# Background job queue (app/jobs). JOB_WORKERS=0 leaves jobs to dedicated `python -m app.jobs.worker` processes.
+JOB_WORKERS = int(os.getenv("JOB_WORKERS", "4"))
+JOB_LEASE_SECONDS = float(os.getenv("JOB_LEASE_SECONDS", "120"))
+JOB_MAX_ATTEMPTS = int(os.getenv("JOB_MAX_ATTEMPTS", "3"))
+JOB_RETRY_BACKOFF_SECONDS = float(os.getenv("JOB_RETRY_BACKOFF_SECONDS", "5"))
+JOB_POLL_INTERVAL_SECONDS = float(os.getenv("JOB_POLL_INTERVAL_SECONDS", "1"))
+
+
+# Bulk transcript import (POST /meetings/import)
+IMPORT_BATCH_SIZE = int(os.getenv("IMPORT_BATCH_SIZE", "200"))
+IMPORT_CONCURRENCY = int(os.getenv("IMPORT_CONCURRENCY", "4"))
+IMPORT_MAX_RECORD_BYTES = int(os.getenv("IMPORT_MAX_RECORD_BYTES", str(5 * 1024 * 1024)))
+IMPORT_MAX_ERRORS = int(os.getenv("IMPORT_MAX_ERRORS", "100"))
+# An import still receiving that has not stored a batch for this long is treated as abandoned
+IMPORT_RECEIVE_LEASE_SECONDS = float(os.getenv("IMPORT_RECEIVE_LEASE_SECONDS", "300"))
+
+# Task list pagination (GET /tasks/, /tasks/my, /tasks/blockers, /sprints/{id}/tasks)
+TASK_PAGE_SIZE = int(os.getenv("TASK_PAGE_SIZE", "100"))
+TASK_MAX_PAGE_SIZE = int(os.getenv("TASK_MAX_PAGE_SIZE", "1000"))
+
+# ETags on polled read endpoints (GET /tasks/, /briefing/daily, /analytics/*).
+# Views relative to the current time (overdue, days remaining) also change
+# without a write, so their ETags roll over every ETAG_CLOCK_SECONDS.
+ETAG_CLOCK_SECONDS = int(os.getenv("ETAG_CLOCK_SECONDS", "300"))
@@ -1,15 +1,51 @@
-from sqlalchemy import create_engine
+import asyncio
+from typing import Any, Callable, TypeVar
+from sqlalchemy import create_engine, event
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import Session, sessionmaker
 from .config import DATABASE_URL
 
 engine = create_engine(DATABASE_URL, connect_args={"check_same_thread": False})
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 Base = declarative_base()
 
+T = TypeVar("T")
+
 def get_db():
     db = SessionLocal()
     try:
         yield db
     finally:
         db.close()
+
+def after_commit(db: Session, callback: Callable[[], None]) -> None:
+    """Run callback once db's current transaction commits; it is dropped if the transaction rolls back.
+
+    For in-process state that mirrors the database. The callback runs after
+    the commit has expired the session's objects, so it must not load them.
+    """
+    db.info.setdefault("after_commit", []).append(callback)
+
+async def run_in_thread(fn: Callable[..., T], *args: Any) -> T:
+    """Run blocking session or CPU work in a worker thread, keeping the event loop free.
+
+    If the caller is cancelled meanwhile, the thread is waited for before the
+    cancellation is re-raised, so the caller's cleanup (a rollback, say) never
+    uses the session while the thread still does.
+    """
+    work = asyncio.ensure_future(asyncio.to_thread(fn, *args))
+    try:
+        return await asyncio.shield(work)
+    except asyncio.CancelledError:
+        await asyncio.wait([work])
+        raise
+
+@event.listens_for(Session, "after_commit")
+def _run_after_commit(session):
+    for callback in session.info.pop("after_commit", []):
+        callback()
+
+@event.listens_for(Session, "after_transaction_end")
+def _drop_after_commit(session, transaction):
+    if transaction.parent is None:
+        session.info.pop("after_commit", None)
@@ -0,0 +1,44 @@
+"""Job handlers by kind
+
+A handler is an async function taking a database session and the job
+payload, and returning a JSON-serializable result. Raise PermanentJobError
+for failures a retry cannot fix; any other exception is retried.
+"""
+from sqlalchemy.orm import Session
+from typing import Any, Awaitable, Callable, Dict
+from ..services.meeting_service import process_meeting, reextract_meeting
+from ..services.import_service import run_import
+
+JobHandler = Callable[[Session, Dict[str, Any]], Awaitable[Dict[str, Any]]]
+
+class PermanentJobError(Exception):
+    """Job failure that should not be retried"""
+
+HANDLERS: Dict[str, JobHandler] = {}
+
+def handler(kind: str):
+    def register(fn: JobHandler) -> JobHandler:
+        HANDLERS[kind] = fn
+        return fn
+    return register
+
+@handler("process_meeting")
+async def process_meeting_job(db: Session, payload: Dict[str, Any]) -> Dict[str, Any]:
+    try:
+        return await process_meeting(db, payload["meeting_id"])
+    except LookupError as e:
+        raise PermanentJobError(str(e))
+
+@handler("update_transcript")
+async def update_transcript_job(db: Session, payload: Dict[str, Any]) -> Dict[str, Any]:
+    try:
+        return await reextract_meeting(db, payload["meeting_id"], payload["transcript"])
+    except LookupError as e:
+        raise PermanentJobError(str(e))
+
+@handler("process_import")
+async def process_import_job(db: Session, payload: Dict[str, Any]) -> Dict[str, Any]:
+    try:
+        return await run_import(db, payload["import_id"])
+    except LookupError as e:
+        raise PermanentJobError(str(e))
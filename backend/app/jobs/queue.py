@@ -0,0 +1,172 @@
+"""Database-backed job queue with leases
+
+A worker claims a job by moving it to running and taking a lease. The claim
+is one conditional UPDATE, so when several workers (threads or processes)
+race for the same row, only one of them wins. While the handler runs, the
+worker extends the lease. If the worker dies, the lease expires and another
+worker picks the job up again. A failed attempt goes back to the queue with
+exponential backoff until max_attempts is reached, and is then marked failed.
+"""
+import logging
+from datetime import datetime, timedelta
+from sqlalchemy import and_, or_, func
+from sqlalchemy.orm import Session
+from typing import Any, Dict, List, Optional
+from ..models import Job
+from ..config import JOB_LEASE_SECONDS, JOB_MAX_ATTEMPTS, JOB_RETRY_BACKOFF_SECONDS
+
+logger = logging.getLogger(__name__)
+
+TERMINAL_STATUSES = ("succeeded", "failed")
+
+# Times a worker retries after losing a claim race before reporting no work
+CLAIM_RACE_RETRIES = 3
+
+def enqueue(
+    db: Session,
+    kind: str,
+    payload: Dict[str, Any],
+    workspace_id: Optional[int] = None,
+    max_attempts: int = JOB_MAX_ATTEMPTS
+) -> Job:
+    job = Job(
+        workspace_id=workspace_id,
+        kind=kind,
+        payload=payload,
+        status="queued",
+        attempts=0,
+        max_attempts=max_attempts,
+        run_after=datetime.utcnow()
+    )
+    db.add(job)
+    db.commit()
+    db.refresh(job)
+    return job
+
+def _claimable(now: datetime):
+    return or_(
+        and_(Job.status == "queued", Job.run_after <= now),
+        and_(Job.status == "running", Job.lease_expires_at < now, Job.attempts < Job.max_attempts)
+    )
+
+def claim(db: Session, worker_id: str, lease_seconds: float = JOB_LEASE_SECONDS) -> Optional[Job]:
+    """Claim the oldest runnable job (queued, or running with an expired lease), or None"""
+    for _ in range(CLAIM_RACE_RETRIES):
+        now = datetime.utcnow()
+        candidate = db.query(Job.id).filter(_claimable(now)).order_by(Job.run_after, Job.id).first()
+        if not candidate:
+            return None
+        claimed = db.query(Job).filter(Job.id == candidate.id, _claimable(now)).update({
+            Job.status: "running",
+            Job.lease_owner: worker_id,
+            Job.lease_expires_at: now + timedelta(seconds=lease_seconds),
+            Job.attempts: Job.attempts + 1,
+            Job.started_at: now
+        }, synchronize_session=False)
+        db.commit()
+        if claimed:
+            return db.query(Job).filter(Job.id == candidate.id).first()
+    return None
+
+def _owned(job_id: int, worker_id: str):
+    return and_(Job.id == job_id, Job.status == "running", Job.lease_owner == worker_id)
+
+def heartbeat(db: Session, job_id: int, worker_id: str, lease_seconds: float = JOB_LEASE_SECONDS) -> bool:
+    """Extend the lease. False means the worker lost it and must stop working on the job."""
+    extended = db.query(Job).filter(_owned(job_id, worker_id)).update({
+        Job.lease_expires_at: datetime.utcnow() + timedelta(seconds=lease_seconds)
+    }, synchronize_session=False)
+    db.commit()
+    return bool(extended)
+
+def complete(db: Session, job_id: int, worker_id: str, result: Dict[str, Any]) -> bool:
+    """Record success. A worker whose lease was taken over does not overwrite the new owner's run."""
+    updated = db.query(Job).filter(_owned(job_id, worker_id)).update({
+        Job.status: "succeeded",
+        Job.result: result,
+        Job.error: None,
+        Job.lease_owner: None,
+        Job.lease_expires_at: None,
+        Job.finished_at: datetime.utcnow()
+    }, synchronize_session=False)
+    db.commit()
+    if not updated:
+        logger.warning(f"Job {job_id} finished on {worker_id} after its lease was lost, result dropped")
+    return bool(updated)
+
+def fail(db: Session, job_id: int, worker_id: str, error: str, retry: bool = True) -> bool:
+    """Record a failed attempt: back to the queue with backoff, or failed for good"""
+    job = db.query(Job).filter(_owned(job_id, worker_id)).first()
+    if not job:
+        return False
+    now = datetime.utcnow()
+    job.error = error
+    job.lease_owner = None
+    job.lease_expires_at = None
+    if retry and job.attempts < job.max_attempts:
+        job.status = "queued"
+        job.run_after = now + timedelta(seconds=JOB_RETRY_BACKOFF_SECONDS * 2 ** (job.attempts - 1))
+        logger.warning(f"Job {job_id} attempt {job.attempts} failed, retrying after {job.run_after}: {error}")
+    else:
+        job.status = "failed"
+        job.finished_at = now
+        logger.error(f"Job {job_id} failed after {job.attempts} attempts: {error}")
+    db.commit()
+    return True
+
+def release(db: Session, job_id: int, worker_id: str) -> bool:
+    """Hand a job back untouched (worker shutting down); the attempt is not counted"""
+    released = db.query(Job).filter(_owned(job_id, worker_id)).update({
+        Job.status: "queued",
+        Job.attempts: Job.attempts - 1,
+        Job.lease_owner: None,
+        Job.lease_expires_at: None
+    }, synchronize_session=False)
+    db.commit()
+    return bool(released)
+
+def reap_expired(db: Session) -> int:
+    """Fail jobs whose lease expired on their last allowed attempt"""
+    now = datetime.utcnow()
+    reaped = db.query(Job).filter(
+        Job.status == "running",
+        Job.lease_expires_at < now,
+        Job.attempts >= Job.max_attempts
+    ).update({
+        Job.status: "failed",
+        Job.error: "Lease expired on the last attempt",
+        Job.lease_owner: None,
+        Job.lease_expires_at: None,
+        Job.finished_at: now
+    }, synchronize_session=False)
+    db.commit()
+    return reaped
+
+def job_to_dict(job: Job) -> Dict[str, Any]:
+    return {
+        "job_id": job.id,
+        "kind": job.kind,
+        "workspace_id": job.workspace_id,
+        "status": job.status,
+        "attempts": job.attempts,
+        "max_attempts": job.max_attempts,
+        "error": job.error,
+        "result": job.result,
+        "created_at": job.created_at.isoformat() if job.created_at else None,
+        "started_at": job.started_at.isoformat() if job.started_at else None,
+        "finished_at": job.finished_at.isoformat() if job.finished_at else None
+    }
+
+def queue_stats(db: Session, workspace_id: Optional[int] = None) -> Dict[str, int]:
+    query = db.query(Job.status, func.count(Job.id))
+    if workspace_id is not None:
+        query = query.filter(Job.workspace_id == workspace_id)
+    counts = {status: 0 for status in ("queued", "running", "succeeded", "failed")}
+    counts.update(dict(query.group_by(Job.status).all()))
+    return counts
+
+def list_jobs(db: Session, workspace_id: int, status: Optional[str] = None, limit: int = 50) -> List[Job]:
+    query = db.query(Job).filter(Job.workspace_id == workspace_id)
+    if status:
+        query = query.filter(Job.status == status)
+    return query.order_by(Job.id.desc()).limit(limit).all()
@@ -0,0 +1,220 @@
+"""Worker pool that runs jobs from the database queue
+
+The API process starts JOB_WORKERS workers on its own event loop. To scale
+ingestion past one process, set JOB_WORKERS=0 on the API and run dedicated
+worker processes against the same database:
+
+    python -m app.jobs.worker --workers 8
+
+Each pool has its own connection pool, sized so that every worker, plus a
+lease heartbeat per worker, can hold a connection at once. Workers run on
+the API's event loop, but their queue queries, like the handlers' database
+and CPU work, run in worker threads (run_in_thread), so a slow query or a
+long transcript does not hold up requests.
+
+Workers sleep for JOB_POLL_INTERVAL_SECONDS when the queue is empty. The API
+wakes the in-process pool as soon as it enqueues a job, so a job does not wait
+out a poll interval there.
+"""
+import argparse
+import asyncio
+import logging
+import os
+import socket
+import uuid
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session, sessionmaker
+from typing import List, Optional
+from ..config import DATABASE_URL, JOB_WORKERS, JOB_LEASE_SECONDS, JOB_POLL_INTERVAL_SECONDS
+from ..database import run_in_thread
+from .queue import claim, heartbeat, complete, fail, release, reap_expired
+from .handlers import HANDLERS, PermanentJobError
+
+logger = logging.getLogger(__name__)
+
+class LeaseLost(Exception):
+    """Another worker took over the job after this worker's lease expired"""
+
+class WorkerPool:
+    """A fixed number of asyncio workers claiming and running jobs"""
+
+    def __init__(
+        self,
+        size: int = JOB_WORKERS,
+        lease_seconds: float = JOB_LEASE_SECONDS,
+        poll_interval: float = JOB_POLL_INTERVAL_SECONDS
+    ):
+        self.size = size
+        self.lease_seconds = lease_seconds
+        self.poll_interval = poll_interval
+        self.name = f"{socket.gethostname()}-{os.getpid()}-{uuid.uuid4().hex[:6]}"
+        workers = max(size, 1)
+        self._engine = create_engine(
+            DATABASE_URL,
+            connect_args={"check_same_thread": False},
+            pool_size=workers + 1,
+            max_overflow=workers
+        )
+        self._sessions = sessionmaker(autocommit=False, autoflush=False, bind=self._engine)
+        self._tasks: List[asyncio.Task] = []
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._wake: Optional[asyncio.Event] = None
+        self.processed = 0
+        self.failed = 0
+
+    async def run_job(self, worker_id: str) -> bool:
+        """Claim and run one job. False when nothing was runnable."""
+        db = self._sessions()
+        try:
+            job = await run_in_thread(claim, db, worker_id, self.lease_seconds)
+            if not job:
+                return False
+            job_id, kind, payload = job.id, job.kind, job.payload
+            handle = HANDLERS.get(kind)
+            if handle is None:
+                await self._fail(db, job_id, worker_id, f"No handler for job kind {kind!r}", retry=False)
+                return True
+
+            work = asyncio.ensure_future(handle(db, payload))
+            keepalive = asyncio.ensure_future(self._keep_lease(job_id, worker_id, work))
+            try:
+                result = await work
+            except asyncio.CancelledError:
+                if keepalive.done() and not keepalive.cancelled() and isinstance(keepalive.exception(), LeaseLost):
+                    logger.warning(f"Job {job_id} abandoned by {worker_id}: lease lost")
+                    db.rollback()
+                    return True
+                db.rollback()
+                release(db, job_id, worker_id)
+                raise
+            except PermanentJobError as e:
+                db.rollback()
+                await self._fail(db, job_id, worker_id, str(e), retry=False)
+                return True
+            except Exception as e:
+                logger.exception(f"Job {job_id} ({kind}) raised")
+                db.rollback()
+                await self._fail(db, job_id, worker_id, f"{type(e).__name__}: {e}")
+                return True
+            finally:
+                keepalive.cancel()
+            # Only a completion that still held the lease counts; otherwise another worker owns the job now
+            if await run_in_thread(complete, db, job_id, worker_id, result):
+                self.processed += 1
+            else:
+                logger.warning(f"Job {job_id} finished by {worker_id} after its lease was lost; result discarded")
+            return True
+        finally:
+            db.close()
+
+    async def _fail(self, db: Session, job_id: int, worker_id: str, error: str, retry: bool = True) -> None:
+        if await run_in_thread(fail, db, job_id, worker_id, error, retry):
+            self.failed += 1
+
+    async def _keep_lease(self, job_id: int, worker_id: str, work: asyncio.Future) -> None:
+        """Extend the lease every third of its length; cancel the work if it was lost"""
+        while True:
+            await asyncio.sleep(self.lease_seconds / 3)
+            db = self._sessions()
+            try:
+                held = await run_in_thread(heartbeat, db, job_id, worker_id, self.lease_seconds)
+            finally:
+                db.close()
+            if not held:
+                work.cancel()
+                raise LeaseLost(job_id)
+
+    async def _worker(self, index: int) -> None:
+        worker_id = f"{self.name}/{index}"
+        while True:
+            try:
+                if await self.run_job(worker_id):
+                    continue
+                if index == 0:
+                    db = self._sessions()
+                    try:
+                        await run_in_thread(reap_expired, db)
+                    finally:
+                        db.close()
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception(f"Worker {worker_id} error")
+            self._wake.clear()
+            try:
+                await asyncio.wait_for(self._wake.wait(), self.poll_interval)
+            except asyncio.TimeoutError:
+                pass
+
+    def start(self) -> None:
+        """Start the workers on the running event loop"""
+        if self._tasks or self.size <= 0:
+            return
+        self._loop = asyncio.get_running_loop()
+        self._wake = asyncio.Event()
+        self._tasks = [asyncio.ensure_future(self._worker(i)) for i in range(self.size)]
+        logger.info(f"Started {self.size} job workers as {self.name}")
+
+    async def stop(self) -> None:
+        """Stop the workers; jobs in flight go back to the queue without counting an attempt"""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    def wake(self) -> None:
+        """Let idle workers poll now. Safe to call from any thread."""
+        if self._loop is not None and not self._loop.is_closed():
+            self._loop.call_soon_threadsafe(self._wake.set)
+
+    async def drain(self, concurrency: Optional[int] = None) -> int:
+        """Run jobs until none is runnable, then return how many ran (tests, benchmarks, CLI)"""
+        ran = 0
+
+        async def worker(index: int) -> None:
+            nonlocal ran
+            while await self.run_job(f"{self.name}/drain-{index}"):
+                ran += 1
+
+        workers = min(concurrency or self.size, max(self.size, 1)) or 1
+        await asyncio.gather(*(worker(i) for i in range(workers)))
+        return ran
+
+    def stats(self) -> dict:
+        return {
+            "name": self.name,
+            "workers": len(self._tasks),
+            "processed": self.processed,
+            "failed": self.failed
+        }
+
+worker_pool = WorkerPool()
+
+async def _serve(workers: int) -> None:
+    pool = WorkerPool(size=workers)
+    pool.start()
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await pool.stop()
+
+def main():
+    parser = argparse.ArgumentParser(description="Run background job workers")
+    parser.add_argument("--workers", type=int, default=max(JOB_WORKERS, 1))
+    parser.add_argument("--drain", action="store_true", help="Run queued jobs, then exit")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+
+    from ..database import engine, Base
+    Base.metadata.create_all(bind=engine)
+    if args.drain:
+        ran = asyncio.run(WorkerPool(size=args.workers).drain())
+        print(f"Ran {ran} jobs")
+        return
+    try:
+        asyncio.run(_serve(args.workers))
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == "__main__":
+    main()
@@ -1,9 +1,12 @@
 """FastAPI main application"""
+import threading
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from .database import engine, Base
+from .config import LLM_WARMUP_ON_STARTUP
 from .routers import auth, meetings, tasks, sprints, analytics as analytics_old, agent, workspaces, audits, briefing, smart_actions
-from .routers import analytics as analytics_new, intelligence, auto_mapping, chat_agent
+from .routers import analytics as analytics_new, intelligence, auto_mapping, chat_agent, jobs, search
+from .jobs.worker import worker_pool
 
 # Create database tables
 Base.metadata.create_all(bind=engine)
@@ -17,6 +20,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["ETag", "X-Next-Cursor"],
 )
 
 # Include routers
@@ -34,6 +38,28 @@ app.include_router(workspaces.router)
 app.include_router(audits.router)
 app.include_router(briefing.router)
 app.include_router(smart_actions.router)
+app.include_router(jobs.router)
+app.include_router(search.router)
+
+@app.on_event("startup")
+def warm_up_llm():
+    """Import and configure the Gemini SDK off the request path, so the first live call does not pay for it.
+
+    Only the SDK is deferred. The routers, and through them gemini_client,
+    the parser, similarity and the job modules, load with app.main.
+    """
+    if LLM_WARMUP_ON_STARTUP:
+        from .ai.gemini_client import warm_up
+        threading.Thread(target=warm_up, name="llm-warmup", daemon=True).start()
+
+@app.on_event("startup")
+async def start_job_workers():
+    """Run queued jobs (meeting processing) on this process's event loop; JOB_WORKERS=0 disables"""
+    worker_pool.start()
+
+@app.on_event("shutdown")
+async def stop_job_workers():
+    await worker_pool.stop()
 
 @app.get("/")
 def root():
@@ -1,9 +1,30 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime, Boolean, Float, ForeignKey, JSON, Enum as SQLEnum
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, Integer, String, Text, DateTime, Boolean, Float, ForeignKey, JSON, Index, LargeBinary, Enum as SQLEnum
+from sqlalchemy import bindparam, event, inspect, select, text
+from sqlalchemy.orm import relationship, deferred, validates
+from sqlalchemy.schema import CreateColumn
+from sqlalchemy.types import TypeDecorator
 from datetime import datetime
 import enum
+import zlib
 from .database import Base
 
+class CompressedText(TypeDecorator):
+    """Text stored zlib-compressed.
+
+    Rows written as plain text before compression still read back, once
+    add_missing_columns has brought their table up to date.
+    """
+    impl = LargeBinary
+    cache_ok = True
+
+    def process_bind_param(self, value, dialect):
+        return zlib.compress(value.encode("utf-8")) if value is not None else None
+
+    def process_result_value(self, value, dialect):
+        if value is None or isinstance(value, str):
+            return value
+        return zlib.decompress(value).decode("utf-8")
+
 class TaskStatus(str, enum.Enum):
     todo = "todo"
     in_progress = "in_progress"
@@ -56,9 +77,57 @@ class Meeting(Base):
     workspace_id = Column(Integer, ForeignKey("workspaces.id"))
     title = Column(String)
     meeting_date = Column(DateTime)
-    transcript_text = Column(Text)
+    # Compressed, and only loaded when accessed: listing meetings does not read transcripts
+    transcript_text = deferred(Column(CompressedText))
+    transcript_size = Column(Integer, nullable=True)
+    summary = Column(Text, nullable=True)
     created_by = Column(Integer, ForeignKey("users.id"))
     created_at = Column(DateTime, default=datetime.utcnow)
+    # Near-duplicate detection: MinHash signature, extraction results to reuse, and the meeting this repeats
+    minhash = Column(JSON, nullable=True)
+    analysis = Column(JSON, nullable=True)
+    duplicate_of_id = Column(Integer, ForeignKey("meetings.id"), nullable=True)
+    import_id = Column(Integer, ForeignKey("meeting_imports.id"), nullable=True, index=True)
+
+    @validates("transcript_text")
+    def _track_transcript_size(self, key, transcript):
+        self.transcript_size = len(transcript) if transcript is not None else None
+        return transcript
+
+class MeetingImport(Base):
+    """Bulk transcript import: what was stored from the upload, then extraction progress of its meetings"""
+    __tablename__ = "meeting_imports"
+    id = Column(Integer, primary_key=True, index=True)
+    workspace_id = Column(Integer, ForeignKey("workspaces.id"))
+    status = Column(String, default="receiving")  # receiving | queued | processing | completed | failed
+    received = Column(Integer, default=0)
+    stored = Column(Integer, default=0)
+    rejected = Column(Integer, default=0)
+    processed = Column(Integer, default=0)
+    failed = Column(Integer, default=0)
+    suggestions_created = Column(Integer, default=0)
+    errors = Column(JSON, default=list)
+    job_id = Column(Integer, ForeignKey("jobs.id"), nullable=True)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    started_at = Column(DateTime, nullable=True)
+    finished_at = Column(DateTime, nullable=True)
+
+class MeetingLSHBucket(Base):
+    """One LSH band key of a meeting's MinHash signature, looked up per workspace"""
+    __tablename__ = "meeting_lsh_buckets"
+    id = Column(Integer, primary_key=True, index=True)
+    workspace_id = Column(Integer, ForeignKey("workspaces.id"))
+    band = Column(Integer)
+    bucket = Column(String)
+    meeting_id = Column(Integer, ForeignKey("meetings.id"))
+    __table_args__ = (Index("ix_meeting_lsh_buckets_lookup", "workspace_id", "bucket"),)
+
+# Statuses of open work. SQLite only uses a partial index when the query
+# repeats its condition with the same literals (a bound IN list never
+# matches), so filter with ACTIVE_TASK below rather than a status list.
+ACTIVE_STATUSES = ("todo", "in_progress")
+ACTIVE_STATUS_SQL = "status IN ({})".format(", ".join(f"'{status}'" for status in ACTIVE_STATUSES))
 
 class Task(Base):
     __tablename__ = "tasks"
@@ -87,6 +156,23 @@ class Task(Base):
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     sprint_id = Column(Integer, ForeignKey("sprints.id"), nullable=True)
     epic_id = Column(Integer, ForeignKey("epics.id"), nullable=True)
+    __table_args__ = (
+        # Keyset pagination of task lists: newest first by (created_at, id) within each filter
+        Index("ix_tasks_workspace_created", "workspace_id", "created_at", "id"),
+        Index("ix_tasks_assignee_created", "assignee_id", "created_at", "id"),
+        Index("ix_tasks_sprint_created", "sprint_id", "created_at", "id"),
+        # Status views: review queues, quick wins by priority, done work by completion time
+        Index("ix_tasks_workspace_status_priority", "workspace_id", "status", "priority"),
+        Index("ix_tasks_workspace_status_updated", "workspace_id", "status", "updated_at"),
+        # Per-assignee load and picks; covers the workload aggregates, which then never read the table
+        Index("ix_tasks_workspace_assignee", "workspace_id", "assignee_id", "status", "priority", "story_points"),
+        # Open work only, a small slice of a mature workspace: overdue and due soon
+        Index("ix_tasks_active_due", "workspace_id", "due_date", sqlite_where=text(ACTIVE_STATUS_SQL)),
+        # Blocked work, newest first (also pages /tasks/blockers)
+        Index("ix_tasks_workspace_blocked", "workspace_id", "is_blocked", "created_at", "id"),
+    )
+
+ACTIVE_TASK = Task.status.in_(bindparam("active_statuses", list(ACTIVE_STATUSES), expanding=True, literal_execute=True))
 
 class Dependency(Base):
     __tablename__ = "dependencies"
@@ -118,6 +204,50 @@ class AgentSuggestion(Base):
     applied = Column(Boolean, default=False)
     created_at = Column(DateTime, default=datetime.utcnow)
 
+class Job(Base):
+    """Background job. Workers claim it by taking a lease; an expired lease makes it claimable again."""
+    __tablename__ = "jobs"
+    id = Column(Integer, primary_key=True, index=True)
+    workspace_id = Column(Integer, ForeignKey("workspaces.id"), nullable=True)
+    kind = Column(String)
+    payload = Column(JSON)
+    status = Column(String, default="queued")  # queued | running | succeeded | failed
+    attempts = Column(Integer, default=0)
+    max_attempts = Column(Integer, default=3)
+    run_after = Column(DateTime, default=datetime.utcnow)
+    lease_owner = Column(String, nullable=True)
+    lease_expires_at = Column(DateTime, nullable=True)
+    result = Column(JSON, nullable=True)
+    error = Column(Text, nullable=True)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    started_at = Column(DateTime, nullable=True)
+    finished_at = Column(DateTime, nullable=True)
+    __table_args__ = (Index("ix_jobs_claim", "status", "run_after"),)
+
+class LLMUsage(Base):
+    """One request sent to the model, for usage accounting. hedge marks the duplicate of a hedged call."""
+    __tablename__ = "llm_usage"
+    id = Column(Integer, primary_key=True, index=True)
+    workspace_id = Column(Integer, nullable=True)  # None for calls made outside a workspace
+    prompt = Column(String)
+    model = Column(String)
+    input_chars = Column(Integer, default=0)
+    output_chars = Column(Integer, default=0)
+    input_tokens = Column(Integer, default=0)
+    output_tokens = Column(Integer, default=0)
+    latency_seconds = Column(Float, default=0.0)
+    cost = Column(Float, default=0.0)
+    ok = Column(Boolean, default=True)
+    hedge = Column(Boolean, default=False)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    __table_args__ = (Index("ix_llm_usage_workspace_created", "workspace_id", "created_at"),)
+
+class WorkspaceVersion(Base):
+    """Change counter per workspace, bumped by triggers on every write to the tables below"""
+    __tablename__ = "workspace_versions"
+    workspace_id = Column(Integer, primary_key=True)
+    version = Column(Integer, nullable=False, default=0)
+
 class Sprint(Base):
     __tablename__ = "sprints"
     id = Column(Integer, primary_key=True, index=True)
@@ -176,3 +306,127 @@ class Retrospective(Base):
     needs_improvement = Column(Text)
     action_items = Column(Text)
     created_at = Column(DateTime, default=datetime.utcnow)
+
+@event.listens_for(Base.metadata, "before_create")
+def add_missing_columns(target, connection, **kw):
+    """Add columns declared after a table was created (create_all never alters existing tables).
+
+    Runs before create_all, so the indexes and triggers created afterwards
+    find every column. Added columns are NULL on existing rows.
+    """
+    existing = inspect(connection)
+    tables = set(existing.get_table_names())
+    for table in target.sorted_tables:
+        if table.name not in tables:
+            continue
+        present = {column["name"] for column in existing.get_columns(table.name)}
+        for column in table.columns:
+            if column.name not in present:
+                ddl = CreateColumn(column).compile(dialect=connection.dialect)
+                connection.execute(text(f"ALTER TABLE {table.name} ADD COLUMN {ddl}"))
+
+@event.listens_for(Base.metadata, "after_create")
+def create_missing_indexes(target, connection, **kw):
+    """Add indexes declared after a table was created (create_all only indexes new tables).
+
+    add_missing_columns has run by now, so indexes on added columns can be built.
+    """
+    for table in target.sorted_tables:
+        for index in table.indexes:
+            index.create(connection, checkfirst=True)
+
+# Full-text search (SQLite FTS5). tasks_fts indexes tasks in place (external
+# content) and triggers keep it current through every write path. Transcripts
+# are stored compressed, which FTS5 cannot read, so meetings_fts holds its own
+# copy of title and transcript. The Meeting mapper events below keep it current,
+# and bulk inserts call index_meetings themselves.
+SEARCH_DDL = [
+    """CREATE VIRTUAL TABLE IF NOT EXISTS tasks_fts USING fts5(
+        title, description, content='tasks', content_rowid='id', tokenize='porter unicode61')""",
+    """CREATE TRIGGER IF NOT EXISTS tasks_fts_insert AFTER INSERT ON tasks BEGIN
+        INSERT INTO tasks_fts(rowid, title, description) VALUES (new.id, new.title, new.description);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS tasks_fts_delete AFTER DELETE ON tasks BEGIN
+        INSERT INTO tasks_fts(tasks_fts, rowid, title, description) VALUES ('delete', old.id, old.title, old.description);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS tasks_fts_update AFTER UPDATE OF title, description ON tasks BEGIN
+        INSERT INTO tasks_fts(tasks_fts, rowid, title, description) VALUES ('delete', old.id, old.title, old.description);
+        INSERT INTO tasks_fts(rowid, title, description) VALUES (new.id, new.title, new.description);
+    END""",
+    """CREATE VIRTUAL TABLE IF NOT EXISTS meetings_fts USING fts5(title, transcript, tokenize='porter unicode61')"""
+]
+
+@event.listens_for(Base.metadata, "after_create")
+def create_search_index(target, connection, **kw):
+    """Create the FTS tables and triggers, and fill them the first time"""
+    existing = {row[0] for row in connection.execute(text(
+        "SELECT name FROM sqlite_master WHERE name IN ('tasks_fts', 'meetings_fts')"
+    ))}
+    for statement in SEARCH_DDL:
+        connection.execute(text(statement))
+    if "tasks_fts" not in existing:
+        connection.execute(text("INSERT INTO tasks_fts(tasks_fts) VALUES ('rebuild')"))
+    if "meetings_fts" not in existing:
+        rows = connection.execute(select(Meeting.id, Meeting.title, Meeting.transcript_text))
+        index_meetings(connection, [tuple(row) for row in rows])
+
+def index_meetings(connection, meetings) -> None:
+    """(Re)index meetings given as (id, title, transcript)"""
+    rows = [{"id": id, "title": title, "transcript": transcript} for id, title, transcript in meetings]
+    if rows:
+        connection.execute(text("DELETE FROM meetings_fts WHERE rowid = :id"), rows)
+        connection.execute(text("INSERT INTO meetings_fts(rowid, title, transcript) VALUES (:id, :title, :transcript)"), rows)
+
+@event.listens_for(Meeting, "after_insert")
+def _index_new_meeting(mapper, connection, meeting):
+    index_meetings(connection, [(meeting.id, meeting.title, meeting.transcript_text)])
+
+@event.listens_for(Meeting, "after_update")
+def _reindex_meeting(mapper, connection, meeting):
+    # Only columns that changed are rewritten, so an unloaded transcript is not loaded mid-flush
+    attrs = inspect(meeting).attrs
+    for attr, column in (("title", "title"), ("transcript_text", "transcript")):
+        if attrs[attr].history.has_changes():
+            connection.execute(
+                text(f"UPDATE meetings_fts SET {column} = :value WHERE rowid = :id"),
+                {"value": getattr(meeting, attr), "id": meeting.id}
+            )
+
+@event.listens_for(Meeting, "after_delete")
+def _unindex_meeting(mapper, connection, meeting):
+    connection.execute(text("DELETE FROM meetings_fts WHERE rowid = :id"), {"id": meeting.id})
+
+# Workspace versions. Any insert, update or delete on a versioned table bumps
+# its workspace's counter in the same transaction, so Core bulk writes, ORM
+# flushes and raw SQL are all covered and a rolled back write leaves it alone.
+# Read endpoints derive ETags from it (app/caching.py).
+VERSIONED_TABLES = ["tasks", "agent_suggestions", "meetings", "sprints", "dependencies", "audits"]
+
+# The SELECT ... WHERE form lets a trigger bump conditionally (the WHERE also
+# keeps SQLite from reading ON CONFLICT as part of the SELECT)
+_BUMP_VERSION = """INSERT INTO workspace_versions(workspace_id, version) SELECT {row}.workspace_id, 1 WHERE {condition}
+        ON CONFLICT(workspace_id) DO UPDATE SET version = version + 1;"""
+
+VERSION_DDL = [
+    statement
+    for table in VERSIONED_TABLES
+    for statement in (
+        f"""CREATE TRIGGER IF NOT EXISTS {table}_version_insert AFTER INSERT ON {table} BEGIN
+        {_BUMP_VERSION.format(row="new", condition="new.workspace_id IS NOT NULL")}
+    END""",
+        f"""CREATE TRIGGER IF NOT EXISTS {table}_version_delete AFTER DELETE ON {table} BEGIN
+        {_BUMP_VERSION.format(row="old", condition="old.workspace_id IS NOT NULL")}
+    END""",
+        # A row moved to another workspace changes both
+        f"""CREATE TRIGGER IF NOT EXISTS {table}_version_update AFTER UPDATE ON {table} BEGIN
+        {_BUMP_VERSION.format(row="new", condition="new.workspace_id IS NOT NULL")}
+        {_BUMP_VERSION.format(row="old", condition="old.workspace_id IS NOT new.workspace_id AND old.workspace_id IS NOT NULL")}
+    END"""
+    )
+]
+
+@event.listens_for(Base.metadata, "after_create")
+def create_version_triggers(target, connection, **kw):
+    """Create the version triggers; a workspace without a row is at version 0"""
+    for statement in VERSION_DDL:
+        connection.execute(text(statement))
@@ -1,10 +1,11 @@
 """Agent router for Nova assistant"""
+from typing import Optional
 from fastapi import APIRouter, Depends, BackgroundTasks, HTTPException
 from sqlalchemy.orm import Session
 from ..database import get_db
 from ..models import AgentSuggestion, Audit
 from ..services.agent_service import run_suggestion_engine, undo_action, apply_suggestion, reject_suggestion
-from ..ai.gemini_client import assistant_chat
+from ..ai.gemini_client import assistant_chat, cache_stats, llm_metrics, llm_usage
 
 router = APIRouter(prefix="/agent", tags=["agent"])
 
@@ -46,7 +47,22 @@ def run_suggestions(
     }
 
 @router.post("/chat")
-def chat_with_nova(message: str, context: str = "", db: Session = Depends(get_db)):
-    """Chat with Nova assistant"""
-    response = assistant_chat(message, context)
+def chat_with_nova(message: str, context: str = "", workspace_id: Optional[int] = None, db: Session = Depends(get_db)):
+    """Chat with Nova assistant. The call is billed to workspace_id in the usage ledger when given."""
+    response = assistant_chat(message, context, workspace_id)
     return response
+
+@router.get("/cache-stats")
+def get_cache_stats():
+    """Gemini response cache hit/miss counters"""
+    return cache_stats()
+
+@router.get("/llm-metrics")
+def get_llm_metrics():
+    """Gemini circuit breaker state, latency percentiles and call outcomes"""
+    return llm_metrics()
+
+@router.get("/llm-usage")
+def get_llm_usage(workspace_id: int = None, recent: int = 20):
+    """Estimated LLM tokens, latency and spend per workspace and prompt template"""
+    return llm_usage(workspace_id, recent)
@@ -4,11 +4,13 @@ from sqlalchemy.orm import Session
 from sqlalchemy import func, case
 from datetime import datetime, timedelta
 from ..database import get_db
-from ..models import Task, Sprint, User, AgentSuggestion, Audit
+from ..caching import workspace_etag
+from ..models import Task, Sprint, User, AgentSuggestion, Audit, ACTIVE_TASK
 from typing import Dict, List
 import statistics
 
-router = APIRouter(prefix="/analytics", tags=["analytics"])
+# Every endpoint here is a workspace_id view relative to now
+router = APIRouter(prefix="/analytics", tags=["analytics"], dependencies=[Depends(workspace_etag(clock=True))])
 
 @router.get("/velocity-forecast")
 def forecast_velocity(workspace_id: int, db: Session = Depends(get_db)):
@@ -209,7 +211,7 @@ def generate_risk_heatmap(workspace_id: int, db: Session = Depends(get_db)):
     """Generate risk heatmap across priority and progress dimensions"""
     tasks = db.query(Task).filter(
         Task.workspace_id == workspace_id,
-        Task.status.in_(["todo", "in_progress"]),
+        ACTIVE_TASK,
         Task.priority.isnot(None)
     ).all()
     
@@ -3,10 +3,11 @@ from fastapi import APIRouter, Depends
 from sqlalchemy.orm import Session
 from datetime import datetime, timedelta
 from ..database import get_db
-from ..models import Task, User, Meeting, Dependency
-from ..services.agent_service import create_suggestion
+from ..models import Task, User, Meeting, Dependency, ACTIVE_TASK
+from ..services.agent_service import create_suggestions
+from ..ai.keywords import heuristic_keywords, LoweredText
 import re
-from typing import List, Dict
+from typing import List, Dict, Optional
 
 router = APIRouter(prefix="/auto-map", tags=["auto-mapping"])
 
@@ -20,34 +21,35 @@ def auto_map_meeting(meeting_id: int, db: Session = Depends(get_db)):
     text = meeting.transcript_text
     mapped_tasks = []
     
-    # Extract all potential tasks
-    sentences = text.split('.')
+    # Extract all potential tasks: only sentences with an action word are visited
+    sentences = heuristic_keywords.matching_pieces(text, '.', "action")
     for sentence in sentences:
         sentence = sentence.strip()
         if not sentence or len(sentence) < 10:
             continue
         
-        # Check if it's an action item
-        if any(word in sentence.lower() for word in ['will', 'should', 'need to', 'must', 'going to', 'has to']):
-            task_data = {
-                "title": extract_title(sentence),
-                "description": sentence,
-                "owner": extract_owner(sentence, db, meeting.workspace_id),
-                "deadline": extract_deadline(sentence),
-                "dependencies": extract_dependencies(sentence, mapped_tasks),
-                "blockers": extract_blockers(sentence),
-                "priority": infer_priority(sentence),
-                "confidence": calculate_confidence(sentence)
-            }
-            
-            if task_data["title"]:
-                suggestion = create_suggestion(
-                    db, meeting.workspace_id, "auto_mapped_task",
-                    task_data, task_data["confidence"]
-                )
-                mapped_tasks.append({"id": suggestion.id, "title": task_data["title"]})
+        # The other heuristics reuse one lowercased copy of the sentence
+        hits = heuristic_keywords.lower(sentence)
+        task_data = {
+            "title": extract_title(sentence),
+            "description": sentence,
+            "owner": extract_owner(sentence, db, meeting.workspace_id),
+            "deadline": _isoformat(extract_deadline(sentence)),
+            "dependencies": extract_dependencies(sentence, mapped_tasks),
+            "blockers": extract_blockers(sentence, hits),
+            "priority": infer_priority(sentence, hits),
+            "confidence": calculate_confidence(sentence, hits)
+        }
+        
+        if task_data["title"]:
+            mapped_tasks.append({"title": task_data["title"], "data": task_data})
     
-    db.commit()
+    # One insert and one commit for every mapped task
+    ids = create_suggestions(
+        db, meeting.workspace_id,
+        [("auto_mapped_task", task["data"], task["data"]["confidence"]) for task in mapped_tasks]
+    )
+    mapped_tasks = [{"id": suggestion_id, "title": task["title"]} for suggestion_id, task in zip(ids, mapped_tasks)]
     return {
         "tasks_mapped": len(mapped_tasks),
         "suggestions": mapped_tasks,
@@ -59,12 +61,16 @@ def auto_map_meeting(meeting_id: int, db: Session = Depends(get_db)):
         }
     }
 
+def _isoformat(value: Optional[datetime]) -> Optional[str]:
+    """Suggestion payloads are JSON"""
+    return value.isoformat() if value else None
+
 @router.post("/infer-dependencies")
 def infer_task_dependencies(workspace_id: int, db: Session = Depends(get_db)):
     """Automatically infer dependencies from task relationships"""
     tasks = db.query(Task).filter(
         Task.workspace_id == workspace_id,
-        Task.status.in_(["todo", "in_progress"])
+        ACTIVE_TASK
     ).all()
     
     dependencies_found = []
@@ -109,7 +115,7 @@ def auto_detect_blockers(workspace_id: int, db: Session = Depends(get_db)):
     """Automatically detect blockers from task state and dependencies"""
     tasks = db.query(Task).filter(
         Task.workspace_id == workspace_id,
-        Task.status.in_(["todo", "in_progress"])
+        ACTIVE_TASK
     ).all()
     
     blockers_detected = []
@@ -215,48 +221,45 @@ def extract_dependencies(sentence: str, existing_tasks: List[Dict]) -> List[str]
     
     return deps
 
-def extract_blockers(sentence: str) -> str:
+def extract_blockers(sentence: str, hits: Optional[LoweredText] = None) -> str:
     """Extract blocker information from sentence"""
-    sentence_lower = sentence.lower()
+    hits = hits or heuristic_keywords.lower(sentence)
     
-    blocker_keywords = ['blocked by', 'waiting for', 'pending', 'stuck on', 'need approval']
-    for keyword in blocker_keywords:
-        if keyword in sentence_lower:
-            # Extract text after keyword
-            idx = sentence_lower.index(keyword)
-            blocker_text = sentence[idx:idx+100]
-            return blocker_text
+    found = hits.first_of("blocker")
+    if found:
+        # Extract text after keyword
+        idx = found[1]
+        blocker_text = sentence[idx:idx+100]
+        return blocker_text
     
     return None
 
-def infer_priority(sentence: str) -> int:
+def infer_priority(sentence: str, hits: Optional[LoweredText] = None) -> int:
     """Infer priority from sentence urgency"""
-    sentence_lower = sentence.lower()
-    
-    high_urgency = ['urgent', 'critical', 'asap', 'immediately', 'emergency']
-    medium_urgency = ['important', 'soon', 'priority', 'should']
+    hits = hits or heuristic_keywords.lower(sentence)
     
-    if any(word in sentence_lower for word in high_urgency):
+    if hits.has("high_urgency"):
         return 9
-    if any(word in sentence_lower for word in medium_urgency):
+    if hits.has("medium_urgency"):
         return 7
     
     return 5
 
-def calculate_confidence(sentence: str) -> float:
+def calculate_confidence(sentence: str, hits: Optional[LoweredText] = None) -> float:
     """Calculate confidence score for extraction"""
+    hits = hits or heuristic_keywords.lower(sentence)
     score = 0.5
     
     # Higher confidence if clear action words
-    if any(word in sentence.lower() for word in ['will', 'must', 'need to']):
+    if hits.has("strong_action"):
         score += 0.2
     
     # Higher confidence if owner mentioned
-    if any(word in sentence.lower() for word in ['i will', 'john', 'sarah', 'dev', 'qa']):
+    if hits.has("owner"):
         score += 0.15
     
     # Higher confidence if deadline mentioned
-    if any(word in sentence.lower() for word in ['by', 'today', 'tomorrow', 'friday', 'next week']):
+    if hits.has("deadline"):
         score += 0.15
     
     return min(score, 0.95)
@@ -4,11 +4,12 @@ from sqlalchemy.orm import Session
 from sqlalchemy import func
 from datetime import datetime, timedelta
 from ..database import get_db
-from ..models import Task, AgentSuggestion, User
+from ..caching import workspace_etag
+from ..models import Task, AgentSuggestion, User, ACTIVE_TASK
 
 router = APIRouter(prefix="/briefing", tags=["briefing"])
 
-@router.get("/daily")
+@router.get("/daily", dependencies=[Depends(workspace_etag(clock=True))])
 def get_daily_briefing(workspace_id: int, user_id: int = None, db: Session = Depends(get_db)):
     """AI-generated daily briefing with priorities and risks"""
     today = datetime.utcnow()
@@ -17,7 +18,7 @@ def get_daily_briefing(workspace_id: int, user_id: int = None, db: Session = Dep
     overdue = db.query(Task).filter(
         Task.workspace_id == workspace_id,
         Task.due_date < today,
-        Task.status.in_(["todo", "in_progress"])
+        ACTIVE_TASK
     ).all()
     
     # Blocked tasks
@@ -32,7 +33,7 @@ def get_daily_briefing(workspace_id: int, user_id: int = None, db: Session = Dep
         Task.priority >= 8,
         Task.progress < 50,
         Task.due_date.between(today, today + timedelta(days=3)),
-        Task.status.in_(["todo", "in_progress"])
+        ACTIVE_TASK
     ).all()
     
     # Pending reviews (submitted tasks)
@@ -62,7 +63,7 @@ def get_daily_briefing(workspace_id: int, user_id: int = None, db: Session = Dep
         my_tasks_today = db.query(Task).filter(
             Task.workspace_id == workspace_id,
             Task.assignee_id == user_id,
-            Task.status.in_(["todo", "in_progress"]),
+            ACTIVE_TASK,
             Task.priority >= 7
         ).order_by(Task.priority.desc()).limit(5).all()
     
@@ -4,7 +4,8 @@ from sqlalchemy.orm import Session
 from sqlalchemy import func, and_
 from datetime import datetime, timedelta
 from ..database import get_db
-from ..models import Task, User, Sprint, Meeting, AgentSuggestion
+from ..models import Task, User, Sprint, Meeting, AgentSuggestion, ACTIVE_TASK
+from ..services.search_service import find_task
 from typing import Dict, Any
 import re
 
@@ -57,7 +58,7 @@ def handle_overdue_query(workspace_id: int, db: Session) -> Dict[str, Any]:
     overdue = db.query(Task).filter(
         Task.workspace_id == workspace_id,
         Task.due_date < datetime.utcnow(),
-        Task.status.in_(["todo", "in_progress"])
+        ACTIVE_TASK
     ).all()
     
     if not overdue:
@@ -165,7 +166,7 @@ def handle_workload_query(workspace_id: int, db: Session) -> Dict[str, Any]:
         func.sum(Task.story_points).label('points')
     ).join(Task, Task.assignee_id == User.id).filter(
         Task.workspace_id == workspace_id,
-        Task.status.in_(["todo", "in_progress"])
+        ACTIVE_TASK
     ).group_by(User.display_name).all()
     
     if not workloads:
@@ -235,7 +236,7 @@ def handle_assignment_query(question: str, workspace_id: int, db: Session) -> Di
     tasks = db.query(Task).filter(
         Task.workspace_id == workspace_id,
         Task.assignee_id == target_user.id,
-        Task.status.in_(["todo", "in_progress"])
+        ACTIVE_TASK
     ).all()
     
     response = f"{target_user.display_name} has {len(tasks)} active tasks. "
@@ -270,7 +271,7 @@ def handle_deadline_query(question: str, workspace_id: int, db: Session) -> Dict
         Task.workspace_id == workspace_id,
         Task.due_date.isnot(None),
         Task.due_date <= end_date,
-        Task.status.in_(["todo", "in_progress"])
+        ACTIVE_TASK
     ).order_by(Task.due_date).all()
     
     response = f"{len(tasks)} tasks due {timeframe}. "
@@ -321,15 +322,8 @@ def handle_count_query(question: str, workspace_id: int, db: Session) -> Dict[st
 
 def handle_status_query(question: str, workspace_id: int, db: Session) -> Dict[str, Any]:
     """Handle status queries"""
-    # Extract task title from question
-    tasks = db.query(Task).filter(Task.workspace_id == workspace_id).all()
-    
-    # Simple matching
-    best_match = None
-    for task in tasks:
-        if task.title.lower() in question.lower():
-            best_match = task
-            break
+    # Resolve the task the question names through the title index
+    best_match = find_task(db, workspace_id, question)
     
     if not best_match:
         return {
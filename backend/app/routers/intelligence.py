@@ -4,9 +4,10 @@ from sqlalchemy.orm import Session
 from sqlalchemy import func
 from datetime import datetime, timedelta
 from ..database import get_db
-from ..models import Task, User, AgentSuggestion, Audit, Meeting
-from ..services.agent_service import create_suggestion
-from typing import List, Dict
+from ..models import Task, User, AgentSuggestion, Audit, Meeting, ACTIVE_TASK
+from ..services.agent_service import create_suggestions
+from ..ai.keywords import heuristic_keywords, LoweredText
+from typing import List, Dict, Optional
 import re
 
 router = APIRouter(prefix="/intelligence", tags=["intelligence"])
@@ -124,23 +125,18 @@ def optimize_task_assignments(workspace_id: int, db: Session = Depends(get_db)):
         Task.status == "todo"
     ).all()
     
-    suggestions_created = []
+    assignments = []
     for task in unassigned:
         best_match = find_best_assignee(task, expertise)
         if best_match:
-            suggestion = create_suggestion(
-                db, workspace_id, "optimize_assignment",
-                {
-                    "task_id": task.id,
-                    "suggested_assignee": best_match["user_id"],
-                    "reason": best_match["reason"],
-                    "confidence_factors": best_match["factors"]
-                },
-                best_match["confidence"]
-            )
-            suggestions_created.append(suggestion.id)
-    
-    db.commit()
+            assignments.append(("optimize_assignment", {
+                "task_id": task.id,
+                "suggested_assignee": best_match["user_id"],
+                "reason": best_match["reason"],
+                "confidence_factors": best_match["factors"]
+            }, best_match["confidence"]))
+    
+    suggestions_created = create_suggestions(db, workspace_id, assignments)
     return {
         "optimized_assignments": len(suggestions_created),
         "suggestion_ids": suggestions_created,
@@ -214,12 +210,12 @@ def detect_workflow_anomalies(workspace_id: int, db: Session = Depends(get_db)):
     high_priority_count = db.query(func.count(Task.id)).filter(
         Task.workspace_id == workspace_id,
         Task.priority >= 8,
-        Task.status.in_(["todo", "in_progress"])
+        ACTIVE_TASK
     ).scalar()
     
     total_active = db.query(func.count(Task.id)).filter(
         Task.workspace_id == workspace_id,
-        Task.status.in_(["todo", "in_progress"])
+        ACTIVE_TASK
     ).scalar()
     
     if total_active > 0 and (high_priority_count / total_active) > 0.5:
@@ -244,12 +240,13 @@ def extract_meeting_insights(meeting_id: int, db: Session = Depends(get_db)):
         return {"error": "Meeting not found"}
     
     text = meeting.transcript_text.lower()
+    hits = heuristic_keywords.lower(text)
     
     insights = {
-        "sentiment": analyze_sentiment(text),
+        "sentiment": analyze_sentiment(text, hits),
         "key_topics": extract_topics(text),
         "decision_points": extract_decisions(text),
-        "action_density": calculate_action_density(text),
+        "action_density": calculate_action_density(text, hits),
         "participation_balance": "balanced"  # Simplified
     }
     
@@ -301,12 +298,11 @@ def calculate_health_score(anomalies: List[Dict]) -> int:
     deductions = sum([severity_weights.get(a["severity"], 10) for a in anomalies])
     return max(0, 100 - deductions)
 
-def analyze_sentiment(text: str) -> str:
-    positive_words = ["great", "excellent", "good", "progress", "completed", "success"]
-    negative_words = ["blocked", "issue", "problem", "delayed", "concern", "risk"]
+def analyze_sentiment(text: str, hits: Optional[LoweredText] = None) -> str:
+    hits = hits or heuristic_keywords.lower(text)
     
-    pos_count = sum([text.count(word) for word in positive_words])
-    neg_count = sum([text.count(word) for word in negative_words])
+    pos_count = hits.count("positive")
+    neg_count = hits.count("negative")
     
     if pos_count > neg_count * 1.5:
         return "positive"
@@ -338,9 +334,9 @@ def extract_decisions(text: str) -> List[str]:
         decisions.extend(matches[:3])
     return decisions
 
-def calculate_action_density(text: str) -> str:
-    action_words = ["will", "should", "need to", "must", "going to"]
-    count = sum([text.count(word) for word in action_words])
+def calculate_action_density(text: str, hits: Optional[LoweredText] = None) -> str:
+    hits = hits or heuristic_keywords.lower(text)
+    count = hits.count("density_action")
     words = len(text.split())
     density = (count / words * 100) if words > 0 else 0
     
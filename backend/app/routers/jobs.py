@@ -0,0 +1,76 @@
+"""Jobs router: status of background jobs, by polling or server-sent events"""
+import asyncio
+import json
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import StreamingResponse
+from sqlalchemy.orm import Session
+from typing import Optional
+from ..database import get_db, SessionLocal
+from ..models import Job
+from ..jobs.queue import job_to_dict, queue_stats, list_jobs, TERMINAL_STATUSES
+from ..jobs.worker import worker_pool
+
+router = APIRouter(prefix="/jobs", tags=["jobs"])
+
+# How often the event stream re-reads the job row
+EVENTS_POLL_SECONDS = 0.5
+
+def _sse(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+@router.get("/")
+def get_jobs(workspace_id: int, status: Optional[str] = None, limit: int = Query(50, ge=1, le=500), db: Session = Depends(get_db)):
+    """Most recent jobs for a workspace"""
+    return [job_to_dict(job) for job in list_jobs(db, workspace_id, status, limit)]
+
+@router.get("/stats")
+def get_job_stats(workspace_id: Optional[int] = None, db: Session = Depends(get_db)):
+    """Job counts by status, plus this process's worker pool"""
+    return {"jobs": queue_stats(db, workspace_id), "pool": worker_pool.stats()}
+
+@router.get("/{job_id}")
+def get_job(job_id: int, db: Session = Depends(get_db)):
+    """Job status, with the result once it has succeeded"""
+    job = db.query(Job).filter(Job.id == job_id).first()
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job_to_dict(job)
+
+@router.get("/{job_id}/events")
+async def job_events(job_id: int, timeout: float = Query(300, gt=0, le=3600)):
+    """Push a status event whenever the job changes, then done with the final state"""
+    db = SessionLocal()
+    try:
+        exists = db.query(Job.id).filter(Job.id == job_id).first()
+    finally:
+        db.close()
+    if not exists:
+        raise HTTPException(status_code=404, detail="Job not found")
+
+    async def events():
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        last = None
+        while True:
+            db = SessionLocal()
+            try:
+                job = job_to_dict(db.query(Job).filter(Job.id == job_id).first())
+            finally:
+                db.close()
+            state = (job["status"], job["attempts"])
+            if job["status"] in TERMINAL_STATUSES:
+                yield _sse("done", job)
+                return
+            if state != last:
+                yield _sse("status", {key: job[key] for key in ("job_id", "status", "attempts", "error")})
+                last = state
+            if loop.time() >= deadline:
+                yield _sse("timeout", {"job_id": job_id, "status": job["status"]})
+                return
+            await asyncio.sleep(EVENTS_POLL_SECONDS)
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
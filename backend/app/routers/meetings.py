@@ -1,23 +1,35 @@
 """Meetings router for processing transcripts"""
-from fastapi import APIRouter, Depends, BackgroundTasks
+import json
+from fastapi import APIRouter, Depends, BackgroundTasks, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
+from starlette.requests import ClientDisconnect
 from sqlalchemy.orm import Session
 from typing import List
 from ..database import get_db
 from ..models import Meeting
-from ..schemas import ProcessMeetingRequest, TaskCandidate
-from ..ai.gemini_client import generate_tasks_from_transcript, detect_dependencies
-from ..services.agent_service import create_suggestion
+from ..schemas import ProcessMeetingRequest, TaskCandidate, UpdateTranscriptRequest
+from ..services.meeting_service import edit_transcript, latest_transcript, stream_meeting, MeetingBusy
+from ..services.import_service import ImportWriter, import_ndjson, import_files, get_import, list_imports
+from ..jobs.queue import enqueue
+from ..jobs.worker import worker_pool
 
 router = APIRouter(prefix="/meetings", tags=["meetings"])
 
-@router.post("/process")
+def _sse(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+@router.post("/process", status_code=202)
 def process_meeting(
     request: ProcessMeetingRequest,
     background_tasks: BackgroundTasks,
     db: Session = Depends(get_db)
 ):
-    """Process meeting transcript and extract tasks"""
-    # Store meeting
+    """Store a meeting and queue its transcript for extraction.
+    
+    Returns a job id right away. Poll GET /jobs/{job_id}, or subscribe to
+    GET /jobs/{job_id}/events; the finished job's result holds the candidates,
+    dependencies, summary and the suggestions created.
+    """
     meeting = Meeting(
         workspace_id=request.workspace_id,
         title=request.title,
@@ -29,37 +41,144 @@ def process_meeting(
     db.commit()
     db.refresh(meeting)
     
-    # Extract tasks using Gemini
-    candidates = generate_tasks_from_transcript(request.transcript)
+    job = enqueue(db, "process_meeting", {"meeting_id": meeting.id}, request.workspace_id)
+    background_tasks.add_task(worker_pool.wake)
+    return {"job_id": job.id, "meeting_id": meeting.id, "status": job.status}
+
+@router.post("/process/stream")
+def process_meeting_stream(request: ProcessMeetingRequest, db: Session = Depends(get_db)):
+    """Process a transcript and push each task candidate over SSE as soon as it is extracted.
+
+    The meeting's analysis and fingerprint are stored when the stream ends,
+    as they are for /process.
+    """
+    meeting = Meeting(
+        workspace_id=request.workspace_id,
+        title=request.title,
+        meeting_date=request.meeting_date,
+        transcript_text=request.transcript,
+        created_by=1  # Demo user
+    )
+    db.add(meeting)
+    db.commit()
+    db.refresh(meeting)
+    meeting_id = meeting.id
     
-    # Store as agent suggestions
-    for candidate in candidates:
-        create_suggestion(
-            db,
-            request.workspace_id,
-            "create_task",
-            {
-                "title": candidate["description"][:100],
-                "description": candidate["description"],
-                "assignee": candidate.get("assignee"),
-                "priority": candidate.get("priority"),
-                "effort_tag": candidate.get("effort_tag"),
-                "is_blocked": candidate.get("is_blocked"),
-                "blocker_reason": candidate.get("blocker_reason")
-            },
-            candidate["confidence"]
-        )
+    async def events():
+        yield _sse("meeting", {"meeting_id": meeting_id})
+        count = 0
+        async for event in stream_meeting(db, meeting_id):
+            count += 1
+            yield _sse("candidate", event)
+        yield _sse("done", {"meeting_id": meeting_id, "count": count})
     
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+@router.post("/import", status_code=202)
+async def import_meetings(
+    workspace_id: int,
+    request: Request,
+    background_tasks: BackgroundTasks,
+    db: Session = Depends(get_db)
+):
+    """Bulk import transcripts, stored as they are read, and queue their extraction.
+    
+    The body is either NDJSON, one {"title", "meeting_date", "transcript"}
+    object per line, or a multipart form with one or more `files`. Uploaded
+    .ndjson/.jsonl files are read the same way; any other file is a single
+    transcript titled after its file name and dated by the optional
+    `meeting_date` form field. Invalid records are skipped and reported.
+    
+    Track extraction with GET /meetings/imports/{import_id}.
+    """
+    writer = ImportWriter(db, workspace_id)
+    try:
+        if request.headers.get("content-type", "").startswith("multipart/form-data"):
+            form = await request.form()
+            try:
+                await import_files(writer, form.getlist("files"), form.get("meeting_date"))
+            finally:
+                await form.close()
+        else:
+            await import_ndjson(writer, request.stream())
+    except ClientDisconnect:
+        writer.fail("Upload interrupted")
+        raise HTTPException(status_code=400, detail="Upload interrupted")
+    except BaseException as e:
+        # A failed or cancelled request must not leave the import receiving
+        writer.fail(f"Import failed: {type(e).__name__}")
+        raise
+    
+    job = writer.finish()
+    if job:
+        background_tasks.add_task(worker_pool.wake)
     return {
-        "meeting_id": meeting.id,
-        "candidates": candidates,
-        "count": len(candidates)
+        "import_id": writer.import_id,
+        "job_id": job.id if job else None,
+        "received": writer.received,
+        "stored": writer.stored,
+        "rejected": writer.rejected,
+        "errors": writer.errors
     }
 
+@router.get("/imports")
+def get_imports(workspace_id: int, limit: int = Query(20, ge=1, le=200), db: Session = Depends(get_db)):
+    """Most recent bulk imports for a workspace"""
+    return list_imports(db, workspace_id, limit)
+
+@router.get("/imports/{import_id}")
+def get_import_progress(import_id: int, db: Session = Depends(get_db)):
+    """Progress of a bulk import: records stored and rejected, meetings extracted, failed and pending"""
+    summary = get_import(db, import_id)
+    if not summary:
+        raise HTTPException(status_code=404, detail="Import not found")
+    return summary
+
+# Columns of the meeting list; transcripts and analysis are fetched per meeting
+MEETING_LIST_COLUMNS = (
+    Meeting.id, Meeting.workspace_id, Meeting.title, Meeting.meeting_date, Meeting.summary,
+    Meeting.transcript_size, Meeting.created_by, Meeting.created_at, Meeting.duplicate_of_id, Meeting.import_id
+)
+
 @router.get("/")
 def list_meetings(workspace_id: int, db: Session = Depends(get_db)):
-    """List all meetings for a workspace"""
-    meetings = db.query(Meeting).filter(
+    """List all meetings for a workspace, without transcripts (see GET /meetings/{id}/transcript)"""
+    rows = db.query(*MEETING_LIST_COLUMNS).filter(
         Meeting.workspace_id == workspace_id
     ).order_by(Meeting.meeting_date.desc()).all()
-    return meetings
+    return [row._asdict() for row in rows]
+
+@router.get("/{meeting_id}/transcript")
+def get_transcript(meeting_id: int, db: Session = Depends(get_db)):
+    """Full transcript of one meeting, including an edit that is still being re-extracted"""
+    transcript = latest_transcript(db, meeting_id)
+    if transcript is None:
+        raise HTTPException(status_code=404, detail="Meeting not found")
+    return {"meeting_id": meeting_id, "transcript": transcript}
+
+@router.put("/{meeting_id}/transcript", status_code=202)
+def update_transcript(
+    meeting_id: int,
+    request: UpdateTranscriptRequest,
+    background_tasks: BackgroundTasks,
+    db: Session = Depends(get_db)
+):
+    """Replace a meeting's transcript and queue re-extraction of the turns that changed.
+    
+    The finished job's result lists the suggestions added, updated in place
+    and retracted. job_id is null when the text did not change turn by turn.
+    409 while the meeting's previous extraction is still queued or running.
+    """
+    try:
+        result = edit_transcript(db, meeting_id, request.transcript)
+    except LookupError:
+        raise HTTPException(status_code=404, detail="Meeting not found")
+    except MeetingBusy as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    if result["job_id"]:
+        background_tasks.add_task(worker_pool.wake)
+    return result
@@ -0,0 +1,26 @@
+"""Search router: full-text search over tasks and meeting transcripts"""
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.orm import Session
+from typing import Literal
+from ..database import get_db
+from ..services.search_service import search_tasks, search_meetings
+
+router = APIRouter(prefix="/search", tags=["search"])
+
+@router.get("/")
+def search(
+    workspace_id: int,
+    q: str = Query(..., min_length=1),
+    type: Literal["all", "tasks", "meetings"] = "all",
+    limit: int = Query(20, ge=1, le=100),
+    db: Session = Depends(get_db)
+):
+    """Tasks and meetings matching every word of q (the last one as a prefix), best first.
+    
+    Each hit carries a snippet of the matching passage with terms wrapped in <b>.
+    """
+    return {
+        "query": q,
+        "tasks": search_tasks(db, workspace_id, q, limit) if type in ("all", "tasks") else [],
+        "meetings": search_meetings(db, workspace_id, q, limit) if type in ("all", "meetings") else []
+    }
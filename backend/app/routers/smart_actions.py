@@ -4,8 +4,8 @@ from sqlalchemy.orm import Session
 from sqlalchemy import func
 from datetime import datetime, timedelta
 from ..database import get_db
-from ..models import Task, User, AgentSuggestion
-from ..services.agent_service import create_suggestion
+from ..models import Task, User, AgentSuggestion, ACTIVE_TASK
+from ..services.agent_service import create_suggestions
 
 router = APIRouter(prefix="/smart", tags=["smart"])
 
@@ -13,12 +13,12 @@ router = APIRouter(prefix="/smart", tags=["smart"])
 def detect_risks(workspace_id: int, db: Session = Depends(get_db)):
     """Auto-detect at-risk tasks and create suggestions"""
     today = datetime.utcnow()
-    suggestions_created = []
+    risks = []
     
     # Find tasks at risk
     tasks = db.query(Task).filter(
         Task.workspace_id == workspace_id,
-        Task.status.in_(["todo", "in_progress"]),
+        ACTIVE_TASK,
         Task.is_potential_risk == False
     ).all()
     
@@ -50,14 +50,10 @@ def detect_risks(workspace_id: int, db: Session = Depends(get_db)):
             task.is_potential_risk = True
             task.risk_reason = risk_reason
             
-            suggestion = create_suggestion(
-                db, workspace_id, "flag_risk",
-                {"task_id": task.id, "reason": risk_reason, "action": "escalate_or_split"},
-                0.82
-            )
-            suggestions_created.append(suggestion.id)
+            risks.append(("flag_risk", {"task_id": task.id, "reason": risk_reason, "action": "escalate_or_split"}, 0.82))
     
-    db.commit()
+    # Suggestions go in with the risk flags, in one transaction
+    suggestions_created = create_suggestions(db, workspace_id, risks)
     return {"risks_detected": len(suggestions_created), "suggestion_ids": suggestions_created}
 
 @router.post("/suggest-rebalance")
@@ -70,11 +66,11 @@ def suggest_rebalance(workspace_id: int, db: Session = Depends(get_db)):
         func.sum(Task.story_points).label('total_points')
     ).filter(
         Task.workspace_id == workspace_id,
-        Task.status.in_(["todo", "in_progress"]),
+        ACTIVE_TASK,
         Task.assignee_id.isnot(None)
     ).group_by(Task.assignee_id).all()
     
-    suggestions_created = []
+    rebalances = []
     
     for user_id, task_count, total_points in user_loads:
         if task_count > 5 or (total_points and total_points > 20):
@@ -87,19 +83,14 @@ def suggest_rebalance(workspace_id: int, db: Session = Depends(get_db)):
             ).order_by(Task.priority).limit(2).all()
             
             for task in tasks:
-                suggestion = create_suggestion(
-                    db, workspace_id, "rebalance_task",
-                    {
-                        "task_id": task.id,
-                        "current_assignee": user_id,
-                        "reason": f"User has {task_count} tasks ({total_points} points)",
-                        "action": "reassign_to_available_member"
-                    },
-                    0.75
-                )
-                suggestions_created.append(suggestion.id)
+                rebalances.append(("rebalance_task", {
+                    "task_id": task.id,
+                    "current_assignee": user_id,
+                    "reason": f"User has {task_count} tasks ({total_points} points)",
+                    "action": "reassign_to_available_member"
+                }, 0.75))
     
-    db.commit()
+    suggestions_created = create_suggestions(db, workspace_id, rebalances)
     return {"rebalance_suggestions": len(suggestions_created), "suggestion_ids": suggestions_created}
 
 @router.post("/find-dependencies")
@@ -107,10 +98,10 @@ def find_dependencies(workspace_id: int, db: Session = Depends(get_db)):
     """Auto-detect task dependencies based on titles and descriptions"""
     tasks = db.query(Task).filter(
         Task.workspace_id == workspace_id,
-        Task.status.in_(["todo", "in_progress"])
+        ACTIVE_TASK
     ).all()
     
-    suggestions_created = []
+    detected = []
     keywords = ["after", "depends on", "requires", "needs", "blocked by", "waiting for"]
     
     for task in tasks:
@@ -119,20 +110,15 @@ def find_dependencies(workspace_id: int, db: Session = Depends(get_db)):
         # Simple keyword detection
         for keyword in keywords:
             if keyword in text:
-                suggestion = create_suggestion(
-                    db, workspace_id, "add_dependency",
-                    {
-                        "task_id": task.id,
-                        "detected_keyword": keyword,
-                        "suggestion": "Review task description to identify dependency",
-                        "action": "manual_review_recommended"
-                    },
-                    0.65
-                )
-                suggestions_created.append(suggestion.id)
+                detected.append(("add_dependency", {
+                    "task_id": task.id,
+                    "detected_keyword": keyword,
+                    "suggestion": "Review task description to identify dependency",
+                    "action": "manual_review_recommended"
+                }, 0.65))
                 break
     
-    db.commit()
+    suggestions_created = create_suggestions(db, workspace_id, detected)
     return {"dependencies_detected": len(suggestions_created), "suggestion_ids": suggestions_created}
 
 @router.get("/quick-wins")
@@ -168,7 +154,7 @@ def get_quick_wins(workspace_id: int, user_id: int = None, db: Session = Depends
 def auto_prioritize(workspace_id: int, db: Session = Depends(get_db)):
     """Auto-suggest priority adjustments based on deadlines and dependencies"""
     today = datetime.utcnow()
-    suggestions_created = []
+    priorities = []
     
     # Find tasks with no priority set
     tasks = db.query(Task).filter(
@@ -195,12 +181,7 @@ def auto_prioritize(workspace_id: int, db: Session = Depends(get_db)):
             suggested_priority = min(10, suggested_priority + 2)
         
         if suggested_priority >= 6:
-            suggestion = create_suggestion(
-                db, workspace_id, "set_priority",
-                {"task_id": task.id, "suggested_priority": suggested_priority},
-                0.80
-            )
-            suggestions_created.append(suggestion.id)
+            priorities.append(("set_priority", {"task_id": task.id, "suggested_priority": suggested_priority}, 0.80))
     
-    db.commit()
+    suggestions_created = create_suggestions(db, workspace_id, priorities)
     return {"priorities_suggested": len(suggestions_created), "suggestion_ids": suggestions_created}
@@ -1,8 +1,11 @@
 """Sprints router"""
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Query, Response
 from sqlalchemy.orm import Session
+from typing import Optional
 from ..database import get_db
 from ..models import Sprint, Task
+from ..config import TASK_PAGE_SIZE, TASK_MAX_PAGE_SIZE
+from .tasks import task_page
 
 router = APIRouter(prefix="/sprints", tags=["sprints"])
 
@@ -15,7 +18,13 @@ def list_sprints(workspace_id: int, db: Session = Depends(get_db)):
     return sprints
 
 @router.get("/{sprint_id}/tasks")
-def get_sprint_tasks(sprint_id: int, db: Session = Depends(get_db)):
-    """Get tasks in a sprint"""
-    tasks = db.query(Task).filter(Task.sprint_id == sprint_id).all()
-    return tasks
+def get_sprint_tasks(
+    sprint_id: int,
+    response: Response,
+    fields: Optional[str] = None,
+    limit: int = Query(TASK_PAGE_SIZE, ge=1, le=TASK_MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    db: Session = Depends(get_db)
+):
+    """Get tasks in a sprint, a page at a time (see GET /tasks/)"""
+    return task_page(response, db, [Task.sprint_id == sprint_id], fields, limit, cursor)
@@ -1,15 +1,35 @@
 """Tasks router for task management"""
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
 from ..database import get_db
+from ..caching import workspace_etag
 from ..models import Task, AgentSuggestion
-from ..schemas import TaskResponse, TaskUpdate, CaptureRequest
-from ..services.task_service import create_task_from_candidate, get_review_queue, capture_quick_task
+from ..schemas import TaskResponse, TaskUpdate, BulkTaskUpdate, CaptureRequest
+from ..services.task_service import create_task_from_candidate, get_review_queue, capture_quick_task, score_backlog, list_task_page, bulk_update_tasks
 from ..services.agent_service import apply_suggestion
+from ..services.similarity_service import similar_tasks, index_task
+from ..config import TASK_PAGE_SIZE, TASK_MAX_PAGE_SIZE
 
 router = APIRouter(prefix="/tasks", tags=["tasks"])
 
+def task_page(
+    response: Response,
+    db: Session,
+    filters: list,
+    fields: Optional[str],
+    limit: int,
+    cursor: Optional[str]
+) -> List[dict]:
+    """A page of tasks, newest first; the next page's cursor goes in the X-Next-Cursor header"""
+    try:
+        tasks, next_cursor = list_task_page(db, filters, fields, limit, cursor)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    return tasks
+
 @router.get("/review")
 def get_review_tasks(workspace_id: int, db: Session = Depends(get_db)):
     """Get tasks in review queue (unapplied suggestions)"""
@@ -36,19 +56,72 @@ def approve_task(task_id: int, db: Session = Depends(get_db)):
     
     return {"success": True, "message": "Task created"}
 
+@router.post("/rice-score")
+async def score_workspace_backlog(workspace_id: int, status: Optional[List[str]] = Query(None), db: Session = Depends(get_db)):
+    """RICE-score the workspace backlog (todo tasks by default) in batched LLM calls"""
+    results = await score_backlog(db, workspace_id, status)
+    return {"workspace_id": workspace_id, "scored": len(results), "tasks": results}
+
+@router.get("/similar")
+def get_similar_tasks(workspace_id: int, text: str, k: int = Query(5, ge=1, le=50), db: Session = Depends(get_db)):
+    """Existing tasks and pending suggestions most similar to text, best first"""
+    return similar_tasks(db, workspace_id, text, k)
+
 @router.get("/my")
-def get_my_tasks(user_id: int, db: Session = Depends(get_db)):
-    """Get tasks assigned to user"""
-    tasks = db.query(Task).filter(Task.assignee_id == user_id).all()
-    return tasks
+def get_my_tasks(
+    user_id: int,
+    response: Response,
+    fields: Optional[str] = None,
+    limit: int = Query(TASK_PAGE_SIZE, ge=1, le=TASK_MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    db: Session = Depends(get_db)
+):
+    """Get tasks assigned to user, a page at a time (see list_tasks)"""
+    return task_page(response, db, [Task.assignee_id == user_id], fields, limit, cursor)
+
+@router.get("/blockers")
+def get_blocked_tasks(
+    workspace_id: int,
+    response: Response,
+    fields: Optional[str] = None,
+    limit: int = Query(TASK_PAGE_SIZE, ge=1, le=TASK_MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    db: Session = Depends(get_db)
+):
+    """Get blocked tasks, a page at a time (see list_tasks)"""
+    return task_page(response, db, [Task.workspace_id == workspace_id, Task.is_blocked == True], fields, limit, cursor)
 
-@router.get("/")
-def list_tasks(workspace_id: int, status: str = None, db: Session = Depends(get_db)):
-    """List all tasks with optional status filter"""
-    query = db.query(Task).filter(Task.workspace_id == workspace_id)
+@router.get("/", dependencies=[Depends(workspace_etag())])
+def list_tasks(
+    workspace_id: int,
+    response: Response,
+    status: str = None,
+    fields: Optional[str] = None,
+    limit: int = Query(TASK_PAGE_SIZE, ge=1, le=TASK_MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    db: Session = Depends(get_db)
+):
+    """List tasks with optional status filter, newest first, a page at a time.
+    
+    fields is a comma-separated list of columns to return (default: all).
+    When more tasks follow, the X-Next-Cursor response header holds the
+    cursor to pass for the next page.
+    """
+    filters = [Task.workspace_id == workspace_id]
     if status:
-        query = query.filter(Task.status == status)
-    return query.order_by(Task.created_at.desc()).all()
+        filters.append(Task.status == status)
+    return task_page(response, db, filters, fields, limit, cursor)
+
+@router.patch("/bulk")
+def bulk_update(request: BulkTaskUpdate, db: Session = Depends(get_db)):
+    """Update many tasks in one transaction, with a result per item.
+    
+    mode=atomic (default) applies nothing if any item fails; mode=continue
+    applies every item that can be applied. Items name the task by id and
+    carry the same fields as PATCH /tasks/{task_id}.
+    """
+    updates = [(item.id, item.model_dump(exclude_unset=True, exclude={"id"})) for item in request.updates]
+    return bulk_update_tasks(db, updates, atomic=request.mode == "atomic", workspace_id=request.workspace_id)
 
 @router.get("/{task_id}")
 def get_task(task_id: int, db: Session = Depends(get_db)):
@@ -68,6 +141,8 @@ def update_task(task_id: int, update: TaskUpdate, db: Session = Depends(get_db))
     update_data = update.model_dump(exclude_unset=True)
     for field, value in update_data.items():
         setattr(task, field, value)
+    if "title" in update_data or "description" in update_data:
+        index_task(db, task)
     
     db.commit()
     db.refresh(task)
@@ -94,12 +169,3 @@ def capture_task(request: CaptureRequest, db: Session = Depends(get_db)):
     """Quick capture a task"""
     task = capture_quick_task(db, request.workspace_id, request.text, user_id=1)
     return task
-
-@router.get("/blockers")
-def get_blocked_tasks(workspace_id: int, db: Session = Depends(get_db)):
-    """Get all blocked tasks"""
-    tasks = db.query(Task).filter(
-        Task.workspace_id == workspace_id,
-        Task.is_blocked == True
-    ).all()
-    return tasks
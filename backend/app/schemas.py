@@ -1,5 +1,5 @@
-from pydantic import BaseModel
-from typing import Optional, List
+from pydantic import BaseModel, Field
+from typing import Optional, List, Literal
 from datetime import datetime
 from .models import TaskStatus, EffortTag, AgentMode
 
@@ -22,6 +22,15 @@ class ProcessMeetingRequest(BaseModel):
     meeting_date: datetime
     transcript: str
 
+class UpdateTranscriptRequest(BaseModel):
+    transcript: str
+
+class ImportedMeeting(BaseModel):
+    """One record of a bulk import; the workspace comes from the import"""
+    title: str
+    meeting_date: datetime
+    transcript: str
+
 class TaskCandidate(BaseModel):
     assignee: Optional[str]
     description: str
@@ -62,6 +71,15 @@ class TaskUpdate(BaseModel):
     blocker_reason: Optional[str] = None
     priority: Optional[int] = None
 
+class BulkTaskUpdateItem(TaskUpdate):
+    id: int
+
+class BulkTaskUpdate(BaseModel):
+    updates: List[BulkTaskUpdateItem] = Field(..., min_length=1, max_length=500)
+    # atomic: any failed item rolls back the whole batch; continue: apply every item that can be applied
+    mode: Literal["atomic", "continue"] = "atomic"
+    workspace_id: Optional[int] = None
+
 class CaptureRequest(BaseModel):
     workspace_id: int
     text: str
@@ -1,10 +1,14 @@
 """Agent service for Nova suggestions and auto-actions"""
 import logging
+from functools import partial
 from sqlalchemy.orm import Session
 from datetime import datetime
-from typing import List, Dict, Any
-from ..models import AgentSuggestion, Task, Workspace, Audit, AgentMode
+from sqlalchemy import insert
+from typing import List, Dict, Any, Iterable, Tuple
+from ..database import after_commit
+from ..models import AgentSuggestion, Task, Workspace, Audit, AgentMode, ACTIVE_TASK
 from ..config import AGENT_AUTO_CONFIDENCE
+from ..ai.similarity import task_indexes
 
 logger = logging.getLogger(__name__)
 
@@ -28,6 +32,68 @@ def create_suggestion(
     db.refresh(suggestion)
     return suggestion
 
+def create_suggestions(
+    db: Session,
+    workspace_id: int,
+    suggestions: Iterable[Tuple[str, Dict[str, Any], float]],
+    commit: bool = True
+) -> List[int]:
+    """Insert many (suggestion_type, payload, confidence) suggestions at once and return their ids, in order.
+
+    Uses one multi-row INSERT ... RETURNING and a single commit, instead of
+    one commit (and fsync) per row. Pass commit=False to add the rows to the
+    caller's transaction, together with the other changes it makes.
+    """
+    now = datetime.utcnow()
+    rows = [
+        {
+            "workspace_id": workspace_id,
+            "suggestion_type": suggestion_type,
+            "payload": payload,
+            "confidence": confidence,
+            "applied": False,
+            "created_at": now
+        }
+        for suggestion_type, payload, confidence in suggestions
+    ]
+    if not rows:
+        return []
+    ids = list(db.scalars(insert(AgentSuggestion).returning(AgentSuggestion.id, sort_by_parameter_order=True), rows))
+    if commit:
+        db.commit()
+    return ids
+
+def retract_suggestions(
+    db: Session,
+    suggestion_ids: Iterable[int],
+    reason: str,
+    commit: bool = True
+) -> List[int]:
+    """Withdraw pending suggestions whose source went away. Returns the ids that were still pending.
+
+    Retracted suggestions leave the review queue like rejected ones, with an
+    audit entry recording why, but no user as actor.
+    """
+    suggestions = db.query(AgentSuggestion).filter(
+        AgentSuggestion.id.in_(list(suggestion_ids)),
+        AgentSuggestion.applied == False
+    ).all()
+    for suggestion in suggestions:
+        suggestion.applied = True
+        after_commit(db, partial(task_indexes.forget, suggestion.workspace_id, ("suggestion", suggestion.id)))
+        db.add(Audit(
+            workspace_id=suggestion.workspace_id,
+            actor_id=None,
+            action_type="agent_suggestion_retracted",
+            target_type="suggestion",
+            target_id=suggestion.id,
+            before={"suggestion_type": suggestion.suggestion_type},
+            after={"retracted": True, "reason": reason}
+        ))
+    if commit:
+        db.commit()
+    return [suggestion.id for suggestion in suggestions]
+
 def reject_suggestion(
     db: Session,
     suggestion_id: int,
@@ -39,6 +105,7 @@ def reject_suggestion(
         return False
     
     suggestion.applied = True  # Mark as processed
+    after_commit(db, partial(task_indexes.forget, suggestion.workspace_id, ("suggestion", suggestion.id)))
     audit = Audit(
         workspace_id=suggestion.workspace_id,
         actor_id=actor_id,
@@ -140,6 +207,7 @@ def apply_suggestion(
     
     if success:
         suggestion.applied = True
+        after_commit(db, partial(task_indexes.forget, suggestion.workspace_id, ("suggestion", suggestion.id)))
         
         # Create audit log
         audit = Audit(
@@ -170,7 +238,7 @@ def run_suggestion_engine(db: Session, workspace_id: int) -> List[AgentSuggestio
     tasks_without_focus = db.query(Task).filter(
         Task.workspace_id == workspace_id,
         Task.suggested_focus_time.is_(None),
-        Task.status.in_(["todo", "in_progress"])
+        ACTIVE_TASK
     ).limit(5).all()
     
     for task in tasks_without_focus:
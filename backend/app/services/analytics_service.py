@@ -3,7 +3,7 @@ from sqlalchemy.orm import Session
 from sqlalchemy import func
 from datetime import datetime, timedelta
 from typing import List, Dict, Any
-from ..models import Task, Sprint, TaskStatus
+from ..models import Task, Sprint, TaskStatus, ACTIVE_TASK
 
 def get_briefing(db: Session, workspace_id: int, days: int = 7) -> Dict[str, Any]:
     """Generate executive briefing"""
@@ -13,14 +13,14 @@ def get_briefing(db: Session, workspace_id: int, days: int = 7) -> Dict[str, Any
     blockers = db.query(Task).filter(
         Task.workspace_id == workspace_id,
         Task.is_blocked == True,
-        Task.status.in_([TaskStatus.todo, TaskStatus.in_progress])
+        ACTIVE_TASK
     ).all()
     
     # Overdue tasks
     overdue = db.query(Task).filter(
         Task.workspace_id == workspace_id,
         Task.due_date < datetime.utcnow(),
-        Task.status.in_([TaskStatus.todo, TaskStatus.in_progress])
+        ACTIVE_TASK
     ).all()
     
     # Risky chains (tasks with dependencies that are blocked)
@@ -0,0 +1,323 @@
+"""Import service: bulk transcript import from streamed NDJSON or uploaded files
+
+Records are read as they arrive and stored IMPORT_BATCH_SIZE meetings per
+INSERT and commit, so an upload of any size holds at most one batch (and one
+record) in memory. Extraction then runs as a single process_import job that
+works through the import's meetings IMPORT_CONCURRENCY at a time. A large
+backfill therefore occupies one worker and a bounded share of the LLM instead
+of flooding the queue ahead of other workspaces' meetings.
+"""
+import asyncio
+import json
+import logging
+from datetime import datetime
+from pydantic import ValidationError
+from sqlalchemy import insert
+from sqlalchemy.orm import Session, sessionmaker
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+from ..models import Meeting, MeetingImport, Job, index_meetings
+from ..schemas import ImportedMeeting
+from ..config import IMPORT_BATCH_SIZE, IMPORT_CONCURRENCY, IMPORT_MAX_RECORD_BYTES, IMPORT_MAX_ERRORS
+from ..jobs.queue import enqueue
+from .meeting_service import process_meeting
+
+logger = logging.getLogger(__name__)
+
+async def iter_lines(
+    chunks: AsyncIterator[bytes],
+    max_bytes: int = IMPORT_MAX_RECORD_BYTES
+) -> AsyncIterator[Tuple[int, Optional[bytes]]]:
+    """(line number, line) for each non-blank line of a byte stream.
+
+    A line longer than max_bytes is dropped as it streams in and reported as
+    (line number, None), so one bad record cannot make the import buffer the
+    rest of the upload.
+    """
+    buffer = bytearray()
+    number = 0
+    oversized = False
+    async for chunk in chunks:
+        start = 0
+        while True:
+            end = chunk.find(b"\n", start)
+            if end < 0:
+                if not oversized:
+                    buffer += chunk[start:]
+                    if len(buffer) > max_bytes:
+                        oversized = True
+                        buffer.clear()
+                break
+            number += 1
+            if oversized:
+                yield number, None
+            else:
+                buffer += chunk[start:end]
+                if len(buffer) > max_bytes:
+                    yield number, None
+                elif buffer.strip():
+                    yield number, bytes(buffer)
+            buffer.clear()
+            oversized = False
+            start = end + 1
+    if oversized or buffer.strip():
+        number += 1
+        yield number, None if oversized else bytes(buffer)
+
+def _validation_message(error: ValidationError) -> str:
+    return "; ".join(f"{'.'.join(str(part) for part in e['loc'])}: {e['msg']}" for e in error.errors())
+
+class ImportWriter:
+    """Stores validated records of one import in batches, one INSERT and commit per batch"""
+
+    def __init__(self, db: Session, workspace_id: int, batch_size: int = IMPORT_BATCH_SIZE):
+        self.db = db
+        self.batch_size = batch_size
+        self.meeting_import = MeetingImport(workspace_id=workspace_id, status="receiving", errors=[])
+        db.add(self.meeting_import)
+        db.commit()
+        self.import_id = self.meeting_import.id
+        self.workspace_id = workspace_id
+        self.received = 0
+        self.stored = 0
+        self.rejected = 0
+        self.errors: List[Dict[str, Any]] = []
+        self._rows: List[Dict[str, Any]] = []
+
+    def add_record(self, data: Any, **where) -> None:
+        """Validate one parsed record and queue it for the next batch"""
+        self.received += 1
+        try:
+            record = ImportedMeeting.model_validate(data)
+        except ValidationError as e:
+            self._reject(_validation_message(e), where)
+            return
+        self.add(record.title, record.meeting_date, record.transcript)
+
+    def add_line(self, raw: Optional[bytes], **where) -> None:
+        """Parse one NDJSON line; None is a line that was too long to keep"""
+        if raw is None:
+            self.received += 1
+            self._reject(f"Record exceeds {IMPORT_MAX_RECORD_BYTES} bytes", where)
+            return
+        try:
+            data = json.loads(raw)
+        except ValueError as e:
+            self.received += 1
+            self._reject(f"Invalid JSON: {e}", where)
+            return
+        self.add_record(data, **where)
+
+    def add(self, title: str, meeting_date: datetime, transcript: str) -> None:
+        self._rows.append({
+            "workspace_id": self.workspace_id,
+            "title": title,
+            "meeting_date": meeting_date,
+            "transcript_text": transcript,
+            "transcript_size": len(transcript),
+            "created_by": 1,  # Demo user
+            "import_id": self.import_id
+        })
+
+    def reject(self, error: str, **where) -> None:
+        """Count a record that could not even be read"""
+        self.received += 1
+        self._reject(error, where)
+
+    def _reject(self, error: str, where: Dict[str, Any]) -> None:
+        self.rejected += 1
+        if len(self.errors) < IMPORT_MAX_ERRORS:
+            self.errors.append({**where, "error": error})
+
+    @property
+    def batch_full(self) -> bool:
+        return len(self._rows) >= self.batch_size
+
+    def flush(self) -> None:
+        """Insert the pending batch and publish the counts so far"""
+        if self._rows:
+            ids = self.db.scalars(insert(Meeting).returning(Meeting.id, sort_by_parameter_order=True), self._rows).all()
+            # Core inserts skip the mapper events that keep the search index current
+            index_meetings(self.db.connection(), [
+                (id, row["title"], row["transcript_text"]) for id, row in zip(ids, self._rows)
+            ])
+            self.stored += len(self._rows)
+            self._rows = []
+        self.db.query(MeetingImport).filter(MeetingImport.id == self.import_id).update({
+            MeetingImport.received: self.received,
+            MeetingImport.stored: self.stored,
+            MeetingImport.rejected: self.rejected,
+            MeetingImport.errors: self.errors
+        }, synchronize_session=False)
+        self.db.commit()
+
+    def finish(self) -> Optional[Job]:
+        """Flush the last batch and queue extraction of everything stored"""
+        self.flush()
+        meeting_import = self.db.query(MeetingImport).filter(MeetingImport.id == self.import_id).first()
+        job = None
+        if self.stored:
+            job = enqueue(self.db, "process_import", {"import_id": self.import_id}, self.workspace_id)
+            meeting_import.job_id = job.id
+            meeting_import.status = "queued"
+        else:
+            meeting_import.status = "completed"
+            meeting_import.finished_at = datetime.utcnow()
+        self.db.commit()
+        return job
+
+    def fail(self, error: str) -> None:
+        """Mark an import whose upload broke off. Batches already stored are kept, but not processed."""
+        self.db.rollback()
+        self._rows = []
+        self._reject(error, {})
+        self.flush()
+        self.db.query(MeetingImport).filter(MeetingImport.id == self.import_id).update({
+            MeetingImport.status: "failed",
+            MeetingImport.finished_at: datetime.utcnow()
+        }, synchronize_session=False)
+        self.db.commit()
+
+async def import_ndjson(writer: ImportWriter, chunks: AsyncIterator[bytes], **where) -> None:
+    """Store every line of an NDJSON byte stream, a batch at a time"""
+    async for number, line in iter_lines(chunks):
+        writer.add_line(line, **where, line=number)
+        if writer.batch_full:
+            writer.flush()
+
+async def _upload_chunks(upload, chunk_size: int = 64 * 1024) -> AsyncIterator[bytes]:
+    while True:
+        chunk = await upload.read(chunk_size)
+        if not chunk:
+            return
+        yield chunk
+
+async def import_files(writer: ImportWriter, uploads: List[Any], meeting_date: Optional[str] = None) -> None:
+    """Store uploaded files: .ndjson/.jsonl line by line, anything else as one transcript.
+
+    A transcript file is titled after its name without the extension and
+    dated meeting_date, or now when that is not given.
+    """
+    for upload in uploads:
+        name = upload.filename or "transcript"
+        if name.lower().endswith((".ndjson", ".jsonl")):
+            await import_ndjson(writer, _upload_chunks(upload), file=name)
+            continue
+        content = await upload.read(IMPORT_MAX_RECORD_BYTES + 1)
+        if len(content) > IMPORT_MAX_RECORD_BYTES:
+            writer.reject(f"Record exceeds {IMPORT_MAX_RECORD_BYTES} bytes", file=name)
+            continue
+        try:
+            transcript = content.decode("utf-8")
+        except UnicodeDecodeError:
+            writer.reject("Transcript is not UTF-8 text", file=name)
+            continue
+        writer.add_record({
+            "title": name.rsplit(".", 1)[0] if "." in name else name,
+            "meeting_date": meeting_date or datetime.utcnow(),
+            "transcript": transcript
+        }, file=name)
+        if writer.batch_full:
+            writer.flush()
+
+def import_to_dict(meeting_import: MeetingImport, job: Optional[Job] = None) -> Dict[str, Any]:
+    """Progress and result summary of an import"""
+    finished = meeting_import.finished_at or datetime.utcnow()
+    elapsed = (finished - meeting_import.started_at).total_seconds() if meeting_import.started_at else None
+    done = meeting_import.processed + meeting_import.failed
+    rate = done / elapsed if elapsed else None
+    pending = meeting_import.stored - done
+    return {
+        "import_id": meeting_import.id,
+        "workspace_id": meeting_import.workspace_id,
+        "status": meeting_import.status,
+        "received": meeting_import.received,
+        "stored": meeting_import.stored,
+        "rejected": meeting_import.rejected,
+        "processed": meeting_import.processed,
+        "failed": meeting_import.failed,
+        "pending": pending,
+        "progress": round(done / meeting_import.stored, 3) if meeting_import.stored else 1.0,
+        "suggestions_created": meeting_import.suggestions_created,
+        "meetings_per_second": round(rate, 3) if rate else None,
+        "eta_seconds": round(pending / rate, 1) if rate and meeting_import.status == "processing" else None,
+        "errors": meeting_import.errors or [],
+        "job": {"job_id": job.id, "status": job.status, "attempts": job.attempts, "error": job.error} if job else None,
+        "created_at": meeting_import.created_at.isoformat() if meeting_import.created_at else None,
+        "started_at": meeting_import.started_at.isoformat() if meeting_import.started_at else None,
+        "finished_at": meeting_import.finished_at.isoformat() if meeting_import.finished_at else None
+    }
+
+def get_import(db: Session, import_id: int) -> Optional[Dict[str, Any]]:
+    meeting_import = db.query(MeetingImport).filter(MeetingImport.id == import_id).first()
+    if not meeting_import:
+        return None
+    job = db.query(Job).filter(Job.id == meeting_import.job_id).first() if meeting_import.job_id else None
+    return import_to_dict(meeting_import, job)
+
+def list_imports(db: Session, workspace_id: int, limit: int = 20) -> List[Dict[str, Any]]:
+    imports = db.query(MeetingImport).filter(
+        MeetingImport.workspace_id == workspace_id
+    ).order_by(MeetingImport.id.desc()).limit(limit).all()
+    return [import_to_dict(meeting_import) for meeting_import in imports]
+
+def _record_outcome(db: Session, import_id: int, meeting_id: int, result: Optional[Dict[str, Any]], error: Optional[str]) -> None:
+    if result is not None:
+        db.query(MeetingImport).filter(MeetingImport.id == import_id).update({
+            MeetingImport.processed: MeetingImport.processed + 1,
+            MeetingImport.suggestions_created: MeetingImport.suggestions_created + result["suggestions_created"]
+        }, synchronize_session=False)
+    else:
+        meeting_import = db.query(MeetingImport).filter(MeetingImport.id == import_id).first()
+        meeting_import.failed += 1
+        if len(meeting_import.errors or []) < IMPORT_MAX_ERRORS:
+            meeting_import.errors = (meeting_import.errors or []) + [{"meeting_id": meeting_id, "error": error}]
+    db.commit()
+
+async def run_import(db: Session, import_id: int, concurrency: int = IMPORT_CONCURRENCY) -> Dict[str, Any]:
+    """Extract every meeting of an import that has no analysis yet, concurrency at a time.
+
+    A meeting that fails is counted and reported in the import's errors; the
+    rest carry on. Run again after an interruption, it picks up the meetings
+    still without analysis, including the ones that failed.
+    """
+    meeting_import = db.query(MeetingImport).filter(MeetingImport.id == import_id).first()
+    if not meeting_import:
+        raise LookupError(f"Import {import_id} not found")
+    pending = [
+        meeting_id for (meeting_id,) in db.query(Meeting.id).filter(
+            Meeting.import_id == import_id,
+            Meeting.analysis.is_(None)
+        ).order_by(Meeting.id)
+    ]
+    meeting_import.status = "processing"
+    meeting_import.started_at = meeting_import.started_at or datetime.utcnow()
+    meeting_import.processed = meeting_import.stored - len(pending)
+    meeting_import.failed = 0
+    meeting_import.errors = [error for error in meeting_import.errors or [] if "meeting_id" not in error]
+    db.commit()
+
+    # Each meeting gets its own session: the concurrent extractions interleave at every await
+    sessions = sessionmaker(autocommit=False, autoflush=False, bind=db.get_bind())
+    remaining = iter(pending)
+
+    async def work() -> None:
+        for meeting_id in remaining:
+            session = sessions()
+            result, error = None, None
+            try:
+                result = await process_meeting(session, meeting_id)
+            except Exception as e:
+                logger.warning(f"Import {import_id}: meeting {meeting_id} failed: {e}")
+                session.rollback()
+                error = f"{type(e).__name__}: {e}"
+            finally:
+                session.close()
+            _record_outcome(db, import_id, meeting_id, result, error)
+
+    await asyncio.gather(*(work() for _ in range(max(min(concurrency, len(pending)), 1))))
+
+    meeting_import = db.query(MeetingImport).filter(MeetingImport.id == import_id).first()
+    meeting_import.status = "completed"
+    meeting_import.finished_at = datetime.utcnow()
+    db.commit()
+    return import_to_dict(meeting_import)
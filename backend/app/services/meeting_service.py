@@ -0,0 +1,502 @@
+"""Meeting service: extraction, near-duplicate transcript detection, and incremental re-extraction of edits"""
+import asyncio
+import difflib
+import logging
+from collections import Counter
+from datetime import datetime, timedelta
+from sqlalchemy.orm import Session
+from sqlalchemy.orm.attributes import flag_modified
+from typing import AsyncIterator, List, Dict, Any, Optional, Tuple
+from ..database import run_in_thread
+from ..models import Meeting, MeetingLSHBucket, MeetingImport, Job
+from ..config import MEETING_DUPLICATE_THRESHOLD, MEETING_DEDUP_ENABLED, IMPORT_RECEIVE_LEASE_SECONDS
+from ..ai.minhash import minhash_signature, band_keys, estimated_similarity
+from ..ai.compaction import compact_transcript
+from ..ai.chunking import split_speaker_turns, is_duplicate_candidate
+from ..ai.similarity import tokenize
+from ..ai.gemini_client import (
+    generate_tasks_from_transcript_async,
+    analyze_meeting_async,
+    stream_tasks_from_transcript,
+    detect_dependencies_async,
+    summarize_meeting_async
+)
+from ..jobs.queue import enqueue
+from .similarity_service import create_task_suggestions, create_task_suggestion, update_task_suggestion
+from .agent_service import retract_suggestions
+
+logger = logging.getLogger(__name__)
+
+# Candidates verified against their stored signature per lookup, most shared bands first
+MAX_CANDIDATES_CHECKED = 10
+# Jaccard overlap at which a candidate from an edited turn is the same action item reworded
+EDIT_MATCH_THRESHOLD = 0.5
+
+class MeetingBusy(Exception):
+    """The meeting's extraction is still queued or running"""
+
+def transcript_fingerprint(transcript: str) -> Optional[List[int]]:
+    """MinHash signature of the compacted transcript, so timestamps and filler do not count"""
+    return minhash_signature(compact_transcript(transcript))
+
+def find_near_duplicate(
+    db: Session,
+    workspace_id: int,
+    signature: List[int],
+    threshold: float = MEETING_DUPLICATE_THRESHOLD
+) -> Optional[Tuple[Meeting, float]]:
+    """Most similar earlier meeting in the workspace that has reusable analysis, if above threshold"""
+    keys = band_keys(signature)
+    rows = db.query(MeetingLSHBucket.meeting_id, MeetingLSHBucket.band, MeetingLSHBucket.bucket).filter(
+        MeetingLSHBucket.workspace_id == workspace_id,
+        MeetingLSHBucket.bucket.in_(keys)
+    ).all()
+    shared_bands = Counter(row.meeting_id for row in rows if keys[row.band] == row.bucket)
+    if not shared_bands:
+        return None
+
+    candidate_ids = [meeting_id for meeting_id, _ in shared_bands.most_common(MAX_CANDIDATES_CHECKED)]
+    candidates = db.query(Meeting).filter(Meeting.id.in_(candidate_ids), Meeting.analysis.isnot(None)).all()
+    best = None
+    for meeting in candidates:
+        similarity = estimated_similarity(signature, meeting.minhash)
+        if similarity >= threshold and (best is None or similarity > best[1]):
+            best = (meeting, similarity)
+    return best
+
+def index_meeting(db: Session, meeting: Meeting, signature: List[int]) -> None:
+    """Store a meeting's signature and LSH buckets. The caller commits."""
+    meeting.minhash = signature
+    for band, bucket in enumerate(band_keys(signature)):
+        db.add(MeetingLSHBucket(
+            workspace_id=meeting.workspace_id,
+            band=band,
+            bucket=bucket,
+            meeting_id=meeting.id
+        ))
+
+def _normalize_turn(turn: str) -> str:
+    return " ".join(turn.split())
+
+def diff_turns(previous_transcript: str, transcript: str) -> Tuple[List[str], List[str]]:
+    """(removed, added) speaker turns between two versions of a transcript. An edited turn is in both."""
+    before = [_normalize_turn(turn) for turn in split_speaker_turns(compact_transcript(previous_transcript))]
+    after = [_normalize_turn(turn) for turn in split_speaker_turns(compact_transcript(transcript))]
+    removed: List[str] = []
+    added: List[str] = []
+    for tag, i1, i2, j1, j2 in difflib.SequenceMatcher(None, before, after, autojunk=False).get_opcodes():
+        if tag != "equal":
+            removed.extend(before[i1:i2])
+            added.extend(after[j1:j2])
+    return removed, added
+
+def source_turn(candidate: Dict[str, Any], turns: List[str]) -> Optional[int]:
+    """Index of the turn sharing the most words with a candidate's description, None if no turn shares any"""
+    words = set(tokenize(candidate["description"]))
+    best, best_overlap = None, 0
+    for i, turn in enumerate(turns):
+        overlap = len(words & set(tokenize(turn)))
+        if overlap > best_overlap:
+            best, best_overlap = i, overlap
+    return best
+
+def added_turns(previous_transcript: str, transcript: str) -> List[str]:
+    """Speaker turns in transcript that do not appear in the previous version"""
+    seen = {" ".join(turn.split()) for turn in split_speaker_turns(compact_transcript(previous_transcript))}
+    return [
+        turn for turn in split_speaker_turns(compact_transcript(transcript))
+        if " ".join(turn.split()) not in seen
+    ]
+
+async def reuse_analysis(
+    previous: Meeting,
+    transcript: str,
+    workspace_id: int
+) -> Tuple[Dict[str, Any], List[Dict[str, Any]]]:
+    """Analysis for a near-duplicate of an earlier meeting, plus the candidates that are new.
+
+    Only speaker turns added since the earlier upload go to the LLM. Candidates
+    extracted from them that repeat an earlier one are dropped. Dependencies
+    and summary are carried over unchanged.
+    """
+    analysis = dict(previous.analysis)
+    new_turns = await run_in_thread(added_turns, previous.transcript_text, transcript)
+    if not new_turns:
+        return analysis, []
+
+    logger.info(f"Meeting {previous.id} repeated with {len(new_turns)} new turns, extracting those only")
+    extracted = await generate_tasks_from_transcript_async("\n".join(new_turns), workspace_id)
+    fresh = [
+        candidate for candidate in extracted
+        if not any(is_duplicate_candidate(candidate, existing) for existing in analysis["candidates"])
+    ]
+    analysis["candidates"] = analysis["candidates"] + fresh
+    return analysis, fresh
+
+def candidate_payload(candidate: dict) -> dict:
+    """create_task suggestion payload for an extracted candidate"""
+    return {
+        "title": candidate["description"][:100],
+        "description": candidate["description"],
+        "assignee": candidate.get("assignee"),
+        "priority": candidate.get("priority"),
+        "effort_tag": candidate.get("effort_tag"),
+        "is_blocked": candidate.get("is_blocked"),
+        "blocker_reason": candidate.get("blocker_reason")
+    }
+
+def _load_meeting(db: Session, meeting_id: int) -> Tuple[Meeting, str]:
+    """A meeting and its (deferred) transcript. Raises LookupError for an unknown meeting."""
+    meeting = db.query(Meeting).filter(Meeting.id == meeting_id).first()
+    if not meeting:
+        raise LookupError(f"Meeting {meeting_id} not found")
+    return meeting, meeting.transcript_text
+
+def _lookup_duplicate(db: Session, meeting: Meeting) -> Tuple[Optional[List[int]], Optional[Tuple[Meeting, float]]]:
+    """(fingerprint, near-duplicate) for a meeting about to be extracted, ending the transaction.
+
+    The transaction ends so the pooled connection is not held while waiting
+    on the model.
+    """
+    signature = transcript_fingerprint(meeting.transcript_text) if MEETING_DEDUP_ENABLED else None
+    duplicate = find_near_duplicate(db, meeting.workspace_id, signature) if signature else None
+    if duplicate:
+        meeting.duplicate_of_id = duplicate[0].id
+        # Load the deferred transcript, then detach so its fields stay readable after the commit
+        duplicate[0].transcript_text
+        db.expunge(duplicate[0])
+    db.commit()
+    return signature, duplicate
+
+def _store_analysis(db: Session, meeting: Meeting, analysis: Dict[str, Any], signature: Optional[List[int]]) -> None:
+    """Save a meeting's analysis and summary and index its fingerprint for near-duplicate lookups"""
+    meeting.summary = analysis["summary"]
+    meeting.analysis = analysis
+    if signature:
+        index_meeting(db, meeting, signature)
+    db.commit()
+
+def _suggest_pending(
+    db: Session,
+    meeting: Meeting,
+    analysis: Dict[str, Any],
+    new_candidates: List[Dict[str, Any]]
+) -> Tuple[Dict[str, Any], List[Dict[str, Any]]]:
+    """Create the suggestions for new_candidates and clear "pending", in one transaction"""
+    # Skips candidates that duplicate existing work
+    results = create_task_suggestions(
+        db,
+        meeting.workspace_id,
+        [(candidate_payload(candidate), candidate["confidence"]) for candidate in new_candidates],
+        commit=False
+    )
+    # Remember which suggestion each candidate created, so an edit of the transcript can revise it
+    for candidate, result in zip(new_candidates, results):
+        if result["suggestion_id"]:
+            candidate["suggestion_id"] = result["suggestion_id"]
+    if "pending" in analysis:
+        analysis = {key: value for key, value in analysis.items() if key != "pending"}
+        meeting.analysis = analysis
+        flag_modified(meeting, "analysis")
+    db.commit()
+    return analysis, results
+
+async def process_meeting(db: Session, meeting_id: int) -> Dict[str, Any]:
+    """Extract tasks, dependencies and summary for a stored meeting and create suggestions.
+
+    A near-duplicate of an earlier meeting in the workspace reuses that
+    meeting's results. Only newly added speaker turns are extracted, and
+    suggestions are created just for candidates that are new. Candidates that
+    duplicate an existing task or pending suggestion are reported under
+    duplicates instead (see TASK_DEDUP_MODE).
+
+    Safe to run again after a failed attempt. The analysis is stored before
+    any suggestion is created, together with the positions of the candidates
+    that still need one ("pending"). A retry reuses the analysis and creates
+    suggestions for those candidates only, so candidates carried over from an
+    earlier meeting are never suggested again. The suggestions and the
+    cleared "pending" list are committed together.
+
+    Database, fingerprint and similarity work runs in a worker thread (see
+    run_in_thread), so the event loop keeps serving requests meanwhile.
+    """
+    meeting, transcript = await run_in_thread(_load_meeting, db, meeting_id)
+    duplicate = None
+    duplicate_of = meeting.duplicate_of_id
+    if meeting.analysis is not None:
+        analysis = meeting.analysis
+        # No "pending" list means an earlier run finished
+        new_candidates = [analysis["candidates"][i] for i in analysis.get("pending", [])]
+    else:
+        workspace_id = meeting.workspace_id
+        signature, duplicate = await run_in_thread(_lookup_duplicate, db, meeting)
+        if duplicate:
+            duplicate_of = duplicate[0].id
+            analysis, new_candidates = await reuse_analysis(duplicate[0], transcript, workspace_id)
+        else:
+            # Extract tasks, dependencies and summary concurrently using Gemini
+            analysis = await analyze_meeting_async(transcript, workspace_id)
+            new_candidates = analysis["candidates"]
+        first_new = len(analysis["candidates"]) - len(new_candidates)
+        analysis = {**analysis, "pending": list(range(first_new, len(analysis["candidates"])))}
+        await run_in_thread(_store_analysis, db, meeting, analysis, signature)
+
+    analysis, results = await run_in_thread(_suggest_pending, db, meeting, analysis, new_candidates)
+    suggestions_created = sum(1 for result in results if result["suggestion_id"])
+    duplicates = [
+        {"description": candidate["description"], "matches": result["duplicate"]}
+        for candidate, result in zip(new_candidates, results) if result["duplicate"]
+    ]
+
+    return {
+        "meeting_id": meeting_id,
+        "candidates": analysis["candidates"],
+        "count": len(analysis["candidates"]),
+        "suggestions_created": suggestions_created,
+        "duplicates": duplicates,
+        "dependencies": analysis["dependencies"],
+        "summary": analysis["summary"],
+        "duplicate_of": duplicate_of,
+        "similarity": round(duplicate[1], 3) if duplicate else None
+    }
+
+async def stream_meeting(db: Session, meeting_id: int) -> AsyncIterator[Dict[str, Any]]:
+    """process_meeting for a live client: yields {"candidate", "suggestion_id", "duplicate"} as each is ready.
+
+    Candidates stream from the model and each becomes a suggestion right
+    away. Dependencies and the summary are extracted after the last one, and
+    the analysis and fingerprint are then stored as process_meeting stores
+    them, so the meeting takes part in near-duplicate detection and edits of
+    it are re-extracted incrementally. A near-duplicate of an earlier meeting
+    reuses that meeting's analysis, and only its new candidates are yielded.
+    If the client goes away mid-stream, the suggestions made so far are kept
+    but no analysis is stored.
+    """
+    meeting, transcript = await run_in_thread(_load_meeting, db, meeting_id)
+    workspace_id = meeting.workspace_id
+    signature, duplicate = await run_in_thread(_lookup_duplicate, db, meeting)
+
+    if duplicate:
+        analysis, fresh = await reuse_analysis(duplicate[0], transcript, workspace_id)
+        first_new = len(analysis["candidates"]) - len(fresh)
+        analysis = {**analysis, "pending": list(range(first_new, len(analysis["candidates"])))}
+        await run_in_thread(_store_analysis, db, meeting, analysis, signature)
+        analysis, results = await run_in_thread(_suggest_pending, db, meeting, analysis, fresh)
+        for candidate, result in zip(fresh, results):
+            yield {"candidate": candidate, **result}
+        return
+
+    candidates: List[Dict[str, Any]] = []
+    async for candidate in stream_tasks_from_transcript(transcript, workspace_id):
+        result = await run_in_thread(create_task_suggestion, db, workspace_id, candidate_payload(candidate), candidate["confidence"])
+        if result["suggestion_id"]:
+            candidate["suggestion_id"] = result["suggestion_id"]
+        candidates.append(candidate)
+        yield {"candidate": candidate, **result}
+
+    dependencies, summary = await asyncio.gather(
+        detect_dependencies_async(transcript, workspace_id),
+        summarize_meeting_async(transcript, workspace_id)
+    )
+    analysis = {"candidates": candidates, "dependencies": dependencies["dependencies"], "summary": summary}
+    await run_in_thread(_store_analysis, db, meeting, analysis, signature)
+
+def unfinished_extraction(db: Session, meeting: Meeting) -> bool:
+    """True while a queued or running job will still write the meeting's analysis.
+
+    An import that is still receiving holds its meetings for
+    IMPORT_RECEIVE_LEASE_SECONDS after it last stored a batch; past that its
+    upload is taken to have died without being marked failed.
+    """
+    if meeting.import_id is not None and meeting.analysis is None:
+        status, updated_at = db.query(MeetingImport.status, MeetingImport.updated_at).filter(
+            MeetingImport.id == meeting.import_id
+        ).one_or_none() or (None, None)
+        if status == "receiving":
+            if updated_at and updated_at > datetime.utcnow() - timedelta(seconds=IMPORT_RECEIVE_LEASE_SECONDS):
+                return True
+        elif status in ("queued", "processing"):
+            return True
+    return _unfinished_job(db, meeting.workspace_id, meeting.id, ["process_meeting", "update_transcript"]) is not None
+
+def _unfinished_job(db: Session, workspace_id: int, meeting_id: int, kinds: List[str]) -> Optional[Job]:
+    """The latest queued or running job of one of kinds for a meeting"""
+    return db.query(Job).filter(
+        Job.kind.in_(kinds),
+        Job.status.in_(["queued", "running"]),
+        Job.workspace_id == workspace_id,
+        Job.payload["meeting_id"].as_integer() == meeting_id
+    ).order_by(Job.id.desc()).first()
+
+def latest_transcript(db: Session, meeting_id: int) -> Optional[str]:
+    """A meeting's transcript including an edit still being re-extracted, None for an unknown meeting"""
+    meeting = db.query(Meeting.workspace_id, Meeting.transcript_text).filter(Meeting.id == meeting_id).first()
+    if not meeting:
+        return None
+    job = _unfinished_job(db, meeting.workspace_id, meeting_id, ["update_transcript"])
+    return job.payload["transcript"] if job else meeting.transcript_text
+
+def edit_transcript(db: Session, meeting_id: int, transcript: str) -> Dict[str, Any]:
+    """Queue a new version of a meeting's transcript for re-extraction of what changed.
+
+    The job re-extracts only the speaker turns that changed and reconciles
+    the meeting's suggestions (see reextract_meeting). The stored transcript
+    is replaced by the job, together with the suggestions, so after a failed
+    job it is still the version the suggestions were made from and the next
+    edit is diffed against that. A meeting that was never extracted gets the
+    new transcript at once and is queued for full extraction instead. Raises
+    LookupError for an unknown meeting and MeetingBusy while an earlier
+    extraction of it has not finished.
+    """
+    meeting = db.query(Meeting).filter(Meeting.id == meeting_id).first()
+    if not meeting:
+        raise LookupError(f"Meeting {meeting_id} not found")
+    if unfinished_extraction(db, meeting):
+        raise MeetingBusy(f"Meeting {meeting_id} is still being extracted")
+
+    removed, added = diff_turns(meeting.transcript_text, transcript)
+    if not removed and not added:
+        return {"meeting_id": meeting_id, "job_id": None, "turns_removed": 0, "turns_added": 0}
+    if meeting.analysis is None:
+        meeting.transcript_text = transcript
+        job = enqueue(db, "process_meeting", {"meeting_id": meeting_id}, meeting.workspace_id)
+    else:
+        job = enqueue(db, "update_transcript", {"meeting_id": meeting_id, "transcript": transcript}, meeting.workspace_id)
+    return {"meeting_id": meeting_id, "job_id": job.id, "turns_removed": len(removed), "turns_added": len(added)}
+
+def _replace_transcript(db: Session, meeting: Meeting, transcript: str) -> None:
+    meeting.transcript_text = transcript
+    db.commit()
+
+def _trace_edit(
+    db: Session,
+    meeting: Meeting,
+    previous: str,
+    transcript: str
+) -> Tuple[List[str], List[str], List[Dict[str, Any]], List[Dict[str, Any]], List[Dict[str, Any]], Optional[List[int]]]:
+    """(removed, added, affected, kept, unsuggested, fingerprint) for an edit of a meeting's transcript, ending the transaction.
+
+    unsuggested are the kept candidates still listed in "pending", which a
+    failed extraction left without a suggestion.
+    """
+    removed, added = diff_turns(previous, transcript)
+    # The stored version's turns, the ones the edit keeps first
+    before = Counter(_normalize_turn(turn) for turn in split_speaker_turns(compact_transcript(previous)))
+    unchanged = list((before - Counter(removed)).elements())
+    previous_turns = unchanged + removed
+    pending = set(meeting.analysis.get("pending", []))
+    affected: List[Dict[str, Any]] = []
+    kept: List[Dict[str, Any]] = []
+    unsuggested: List[Dict[str, Any]] = []
+    for position, candidate in enumerate(meeting.analysis["candidates"]):
+        turn = source_turn(candidate, previous_turns)
+        if turn is not None and turn >= len(unchanged):
+            affected.append(candidate)
+            continue
+        kept.append(candidate)
+        if position in pending:
+            unsuggested.append(candidate)
+    signature = transcript_fingerprint(transcript) if MEETING_DEDUP_ENABLED else None
+    # End the transaction so the pooled connection is not held while waiting on the model
+    db.commit()
+    return removed, added, affected, kept, unsuggested, signature
+
+def _apply_edit(
+    db: Session,
+    meeting: Meeting,
+    transcript: str,
+    extracted: List[Dict[str, Any]],
+    affected: List[Dict[str, Any]],
+    kept: List[Dict[str, Any]],
+    unsuggested: List[Dict[str, Any]],
+    signature: Optional[List[int]]
+) -> Dict[str, Any]:
+    """Reconcile the meeting's suggestions with the candidates extracted from an edit and store it, in one transaction"""
+    meeting_id, workspace_id = meeting.id, meeting.workspace_id
+    updated: List[Dict[str, Any]] = []
+    fresh: List[Dict[str, Any]] = []
+    unmatched = list(affected)
+    for candidate in extracted:
+        if any(is_duplicate_candidate(candidate, other) for other in kept + updated):
+            continue
+        match = next((old for old in unmatched if is_duplicate_candidate(candidate, old, EDIT_MATCH_THRESHOLD)), None)
+        if match is not None and match.get("suggestion_id") and update_task_suggestion(
+            db, match["suggestion_id"], candidate_payload(candidate), candidate["confidence"]
+        ):
+            unmatched.remove(match)
+            updated.append({**candidate, "suggestion_id": match["suggestion_id"]})
+        else:
+            if match is not None:
+                unmatched.remove(match)
+            fresh.append(candidate)
+
+    retracted = retract_suggestions(
+        db,
+        [old["suggestion_id"] for old in unmatched if old.get("suggestion_id")],
+        reason=f"Source removed from meeting {meeting_id} transcript",
+        commit=False
+    )
+    # Kept candidates a failed extraction never suggested get theirs now, with the new ones
+    suggest = unsuggested + fresh
+    results = create_task_suggestions(
+        db,
+        workspace_id,
+        [(candidate_payload(candidate), candidate["confidence"]) for candidate in suggest],
+        commit=False
+    )
+    for candidate, result in zip(suggest, results):
+        if result["suggestion_id"]:
+            candidate["suggestion_id"] = result["suggestion_id"]
+
+    # Positions in "pending" would point into the old candidate list, and nothing is left pending
+    analysis = {key: value for key, value in meeting.analysis.items() if key != "pending"}
+    analysis["candidates"] = kept + updated + fresh
+    meeting.transcript_text = transcript
+    meeting.analysis = analysis
+    if signature:
+        db.query(MeetingLSHBucket).filter(MeetingLSHBucket.meeting_id == meeting_id).delete(synchronize_session=False)
+        index_meeting(db, meeting, signature)
+    db.commit()
+
+    return {
+        "added": [result["suggestion_id"] for result in results if result["suggestion_id"]],
+        "updated": [candidate["suggestion_id"] for candidate in updated],
+        "retracted": retracted,
+        "duplicates": [
+            {"description": candidate["description"], "matches": result["duplicate"]}
+            for candidate, result in zip(suggest, results) if result["duplicate"]
+        ],
+        "candidates": analysis["candidates"],
+        "count": len(analysis["candidates"])
+    }
+
+async def reextract_meeting(db: Session, meeting_id: int, transcript: str) -> Dict[str, Any]:
+    """Store a new transcript, re-extract the turns it changed and reconcile the meeting's suggestions with the result.
+
+    Each earlier candidate is traced to the turn of the stored transcript it
+    shares the most words with. Candidates whose turn was removed or edited
+    are the affected ones; the others are kept as they are. Only the added
+    turns go to the LLM, so the cost follows the size of the edit. A new
+    candidate that rewords an affected one updates that candidate's pending
+    suggestion in place. A new candidate repeating a kept one is dropped, and
+    any other is added as a new suggestion. Affected candidates that nothing
+    replaced have their pending suggestions retracted. Kept candidates that a
+    failed extraction left in "pending" are suggested too, and the list is
+    dropped. The summary and dependencies are not re-derived.
+
+    The transcript, analysis, fingerprint and every suggestion change are
+    committed in one transaction, so a failure leaves the meeting as it was.
+    Like process_meeting, everything but the model call runs in a worker thread.
+    """
+    meeting, previous = await run_in_thread(_load_meeting, db, meeting_id)
+    if meeting.analysis is None:
+        await run_in_thread(_replace_transcript, db, meeting, transcript)
+        return await process_meeting(db, meeting_id)
+
+    workspace_id = meeting.workspace_id
+    removed, added, affected, kept, unsuggested, signature = await run_in_thread(_trace_edit, db, meeting, previous, transcript)
+
+    extracted = await generate_tasks_from_transcript_async("\n".join(added), workspace_id) if added else []
+
+    result = await run_in_thread(_apply_edit, db, meeting, transcript, extracted, affected, kept, unsuggested, signature)
+    return {"meeting_id": meeting_id, "turns_removed": len(removed), "turns_added": len(added), **result}
@@ -0,0 +1,120 @@
+"""Search service: ranked full-text search over tasks and meeting transcripts (SQLite FTS5)"""
+import math
+import re
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+from typing import Any, Dict, List, Optional
+from ..models import Task
+from ..ai.similarity import tokenize
+
+# bm25 column weights: a hit in the title counts ten times one in the body
+TITLE_WEIGHT = 10.0
+BODY_WEIGHT = 1.0
+SNIPPET_TOKENS = 16
+
+_WORD_RE = re.compile(r"\w+", re.UNICODE)
+
+def match_expression(query: str, any_term: bool = False, column: Optional[str] = None) -> Optional[str]:
+    """FTS5 MATCH expression for free text, or None when it has no words.
+
+    Every word is quoted, so operators and punctuation in user input are
+    searched for literally instead of being parsed. All words must match,
+    the last one as a prefix so results show up while typing; any_term
+    matches any word instead.
+    """
+    words = _WORD_RE.findall(query.lower())
+    if not words:
+        return None
+    terms = [f'"{word}"' for word in words]
+    if any_term:
+        expression = " OR ".join(terms)
+    else:
+        terms[-1] += "*"
+        expression = " ".join(terms)
+    return f"{column} : ({expression})" if column else expression
+
+def search_tasks(db: Session, workspace_id: int, query: str, limit: int = 20) -> List[Dict[str, Any]]:
+    """Tasks matching every word of query, best first, with the matching passage"""
+    expression = match_expression(query)
+    if not expression:
+        return []
+    rows = db.execute(text("""
+        SELECT t.id, t.title, t.status, t.assignee_id,
+               snippet(tasks_fts, -1, '<b>', '</b>', '…', :tokens) AS snippet,
+               bm25(tasks_fts, :title_weight, :body_weight) AS rank
+        FROM tasks_fts JOIN tasks t ON t.id = tasks_fts.rowid
+        WHERE tasks_fts MATCH :query AND t.workspace_id = :workspace_id
+        ORDER BY rank LIMIT :limit
+    """), {
+        "query": expression, "workspace_id": workspace_id, "limit": limit, "tokens": SNIPPET_TOKENS,
+        "title_weight": TITLE_WEIGHT, "body_weight": BODY_WEIGHT
+    })
+    return [{
+        "type": "task",
+        "id": row.id,
+        "title": row.title,
+        "status": row.status,
+        "assignee_id": row.assignee_id,
+        "snippet": row.snippet,
+        "score": round(-row.rank, 6)
+    } for row in rows]
+
+def search_meetings(db: Session, workspace_id: int, query: str, limit: int = 20) -> List[Dict[str, Any]]:
+    """Meetings whose title or transcript matches every word of query, best first"""
+    expression = match_expression(query)
+    if not expression:
+        return []
+    rows = db.execute(text("""
+        SELECT m.id, m.title, m.meeting_date,
+               snippet(meetings_fts, -1, '<b>', '</b>', '…', :tokens) AS snippet,
+               bm25(meetings_fts, :title_weight, :body_weight) AS rank
+        FROM meetings_fts JOIN meetings m ON m.id = meetings_fts.rowid
+        WHERE meetings_fts MATCH :query AND m.workspace_id = :workspace_id
+        ORDER BY rank LIMIT :limit
+    """), {
+        "query": expression, "workspace_id": workspace_id, "limit": limit, "tokens": SNIPPET_TOKENS,
+        "title_weight": TITLE_WEIGHT, "body_weight": BODY_WEIGHT
+    })
+    return [{
+        "type": "meeting",
+        "id": row.id,
+        "title": row.title,
+        "meeting_date": row.meeting_date,
+        "snippet": row.snippet,
+        "score": round(-row.rank, 6)
+    } for row in rows]
+
+def find_task(db: Session, workspace_id: int, question: str, candidates: int = 10) -> Optional[Task]:
+    """Task a question refers to by title, or None.
+
+    The index proposes tasks whose title shares any word with the question. A
+    title contained in the question wins outright. Otherwise the best-ranked
+    title that has at least half of its content words in the question is
+    taken, so one shared word does not pick an unrelated task.
+    """
+    expression = match_expression(question, any_term=True, column="title")
+    if not expression:
+        return None
+    ids = [row.id for row in db.execute(text("""
+        SELECT t.id FROM tasks_fts JOIN tasks t ON t.id = tasks_fts.rowid
+        WHERE tasks_fts MATCH :query AND t.workspace_id = :workspace_id
+        ORDER BY bm25(tasks_fts, :title_weight, :body_weight) LIMIT :limit
+    """), {
+        "query": expression, "workspace_id": workspace_id, "limit": candidates,
+        "title_weight": TITLE_WEIGHT, "body_weight": BODY_WEIGHT
+    })]
+    if not ids:
+        return None
+    tasks = {task.id: task for task in db.query(Task).filter(Task.id.in_(ids))}
+    ranked = [tasks[id] for id in ids if id in tasks]
+
+    question_lower = question.lower()
+    for task in ranked:
+        if task.title and task.title.lower() in question_lower:
+            return task
+    question_words = set(tokenize(question))
+    for task in ranked:
+        title_words = set(tokenize(task.title or ""))
+        if title_words and len(title_words & question_words) >= math.ceil(len(title_words) / 2):
+            return task
+    return None
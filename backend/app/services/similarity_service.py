@@ -0,0 +1,219 @@
+"""Similarity service: keeps per-workspace task indexes in sync and deduplicates AI candidates"""
+import logging
+from functools import partial
+from sqlalchemy.orm import Session
+from sqlalchemy.orm.attributes import flag_modified
+from typing import List, Dict, Any, Optional, Tuple
+from ..caching import get_workspace_version
+from ..database import after_commit
+from ..models import Task, AgentSuggestion
+from ..config import TASK_DEDUP_MODE, TASK_DUPLICATE_THRESHOLD
+from ..ai.similarity import SimilarityIndex, task_indexes
+from .agent_service import create_suggestions
+
+logger = logging.getLogger(__name__)
+
+def _task_text(title: Optional[str], description: Optional[str]) -> str:
+    return f"{title or ''} {description or ''}"
+
+def sync_index(db: Session, workspace_id: int) -> SimilarityIndex:
+    """Index tasks and pending create_task suggestions added since the last sync.
+
+    Each workspace remembers the highest task and suggestion id it has seen,
+    so a call only reads new rows. Once the workspace version has moved on
+    (any write, including one from another worker process), the index is
+    rebuilt from the database instead.
+    """
+    index = task_indexes.get(workspace_id, get_workspace_version(db, workspace_id))
+    last_task_id = task_indexes.synced_ids.get((workspace_id, "task"), 0)
+    last_suggestion_id = task_indexes.synced_ids.get((workspace_id, "suggestion"), 0)
+
+    tasks = db.query(Task.id, Task.title, Task.description).filter(
+        Task.workspace_id == workspace_id,
+        Task.id > last_task_id
+    ).all()
+    suggestions = db.query(AgentSuggestion.id, AgentSuggestion.payload).filter(
+        AgentSuggestion.workspace_id == workspace_id,
+        AgentSuggestion.suggestion_type == "create_task",
+        AgentSuggestion.applied == False,
+        AgentSuggestion.id > last_suggestion_id
+    ).all()
+
+    documents = [(("task", task.id), _task_text(task.title, task.description)) for task in tasks]
+    documents += [
+        (("suggestion", suggestion.id), _task_text(suggestion.payload.get("title"), suggestion.payload.get("description")))
+        for suggestion in suggestions
+    ]
+    if len(documents) > 100:
+        index.add_many(documents)
+    else:
+        for key, text in documents:
+            index.add(key, text)
+
+    if tasks:
+        task_indexes.synced_ids[(workspace_id, "task")] = max(last_task_id, max(task.id for task in tasks))
+    if suggestions:
+        task_indexes.synced_ids[(workspace_id, "suggestion")] = max(last_suggestion_id, max(s.id for s in suggestions))
+    return index
+
+def index_task(db: Session, task: Task) -> None:
+    """Re-index a task whose title or description changed, once db commits the change"""
+    after_commit(db, partial(task_indexes.update, task.workspace_id, ("task", task.id), _task_text(task.title, task.description)))
+
+def similar_tasks(db: Session, workspace_id: int, text: str, k: int = 5, min_score: float = 0.0) -> List[Dict[str, Any]]:
+    """Top-k existing tasks and pending suggestions most similar to text"""
+    matches = [
+        (key, score) for key, score in sync_index(db, workspace_id).query(text, k, min_score)
+        if key[0] != "candidate"
+    ]
+    task_ids = [key[1] for key, _ in matches if key[0] == "task"]
+    suggestion_ids = [key[1] for key, _ in matches if key[0] == "suggestion"]
+    titles = {("task", row.id): row.title for row in db.query(Task.id, Task.title).filter(Task.id.in_(task_ids))}
+    titles.update({
+        ("suggestion", row.id): row.payload.get("title")
+        for row in db.query(AgentSuggestion.id, AgentSuggestion.payload).filter(AgentSuggestion.id.in_(suggestion_ids))
+    })
+    return [
+        {"type": key[0], "id": key[1], "title": titles.get(key), "score": score}
+        for key, score in matches
+    ]
+
+def find_duplicate(db: Session, workspace_id: int, text: str) -> Optional[Dict[str, Any]]:
+    """Best match above TASK_DUPLICATE_THRESHOLD, skipping suggestions resolved elsewhere"""
+    index = sync_index(db, workspace_id)
+    return _best_duplicate(db, index, text)
+
+def _best_duplicate(db: Session, index: SimilarityIndex, text: str, batch: Optional[int] = None) -> Optional[Dict[str, Any]]:
+    for key, score in index.query(text, k=3, min_score=TASK_DUPLICATE_THRESHOLD):
+        if key[0] == "candidate":
+            # Not yet inserted candidates of an in-flight create_task_suggestions call; only its own count
+            if key[1] != batch:
+                continue
+            return {"type": "candidate", "id": key[2], "score": score}
+        if key[0] == "suggestion":
+            pending = db.query(AgentSuggestion.id).filter(
+                AgentSuggestion.id == key[1],
+                AgentSuggestion.applied == False
+            ).first()
+            if not pending:
+                index.discard(key)
+                continue
+        return {"type": key[0], "id": key[1], "score": score}
+    return None
+
+def _merge_payload(target: Dict[str, Any], payload: Dict[str, Any]) -> None:
+    """Fill fields the target left empty"""
+    for field, value in payload.items():
+        if target.get(field) is None and value is not None:
+            target[field] = value
+
+def _merge_into_suggestion(db: Session, suggestion_id: int, payload: Dict[str, Any], confidence: float) -> None:
+    """Fill fields the pending suggestion left empty and keep the higher confidence. The caller commits."""
+    suggestion = db.query(AgentSuggestion).filter(AgentSuggestion.id == suggestion_id).first()
+    _merge_payload(suggestion.payload, payload)
+    flag_modified(suggestion, "payload")
+    suggestion.confidence = max(suggestion.confidence or 0.0, confidence)
+
+def update_task_suggestion(db: Session, suggestion_id: int, payload: Dict[str, Any], confidence: float) -> bool:
+    """Replace a pending create_task suggestion's payload, re-indexed on commit. False if it is no longer pending. The caller commits."""
+    suggestion = db.query(AgentSuggestion).filter(
+        AgentSuggestion.id == suggestion_id,
+        AgentSuggestion.applied == False
+    ).first()
+    if not suggestion:
+        return False
+    suggestion.payload = payload
+    suggestion.confidence = confidence
+    after_commit(db, partial(
+        task_indexes.update, suggestion.workspace_id, ("suggestion", suggestion.id), _task_text(payload.get("title"), payload.get("description"))
+    ))
+    return True
+
+def create_task_suggestions(
+    db: Session,
+    workspace_id: int,
+    candidates: List[Tuple[Dict[str, Any], float]],
+    commit: bool = True
+) -> List[Dict[str, Any]]:
+    """Create create_task suggestions for (payload, confidence) candidates, skipping duplicates, in one transaction.
+
+    Duplicates are checked against existing tasks, pending suggestions, and
+    earlier candidates in the same call. With TASK_DEDUP_MODE=merge, a
+    duplicate of a pending suggestion or an earlier candidate is merged into
+    it, and a duplicate of a task is skipped. With flag, every candidate
+    becomes a suggestion, marked possible_duplicate where it matched. With
+    off, no check is made. Returns, per candidate,
+    {"suggestion_id": id or None, "duplicate": match or None}.
+
+    All rows go in with one multi-row INSERT and one commit. The one
+    exception is a flagged candidate that repeats an earlier one in the same
+    call: the earlier rows are inserted first, so the marker can point at
+    a real id. Pass commit=False to commit them with the caller's own changes.
+    """
+    dedup = TASK_DEDUP_MODE != "off"
+    index = sync_index(db, workspace_id) if dedup else None
+    results: List[Dict[str, Any]] = []
+    # Candidates not inserted yet, by position. Every candidate is indexed as
+    # ("candidate", batch, position) until the call ends; its suggestion only
+    # enters the shared index once the transaction commits.
+    pending: Dict[int, Dict[str, Any]] = {}
+    indexed: List[int] = []
+    batch = id(pending)
+
+    def insert_pending() -> None:
+        items = list(pending.items())
+        ids = create_suggestions(db, workspace_id, [("create_task", item["payload"], item["confidence"]) for _, item in items], commit=False)
+        for (position, item), suggestion_id in zip(items, ids):
+            results[position]["suggestion_id"] = suggestion_id
+            if dedup:
+                after_commit(db, partial(task_indexes.update, workspace_id, ("suggestion", suggestion_id), item["text"]))
+        pending.clear()
+
+    try:
+        for position, (payload, confidence) in enumerate(candidates):
+            text = _task_text(payload.get("title"), payload.get("description"))
+            duplicate = _best_duplicate(db, index, text, batch) if dedup else None
+            results.append({"suggestion_id": None, "duplicate": duplicate})
+
+            if duplicate and TASK_DEDUP_MODE == "merge":
+                if duplicate["type"] == "suggestion":
+                    _merge_into_suggestion(db, duplicate["id"], payload, confidence)
+                elif duplicate["type"] == "candidate":
+                    target = pending[duplicate["id"]]
+                    _merge_payload(target["payload"], payload)
+                    target["confidence"] = max(target["confidence"], confidence)
+                continue
+
+            if duplicate and duplicate["type"] == "candidate":
+                # Flag mode needs the earlier candidate's id to point at
+                insert_pending()
+                duplicate = {**duplicate, "type": "suggestion", "id": results[duplicate["id"]]["suggestion_id"]}
+                results[position]["duplicate"] = duplicate
+            payload = {**payload, "possible_duplicate": duplicate} if duplicate else dict(payload)
+            pending[position] = {"payload": payload, "confidence": confidence, "text": text}
+            if dedup:
+                index.add(("candidate", batch, position), text)
+                indexed.append(position)
+
+        insert_pending()
+        if commit:
+            db.commit()
+    finally:
+        if dedup:
+            for position in indexed:
+                index.discard(("candidate", batch, position))
+
+    for result in results:
+        duplicate = result["duplicate"]
+        if duplicate and duplicate["type"] == "candidate":
+            result["duplicate"] = {**duplicate, "type": "suggestion", "id": results[duplicate["id"]]["suggestion_id"]}
+    return results
+
+def create_task_suggestion(
+    db: Session,
+    workspace_id: int,
+    payload: Dict[str, Any],
+    confidence: float
+) -> Dict[str, Any]:
+    """create_task_suggestions for a single candidate"""
+    return create_task_suggestions(db, workspace_id, [(payload, confidence)])[0]
@@ -1,8 +1,14 @@
 """Task service for task operations"""
+import base64
+from datetime import datetime
+from sqlalchemy import tuple_
+from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.orm import Session
-from typing import List, Optional
-from ..models import Task, User, AgentSuggestion
-from ..ai.gemini_client import generate_tasks_from_transcript
+from typing import List, Optional, Dict, Any, Tuple
+from ..models import Task, User, AgentSuggestion, TaskStatus
+from ..config import TASK_PAGE_SIZE
+from .similarity_service import index_task
+from ..ai.gemini_client import generate_tasks_from_transcript, score_rice_batch_async
 
 def create_task_from_candidate(
     db: Session,
@@ -57,3 +63,142 @@ def capture_quick_task(db: Session, workspace_id: int, text: str, user_id: int)
     db.commit()
     db.refresh(task)
     return task
+
+def rice_score(fields: Dict[str, Any]) -> float:
+    """RICE = reach * impact * confidence / effort"""
+    return round(fields["reach"] * fields["impact"] * fields["confidence"] / max(fields["effort"], 1), 2)
+
+async def score_backlog(
+    db: Session,
+    workspace_id: int,
+    statuses: Optional[List[str]] = None
+) -> List[Dict[str, Any]]:
+    """RICE-score every backlog task in a workspace with batched prompts, highest score first"""
+    statuses = statuses or [TaskStatus.todo.value]
+    tasks = db.query(Task.id, Task.title, Task.description).filter(
+        Task.workspace_id == workspace_id,
+        Task.status.in_(statuses)
+    ).all()
+    
+    descriptions = {task.id: task.description or task.title or "" for task in tasks}
+    scores = await score_rice_batch_async(descriptions, workspace_id)
+    
+    results = [
+        {"task_id": task.id, "title": task.title, **scores[task.id], "rice_score": rice_score(scores[task.id])}
+        for task in tasks
+    ]
+    results.sort(key=lambda result: result["rice_score"], reverse=True)
+    return results
+
+# Columns a task list can return; ?fields= picks a subset
+TASK_FIELDS = [column.key for column in Task.__table__.columns]
+
+def parse_fields(fields: Optional[str]) -> List[str]:
+    """Column names from a comma-separated fields parameter, all columns when empty"""
+    if not fields:
+        return TASK_FIELDS
+    names = [name.strip() for name in fields.split(",") if name.strip()]
+    unknown = [name for name in names if name not in TASK_FIELDS]
+    if unknown:
+        raise ValueError(f"Unknown task fields: {', '.join(unknown)}")
+    return list(dict.fromkeys(names))
+
+def encode_cursor(created_at: datetime, task_id: int) -> str:
+    return base64.urlsafe_b64encode(f"{created_at.isoformat()}|{task_id}".encode()).decode()
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    try:
+        created_at, task_id = base64.urlsafe_b64decode(cursor.encode()).decode().split("|")
+        return datetime.fromisoformat(created_at), int(task_id)
+    except (ValueError, UnicodeDecodeError):
+        raise ValueError("Invalid cursor")
+
+def list_task_page(
+    db: Session,
+    filters: List[Any],
+    fields: Optional[str] = None,
+    limit: int = TASK_PAGE_SIZE,
+    cursor: Optional[str] = None
+) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+    """One page of tasks matching filters, newest first, and the cursor of the next page (None on the last).
+
+    Pages are keyed on (created_at, id): a page starts right after the last
+    row of the previous one. Deep pages therefore cost the same as the first,
+    and rows inserted meanwhile do not shift or repeat entries. Only the
+    requested columns are selected. Raises ValueError for an unknown field or
+    a malformed cursor.
+    """
+    names = parse_fields(fields)
+    query = db.query(
+        *(getattr(Task, name) for name in names),
+        Task.created_at.label("cursor_created_at"),
+        Task.id.label("cursor_id")
+    ).filter(*filters)
+    if cursor:
+        query = query.filter(tuple_(Task.created_at, Task.id) < tuple_(*decode_cursor(cursor)))
+    rows = query.order_by(Task.created_at.desc(), Task.id.desc()).limit(limit + 1).all()
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor(rows[-1].cursor_created_at, rows[-1].cursor_id)
+    return [dict(zip(names, row)) for row in rows], next_cursor
+
+def bulk_update_tasks(
+    db: Session,
+    updates: List[Tuple[int, Dict[str, Any]]],
+    atomic: bool = True,
+    workspace_id: Optional[int] = None
+) -> Dict[str, Any]:
+    """Apply (task_id, changes) pairs in one transaction and report the outcome of each.
+
+    The targets are loaded with one IN query and written with one flush and
+    commit. A task that does not exist, or belongs to another workspace when
+    workspace_id is given, fails its item. With atomic, any failed item
+    rolls back the whole batch, and the other items are reported as
+    rolled_back. Otherwise the remaining items are committed. A database
+    error on commit fails every item.
+    """
+    query = db.query(Task).filter(Task.id.in_({task_id for task_id, _ in updates}))
+    if workspace_id is not None:
+        query = query.filter(Task.workspace_id == workspace_id)
+    tasks = {task.id: task for task in query}
+
+    results: List[Dict[str, Any]] = []
+    for task_id, changes in updates:
+        task = tasks.get(task_id)
+        if task is None:
+            results.append({"id": task_id, "status": "not_found", "error": "Task not found"})
+            continue
+        for field, value in changes.items():
+            setattr(task, field, value)
+        results.append({"id": task_id, "status": "updated"})
+
+    failed = sum(1 for result in results if result["status"] != "updated")
+    if atomic and failed:
+        db.rollback()
+        for result in results:
+            if result["status"] == "updated":
+                result["status"] = "rolled_back"
+        return {"committed": False, "updated": 0, "failed": failed, "results": results}
+
+    try:
+        db.flush()
+    except SQLAlchemyError as e:
+        db.rollback()
+        error = str(getattr(e, "orig", None) or e)
+        return {
+            "committed": False,
+            "updated": 0,
+            "failed": len(results),
+            "results": [{"id": result["id"], "status": "failed", "error": result.get("error", error)} for result in results]
+        }
+    # Serialized before the commit expires them, so returning the tasks costs no further queries
+    for result in results:
+        if result["status"] == "updated":
+            result["task"] = {name: getattr(tasks[result["id"]], name) for name in TASK_FIELDS}
+    for task_id in {task_id for task_id, changes in updates if "title" in changes or "description" in changes}:
+        if task_id in tasks:
+            index_task(db, tasks[task_id])
+    db.commit()
+    return {"committed": True, "updated": len(results) - failed, "failed": failed, "results": results}
@@ -0,0 +1,159 @@
+"""Benchmark: rule-based keyword heuristics on multi-megabyte transcripts
+
+For each call site, compares the per-keyword ``in``/``count`` loops used
+before with the shared heuristic_keywords table, and checks that both give the same
+answers. As a reference, it also times one pass of a single alternation regex
+over every keyword. That regex pass is slower than the substring scans, which
+is why the keyword table does not use it.
+
+Run from backend/: python -m benchmarks.bench_keywords
+"""
+import random
+import re
+import time
+from app.ai.keywords import heuristic_keywords, HEURISTIC_KEYWORDS
+from app.ai.parser import fallback_task_extractor
+from app.routers.auto_mapping import extract_blockers, infer_priority, calculate_confidence
+from app.routers.intelligence import analyze_sentiment, calculate_action_density
+
+LINES = [
+    "Priya: I will finish the OAuth integration by Friday, it is urgent.",
+    "Dev1: The deploy is blocked by the database migration, still waiting for approval.",
+    "QA1: Good progress on the regression suite, no issue so far.",
+    "Sam: We should look at the flaky tests soon, they are a concern.",
+    "Lee: Action: update the runbook. TODO: rotate the staging keys.",
+    "Priya: Great work everyone, the release went out and was a success.",
+    "Dev2: I need to pair with Sarah on the API, it's stuck on rate limiting.",
+    "Sam: Let's talk about lunch plans and the offsite next month.",
+    "Priya: The dashboard numbers looked about the same as last sprint.",
+    "Dev1: Most of the time went into reading the logs from the staging cluster.",
+    "QA1: Yeah, I saw that too, the timeouts cluster around midnight UTC.",
+    "Sam: Right, that lines up with the nightly export job.",
+    "Lee: Any questions on the roadmap slides before we move on?",
+    "Dev2: Not from me, the slides were clear."
+]
+
+def make_transcript(target_bytes: int) -> str:
+    rng = random.Random(7)
+    lines = []
+    size = 0
+    while size < target_bytes:
+        line = rng.choice(LINES)
+        lines.append(line)
+        size += len(line) + 1
+    return "\n".join(lines)
+
+# The heuristics as they were written before the shared keyword table
+
+def legacy_fallback_lines(transcript: str) -> list:
+    tasks = []
+    for line in transcript.split('\n'):
+        line_lower = line.lower()
+        if any(keyword in line_lower for keyword in ["i will", "i'll", "action:", "todo:", "task:"]):
+            tasks.append({
+                "assignee": None,
+                "description": line.strip(),
+                "due_date": None,
+                "priority": 5,
+                "effort_tag": "medium",
+                "confidence": 0.5,
+                "is_blocked": False,
+                "blocker_reason": None
+            })
+    return tasks
+
+def legacy_sentence_heuristics(sentence: str) -> tuple:
+    sentence_lower = sentence.lower()
+    blocker = None
+    for keyword in ['blocked by', 'waiting for', 'pending', 'stuck on', 'need approval']:
+        if keyword in sentence_lower:
+            idx = sentence_lower.index(keyword)
+            blocker = sentence[idx:idx+100]
+            break
+    if any(word in sentence_lower for word in ['urgent', 'critical', 'asap', 'immediately', 'emergency']):
+        priority = 9
+    elif any(word in sentence_lower for word in ['important', 'soon', 'priority', 'should']):
+        priority = 7
+    else:
+        priority = 5
+    score = 0.5
+    if any(word in sentence.lower() for word in ['will', 'must', 'need to']):
+        score += 0.2
+    if any(word in sentence.lower() for word in ['i will', 'john', 'sarah', 'dev', 'qa']):
+        score += 0.15
+    if any(word in sentence.lower() for word in ['by', 'today', 'tomorrow', 'friday', 'next week']):
+        score += 0.15
+    return blocker, priority, min(score, 0.95)
+
+def legacy_auto_map(text: str) -> list:
+    results = []
+    for sentence in text.split('.'):
+        sentence = sentence.strip()
+        if len(sentence) >= 10 and any(word in sentence.lower() for word in ['will', 'should', 'need to', 'must', 'going to', 'has to']):
+            results.append(legacy_sentence_heuristics(sentence))
+    return results
+
+def legacy_insights(text: str) -> tuple:
+    text = text.lower()
+    pos = sum([text.count(word) for word in ["great", "excellent", "good", "progress", "completed", "success"]])
+    neg = sum([text.count(word) for word in ["blocked", "issue", "problem", "delayed", "concern", "risk"]])
+    sentiment = "positive" if pos > neg * 1.5 else "negative" if neg > pos * 1.5 else "neutral"
+    count = sum([text.count(word) for word in ["will", "should", "need to", "must", "going to"]])
+    words = len(text.split())
+    density = (count / words * 100) if words > 0 else 0
+    return sentiment, "high" if density > 5 else "medium" if density > 2 else "low"
+
+# The same call sites on the shared keyword table
+
+def table_fallback_lines(transcript: str) -> list:
+    return fallback_task_extractor(transcript)
+
+def table_auto_map(text: str) -> list:
+    results = []
+    for sentence in heuristic_keywords.matching_pieces(text, '.', "action"):
+        sentence = sentence.strip()
+        if len(sentence) < 10:
+            continue
+        hits = heuristic_keywords.lower(sentence)
+        results.append((extract_blockers(sentence, hits), infer_priority(sentence, hits), calculate_confidence(sentence, hits)))
+    return results
+
+def table_insights(text: str) -> tuple:
+    hits = heuristic_keywords.lower(text)
+    return analyze_sentiment(hits.text, hits), calculate_action_density(hits.text, hits)
+
+_COMBINED = re.compile("|".join(
+    re.escape(keyword)
+    for keyword in sorted({kw for kws in HEURISTIC_KEYWORDS.values() for kw in kws}, key=len, reverse=True)
+))
+
+def combined_regex_pass(text: str) -> int:
+    """Reference: one pass of a single alternation regex over every keyword"""
+    return len(_COMBINED.findall(text.lower()))
+
+def timed(fn, text: str):
+    start = time.perf_counter()
+    result = fn(text)
+    return result, (time.perf_counter() - start) * 1000
+
+def main():
+    import logging
+    logging.disable(logging.WARNING)
+    cases = [
+        ("fallback lines", legacy_fallback_lines, table_fallback_lines),
+        ("auto-map sentences", legacy_auto_map, table_auto_map),
+        ("insights", legacy_insights, table_insights)
+    ]
+    print(f"{'size':>5} {'call site':<20} {'legacy ms':>10} {'table ms':>11} {'speedup':>8}")
+    for megabytes in (1, 4, 16):
+        text = make_transcript(megabytes * 1024 * 1024)
+        for name, legacy, table in cases:
+            expected, legacy_ms = timed(legacy, text)
+            actual, table_ms = timed(table, text)
+            assert actual == expected, name
+            print(f"{megabytes:>3}MB {name:<20} {legacy_ms:>10.1f} {table_ms:>11.1f} {legacy_ms / table_ms:>7.2f}x")
+        _, regex_ms = timed(combined_regex_pass, text)
+        print(f"{megabytes:>3}MB {'(combined regex)':<20} {'':>10} {regex_ms:>11.1f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,136 @@
+"""Offline throughput benchmark for meeting ingestion against the fake model server
+
+Starts the fake Gemini server in-process, points the app at it (AI_MODE=fake,
+response cache off, throwaway SQLite file) and drives concurrent
+POST /meetings/process requests through the ASGI app. A worker pool of
+--workers runs the queued jobs on the same event loop. The benchmark reports
+request latency (enqueue only) and job latency (enqueue to result)
+separately.
+
+Run from backend/:
+    python -m benchmarks.bench_meeting_throughput --requests 200 --concurrency 20 --workers 8 \
+        --latency lognormal:800,0.5 --error-rate 0.05 --truncate-rate 0.05
+"""
+import argparse
+import asyncio
+import os
+import socket
+import statistics
+import tempfile
+import threading
+import time
+
+TRANSCRIPT = """Priya: Morning everyone. I will finish the OAuth2 login flow by Friday.
+Dev1: I'll pick up the database migration once the schema review is done.
+QA1: Action: write regression tests for the login flow, blocked by the staging deploy.
+PO: We need the release notes drafted before the sprint review."""
+
+def parse_args():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=100)
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--latency", default="lognormal:500,0.5")
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--truncate-rate", type=float, default=0.0)
+    parser.add_argument("--output-tps", type=float, default=0.0)
+    parser.add_argument("--tpm-limit", type=int, default=0)
+    return parser.parse_args()
+
+async def run(args, app):
+    import httpx
+    from app.jobs.worker import WorkerPool
+    latencies = []
+    statuses = {}
+    job_ids = []
+    semaphore = asyncio.Semaphore(args.concurrency)
+    pool = WorkerPool(size=args.workers, poll_interval=0.05)
+    pool.start()
+
+    async with httpx.AsyncClient(app=app, base_url="http://bench", timeout=120) as client:
+        async def one(i):
+            async with semaphore:
+                start = time.perf_counter()
+                response = await client.post("/meetings/process", json={
+                    "workspace_id": 1,
+                    "title": f"Bench meeting {i}",
+                    "meeting_date": "2025-01-15T10:00:00",
+                    "transcript": f"{TRANSCRIPT}\nPriya: Ticket {i}."
+                })
+                latencies.append(time.perf_counter() - start)
+                statuses[response.status_code] = statuses.get(response.status_code, 0) + 1
+                if response.status_code == 202:
+                    job_ids.append(response.json()["job_id"])
+
+        start = time.perf_counter()
+        await asyncio.gather(*(one(i) for i in range(args.requests)))
+        job_latencies, job_statuses = await wait_for_jobs(job_ids)
+        elapsed = time.perf_counter() - start
+        await pool.stop()
+        return elapsed, latencies, statuses, job_latencies, job_statuses
+
+async def wait_for_jobs(job_ids):
+    """Poll until every job is finished, then return enqueue-to-finish latencies and final statuses"""
+    from app.database import SessionLocal
+    from app.models import Job
+    while True:
+        db = SessionLocal()
+        try:
+            jobs = db.query(Job).filter(Job.id.in_(job_ids)).all()
+        finally:
+            db.close()
+        if all(job.status in ("succeeded", "failed") for job in jobs):
+            break
+        await asyncio.sleep(0.1)
+    job_statuses = {}
+    for job in jobs:
+        job_statuses[job.status] = job_statuses.get(job.status, 0) + 1
+    return sorted((job.finished_at - job.created_at).total_seconds() for job in jobs), job_statuses
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+def main():
+    args = parse_args()
+    # app.config is read on first import of anything under app, so configure the environment first
+    port = free_port()
+    db_dir = tempfile.mkdtemp()
+    os.environ.update({
+        "AI_MODE": "fake",
+        "FAKE_LLM_URL": f"http://127.0.0.1:{port}",
+        "LLM_CACHE_ENABLED": "false",
+        "LLM_WARMUP_ON_STARTUP": "false",
+        "JOB_WORKERS": "0",
+        "DATABASE_URL": f"sqlite:///{db_dir}/bench.db"
+    })
+    from app.ai.fake_server import FakeModelConfig, create_server
+    config = FakeModelConfig(args.latency, args.error_rate, args.truncate_rate, args.output_tps, args.tpm_limit)
+    server = create_server("127.0.0.1", port, config)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    from app.main import app
+    from app.database import SessionLocal
+    from app.seed_data import seed_all
+    db = SessionLocal()
+    seed_all(db)
+    db.close()
+
+    elapsed, latencies, statuses, job_latencies, job_statuses = asyncio.run(run(args, app))
+    server.shutdown()
+
+    latencies.sort()
+    print(f"requests={args.requests} concurrency={args.concurrency} latency={args.latency} "
+          f"error_rate={args.error_rate} truncate_rate={args.truncate_rate}")
+    print(f"throughput: {args.requests / elapsed:.1f} meetings/s over {elapsed:.2f}s")
+    print(f"latency p50={statistics.median(latencies) * 1000:.0f}ms "
+          f"p95={latencies[int(len(latencies) * 0.95) - 1] * 1000:.0f}ms max={latencies[-1] * 1000:.0f}ms")
+    print(f"status codes: {statuses}")
+    print(f"jobs ({args.workers} workers): p50={statistics.median(job_latencies) * 1000:.0f}ms "
+          f"p95={job_latencies[int(len(job_latencies) * 0.95) - 1] * 1000:.0f}ms "
+          f"max={job_latencies[-1] * 1000:.0f}ms {job_statuses}")
+    print(f"fake server: {config.stats}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""Micro-benchmark: per-response parse cost of parse_and_validate on large candidate arrays
+
+Run from backend/: python -m benchmarks.bench_parser
+"""
+import json
+import time
+from jsonschema import validate
+from app.ai.parser import parse_and_validate, _compiled, _strip_code_fences, TASK_CANDIDATE_SCHEMA
+
+def make_response(count: int) -> str:
+    candidates = [
+        {
+            "assignee": f"dev{i % 7}",
+            "description": f"Implement feature {i} and write the migration for it",
+            "due_date": "2025-02-15",
+            "priority": i % 10 + 1,
+            "effort_tag": ["small", "medium", "large"][i % 3],
+            "confidence": 0.9,
+            "is_blocked": i % 5 == 0,
+            "blocker_reason": "Waiting for API keys" if i % 5 == 0 else None
+        }
+        for i in range(count)
+    ]
+    return "```json\n" + json.dumps(candidates, indent=2) + "\n```"
+
+def legacy_parse(raw_response: str):
+    """parse_and_validate as it was before validators were precompiled"""
+    cleaned = raw_response.strip()
+    if cleaned.startswith("```json"):
+        cleaned = cleaned[7:]
+    if cleaned.startswith("```"):
+        cleaned = cleaned[3:]
+    if cleaned.endswith("```"):
+        cleaned = cleaned[:-3]
+    data = json.loads(cleaned.strip())
+    validate(instance=data, schema=TASK_CANDIDATE_SCHEMA)
+    return data
+
+def full_validation_only(raw_response: str):
+    """Precompiled validator without the fast path"""
+    data = json.loads(_strip_code_fences(raw_response))
+    _compiled(TASK_CANDIDATE_SCHEMA)[1].validate(data)
+    return data
+
+def time_per_call(fn, raw_response: str, repeat: int) -> float:
+    fn(raw_response)
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn(raw_response)
+    return (time.perf_counter() - start) / repeat * 1000
+
+def main():
+    print(f"{'items':>6} {'legacy ms':>10} {'precompiled ms':>15} {'fast path ms':>13} {'speedup':>8}")
+    for count in (10, 100, 1000, 5000):
+        raw_response = make_response(count)
+        repeat = max(3, 2000 // count)
+        legacy = time_per_call(legacy_parse, raw_response, repeat)
+        precompiled = time_per_call(full_validation_only, raw_response, repeat)
+        fast = time_per_call(lambda raw: parse_and_validate(raw, TASK_CANDIDATE_SCHEMA), raw_response, repeat)
+        print(f"{count:>6} {legacy:>10.3f} {precompiled:>15.3f} {fast:>13.3f} {legacy / fast:>7.1f}x")
+
+if __name__ == "__main__":
+    main()
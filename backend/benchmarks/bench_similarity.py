@@ -0,0 +1,87 @@
+"""Benchmark: TF-IDF task similarity index at workspace scale
+
+Builds an index over synthetic task titles and descriptions, then times
+top-k queries and single-document updates. "common ms" times queries made
+only of frequent title words with no rare term to narrow them, which is
+the worst case for the index. A brute-force cosine scan over
+every document is timed on the smaller sizes as a reference, and its top
+result is compared with the index's to report top-1 agreement under the
+accumulator limit.
+
+Run from backend/: python -m benchmarks.bench_similarity
+"""
+import math
+import random
+import statistics
+import time
+from app.ai.similarity import SimilarityIndex
+
+VERBS = ["fix", "update", "migrate", "review", "write", "test", "deploy", "refactor", "document", "audit", "design", "remove"]
+AREAS = ["billing", "auth", "oauth", "search", "export", "import", "email", "sync", "dashboard", "onboarding",
+         "payments", "invoices", "webhooks", "staging", "analytics", "mobile", "notifications", "permissions"]
+OBJECTS = ["service", "api", "tests", "runbook", "schema", "cache", "queue", "client", "docs", "metrics",
+           "alerts", "config", "pipeline", "release", "migration", "endpoint", "job", "report"]
+
+def make_task(rng: random.Random, i: int) -> str:
+    title = f"{rng.choice(VERBS)} {rng.choice(AREAS)} {rng.choice(OBJECTS)}"
+    detail = " ".join(rng.choice(AREAS + OBJECTS) for _ in range(rng.randint(4, 12)))
+    return f"{title} ticket{i % 5000} {detail}"
+
+def brute_force(index: SimilarityIndex, text: str, k: int) -> list:
+    """Reference: score every document without the inverted index"""
+    query = index._term_weights(text)
+    query_vector = {token: weight * index._idf(token) for token, weight in query.items()}
+    query_norm = math.sqrt(sum(v * v for v in query_vector.values())) or 1.0
+    scores = []
+    for key, weights in index._docs.items():
+        dot = sum(query_vector.get(token, 0.0) * weight * index._idf(token) for token, weight in weights.items())
+        if dot:
+            scores.append((dot / (query_norm * index._norms[key]), key))
+    return sorted(scores, reverse=True)[:k]
+
+def percentile(samples: list, p: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(p * len(ordered)))]
+
+def main():
+    rng = random.Random(11)
+    queries = [make_task(rng, i) for i in range(200)]
+    common = [" ".join(text.split()[:3]) for text in queries[:50]]
+    print(f"{'tasks':>8} {'build s':>8} {'p50 ms':>8} {'p99 ms':>8} {'common ms':>10} {'add ms':>8} {'brute ms':>9} {'top-1':>6}")
+    for size in (1_000, 10_000, 100_000):
+        documents = [(("task", i), make_task(rng, i)) for i in range(size)]
+        index = SimilarityIndex()
+        start = time.perf_counter()
+        index.add_many(documents)
+        build = time.perf_counter() - start
+
+        latencies = []
+        for text in queries:
+            start = time.perf_counter()
+            index.query(text, k=5)
+            latencies.append((time.perf_counter() - start) * 1000)
+
+        common_latencies = []
+        for text in common:
+            start = time.perf_counter()
+            index.query(text, k=5)
+            common_latencies.append((time.perf_counter() - start) * 1000)
+
+        sample = queries[:20] if size <= 10_000 else queries[:5]
+        start = time.perf_counter()
+        exact = [brute_force(index, text, 1) for text in sample]
+        brute = (time.perf_counter() - start) * 1000 / len(sample)
+        # Compare scores rather than keys, so ties between equally good documents count as agreement
+        same = sum(1 for text, best in zip(sample, exact) if abs(index.query(text, k=1)[0][1] - min(best[0][0], 1.0)) < 1e-3)
+        adds = []
+        for i in range(200):
+            start = time.perf_counter()
+            index.add(("suggestion", i), queries[i])
+            adds.append((time.perf_counter() - start) * 1000)
+
+        print(f"{size:>8} {build:>8.2f} {statistics.median(latencies):>8.2f} {percentile(latencies, 0.99):>8.2f} "
+              f"{statistics.median(common_latencies):>10.2f} {statistics.median(adds):>8.3f} {brute:>9.1f} "
+              f"{same:>3}/{len(sample)}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+"""Startup benchmark: import time per module for app.main
+
+Runs a fresh interpreter with -X importtime and reports the slowest modules
+by cumulative import time, plus every app.* module.
+
+Only the Gemini SDK (google.generativeai) is imported lazily, so it should
+not appear here. The routers, and with them gemini_client, the parser,
+similarity and the job modules, are imported by app.main and are counted.
+
+Run from backend/: python -m benchmarks.bench_startup [--top N]
+"""
+import argparse
+import os
+import subprocess
+import sys
+import time
+
+def measure(target: str = "app.main"):
+    env = dict(os.environ, PYTHONDONTWRITEBYTECODE="1")
+    start = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {target}"],
+        capture_output=True, text=True, env=env
+    )
+    wall = time.perf_counter() - start
+    if result.returncode != 0:
+        raise SystemExit(result.stderr)
+    
+    modules = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        if not self_us.strip().isdigit():
+            continue  # header row
+        modules.append((name.strip(), int(self_us), int(cumulative_us)))
+    return wall, modules
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--top", type=int, default=15)
+    parser.add_argument("--target", default="app.main")
+    args = parser.parse_args()
+    
+    wall, modules = measure(args.target)
+    print(f"Interpreter + import {args.target}: {wall * 1000:.0f} ms wall")
+    sdk_loaded = any(name.startswith("google.generativeai") for name, _, _ in modules)
+    print(f"Gemini SDK imported at startup: {'yes' if sdk_loaded else 'no'}")
+    print(f"\n{'cumulative ms':>14} {'self ms':>9}  module")
+    for name, self_us, cumulative_us in sorted(modules, key=lambda m: m[2], reverse=True)[:args.top]:
+        print(f"{cumulative_us / 1000:>14.1f} {self_us / 1000:>9.1f}  {name}")
+    
+    print(f"\n{'cumulative ms':>14} {'self ms':>9}  app module")
+    for name, self_us, cumulative_us in modules:
+        if name.startswith("app"):
+            print(f"{cumulative_us / 1000:>14.1f} {self_us / 1000:>9.1f}  {name}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+"""Benchmark: per-suggestion write cost, one commit per row vs one bulk insert
+
+Writes batches of suggestions to a throwaway SQLite file. It compares
+create_suggestion in a loop (a commit, and so an fsync, plus a refresh per
+row) with create_suggestions (one multi-row INSERT ... RETURNING and one
+commit). Batch sizes cover what one request creates: a meeting's
+candidates, a workspace's at-risk tasks, and unassigned backlog items.
+
+Run from backend/: python -m benchmarks.bench_suggestions
+"""
+import os
+import statistics
+import tempfile
+import time
+
+def main():
+    db_dir = tempfile.mkdtemp()
+    # app.config is read on first import of anything under app
+    os.environ["DATABASE_URL"] = f"sqlite:///{db_dir}/bench.db"
+    import app.models  # noqa: F401 - registers the tables
+    from app.database import Base, engine, SessionLocal
+    from app.services.agent_service import create_suggestion, create_suggestions
+    Base.metadata.create_all(bind=engine)
+
+    def payload(i: int) -> dict:
+        return {"task_id": i, "reason": "High priority task with low progress and approaching deadline", "action": "escalate_or_split"}
+
+    def per_row(db, n: int) -> None:
+        for i in range(n):
+            create_suggestion(db, 1, "flag_risk", payload(i), 0.82)
+
+    def bulk(db, n: int) -> None:
+        create_suggestions(db, 1, [("flag_risk", payload(i), 0.82) for i in range(n)])
+
+    print(f"{'batch':>6} {'per-row us/row':>15} {'bulk us/row':>12} {'speedup':>8}")
+    for n in (5, 20, 100, 500):
+        timings = {}
+        for name, fn in (("per_row", per_row), ("bulk", bulk)):
+            samples = []
+            for _ in range(5):
+                db = SessionLocal()
+                try:
+                    start = time.perf_counter()
+                    fn(db, n)
+                    samples.append((time.perf_counter() - start) / n * 1e6)
+                finally:
+                    db.close()
+            timings[name] = statistics.median(samples)
+        print(f"{n:>6} {timings['per_row']:>15.0f} {timings['bulk']:>12.0f} {timings['per_row'] / timings['bulk']:>7.1f}x")
+
+if __name__ == "__main__":
+    main()
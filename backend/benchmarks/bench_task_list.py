@@ -0,0 +1,94 @@
+"""Benchmark: task list response size and latency, unpaginated vs keyset pages
+
+Fills a throwaway SQLite file with 100k tasks in one workspace and times
+GET /tasks/ through the app. "unpaginated" is the previous behaviour, every
+row loaded as an ORM object and serialized. The others are one 100-row page,
+all columns or fields=id,title,status,assignee_id. A page is timed first and
+deep, after following the cursor 500 pages in. Keyset pages cost the same
+at any depth, where OFFSET would scan everything it skips.
+
+Run from backend/: python -m benchmarks.bench_task_list [--tasks 100000]
+"""
+import argparse
+import os
+import random
+import statistics
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+WORKSPACE_ID = 1
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--tasks", type=int, default=100_000)
+    parser.add_argument("--runs", type=int, default=20)
+    args = parser.parse_args()
+
+    db_dir = tempfile.mkdtemp()
+    # app.config is read on first import of anything under app
+    os.environ["DATABASE_URL"] = f"sqlite:///{db_dir}/bench.db"
+    os.environ["JOB_WORKERS"] = "0"
+    os.environ["LLM_WARMUP_ON_STARTUP"] = "false"
+    from fastapi.encoders import jsonable_encoder
+    from fastapi.responses import JSONResponse
+    from fastapi.testclient import TestClient
+    from sqlalchemy import insert
+    from app.main import app
+    from app.database import SessionLocal
+    from app.models import Task
+
+    rng = random.Random(5)
+    start = datetime(2024, 1, 1)
+    db = SessionLocal()
+    for offset in range(0, args.tasks, 10_000):
+        db.execute(insert(Task), [{
+            "workspace_id": WORKSPACE_ID,
+            "title": f"Update the {rng.choice(['billing', 'auth', 'search', 'export'])} service #{i}",
+            "description": "Details of the change, acceptance criteria and links. " * rng.randint(1, 6),
+            "status": rng.choice(["todo", "in_progress", "qa", "done"]),
+            "assignee_id": rng.randint(1, 50),
+            "priority": rng.randint(1, 10),
+            "progress": rng.randint(0, 100),
+            "is_blocked": rng.random() < 0.05,
+            "created_at": start + timedelta(seconds=i * 30)
+        } for i in range(offset, min(offset + 10_000, args.tasks))])
+    db.commit()
+
+    client = TestClient(app)
+
+    def unpaginated():
+        tasks = db.query(Task).filter(Task.workspace_id == WORKSPACE_ID).order_by(Task.created_at.desc()).all()
+        body = JSONResponse(jsonable_encoder(tasks)).body
+        db.expunge_all()
+        return len(body)
+
+    def page(query: str):
+        def run():
+            return len(client.get(f"/tasks/?workspace_id={WORKSPACE_ID}&limit=100{query}").content)
+        return run
+
+    cursor = None
+    for _ in range(500):
+        cursor = client.get(f"/tasks/?workspace_id={WORKSPACE_ID}&limit=100&fields=id" + (f"&cursor={cursor}" if cursor else "")).headers["X-Next-Cursor"]
+
+    cases = [
+        ("unpaginated", unpaginated, 3),
+        ("page, all fields", page(""), args.runs),
+        ("page, 4 fields", page("&fields=id,title,status,assignee_id"), args.runs),
+        ("page 500, all fields", page(f"&cursor={cursor}"), args.runs),
+        ("page 500, 4 fields", page(f"&fields=id,title,status,assignee_id&cursor={cursor}"), args.runs),
+    ]
+    print(f"{args.tasks} tasks")
+    print(f"{'request':<22} {'bytes':>12} {'p50 ms':>9} {'max ms':>9}")
+    for name, run, runs in cases:
+        samples, size = [], 0
+        for _ in range(runs):
+            began = time.perf_counter()
+            size = run()
+            samples.append((time.perf_counter() - began) * 1000)
+        print(f"{name:<22} {size:>12,} {statistics.median(samples):>9.1f} {max(samples):>9.1f}")
+    db.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,177 @@
+"""Benchmark: query plans and latency of the briefing, smart-action and analytics task queries
+
+Grows a throwaway SQLite file to 10k, 100k and 1M tasks spread over 10
+workspaces (mostly done work, as in a mature workspace) and calls each
+endpoint once for workspace 1, recording the SELECTs it sends to tasks.
+Writes made by the smart actions are rolled back. Each statement is then
+timed on its own and its EXPLAIN QUERY PLAN recorded twice: "before"
+without the status, open-work and blocked indexes on tasks, "after" with
+them.
+
+Run from backend/: python -m benchmarks.bench_task_queries [--sizes 10000,100000,1000000]
+"""
+import argparse
+import os
+import random
+import statistics
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+WORKSPACES = 10
+WORKSPACE_ID = 1
+USERS = 50
+NEW_INDEXES = [
+    "ix_tasks_workspace_status_priority",
+    "ix_tasks_workspace_status_updated",
+    "ix_tasks_active_due",
+    "ix_tasks_workspace_assignee",
+    "ix_tasks_workspace_blocked",
+]
+ENDPOINTS = [
+    ("GET", f"/briefing/daily?workspace_id={WORKSPACE_ID}&user_id=7"),
+    ("POST", f"/smart/detect-risks?workspace_id={WORKSPACE_ID}"),
+    ("POST", f"/smart/suggest-rebalance?workspace_id={WORKSPACE_ID}"),
+    ("POST", f"/smart/find-dependencies?workspace_id={WORKSPACE_ID}"),
+    ("GET", f"/smart/quick-wins?workspace_id={WORKSPACE_ID}&user_id=7"),
+    ("POST", f"/smart/auto-prioritize?workspace_id={WORKSPACE_ID}"),
+    ("GET", f"/analytics/velocity-forecast?workspace_id={WORKSPACE_ID}"),
+    ("GET", f"/analytics/task-cycle-time?workspace_id={WORKSPACE_ID}"),
+    ("GET", f"/analytics/workload-distribution?workspace_id={WORKSPACE_ID}"),
+    ("GET", f"/analytics/ai-effectiveness?workspace_id={WORKSPACE_ID}"),
+    ("GET", f"/analytics/risk-heatmap?workspace_id={WORKSPACE_ID}"),
+]
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", default="10000,100000,1000000")
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+    sizes = [int(size) for size in args.sizes.split(",")]
+
+    db_dir = tempfile.mkdtemp()
+    # app.config is read on first import of anything under app
+    os.environ["DATABASE_URL"] = f"sqlite:///{db_dir}/bench.db"
+    os.environ["JOB_WORKERS"] = "0"
+    os.environ["LLM_WARMUP_ON_STARTUP"] = "false"
+    from fastapi.testclient import TestClient
+    from sqlalchemy import event, insert, text
+    from app.main import app
+    from app.database import SessionLocal, engine, get_db
+    from app.models import Task, User, Sprint
+
+    def rolled_back_db():
+        db = SessionLocal()
+        db.commit = db.flush
+        try:
+            yield db
+        finally:
+            db.rollback()
+            db.close()
+
+    app.dependency_overrides[get_db] = rolled_back_db
+    client = TestClient(app)
+    indexes = {index.name: index for index in Task.__table__.indexes}
+
+    rng = random.Random(25)
+    now = datetime.utcnow()
+    with engine.begin() as connection:
+        connection.execute(insert(User), [
+            {"id": id, "username": f"user{id}", "display_name": f"User {id}", "role": "member"} for id in range(1, USERS + 1)
+        ])
+        connection.execute(insert(Sprint), [{
+            "workspace_id": WORKSPACE_ID, "name": f"Sprint {i}", "velocity": rng.randint(20, 40),
+            "start_date": now + timedelta(days=14 * (i - 6)), "end_date": now + timedelta(days=14 * (i - 5))
+        } for i in range(6)])
+
+    def fill(start: int, stop: int):
+        statuses = ["done"] * 14 + ["qa"] + ["in_progress"] * 2 + ["todo"] * 3
+        for offset in range(start, stop, 10_000):
+            with engine.begin() as connection:
+                connection.execute(insert(Task), [{
+                    "workspace_id": rng.randint(1, WORKSPACES),
+                    "title": f"Update the {rng.choice(['billing', 'auth', 'search', 'export'])} service #{i}",
+                    "description": "Acceptance criteria and links, after review.",
+                    "status": rng.choice(statuses),
+                    "assignee_id": rng.randint(1, USERS) if rng.random() < 0.9 else None,
+                    "priority": rng.randint(1, 10) if rng.random() < 0.9 else None,
+                    "progress": rng.randint(0, 100),
+                    "effort_tag": rng.choice(["small", "medium", "large"]),
+                    "story_points": rng.randint(1, 8),
+                    "is_blocked": rng.random() < 0.03,
+                    "is_potential_risk": False,
+                    "due_date": now + timedelta(hours=rng.randint(-24 * 60, 24 * 60)),
+                    "created_at": now - timedelta(minutes=stop - i),
+                    "updated_at": now - timedelta(minutes=rng.randint(0, 60 * 24 * 90))
+                } for i in range(offset, min(offset + 10_000, stop))])
+
+    def capture():
+        """{(endpoint, n): (statement, parameters)} for the task SELECTs each endpoint sends"""
+        seen = {}
+        for method, url in ENDPOINTS:
+            statements = []
+            listener = lambda conn, cursor, statement, parameters, *rest: statements.append((statement, parameters))
+            event.listen(engine, "before_cursor_execute", listener)
+            try:
+                response = client.request(method, url)
+            finally:
+                event.remove(engine, "before_cursor_execute", listener)
+            assert response.status_code == 200, (url, response.text)
+            name = url.split("?")[0].lstrip("/")
+            # A statement repeated per row (one per overloaded assignee, say) is listed once
+            task_selects = {}
+            for statement, parameters in statements:
+                if statement.lstrip().startswith("SELECT") and "FROM tasks" in statement:
+                    task_selects.setdefault(statement, parameters)
+            for n, statement in enumerate(task_selects.items(), 1):
+                seen[(name, n)] = statement
+        return seen
+
+    def measure(statements):
+        """{key: (p50 ms, plan)}, timing each statement on a raw connection"""
+        results = {}
+        raw = engine.raw_connection()
+        try:
+            cursor = raw.cursor()
+            for key, (statement, parameters) in statements.items():
+                plan = "; ".join(row[3] for row in cursor.execute("EXPLAIN QUERY PLAN " + statement, parameters))
+                samples = []
+                for _ in range(args.runs):
+                    began = time.perf_counter()
+                    cursor.execute(statement, parameters).fetchall()
+                    samples.append((time.perf_counter() - began) * 1000)
+                results[key] = (statistics.median(samples), plan)
+        finally:
+            raw.close()
+        return results
+
+    filled = 0
+    for size in sizes:
+        fill(filled, size)
+        filled = size
+        with engine.begin() as connection:
+            in_workspace = connection.execute(text("SELECT count(*) FROM tasks WHERE workspace_id = :ws"), {"ws": WORKSPACE_ID}).scalar()
+            for name in NEW_INDEXES:
+                connection.execute(text(f"DROP INDEX IF EXISTS {name}"))
+        # Pooled connections keep statements prepared against the old schema
+        engine.dispose()
+        before = measure(capture())
+        with engine.begin() as connection:
+            for name in NEW_INDEXES:
+                indexes[name].create(connection)
+        engine.dispose()
+        after = measure(capture())
+
+        print(f"\n{size:,} tasks, {in_workspace:,} in workspace {WORKSPACE_ID}")
+        print(f"{'query':<40} {'before ms':>10} {'after ms':>10}")
+        for key in after:
+            (name, n) = key
+            before_ms, before_plan = before.get(key, (float("nan"), "-"))
+            after_ms, after_plan = after[key]
+            print(f"{name + ' #' + str(n):<40} {before_ms:>10.2f} {after_ms:>10.2f}")
+            print(f"    before: {before_plan}")
+            print(f"    after:  {after_plan}")
+        print(f"{'total':<40} {sum(ms for ms, _ in before.values()):>10.2f} {sum(ms for ms, _ in after.values()):>10.2f}")
+
+if __name__ == "__main__":
+    main()
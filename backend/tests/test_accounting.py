@@ -0,0 +1,93 @@
+"""Unit tests for transcript compaction and LLM usage accounting"""
+import pytest
+from sqlalchemy import create_engine
+from app.ai.accounting import UsageLedger, estimate_tokens
+from app.ai.compaction import compact_transcript
+from app.ai.chunking import split_speaker_turns
+from app.ai.parser import fallback_task_extractor
+from app.ai.prompts import TASK_EXTRACTION_PROMPT, TASK_CONTINUATION_PROMPT, ASSISTANT_CHAT_PROMPT, prompt_name
+from app.models import LLMUsage
+
+def test_compaction_keeps_speakers_and_drops_filler():
+    """Test timestamps, filler words and greetings are removed but attribution survives"""
+    transcript = """[10:00] Priya: Hi everyone!
+[10:01] Priya: Um, so I will, uh, implement the OAuth login by Friday.
+[10:02] Priya: It's, you know, blocked on the DB migration.
+[10:03] QA1: Yes.
+  I'll write the login tests.
+10:05 Dev1: Thanks, bye!"""
+
+    compacted = compact_transcript(transcript)
+
+    assert compacted == (
+        "Priya: so I will implement the OAuth login by Friday.\n"
+        "It's, you know, blocked on the DB migration.\n"
+        "QA1: Yes.\n"
+        "I'll write the login tests."
+    )
+    assert compact_transcript(compacted) == compacted
+
+def test_compaction_keeps_lines_labels_and_meaning():
+    """Test continuation lines stay separate, labels are not speakers, and hedges are not filler"""
+    transcript = "Bob: I will fix the login bug.\nI will update the docs.\nI will review the PR tomorrow."
+    assert compact_transcript(transcript) == transcript
+    assert len(fallback_task_extractor(compact_transcript(transcript))) == len(fallback_task_extractor(transcript)) == 3
+
+    labelled = "Bob: Let's wrap up.\nAction: Sam to rotate the keys.\nTODO: update the runbook."
+    assert compact_transcript(labelled) == labelled
+    assert len(split_speaker_turns(labelled)) == 1
+    assert compact_transcript("Ana: I mean it is kind of done, sort of.") == "Ana: I mean it is kind of done, sort of."
+
+def test_compaction_does_not_touch_words_containing_filler():
+    """Test filler removal only matches whole words"""
+    assert compact_transcript("Dev1: Ship the umbrella hmmm feature") == "Dev1: Ship the umbrella feature"
+
+def test_prompt_name_identifies_templates():
+    """Test formatted prompts are attributed to the template they came from"""
+    assert prompt_name(TASK_EXTRACTION_PROMPT.format(transcript="x")) == "task_extraction"
+    assert prompt_name(TASK_CONTINUATION_PROMPT.format(transcript="x", extracted="- a")) == "task_continuation"
+    assert prompt_name(ASSISTANT_CHAT_PROMPT.format(message="hi", context="")) == "assistant_chat"
+    assert prompt_name("free-form prompt") == "other"
+
+@pytest.fixture
+def usage_engine(tmp_path):
+    usage_engine = create_engine(f"sqlite:///{tmp_path / 'usage.db'}")
+    LLMUsage.__table__.create(bind=usage_engine)
+    yield usage_engine
+    usage_engine.dispose()
+
+def test_usage_ledger_totals_per_workspace(usage_engine):
+    """Test spend is summed per workspace and per prompt template"""
+    ledger = UsageLedger(input_cost_per_1k=1.0, output_cost_per_1k=2.0, recent_calls=10, bind=usage_engine)
+    prompt = TASK_EXTRACTION_PROMPT.format(transcript="Dev1: I will fix the build.")
+    ledger.record(prompt, "x" * 400, 0.5, "gemini-pro", workspace_id=1)
+    ledger.record(prompt, None, 1.5, "gemini-pro", workspace_id=1)
+    ledger.record("free-form prompt", "ok", 0.1, "gemini-pro", workspace_id=2)
+
+    usage = ledger.workspace_usage(1)
+
+    assert usage["totals"]["calls"] == 2
+    assert usage["totals"]["failed_calls"] == 1
+    assert usage["totals"]["output_tokens"] == 100
+    assert usage["totals"]["avg_latency_seconds"] == 1.0
+    assert set(usage["by_prompt"]) == {"task_extraction"}
+    input_tokens = usage["totals"]["input_tokens"]
+    assert usage["totals"]["cost"] == round((input_tokens * 1.0 + 100 * 2.0) / 1000, 6)
+    assert [w["workspace_id"] for w in ledger.summary()["workspaces"]] == [1, 2]
+    assert len(ledger.recent(2)) == 1
+
+def test_usage_ledger_persists_and_bills_hedged_duplicates(usage_engine):
+    """Test usage survives a new ledger (a restart or another worker) and hedged duplicates count as calls"""
+    prompt = TASK_EXTRACTION_PROMPT.format(transcript="Dev1: I will fix the build.")
+    UsageLedger(bind=usage_engine).record(prompt, "x" * 40, 0.5, "gemini-pro", workspace_id=3)
+    UsageLedger(bind=usage_engine).record(prompt, None, 0.6, "gemini-pro", workspace_id=3, hedge=True)
+
+    totals = UsageLedger(bind=usage_engine).workspace_usage(3)["totals"]
+
+    assert totals["calls"] == 2
+    assert totals["hedge_calls"] == 1
+    assert totals["input_tokens"] == 2 * estimate_tokens(prompt)
+    assert [call["hedge"] for call in UsageLedger(bind=usage_engine).recent(3)] == [False, True]
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,79 @@
+"""Tests for the bulk task update endpoint"""
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+from app.main import app
+from app.database import Base, engine, SessionLocal
+from app.models import Task
+
+WORKSPACE_ID = 909
+
+client = TestClient(app)
+
+@pytest.fixture
+def task_ids():
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    tasks = [Task(workspace_id=WORKSPACE_ID, title=f"Card {i}", status="todo", priority=1) for i in range(3)]
+    other = Task(workspace_id=WORKSPACE_ID + 1, title="Elsewhere", status="todo")
+    db.add_all(tasks + [other])
+    db.commit()
+    ids = [task.id for task in tasks] + [other.id]
+    yield ids
+    db.query(Task).filter(Task.id.in_(ids)).delete()
+    db.commit()
+    db.close()
+
+def statuses(ids):
+    db = SessionLocal()
+    try:
+        return [status.value for (status,) in db.query(Task.status).filter(Task.id.in_(ids)).order_by(Task.id)]
+    finally:
+        db.close()
+
+def test_bulk_update_applies_all_in_one_statement_per_row(task_ids):
+    """Test every item is applied and the targets are read with a single SELECT"""
+    statements = []
+    listener = lambda conn, cursor, statement, *args: statements.append(statement.split()[0])
+    event.listen(engine, "before_cursor_execute", listener)
+    try:
+        response = client.patch("/tasks/bulk", json={"updates": [
+            {"id": task_ids[0], "status": "in_progress", "priority": 5},
+            {"id": task_ids[1], "status": "done"},
+            {"id": task_ids[2], "title": "Card 2 renamed"}
+        ]})
+    finally:
+        event.remove(engine, "before_cursor_execute", listener)
+    body = response.json()
+    assert body["committed"] and body["updated"] == 3 and body["failed"] == 0
+    assert body["results"][0]["task"]["priority"] == 5
+    assert body["results"][2]["task"]["title"] == "Card 2 renamed"
+    assert statements.count("SELECT") == 1
+    assert statuses(task_ids[:3]) == ["in_progress", "done", "todo"]
+
+def test_atomic_batch_rolls_back_on_any_failure(task_ids):
+    """Test one missing or foreign task stops the whole atomic batch"""
+    body = client.patch("/tasks/bulk", json={"workspace_id": WORKSPACE_ID, "updates": [
+        {"id": task_ids[0], "status": "done"},
+        {"id": task_ids[3], "status": "done"}
+    ]}).json()
+    assert not body["committed"]
+    assert [result["status"] for result in body["results"]] == ["rolled_back", "not_found"]
+    assert statuses(task_ids[:1]) == ["todo"]
+
+def test_continue_mode_applies_what_it_can(task_ids):
+    """Test continue mode commits the valid items and reports the others"""
+    body = client.patch("/tasks/bulk", json={"mode": "continue", "updates": [
+        {"id": task_ids[0], "status": "qa"},
+        {"id": 999999, "status": "qa"},
+        {"id": task_ids[1], "is_blocked": True, "blocker_reason": "Waiting on API keys"}
+    ]}).json()
+    assert body["committed"] and (body["updated"], body["failed"]) == (2, 1)
+    assert [result["status"] for result in body["results"]] == ["updated", "not_found", "updated"]
+    assert statuses(task_ids[:2]) == ["qa", "todo"]
+    assert client.get(f"/tasks/{task_ids[1]}").json()["blocker_reason"] == "Waiting on API keys"
+
+def test_bulk_update_validates_the_batch():
+    """Test an empty batch or bad mode is rejected before touching the database"""
+    assert client.patch("/tasks/bulk", json={"updates": []}).status_code == 422
+    assert client.patch("/tasks/bulk", json={"mode": "sometimes", "updates": [{"id": 1}]}).status_code == 422
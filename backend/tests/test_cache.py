@@ -0,0 +1,60 @@
+"""Unit tests for the Gemini response cache"""
+import pytest
+from app.ai.cache import LLMCache, cache_key
+
+def test_cache_hit_and_miss(tmp_path):
+    """Test stored values are returned and counters are updated"""
+    cache = LLMCache(path=str(tmp_path / "cache.db"), ttl_seconds=60, max_entries=10, enabled=True)
+    assert cache.get("prompt") is None
+    
+    cache.set("prompt", [{"description": "Task A"}])
+    assert cache.get("prompt") == [{"description": "Task A"}]
+    
+    stats = cache.stats()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 1
+    assert stats["entries"] == 1
+
+def test_cache_ttl_expiry(tmp_path):
+    """Test entries older than the TTL are treated as misses"""
+    cache = LLMCache(path=str(tmp_path / "cache.db"), ttl_seconds=-1, max_entries=10, enabled=True)
+    cache.set("prompt", "summary")
+    assert cache.get("prompt") is None
+    assert cache.stats()["entries"] == 0
+
+def test_cache_evicts_least_recently_used(tmp_path):
+    """Test the entry cap evicts the least recently accessed prompt"""
+    cache = LLMCache(path=str(tmp_path / "cache.db"), ttl_seconds=60, max_entries=2, enabled=True, touch_seconds=0)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+    
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+
+def test_cache_hits_only_write_stale_access_times(tmp_path):
+    """Test a hit on a recently used entry is a read, and one on a stale entry refreshes it"""
+    cache = LLMCache(path=str(tmp_path / "cache.db"), ttl_seconds=60, max_entries=10, enabled=True, touch_seconds=300)
+    cache.set("prompt", "summary")
+    statements = []
+    cache._connection().set_trace_callback(statements.append)
+    for _ in range(3):
+        assert cache.get("prompt") == "summary"
+    assert not [statement for statement in statements if not statement.startswith("SELECT")]
+
+    cache._connection().execute("UPDATE llm_cache SET accessed_at = accessed_at - 600")
+    cache._connection().commit()
+    statements.clear()
+    cache.get("prompt")
+    assert any(statement.startswith("UPDATE") for statement in statements)
+
+def test_cache_key_depends_on_model_and_version():
+    """Test the key changes with model name and prompt template version"""
+    base = cache_key("prompt", model="gemini-pro", version="1")
+    assert base != cache_key("prompt", model="gemini-1.5-flash", version="1")
+    assert base != cache_key("prompt", model="gemini-pro", version="2")
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
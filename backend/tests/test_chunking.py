@@ -0,0 +1,40 @@
+"""Unit tests for long transcript chunking and candidate merging"""
+import pytest
+from app.ai.chunking import split_speaker_turns, chunk_transcript, merge_candidates
+
+def test_split_speaker_turns_keeps_continuation_lines():
+    """Test lines without a speaker prefix stay with the previous turn"""
+    transcript = "Priya: I will fix the login bug\nand update the docs.\nDev1: I'll review it."
+    turns = split_speaker_turns(transcript)
+    assert len(turns) == 2
+    assert "update the docs" in turns[0]
+
+def test_chunk_transcript_respects_size_and_overlap():
+    """Test chunks stay under the size limit and repeat overlapping turns"""
+    transcript = "\n".join(f"Dev{i}: I will handle item number {i} this sprint." for i in range(40))
+    chunks = chunk_transcript(transcript, max_chars=400, overlap_turns=1)
+    
+    assert len(chunks) > 1
+    assert all(len(chunk) <= 400 for chunk in chunks)
+    assert chunks[0].split("\n")[-1] == chunks[1].split("\n")[0]
+    assert "item number 39" in chunks[-1]
+
+def test_short_transcript_is_single_chunk():
+    """Test short transcripts are not split"""
+    assert chunk_transcript("Dev1: I will do it.", max_chars=400) == ["Dev1: I will do it."]
+
+def test_merge_candidates_deduplicates_across_chunks():
+    """Test the same action item from overlapping chunks is merged"""
+    first = [{"description": "Implement OAuth2 login", "assignee": None, "confidence": 0.7, "is_blocked": False}]
+    second = [
+        {"description": "Implement OAuth2 login", "assignee": "Priya", "confidence": 0.9, "is_blocked": False},
+        {"description": "Write test cases", "assignee": "qa1", "confidence": 0.8, "is_blocked": False}
+    ]
+    merged = merge_candidates([first, second])
+    
+    assert len(merged) == 2
+    assert merged[0]["assignee"] == "Priya"
+    assert merged[0]["confidence"] == 0.9
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,46 @@
+"""Unit tests for the fair LLM concurrency limiter"""
+import asyncio
+import pytest
+from app.ai.concurrency import FairLimiter
+
+def test_limiter_caps_global_concurrency():
+    """Test no more than the global limit run at once"""
+    limiter = FairLimiter(limit=2, per_key_limit=2)
+    peak = {"active": 0, "max": 0}
+    
+    async def call(key):
+        async with limiter.slot(key):
+            peak["active"] += 1
+            peak["max"] = max(peak["max"], peak["active"])
+            await asyncio.sleep(0.01)
+            peak["active"] -= 1
+    
+    async def run():
+        await asyncio.gather(*(call(i % 3) for i in range(9)))
+    
+    asyncio.run(run())
+    assert peak["max"] == 2
+    assert limiter.stats()["active"] == 0
+
+def test_limiter_is_fair_across_workspaces():
+    """Test a busy workspace does not starve a later one"""
+    limiter = FairLimiter(limit=1, per_key_limit=1)
+    order = []
+    
+    async def call(key):
+        async with limiter.slot(key):
+            order.append(key)
+            await asyncio.sleep(0)
+    
+    async def run():
+        tasks = [asyncio.create_task(call(1)) for _ in range(4)]
+        await asyncio.sleep(0)
+        tasks.append(asyncio.create_task(call(2)))
+        await asyncio.gather(*tasks)
+    
+    asyncio.run(run())
+    # Workspace 2 is served right after the call already in flight, not after all of workspace 1
+    assert order.index(2) <= 2
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
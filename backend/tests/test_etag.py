@@ -0,0 +1,105 @@
+"""Tests for workspace versions and conditional GETs"""
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import event, update
+from app.main import app
+from app.database import Base, engine, SessionLocal
+from app.models import Task, AgentSuggestion, Meeting, WorkspaceVersion
+from app.caching import get_workspace_version, etag_matches
+
+WORKSPACE_ID = 910
+
+client = TestClient(app)
+
+@pytest.fixture
+def db():
+    Base.metadata.create_all(bind=engine)
+    session = SessionLocal()
+    yield session
+    session.query(Task).filter(Task.workspace_id.in_([WORKSPACE_ID, WORKSPACE_ID + 1])).delete()
+    session.query(AgentSuggestion).filter(AgentSuggestion.workspace_id == WORKSPACE_ID).delete()
+    for meeting in session.query(Meeting).filter(Meeting.workspace_id == WORKSPACE_ID):
+        session.delete(meeting)
+    session.query(WorkspaceVersion).filter(WorkspaceVersion.workspace_id.in_([WORKSPACE_ID, WORKSPACE_ID + 1])).delete()
+    session.commit()
+    session.close()
+
+def version(db):
+    db.expire_all()
+    return get_workspace_version(db, WORKSPACE_ID)
+
+def test_every_write_path_bumps_the_version(db):
+    """Test ORM and Core writes to tasks, suggestions and meetings each advance the version"""
+    start = version(db)
+    task = Task(workspace_id=WORKSPACE_ID, title="Ship it", status="todo")
+    db.add(task)
+    db.commit()
+    assert version(db) > start
+
+    seen = version(db)
+    db.execute(update(Task).where(Task.id == task.id).values(priority=3))
+    db.commit()
+    assert version(db) > seen
+
+    seen = version(db)
+    suggestion = AgentSuggestion(workspace_id=WORKSPACE_ID, suggestion_type="task", payload={}, applied=False)
+    db.add(suggestion)
+    db.commit()
+    suggestion.applied = True
+    db.commit()
+    assert version(db) >= seen + 2
+
+    seen = version(db)
+    db.add(Meeting(workspace_id=WORKSPACE_ID, title="Standup", transcript_text="PM: Hi."))
+    db.commit()
+    assert version(db) > seen
+
+    # Moving a task changes both workspaces; a rolled back write changes neither
+    other = get_workspace_version(db, WORKSPACE_ID + 1)
+    seen = version(db)
+    task.workspace_id = WORKSPACE_ID + 1
+    db.commit()
+    assert version(db) > seen and get_workspace_version(db, WORKSPACE_ID + 1) > other
+    seen = version(db)
+    db.add(Task(workspace_id=WORKSPACE_ID, title="Never mind"))
+    db.flush()
+    db.rollback()
+    assert version(db) == seen
+
+def test_task_list_answers_304_until_a_write(db):
+    """Test a matching If-None-Match gets 304 without querying tasks, and a write changes the tag"""
+    db.add(Task(workspace_id=WORKSPACE_ID, title="Ship it", status="todo"))
+    db.commit()
+    url = f"/tasks/?workspace_id={WORKSPACE_ID}&fields=id,title"
+    first = client.get(url)
+    etag = first.headers["ETag"]
+    assert first.status_code == 200 and etag.startswith('W/"')
+    assert client.get(f"/tasks/?workspace_id={WORKSPACE_ID}&fields=id").headers["ETag"] != etag
+
+    statements = []
+    listener = lambda conn, cursor, statement, *args: statements.append(statement)
+    event.listen(engine, "before_cursor_execute", listener)
+    try:
+        cached = client.get(url, headers={"If-None-Match": etag})
+    finally:
+        event.remove(engine, "before_cursor_execute", listener)
+    assert cached.status_code == 304 and cached.content == b"" and cached.headers["ETag"] == etag
+    assert len(statements) == 1 and "workspace_versions" in statements[0]
+
+    client.patch("/tasks/bulk", json={"updates": [{"id": first.json()[0]["id"], "status": "done"}]})
+    fresh = client.get(url, headers={"If-None-Match": etag})
+    assert fresh.status_code == 200 and fresh.headers["ETag"] != etag
+
+def test_briefing_and_analytics_are_tagged(db):
+    """Test the time-relative endpoints emit ETags and honour If-None-Match"""
+    for url in (f"/briefing/daily?workspace_id={WORKSPACE_ID}", f"/analytics/risk-heatmap?workspace_id={WORKSPACE_ID}"):
+        etag = client.get(url).headers["ETag"]
+        assert client.get(url, headers={"If-None-Match": f'"other", {etag}'}).status_code == 304
+
+def test_etag_matching():
+    """Test weak comparison, lists and the wildcard"""
+    assert etag_matches('"ws1-v2-abc"', 'W/"ws1-v2-abc"')
+    assert etag_matches('W/"x", W/"ws1-v2-abc"', 'W/"ws1-v2-abc"')
+    assert etag_matches("*", 'W/"ws1-v2-abc"')
+    assert not etag_matches(None, 'W/"ws1-v2-abc"')
+    assert not etag_matches('W/"ws1-v3-abc"', 'W/"ws1-v2-abc"')
@@ -0,0 +1,68 @@
+"""Tests for the fake Gemini server and its HTTP client"""
+import asyncio
+import threading
+import httpx
+import pytest
+from app.ai.fake_server import FakeModelConfig, create_server, parse_latency
+from app.ai.fake_client import FakeGenerativeModel
+
+@pytest.fixture
+def fake_server():
+    config = FakeModelConfig(latency="fixed:0")
+    server = create_server("127.0.0.1", 0, config)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield server, config
+    server.shutdown()
+
+def _url(server):
+    return f"http://127.0.0.1:{server.server_address[1]}"
+
+def test_fake_model_generate_and_stream(fake_server):
+    """Test the client gets the canned reply both whole and streamed"""
+    server, config = fake_server
+    model = FakeGenerativeModel(_url(server), timeout=5)
+    prompt = "Summarize this meeting transcript in 2-3 sentences."
+    
+    text = model.generate_content(prompt).text
+    
+    async def collect():
+        stream = await model.generate_content_async(prompt, stream=True)
+        return [chunk.text async for chunk in stream]
+    
+    pieces = asyncio.run(collect())
+    assert len(pieces) > 1
+    assert "".join(pieces) == text
+    assert config.stats["requests"] == 2
+
+def test_fake_model_async_calls_from_separate_event_loops(fake_server):
+    """Test async calls work from one event loop after another, each with its own pooled client"""
+    server, config = fake_server
+    model = FakeGenerativeModel(_url(server), timeout=5)
+    prompt = "Summarize this meeting transcript in 2-3 sentences."
+
+    async def generate():
+        return (await model.generate_content_async(prompt)).text
+
+    assert asyncio.run(generate()) == asyncio.run(generate())
+    assert config.stats["requests"] == 2
+
+def test_fake_server_injects_failures(fake_server):
+    """Test error injection surfaces as HTTP errors"""
+    server, config = fake_server
+    config.error_rate = 1.0
+    model = FakeGenerativeModel(_url(server), timeout=5)
+    
+    with pytest.raises(httpx.HTTPStatusError):
+        model.generate_content("anything")
+    assert config.stats["errors"] == 1
+
+def test_parse_latency_distributions():
+    """Test latency specs produce non-negative samples in seconds"""
+    assert parse_latency("fixed:250")() == 0.25
+    assert 0.1 <= parse_latency("uniform:100,200")() <= 0.2
+    assert parse_latency("lognormal:500,0.5")() >= 0
+    with pytest.raises(ValueError):
+        parse_latency("pareto:1")
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,185 @@
+"""Unit tests for Gemini client orchestration with a stubbed model"""
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import pytest
+from app.ai import gemini_client
+from app.ai.cache import LLMCache
+from app.ai.mock import mock_response
+from app.ai.prompts import TASK_EXTRACTION_PROMPT, TASK_CONTINUATION_PROMPT
+from app.ai.resilience import CircuitBreaker
+
+@pytest.fixture
+def live_model(monkeypatch):
+    """Pretend the model is live and return queued responses in order"""
+    responses = []
+    prompts = []
+    
+    def fake_call(prompt, workspace_id=None):
+        prompts.append(prompt)
+        return responses.pop(0)
+    
+    monkeypatch.setattr(gemini_client, "_model_available", lambda: True)
+    monkeypatch.setattr(gemini_client, "_call_model", fake_call)
+    monkeypatch.setattr(gemini_client.llm_cache, "enabled", False)
+    return responses, prompts
+
+def test_truncated_extraction_reprompts_for_tail_only(live_model):
+    """Test a cut-off array keeps its valid items and asks only for the rest"""
+    responses, prompts = live_model
+    responses.append('[{"description": "Implement login", "confidence": 0.9, "is_blocked": false}, {"descr')
+    responses.append('[{"description": "Write login tests", "confidence": 0.8, "is_blocked": false}]')
+    
+    tasks = gemini_client.generate_tasks_from_transcript("Dev1: I will implement login.\nQA1: I'll write tests.")
+    
+    assert [task["description"] for task in tasks] == ["Implement login", "Write login tests"]
+    assert len(prompts) == 2
+    assert "- Implement login" in prompts[1]
+
+def test_open_breaker_uses_rule_based_fallback(monkeypatch):
+    """Test calls fail fast to the fallback extractor while the breaker is open"""
+    calls = []
+    monkeypatch.setattr(gemini_client, "_model_available", lambda: True)
+    monkeypatch.setattr(gemini_client.llm_cache, "enabled", False)
+    monkeypatch.setattr(gemini_client.llm_breaker, "allow", lambda: False)
+    monkeypatch.setattr(gemini_client, "gemini_model", type("Model", (), {"generate_content": lambda self, p: calls.append(p)})())
+    
+    tasks = gemini_client.generate_tasks_from_transcript("Dev1: I will fix the build.")
+    
+    assert calls == []
+    assert [task["confidence"] for task in tasks] == [0.5]
+    assert gemini_client.llm_metrics()["calls"]["short_circuited"] >= 1
+
+def test_rice_batches_split_by_count_and_size():
+    """Test batches respect both the item cap and the character budget"""
+    tasks = {i: "x" * 50 for i in range(7)}
+    assert [len(b) for b in gemini_client._rice_batches(tasks, max_items=3, max_chars=10_000)] == [3, 3, 1]
+    assert [len(b) for b in gemini_client._rice_batches(tasks, max_items=10, max_chars=130)] == [2, 2, 2, 1]
+
+def test_rice_batch_retries_missing_ids_then_falls_back(monkeypatch):
+    """Test ids left out of a reply are re-requested once, then get the fallback"""
+    prompts = []
+    replies = [
+        '[{"id": 1, "reach": 10, "impact": 5, "confidence": 0.5, "effort": 2}, {"id": 2, "reach": "bad"}]',
+        '[{"id": 2, "reach": 20, "impact": 4, "confidence": 0.9, "effort": 1}]'
+    ]
+    
+    async def fake_call(prompt, workspace_id=None):
+        prompts.append(prompt)
+        return replies.pop(0) if replies else "[]"
+    
+    monkeypatch.setattr(gemini_client, "_model_available", lambda: True)
+    monkeypatch.setattr(gemini_client, "_call_model_async", fake_call)
+    monkeypatch.setattr(gemini_client.llm_cache, "enabled", False)
+    
+    scores = asyncio.run(gemini_client.score_rice_batch_async({1: "Login", 2: "Tests", 3: "Docs"}))
+    
+    assert scores[1] == {"reach": 10, "impact": 5, "confidence": 0.5, "effort": 2, "source": "model"}
+    assert scores[2]["source"] == "model" and scores[2]["reach"] == 20
+    assert scores[3]["source"] == "fallback"
+    assert len(prompts) == 2
+    assert "[1]" not in prompts[1] and "[2] Tests" in prompts[1] and "[3] Docs" in prompts[1]
+
+@pytest.fixture
+def half_open_breaker(monkeypatch):
+    """A breaker past its cooldown, so the next call is the single half-open probe"""
+    breaker = CircuitBreaker(failure_rate=0.5, window=2, min_calls=2, cooldown_seconds=0)
+    breaker.record_failure()
+    breaker.record_failure()
+    monkeypatch.setattr(gemini_client, "llm_breaker", breaker)
+    monkeypatch.setattr(gemini_client, "_model_available", lambda: True)
+    return breaker
+
+def test_cancelled_probe_releases_half_open_breaker(half_open_breaker, monkeypatch):
+    """Test a probe cancelled mid-call does not leave every later call short-circuited"""
+    async def hang(prompt):
+        await asyncio.sleep(10)
+
+    monkeypatch.setattr(gemini_client, "gemini_model", type("Model", (), {"generate_content_async": lambda self, p, stream=False: hang(p)})())
+
+    async def run():
+        call = asyncio.ensure_future(gemini_client._call_model_async("Prompt", workspace_id=1))
+        await asyncio.sleep(0.05)
+        assert not half_open_breaker.allow()  # the probe is out
+        call.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await call
+
+    asyncio.run(run())
+    assert half_open_breaker.state == "half_open"
+    assert half_open_breaker.allow()
+
+def test_closed_stream_releases_half_open_breaker(half_open_breaker, monkeypatch):
+    """Test a client disconnecting from a probing stream frees the probe"""
+    class Chunk:
+        text = "partial"
+
+    class Stream:
+        def __aiter__(self):
+            return self
+
+        async def __anext__(self):
+            return Chunk()
+
+    async def open_stream(prompt):
+        return Stream()
+
+    monkeypatch.setattr(gemini_client, "gemini_model", type("Model", (), {"generate_content_async": lambda self, p, stream=False: open_stream(p)})())
+
+    async def run():
+        chunks = gemini_client._stream_model_async("Prompt", workspace_id=1)
+        assert await chunks.__anext__() == "partial"
+        await chunks.aclose()
+
+    asyncio.run(run())
+    assert half_open_breaker.allow()
+
+def test_fake_mode_replies_are_not_served_as_real_ones(monkeypatch, tmp_path):
+    """Test the cache is keyed on the active model, so fake-server replies stay out of live lookups"""
+    replies = {"fake": "canned", "gemini": "live"}
+    monkeypatch.setattr(gemini_client, "llm_cache", LLMCache(path=str(tmp_path / "cache.db"), enabled=True))
+    monkeypatch.setattr(gemini_client, "_model_available", lambda: True)
+    monkeypatch.setattr(gemini_client, "_call_model", lambda prompt, workspace_id=None: replies[gemini_client.AI_MODE])
+
+    monkeypatch.setattr(gemini_client, "AI_MODE", "fake")
+    assert gemini_client._cached_generate("Summarize", None) == "canned"
+    monkeypatch.setattr(gemini_client, "AI_MODE", "gemini")
+    assert gemini_client._cached_generate("Summarize", None) == "live"
+    assert gemini_client.llm_cache.hits == 0
+
+def test_sync_calls_are_billed_to_their_workspace(monkeypatch):
+    """Test chat and single RICE scoring record their workspace in the usage ledger"""
+    recorded = []
+    reply = type("Reply", (), {"text": '{"reach": 5, "impact": 2, "confidence": 0.8, "effort": 3}'})()
+    monkeypatch.setattr(gemini_client, "_model_available", lambda: True)
+    monkeypatch.setattr(gemini_client.llm_cache, "enabled", False)
+    monkeypatch.setattr(gemini_client, "llm_breaker", CircuitBreaker())
+    monkeypatch.setattr(gemini_client, "gemini_model", type("Model", (), {"generate_content": lambda self, p: reply})())
+    monkeypatch.setattr(gemini_client.usage_ledger, "record", lambda *args, **kwargs: recorded.append(args[4]))
+
+    gemini_client.score_rice("Add SSO login", workspace_id=7)
+    gemini_client.assistant_chat("What is blocked?", workspace_id=8)
+    assert recorded == [7, 8]
+
+def test_mock_tells_extraction_from_continuation():
+    """Test the canned continuation reply adds nothing, so mock extraction is not doubled"""
+    extraction = TASK_EXTRACTION_PROMPT.format(transcript="Dev1: I will fix the build.")
+    continuation = TASK_CONTINUATION_PROMPT.format(extracted="[]", transcript="Dev1: I will fix the build.")
+    assert len(json.loads(mock_response(extraction))) == 2
+    assert mock_response(continuation) == "[]"
+
+def test_importing_the_app_does_not_import_the_sdk(tmp_path):
+    """Test the Gemini SDK stays out of app.main's imports; it is loaded on first use or by warm_up"""
+    env = dict(os.environ, DATABASE_URL=f"sqlite:///{tmp_path / 'startup.db'}", AI_MODE="gemini")
+    backend = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    result = subprocess.run(
+        [sys.executable, "-c", "import sys, app.main; print('google.generativeai' in sys.modules)"],
+        capture_output=True, text=True, env=env, cwd=backend
+    )
+    assert result.returncode == 0, result.stderr
+    assert result.stdout.strip() == "False"
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
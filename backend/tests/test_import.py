@@ -0,0 +1,169 @@
+"""Tests for bulk transcript import: streamed NDJSON, multi-file upload and progress"""
+import asyncio
+import json
+from datetime import datetime, timedelta
+import pytest
+from fastapi.testclient import TestClient
+from app.main import app
+from app.database import Base, engine, SessionLocal
+from app.models import Meeting, MeetingImport, AgentSuggestion, Job
+from app.services import import_service
+from app.services.import_service import iter_lines, import_ndjson
+from app.services.meeting_service import unfinished_extraction
+from app.jobs.worker import WorkerPool
+
+WORKSPACE_ID = 905
+
+client = TestClient(app)
+
+@pytest.fixture
+def db():
+    Base.metadata.create_all(bind=engine)
+    session = SessionLocal()
+    yield session
+    session.query(AgentSuggestion).filter(AgentSuggestion.workspace_id == WORKSPACE_ID).delete()
+    session.query(Meeting).filter(Meeting.workspace_id == WORKSPACE_ID).delete()
+    session.query(MeetingImport).filter(MeetingImport.workspace_id == WORKSPACE_ID).delete()
+    session.query(Job).filter(Job.workspace_id == WORKSPACE_ID).delete()
+    session.commit()
+    session.close()
+
+def record(i: int) -> dict:
+    return {
+        "title": f"Standup {i}",
+        "meeting_date": "2025-02-03T09:00:00",
+        "transcript": f"Dev{i}: I will fix the export bug number {i} by Friday."
+    }
+
+def test_iter_lines_splits_across_chunks_and_drops_long_lines():
+    """Test lines are reassembled across chunk boundaries and oversized ones are reported, not kept"""
+    async def chunks():
+        for chunk in (b'{"a": 1}\n{"b"', b': 2}\n\n', b"x" * 50, b"y" * 50 + b"\n", b'{"c": 3}'):
+            yield chunk
+
+    async def collect():
+        return [item async for item in iter_lines(chunks(), max_bytes=64)]
+
+    assert asyncio.run(collect()) == [(1, b'{"a": 1}'), (2, b'{"b": 2}'), (4, None), (5, b'{"c": 3}')]
+
+def test_ndjson_import_stores_in_batches_and_reports_bad_lines(db, monkeypatch):
+    """Test valid lines become meetings of the import, bad ones are counted with their line number"""
+    monkeypatch.setattr(import_service, "IMPORT_BATCH_SIZE", 2)
+    lines = [json.dumps(record(i)) for i in range(5)]
+    lines.insert(2, "{not json")
+    lines.insert(4, json.dumps({"title": "No transcript", "meeting_date": "2025-02-03T09:00:00"}))
+
+    def body():
+        # Streamed in small pieces, as a client uploading a large file would
+        payload = ("\n".join(lines) + "\n").encode()
+        for start in range(0, len(payload), 37):
+            yield payload[start:start + 37]
+
+    response = client.post(
+        f"/meetings/import?workspace_id={WORKSPACE_ID}",
+        content=body(),
+        headers={"Content-Type": "application/x-ndjson"}
+    )
+    assert response.status_code == 202
+    summary = response.json()
+    assert (summary["received"], summary["stored"], summary["rejected"]) == (7, 5, 2)
+    assert [error["line"] for error in summary["errors"]] == [3, 5]
+    assert "transcript" in summary["errors"][1]["error"]
+    stored = db.query(Meeting).filter(Meeting.import_id == summary["import_id"]).count()
+    assert stored == 5
+
+    progress = client.get(f"/meetings/imports/{summary['import_id']}").json()
+    assert progress["status"] == "queued" and progress["pending"] == 5 and progress["job"]["job_id"] == summary["job_id"]
+
+    asyncio.run(WorkerPool(size=1).drain())
+    progress = client.get(f"/meetings/imports/{summary['import_id']}").json()
+    assert progress["status"] == "completed"
+    assert (progress["processed"], progress["failed"], progress["pending"]) == (5, 0, 0)
+    assert progress["progress"] == 1.0 and progress["job"]["status"] == "succeeded"
+    assert db.query(Meeting).filter(Meeting.import_id == summary["import_id"], Meeting.analysis.is_(None)).count() == 0
+
+def test_multi_file_upload(db):
+    """Test transcript files become one meeting each and NDJSON files are read line by line"""
+    files = [
+        ("files", ("planning-review.txt", b"Alice: I will update the roadmap by Monday.", "text/plain")),
+        ("files", ("backlog.ndjson", (json.dumps(record(1)) + "\n" + json.dumps(record(2)) + "\n").encode(), "application/x-ndjson")),
+        ("files", ("binary.txt", b"\xff\xfe\x00", "text/plain"))
+    ]
+    response = client.post(
+        f"/meetings/import?workspace_id={WORKSPACE_ID}",
+        files=files,
+        data={"meeting_date": "2025-02-04T15:00:00"}
+    )
+    assert response.status_code == 202
+    summary = response.json()
+    assert (summary["stored"], summary["rejected"]) == (3, 1)
+    assert summary["errors"] == [{"file": "binary.txt", "error": "Transcript is not UTF-8 text"}]
+    titles = {title for (title,) in db.query(Meeting.title).filter(Meeting.import_id == summary["import_id"])}
+    assert titles == {"planning-review", "Standup 1", "Standup 2"}
+
+def test_failed_meetings_are_reported_and_retried(db, monkeypatch):
+    """Test one failing meeting does not stop the import, and a rerun picks it up"""
+    response = client.post(
+        f"/meetings/import?workspace_id={WORKSPACE_ID}",
+        content="\n".join(json.dumps(record(i)) for i in range(4)),
+        headers={"Content-Type": "application/x-ndjson"}
+    )
+    import_id = response.json()["import_id"]
+    failing = db.query(Meeting.id).filter(Meeting.import_id == import_id).order_by(Meeting.id).first().id
+    process_meeting = import_service.process_meeting
+
+    async def flaky(session, meeting_id):
+        if meeting_id == failing:
+            raise RuntimeError("model timed out")
+        return await process_meeting(session, meeting_id)
+
+    monkeypatch.setattr(import_service, "process_meeting", flaky)
+    asyncio.run(import_service.run_import(db, import_id, concurrency=2))
+    progress = client.get(f"/meetings/imports/{import_id}").json()
+    assert (progress["processed"], progress["failed"], progress["pending"]) == (3, 1, 0)
+    assert progress["errors"] == [{"meeting_id": failing, "error": "RuntimeError: model timed out"}]
+
+    monkeypatch.setattr(import_service, "process_meeting", process_meeting)
+    asyncio.run(import_service.run_import(db, import_id))
+    progress = client.get(f"/meetings/imports/{import_id}").json()
+    assert (progress["processed"], progress["failed"], progress["errors"]) == (4, 0, [])
+
+def test_empty_import_completes_without_a_job(db):
+    """Test an upload with no valid records finishes immediately"""
+    response = client.post(
+        f"/meetings/import?workspace_id={WORKSPACE_ID}",
+        content=b"\n\n",
+        headers={"Content-Type": "application/x-ndjson"}
+    )
+    summary = response.json()
+    assert summary["job_id"] is None and summary["received"] == 0
+    assert client.get(f"/meetings/imports/{summary['import_id']}").json()["status"] == "completed"
+    assert client.get("/meetings/imports/999999").status_code == 404
+
+def test_broken_upload_is_failed_and_releases_its_meetings(db, monkeypatch):
+    """Test any error while receiving fails the import, and a receiving import only holds its meetings for the lease"""
+    async def broken(writer, chunks):
+        await import_ndjson(writer, chunks)
+        writer.flush()
+        raise RuntimeError("disk I/O error")
+
+    monkeypatch.setattr("app.routers.meetings.import_ndjson", broken)
+    with pytest.raises(RuntimeError):
+        client.post(
+            f"/meetings/import?workspace_id={WORKSPACE_ID}",
+            content=json.dumps(record(1)),
+            headers={"Content-Type": "application/x-ndjson"}
+        )
+    meeting_import = db.query(MeetingImport).filter(MeetingImport.workspace_id == WORKSPACE_ID).one()
+    meeting = db.query(Meeting).filter(Meeting.import_id == meeting_import.id).one()
+    assert meeting_import.status == "failed"
+    assert meeting_import.errors == [{"error": "Import failed: RuntimeError"}]
+    assert not unfinished_extraction(db, meeting)
+
+    # An upload that died without reaching the handler leaves the import receiving
+    meeting_import.status = "receiving"
+    db.commit()
+    assert unfinished_extraction(db, meeting)
+    meeting_import.updated_at = datetime.utcnow() - timedelta(hours=1)
+    db.commit()
+    assert not unfinished_extraction(db, meeting)
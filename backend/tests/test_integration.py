@@ -1,12 +1,25 @@
 """Integration test for meeting -> review -> approve -> task flow"""
+import asyncio
 import pytest
+from sqlalchemy import text
 from fastapi.testclient import TestClient
 from app.main import app
 from app.database import SessionLocal
 from app.seed_data import seed_all
+from app.jobs.worker import WorkerPool
 
 client = TestClient(app)
 
+def process_meeting(payload: dict) -> dict:
+    """Queue a meeting, run the queue, and return the finished job's result"""
+    response = client.post("/meetings/process", json=payload)
+    assert response.status_code == 202
+    job_id = response.json()["job_id"]
+    asyncio.run(WorkerPool(size=1).drain())
+    job = client.get(f"/jobs/{job_id}").json()
+    assert job["status"] == "succeeded"
+    return job["result"]
+
 @pytest.fixture(scope="module")
 def setup_db():
     """Setup test database with seed data"""
@@ -28,14 +41,13 @@ def test_full_workflow(setup_db):
     token = login_response.json()["token"]
     
     # 2. Process meeting
-    meeting_response = client.post("/meetings/process", json={
+    result = process_meeting({
         "workspace_id": 1,
         "title": "Test Meeting",
         "meeting_date": "2025-01-15T10:00:00",
         "transcript": "Dev1: I will implement the new feature by Friday."
     })
-    assert meeting_response.status_code == 200
-    assert "candidates" in meeting_response.json()
+    assert "candidates" in result
     
     # 3. Get review queue
     review_response = client.get("/tasks/review?workspace_id=1")
@@ -54,6 +66,93 @@ def test_full_workflow(setup_db):
     tasks = tasks_response.json()
     assert len(tasks) > 0
 
+def test_streaming_meeting_processing(setup_db):
+    """Test candidates are pushed as SSE events"""
+    with client.stream("POST", "/meetings/process/stream", json={
+        "workspace_id": 1,
+        "title": "Streamed Meeting",
+        "meeting_date": "2025-01-15T10:00:00",
+        "transcript": "Dev3: I will write the release notes by Thursday."
+    }) as response:
+        assert response.status_code == 200
+        body = "".join(response.iter_text())
+    
+    assert body.startswith("event: meeting")
+    assert "event: candidate" in body
+    assert body.rstrip().split("\n")[-2] == "event: done"
+
+def test_duplicate_meeting_reuses_extraction(setup_db):
+    """Test uploading the same meeting twice does not create duplicate suggestions"""
+    payload = {
+        "workspace_id": 1,
+        "title": "Planning",
+        "meeting_date": "2025-01-16T10:00:00",
+        "transcript": "PM: We reviewed the quarterly roadmap and agreed on priorities.\n"
+                      "Dev2: I will migrate the reporting jobs to the new scheduler this sprint.\n"
+                      "QA2: I will draft regression cases for the reporting exports."
+    }
+    first = process_meeting(payload)
+    second = process_meeting({**payload, "title": "Planning (re-upload)"})
+    
+    assert first["duplicate_of"] is None
+    assert second["duplicate_of"] == first["meeting_id"]
+    assert second["suggestions_created"] == 0
+    assert second["candidates"] == first["candidates"]
+
+def test_meeting_list_omits_transcripts(setup_db):
+    """Test transcripts are stored compressed, left out of the list and served on their own"""
+    transcript = "Dev1: I will document the deploy checklist before the release.\n" * 20
+    meeting_id = process_meeting({
+        "workspace_id": 1,
+        "title": "Release prep",
+        "meeting_date": "2025-01-18T10:00:00",
+        "transcript": transcript
+    })["meeting_id"]
+
+    listed = {meeting["id"]: meeting for meeting in client.get("/meetings/?workspace_id=1").json()}
+    assert "transcript_text" not in listed[meeting_id]
+    assert listed[meeting_id]["transcript_size"] == len(transcript)
+    assert client.get(f"/meetings/{meeting_id}/transcript").json()["transcript"] == transcript
+    assert client.get("/meetings/999999/transcript").status_code == 404
+
+    db = SessionLocal()
+    try:
+        stored = db.execute(text("SELECT transcript_text FROM meetings WHERE id = :id"), {"id": meeting_id}).scalar()
+    finally:
+        db.close()
+    assert isinstance(stored, bytes) and len(stored) < len(transcript) // 4
+
+def test_backlog_rice_scoring(setup_db):
+    """Test the whole todo backlog is scored and ranked"""
+    response = client.post("/tasks/rice-score?workspace_id=1")
+    assert response.status_code == 200
+    data = response.json()
+    todo = client.get("/tasks/?workspace_id=1&status=todo").json()
+    assert data["scored"] == len(todo)
+    assert {item["task_id"] for item in data["tasks"]} == {task["id"] for task in todo}
+    scores = [item["rice_score"] for item in data["tasks"]]
+    assert scores == sorted(scores, reverse=True)
+
+def test_bulk_suggestion_endpoints_return_ids(setup_db):
+    """Test endpoints that create suggestions in bulk report the ids they inserted, in order"""
+    meeting_id = process_meeting({
+        "workspace_id": 1,
+        "title": "Auto-map source",
+        "meeting_date": "2025-01-17T10:00:00",
+        "transcript": "Sam will update the billing runbook by Friday. Lee should review the export job. Nice weather today."
+    })["meeting_id"]
+    mapped = client.post(f"/auto-map/process-meeting?meeting_id={meeting_id}").json()
+    assert mapped["tasks_mapped"] == 2
+    ids = [task["id"] for task in mapped["suggestions"]]
+    assert ids == sorted(ids)
+    
+    review = {item["id"]: item for item in client.get("/tasks/review?workspace_id=1").json()}
+    for task in mapped["suggestions"]:
+        assert task["id"] in review
+    
+    risks = client.post("/smart/detect-risks?workspace_id=1").json()
+    assert risks["risks_detected"] == len(risks["suggestion_ids"])
+
 def test_analytics_endpoints(setup_db):
     """Test analytics endpoints return data"""
     
@@ -0,0 +1,194 @@
+"""Unit tests for the database-backed job queue and worker pool"""
+import asyncio
+from datetime import datetime, timedelta
+import pytest
+from app.database import Base, engine, SessionLocal
+from app.models import Job
+from app.jobs import queue
+from app.jobs.queue import enqueue, claim, heartbeat, complete, fail, release, reap_expired, queue_stats
+from app.jobs.handlers import HANDLERS, PermanentJobError
+from app.jobs.worker import WorkerPool
+
+WORKSPACE_ID = 904
+
+@pytest.fixture
+def db():
+    Base.metadata.create_all(bind=engine)
+    session = SessionLocal()
+    # Park jobs other tests left queued so claims here only see this test's jobs
+    session.query(Job).filter(Job.status.in_(["queued", "running"])).update({Job.status: "failed"}, synchronize_session=False)
+    session.commit()
+    yield session
+    session.query(Job).filter(Job.workspace_id == WORKSPACE_ID).delete()
+    session.commit()
+    session.close()
+
+@pytest.fixture
+def handlers(monkeypatch):
+    calls = []
+
+    async def echo(db, payload):
+        calls.append(payload)
+        return {"echo": payload["value"]}
+
+    async def flaky(db, payload):
+        calls.append(payload)
+        if sum(1 for call in calls if "fail_times" in call) <= payload["fail_times"]:
+            raise RuntimeError("model timed out")
+        return {"ok": True}
+
+    async def broken(db, payload):
+        raise PermanentJobError("meeting deleted")
+
+    monkeypatch.setitem(HANDLERS, "test_echo", echo)
+    monkeypatch.setitem(HANDLERS, "test_flaky", flaky)
+    monkeypatch.setitem(HANDLERS, "test_broken", broken)
+    monkeypatch.setattr(queue, "JOB_RETRY_BACKOFF_SECONDS", 0)
+    return calls
+
+def test_claim_is_exclusive_until_lease_expires(db):
+    """Test a claimed job is invisible to other workers until its lease runs out"""
+    job = enqueue(db, "test_echo", {"value": 1}, WORKSPACE_ID)
+    claimed = claim(db, "worker-a", lease_seconds=60)
+    assert claimed.id == job.id and claimed.attempts == 1 and claimed.lease_owner == "worker-a"
+    assert claim(db, "worker-b") is None
+
+    db.query(Job).filter(Job.id == job.id).update({Job.lease_expires_at: datetime.utcnow() - timedelta(seconds=1)})
+    db.commit()
+    reclaimed = claim(db, "worker-b")
+    assert reclaimed.id == job.id and reclaimed.attempts == 2
+    # The original worker lost the lease: it can neither extend it nor complete the job
+    assert not heartbeat(db, job.id, "worker-a")
+    assert not complete(db, job.id, "worker-a", {"stale": True})
+    assert complete(db, job.id, "worker-b", {"fresh": True})
+    db.refresh(reclaimed)
+    assert reclaimed.status == "succeeded" and reclaimed.result == {"fresh": True}
+
+def test_failed_attempt_backs_off_then_fails_for_good(db, monkeypatch):
+    """Test failures go back to the queue with backoff until max_attempts"""
+    monkeypatch.setattr(queue, "JOB_RETRY_BACKOFF_SECONDS", 30)
+    job = enqueue(db, "test_echo", {"value": 1}, WORKSPACE_ID, max_attempts=2)
+    claim(db, "worker-a")
+    fail(db, job.id, "worker-a", "boom")
+    db.refresh(job)
+    assert job.status == "queued" and job.run_after > datetime.utcnow() + timedelta(seconds=25)
+    assert claim(db, "worker-a") is None  # still backing off
+
+    db.query(Job).filter(Job.id == job.id).update({Job.run_after: datetime.utcnow()})
+    db.commit()
+    claim(db, "worker-a")
+    fail(db, job.id, "worker-a", "boom again")
+    db.refresh(job)
+    assert job.status == "failed" and job.error == "boom again" and job.finished_at is not None
+
+def test_expired_last_attempt_is_reaped(db):
+    """Test a job whose worker died on its final attempt ends up failed, not stuck running"""
+    job = enqueue(db, "test_echo", {"value": 1}, WORKSPACE_ID, max_attempts=1)
+    claim(db, "worker-a")
+    db.query(Job).filter(Job.id == job.id).update({Job.lease_expires_at: datetime.utcnow() - timedelta(seconds=1)})
+    db.commit()
+    assert claim(db, "worker-b") is None
+    assert reap_expired(db) == 1
+    db.refresh(job)
+    assert job.status == "failed"
+
+def test_release_does_not_count_attempt(db):
+    """Test a job handed back on shutdown keeps its attempt budget"""
+    job = enqueue(db, "test_echo", {"value": 1}, WORKSPACE_ID)
+    claim(db, "worker-a")
+    assert release(db, job.id, "worker-a")
+    db.refresh(job)
+    assert job.status == "queued" and job.attempts == 0
+
+def test_pool_runs_retries_and_permanent_failures(db, handlers):
+    """Test the pool completes jobs, retries transient errors and stops on permanent ones"""
+    echo = enqueue(db, "test_echo", {"value": 7}, WORKSPACE_ID)
+    flaky = enqueue(db, "test_flaky", {"fail_times": 1}, WORKSPACE_ID)
+    broken = enqueue(db, "test_broken", {}, WORKSPACE_ID)
+    unknown = enqueue(db, "test_missing_kind", {}, WORKSPACE_ID)
+
+    pool = WorkerPool(size=2)
+    asyncio.run(pool.drain())
+    for job in (echo, flaky, broken, unknown):
+        db.refresh(job)
+    assert echo.status == "succeeded" and echo.result == {"echo": 7}
+    assert flaky.status == "succeeded" and flaky.attempts == 2
+    assert broken.status == "failed" and broken.attempts == 1 and broken.error == "meeting deleted"
+    assert unknown.status == "failed" and "No handler" in unknown.error
+    assert queue_stats(db, WORKSPACE_ID) == {"queued": 0, "running": 0, "succeeded": 2, "failed": 2}
+
+def test_started_pool_picks_up_jobs_when_woken(db, handlers):
+    """Test running workers pick up a new job on wake() without waiting for the poll interval"""
+    async def scenario():
+        pool = WorkerPool(size=2, poll_interval=30)
+        pool.start()
+        await asyncio.sleep(0.05)
+        session = SessionLocal()
+        try:
+            job = enqueue(session, "test_echo", {"value": 3}, WORKSPACE_ID)
+            pool.wake()
+            for _ in range(100):
+                await asyncio.sleep(0.02)
+                session.refresh(job)
+                if job.status == "succeeded":
+                    break
+            return job.status
+        finally:
+            session.close()
+            await pool.stop()
+
+    assert asyncio.run(scenario()) == "succeeded"
+
+def test_lost_lease_cancels_work(db, handlers, monkeypatch):
+    """Test a worker stops a job once another worker has taken over its lease"""
+    cancelled = []
+
+    async def slow(db, payload):
+        try:
+            await asyncio.sleep(5)
+        except asyncio.CancelledError:
+            cancelled.append(True)
+            raise
+
+    monkeypatch.setitem(HANDLERS, "test_slow", slow)
+    job = enqueue(db, "test_slow", {}, WORKSPACE_ID)
+
+    async def scenario():
+        pool = WorkerPool(size=1, lease_seconds=0.3)
+        run = asyncio.ensure_future(pool.run_job("worker-a"))
+        await asyncio.sleep(0.05)
+        session = SessionLocal()
+        try:
+            session.query(Job).filter(Job.id == job.id).update({Job.lease_owner: "worker-b"})
+            session.commit()
+        finally:
+            session.close()
+        return await asyncio.wait_for(run, 2)
+
+    assert asyncio.run(scenario()) is True
+    assert cancelled == [True]
+    db.refresh(job)
+    assert job.lease_owner == "worker-b" and job.status == "running"
+
+def test_completion_after_lost_lease_is_not_counted(db, handlers, monkeypatch):
+    """Test a job that finishes after another worker took its lease is neither completed nor counted"""
+    async def overtaken(session, payload):
+        other = SessionLocal()
+        try:
+            other.query(Job).filter(Job.id == payload["job_id"]).update({Job.lease_owner: "worker-b"})
+            other.commit()
+        finally:
+            other.close()
+        return {"ok": True}
+
+    monkeypatch.setitem(HANDLERS, "test_overtaken", overtaken)
+    job = enqueue(db, "test_overtaken", {}, WORKSPACE_ID)
+    job.payload = {"job_id": job.id}
+    db.commit()
+
+    pool = WorkerPool(size=1)
+    assert asyncio.run(pool.run_job("worker-a")) is True
+    assert pool.stats()["processed"] == 0
+    db.refresh(job)
+    assert job.lease_owner == "worker-b" and job.status == "running"
+
@@ -0,0 +1,37 @@
+"""Unit tests for the shared keyword table of the rule-based heuristics"""
+import pytest
+from app.ai.keywords import KeywordTable, heuristic_keywords
+from app.routers.auto_mapping import extract_blockers, infer_priority, calculate_confidence
+
+table = KeywordTable({"action": ["i will", "todo:"], "urgency": ["urgent", "asap"]})
+
+@pytest.mark.parametrize("text", [
+    "",
+    "I will start",
+    "nothing here\nI will do it\nTODO: docs\nstill nothing",
+    "i will\ni will i will\n\nasap todo:",
+    "trailing hit todo:",
+    "\n\nI WILL shout\n"
+])
+def test_matching_pieces_matches_per_line_scan(text):
+    """Test the whole-text search returns the same lines as testing each line"""
+    expected = [line for line in text.split("\n") if any(kw in line.lower() for kw in ["i will", "todo:"])]
+    assert table.matching_pieces(text, "\n", "action") == expected
+
+def test_family_checks_share_one_lowercased_copy():
+    """Test presence, counts and first positions per family"""
+    hits = table.lower("ASAP: I will fix it, urgent and asap")
+    assert hits.has("action") and hits.has("urgency")
+    assert hits.count("urgency") == 3
+    assert hits.first_of("urgency") == ("urgent", 21)
+
+def test_heuristics_unchanged_with_shared_hits():
+    """Test the auto-mapping heuristics give the same answers with and without precomputed hits"""
+    sentence = "Dev will finish the API by Friday but is Blocked by the urgent migration"
+    hits = heuristic_keywords.lower(sentence)
+    assert extract_blockers(sentence) == extract_blockers(sentence, hits) == "Blocked by the urgent migration"
+    assert infer_priority(sentence, hits) == 9
+    assert calculate_confidence(sentence, hits) == 0.95
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
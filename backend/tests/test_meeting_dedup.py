@@ -0,0 +1,78 @@
+"""Unit tests for MinHash near-duplicate transcript detection"""
+import asyncio
+import pytest
+from app.database import Base, engine, SessionLocal
+from app.models import Meeting
+from app.ai.minhash import minhash_signature, estimated_similarity, band_keys
+from app.services.meeting_service import transcript_fingerprint, find_near_duplicate, index_meeting, added_turns, reuse_analysis
+
+TRANSCRIPT = "\n".join(
+    f"Dev{i % 4}: Item {i} - I will update the {topic} service and report back on the rollout plan."
+    for i, topic in enumerate(["billing", "auth", "search", "export", "import", "audit", "email", "sync"] * 4)
+)
+
+@pytest.fixture
+def db():
+    Base.metadata.create_all(bind=engine)
+    session = SessionLocal()
+    yield session
+    session.rollback()
+    session.close()
+
+def test_signature_similarity_tracks_edits():
+    """Test an edited transcript scores high and an unrelated one low"""
+    edited = TRANSCRIPT.replace("Item 3 -", "Item 3 (edited) -")
+    unrelated = "QA1: The release notes need a screenshot.\nPM: Marketing wants the launch moved."
+    original = minhash_signature(TRANSCRIPT)
+    assert estimated_similarity(original, minhash_signature(TRANSCRIPT)) == 1.0
+    assert estimated_similarity(original, minhash_signature(edited)) > 0.85
+    assert estimated_similarity(original, minhash_signature(unrelated)) < 0.2
+    assert minhash_signature("   ") is None
+
+def test_fingerprint_ignores_timestamps_and_filler():
+    """Test the same meeting exported with timestamps is an exact match"""
+    stamped = "\n".join(f"[10:{i:02d}] {line.replace('I will', 'Um, I will')}" for i, line in enumerate(TRANSCRIPT.split("\n")))
+    assert transcript_fingerprint(stamped) == transcript_fingerprint(TRANSCRIPT)
+
+def test_lookup_is_scoped_to_workspace(db):
+    """Test an indexed meeting is found as a near-duplicate only in its own workspace"""
+    meeting = Meeting(workspace_id=901, title="Standup", transcript_text=TRANSCRIPT,
+                      analysis={"candidates": [], "dependencies": [], "summary": "s"})
+    db.add(meeting)
+    db.flush()
+    signature = transcript_fingerprint(TRANSCRIPT)
+    index_meeting(db, meeting, signature)
+    db.flush()
+    
+    found = find_near_duplicate(db, 901, transcript_fingerprint(TRANSCRIPT + "\nPM: I will book the retro."))
+    assert found is not None and found[0].id == meeting.id
+    assert find_near_duplicate(db, 902, signature) is None
+    assert len(band_keys(signature)) == 32
+
+def test_reuse_extracts_only_added_turns(monkeypatch):
+    """Test a re-upload only sends the new turns to extraction and drops repeated candidates"""
+    sent = []
+    
+    async def fake_extract(transcript, workspace_id=None):
+        sent.append(transcript)
+        return [
+            {"description": "Update the billing service", "confidence": 0.9},
+            {"description": "Book the retro room", "confidence": 0.8}
+        ]
+    
+    monkeypatch.setattr("app.services.meeting_service.generate_tasks_from_transcript_async", fake_extract)
+    previous = Meeting(id=1, transcript_text=TRANSCRIPT, analysis={
+        "candidates": [{"description": "Update the billing service", "confidence": 0.9}],
+        "dependencies": [],
+        "summary": "Billing work"
+    })
+    
+    analysis, fresh = asyncio.run(reuse_analysis(previous, TRANSCRIPT + "\nPM: I will book the retro room.", 1))
+    
+    assert sent == ["PM: I will book the retro room."]
+    assert [c["description"] for c in fresh] == ["Book the retro room"]
+    assert len(analysis["candidates"]) == 2 and analysis["summary"] == "Billing work"
+    assert added_turns(TRANSCRIPT, TRANSCRIPT) == []
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -3,6 +3,11 @@ import pytest
 from app.ai.parser import (
     parse_and_validate,
     fallback_task_extractor,
+    IncrementalArrayParser,
+    parse_and_validate_sections,
+    MEETING_ANALYSIS_SCHEMA,
+    RICE_SCHEMA,
+    recover_partial_array,
     TASK_CANDIDATE_SCHEMA,
     DEPENDENCY_SCHEMA
 )
@@ -62,5 +67,67 @@ def test_parse_dependencies():
     assert result is not None
     assert len(result["dependencies"]) == 1
 
+def test_fast_path_rejects_what_full_validation_rejects():
+    """Test the structural fast path never accepts invalid responses"""
+    invalid = [
+        '[{"description": "Task", "confidence": 1.5, "is_blocked": false}]',
+        '[{"description": "Task", "confidence": 0.5, "is_blocked": "no"}]',
+        '[{"description": "Task", "confidence": 0.5, "is_blocked": false, "effort_tag": "huge"}]',
+        '[{"description": "Task", "confidence": 0.5}]',
+        '{"reach": 10, "impact": 11, "confidence": 0.5, "effort": 3}',
+        '{"reach": true, "impact": 5, "confidence": 0.5, "effort": 3}'
+    ]
+    for raw in invalid[:4]:
+        assert parse_and_validate(raw, TASK_CANDIDATE_SCHEMA) is None
+    for raw in invalid[4:]:
+        assert parse_and_validate(raw, RICE_SCHEMA) is None
+    
+    # Valid edge case outside the fast path still passes full validation
+    assert parse_and_validate('{"reach": 10.0, "impact": 5, "confidence": 1, "effort": 3}', RICE_SCHEMA) is not None
+
+def test_parse_sections_falls_back_per_section():
+    """Test an invalid section does not discard the valid ones"""
+    combined = '''{
+        "tasks": [{"description": "Task A", "confidence": 0.9, "is_blocked": false}],
+        "dependencies": [{"from": "Task A"}],
+        "summary": "Short meeting."
+    }'''
+    sections = parse_and_validate_sections(combined, MEETING_ANALYSIS_SCHEMA)
+    assert sections["tasks"][0]["description"] == "Task A"
+    assert sections["dependencies"] is None
+    assert sections["summary"] == "Short meeting."
+
+def test_recover_partial_array_from_truncated_response():
+    """Test valid items survive a malformed item and a cut-off tail"""
+    truncated = '''[
+        {"description": "Task A", "confidence": 0.9, "is_blocked": false},
+        {"description": "Task B", "confidence": "high", "is_blocked": false},
+        {"description": "Task C", "confidence": 0.7,, "is_blocked": false},
+        {"description": "Task D", "confidence": 0.8, "is_blocked": true},
+        {"description": "Task E", "confid'''
+    assert parse_and_validate(truncated, TASK_CANDIDATE_SCHEMA) is None
+    
+    recovered = recover_partial_array(truncated, TASK_CANDIDATE_SCHEMA)
+    assert [item["description"] for item in recovered] == ["Task A", "Task D"]
+    assert recovered.failed_indices == [1, 2]
+    assert recovered.truncated
+
+def test_incremental_parser_yields_items_as_they_complete():
+    """Test streamed array items are emitted once their closing brace arrives"""
+    stream = '```json\n[{"description": "Fix {braces} in \\"title\\"", "confidence": 0.9, "is_blocked": false},' \
+             ' {"description": "Second", "confidence": 0.8, "is_blocked": true}]\n```'
+    parser = IncrementalArrayParser()
+    
+    emitted = []
+    for i in range(0, len(stream), 7):
+        emitted.append(parser.feed(stream[i:i + 7]))
+    items = [item for batch in emitted for item in batch]
+    
+    assert [item["description"] for item in items] == ['Fix {braces} in "title"', "Second"]
+    assert parser.finished
+    # First item is available before the stream ends
+    first_batch = next(i for i, batch in enumerate(emitted) if batch)
+    assert first_batch < len(emitted) - 1
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
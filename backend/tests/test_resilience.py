@@ -0,0 +1,157 @@
+"""Unit tests for the LLM circuit breaker, deadlines and hedged requests"""
+import asyncio
+import threading
+import time
+import pytest
+from app.ai.resilience import AbandonedCalls, AbandonedCallsFull, CircuitBreaker, LatencyTracker, run_hedged, run_hedged_async
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+def test_breaker_opens_on_error_rate_and_recovers_after_probe():
+    """Test the breaker opens, rejects, then closes after a successful half-open probe"""
+    clock = FakeClock()
+    breaker = CircuitBreaker(failure_rate=0.5, window=4, min_calls=4, cooldown_seconds=10, clock=clock)
+    breaker.record_success()
+    breaker.record_failure()
+    breaker.record_failure()
+    assert breaker.state == "closed"
+    breaker.record_failure()
+    assert breaker.state == "open"
+    assert not breaker.allow()
+
+    clock.now = 10
+    assert breaker.state == "half_open"
+    assert breaker.allow()
+    assert not breaker.allow()  # only one probe at a time
+    breaker.record_success()
+    assert breaker.state == "closed"
+    assert breaker.stats()["rejected"] == 2
+
+def test_breaker_reopens_when_probe_fails():
+    """Test a failed half-open probe starts a new cooldown"""
+    clock = FakeClock()
+    breaker = CircuitBreaker(failure_rate=0.5, window=2, min_calls=2, cooldown_seconds=5, clock=clock)
+    breaker.record_failure()
+    breaker.record_failure()
+    clock.now = 5
+    assert breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == "open"
+    assert breaker.stats()["times_opened"] == 2
+
+def test_latency_percentile_needs_min_samples():
+    """Test percentiles are withheld until enough samples exist"""
+    tracker = LatencyTracker(window=100, min_samples=10)
+    for i in range(9):
+        tracker.record(i)
+    assert tracker.percentile(95) is None
+    tracker.record(9)
+    assert tracker.percentile(50) == 4
+    assert tracker.percentile(100) == 9
+
+def wait_until(condition, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while not condition() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert condition()
+
+def test_run_hedged_times_out():
+    """Test a hung call is abandoned at the deadline"""
+    release = threading.Event()
+    start = time.monotonic()
+    with pytest.raises(TimeoutError):
+        run_hedged(lambda: release.wait(5), deadline=0.05)
+    release.set()
+    assert time.monotonic() - start < 1
+
+def test_run_hedged_duplicate_wins_when_first_attempt_stalls():
+    """Test the hedged duplicate's result is used when the first call is slow"""
+    attempts = []
+    release = threading.Event()
+
+    def call():
+        attempts.append(1)
+        if len(attempts) == 1:
+            release.wait(5)
+            return "slow"
+        return "fast"
+
+    finished = []
+    abandoned = AbandonedCalls(limit=4)
+    result, hedged = run_hedged(
+        call, deadline=2, hedge_after=0.02,
+        on_attempt_done=lambda result, seconds, duplicate: finished.append((result, duplicate)),
+        abandoned=abandoned
+    )
+    assert (result, hedged) == ("fast", True)
+    assert finished == [("fast", True)]
+    assert abandoned.stats()["running"] == 1
+    release.set()
+    wait_until(lambda: len(finished) == 2)
+    assert finished[1] == ("slow", False)
+    assert abandoned.stats()["running"] == 0
+
+def test_run_hedged_async_cancels_loser():
+    """Test the async hedge returns the first result and cancels the other attempt"""
+    cancelled = []
+
+    async def run():
+        calls = []
+
+        async def call():
+            calls.append(1)
+            if len(calls) == 1:
+                try:
+                    await asyncio.sleep(5)
+                except asyncio.CancelledError:
+                    cancelled.append(True)
+                    raise
+            return "fast"
+
+        result = await run_hedged_async(
+            call, deadline=2, hedge_after=0.02,
+            on_attempt_done=lambda result, seconds, duplicate: finished.append((result, duplicate))
+        )
+        for _ in range(3):
+            await asyncio.sleep(0)
+        return result
+
+    finished = []
+    assert asyncio.run(run()) == ("fast", True)
+    assert cancelled == [True]
+    assert sorted(finished, key=str) == [("fast", True), (None, False)]
+
+def test_abandoned_calls_are_capped_and_billed_when_they_finish():
+    """Test attempts left running past the deadline block new calls at the cap, and still report when they finish"""
+    release = threading.Event()
+    finished = []
+    abandoned = AbandonedCalls(limit=1)
+    with pytest.raises(TimeoutError):
+        run_hedged(
+            lambda: release.wait(5) and "late", deadline=0.05,
+            on_attempt_done=lambda result, seconds, duplicate: finished.append(result),
+            abandoned=abandoned
+        )
+    with pytest.raises(AbandonedCallsFull):
+        run_hedged(lambda: "refused", deadline=1, abandoned=abandoned)
+
+    release.set()
+    wait_until(lambda: not abandoned.full())
+    assert finished == ["late"]
+    assert run_hedged(lambda: "ok", deadline=1, abandoned=abandoned) == ("ok", False)
+
+def test_run_hedged_propagates_errors():
+    """Test an erroring call raises instead of waiting for the deadline"""
+    def call():
+        raise ValueError("boom")
+
+    with pytest.raises(ValueError):
+        run_hedged(call, deadline=1)
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
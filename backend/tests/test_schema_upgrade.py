@@ -0,0 +1,87 @@
+"""Tests for starting on a database created by an earlier version of the schema"""
+import os
+import subprocess
+import sys
+import pytest
+from sqlalchemy import create_engine, inspect, text
+from sqlalchemy.orm import sessionmaker
+from app.database import Base
+from app.models import Meeting, MeetingImport
+
+# meetings as the first release created it
+BASELINE_MEETINGS = """CREATE TABLE meetings (
+    id INTEGER PRIMARY KEY, workspace_id INTEGER, title VARCHAR, meeting_date DATETIME,
+    transcript_text TEXT, created_by INTEGER, created_at DATETIME
+)"""
+
+# meeting_imports as bulk import first created it, before its receiving lease
+FIRST_MEETING_IMPORTS = """CREATE TABLE meeting_imports (
+    id INTEGER PRIMARY KEY, workspace_id INTEGER, status VARCHAR, received INTEGER, stored INTEGER,
+    rejected INTEGER, processed INTEGER, failed INTEGER, suggestions_created INTEGER, errors JSON,
+    job_id INTEGER, created_at DATETIME, started_at DATETIME, finished_at DATETIME
+)"""
+
+@pytest.fixture
+def old_engine(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'old.db'}")
+    with engine.begin() as connection:
+        connection.execute(text(BASELINE_MEETINGS))
+        connection.execute(text(
+            "INSERT INTO meetings (workspace_id, title, meeting_date, transcript_text, created_by) "
+            "VALUES (1, 'Kickoff', '2024-01-08 10:00:00', 'PM: Welcome to the billing migration.', 1)"
+        ))
+    yield engine
+    engine.dispose()
+
+def columns(engine, table):
+    return {column["name"] for column in inspect(engine).get_columns(table)}
+
+def test_create_all_adds_columns_missing_from_existing_tables(old_engine):
+    """Test meetings gains the near-duplicate columns and its rows can be queried"""
+    Base.metadata.create_all(bind=old_engine)
+    assert {"minhash", "analysis", "duplicate_of_id"} <= columns(old_engine, "meetings")
+    session = sessionmaker(bind=old_engine)()
+    meeting = session.query(Meeting).one()
+    assert (meeting.title, meeting.analysis, meeting.duplicate_of_id) == ("Kickoff", None, None)
+    session.close()
+
+def test_plain_text_transcripts_read_back_after_upgrade(old_engine):
+    """Test a transcript stored before compression loads, and an edit of it is stored compressed"""
+    Base.metadata.create_all(bind=old_engine)
+    assert {"transcript_size", "summary"} <= columns(old_engine, "meetings")
+    session = sessionmaker(bind=old_engine)()
+    meeting = session.query(Meeting).one()
+    assert meeting.transcript_text == "PM: Welcome to the billing migration." and meeting.transcript_size is None
+
+    meeting.transcript_text += "\nSam: I will update the runbook."
+    session.commit()
+    stored = session.execute(text("SELECT transcript_text FROM meetings")).scalar()
+    assert isinstance(stored, bytes) and session.query(Meeting).one().transcript_size == len(meeting.transcript_text)
+    session.close()
+
+def test_import_columns_are_added(old_engine):
+    """Test meetings gains import_id with its index, and an existing imports table gains its lease column"""
+    with old_engine.begin() as connection:
+        connection.execute(text(FIRST_MEETING_IMPORTS))
+        connection.execute(text("INSERT INTO meeting_imports (workspace_id, status) VALUES (1, 'receiving')"))
+    Base.metadata.create_all(bind=old_engine)
+    assert "import_id" in columns(old_engine, "meetings")
+    assert "ix_meetings_import_id" in {index["name"] for index in inspect(old_engine).get_indexes("meetings")}
+    session = sessionmaker(bind=old_engine)()
+    assert session.query(MeetingImport.status, MeetingImport.updated_at).one() == ("receiving", None)
+    session.close()
+
+def test_app_starts_on_a_baseline_database(old_engine):
+    """Test the app imports, creates its indexes and serves meetings on a first-release database"""
+    script = (
+        "from fastapi.testclient import TestClient\n"
+        "from app.main import app\n"
+        "client = TestClient(app)\n"
+        "assert client.get('/meetings/?workspace_id=1').json()[0]['title'] == 'Kickoff'\n"
+        "assert client.get('/meetings/1/transcript').json()['transcript'].startswith('PM: Welcome')\n"
+    )
+    env = {**os.environ, "DATABASE_URL": str(old_engine.url), "JOB_WORKERS": "0", "LLM_WARMUP_ON_STARTUP": "false"}
+    backend = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    result = subprocess.run([sys.executable, "-c", script], cwd=backend, env=env, capture_output=True, text=True)
+    assert result.returncode == 0, result.stderr
+    assert "ix_meetings_import_id" in {index["name"] for index in inspect(old_engine).get_indexes("meetings")}
@@ -0,0 +1,91 @@
+"""Tests for full-text search over tasks and meeting transcripts"""
+import pytest
+from fastapi.testclient import TestClient
+from app.main import app
+from app.database import Base, engine, SessionLocal
+from app.models import Task, Meeting
+from app.services.search_service import match_expression, search_tasks, search_meetings, find_task
+
+WORKSPACE_ID = 906
+
+client = TestClient(app)
+
+@pytest.fixture
+def db():
+    Base.metadata.create_all(bind=engine)
+    session = SessionLocal()
+    yield session
+    for meeting in session.query(Meeting).filter(Meeting.workspace_id == WORKSPACE_ID):
+        session.delete(meeting)
+    session.query(Task).filter(Task.workspace_id == WORKSPACE_ID).delete()
+    session.commit()
+    session.close()
+
+def test_match_expression_quotes_user_input():
+    """Test FTS operators in user input are searched literally"""
+    assert match_expression('login AND "oauth') == '"login" "and" "oauth"*'
+    assert match_expression("fix login", any_term=True, column="title") == 'title : ("fix" OR "login")'
+    assert match_expression("  -- ") is None
+
+def test_task_index_follows_inserts_updates_and_deletes(db):
+    """Test the trigger-maintained task index sees every change, including bulk ones"""
+    task = Task(workspace_id=WORKSPACE_ID, title="Rotate staging credentials", description="Vault tokens expire Friday", status="todo")
+    other = Task(workspace_id=WORKSPACE_ID + 1, title="Rotate production credentials", status="todo")
+    db.add_all([task, other])
+    db.commit()
+    results = search_tasks(db, WORKSPACE_ID, "rotate cred")
+    assert [result["id"] for result in results] == [task.id]
+    assert "<b>Rotate</b>" in results[0]["snippet"]
+    assert search_tasks(db, WORKSPACE_ID, "vault")[0]["id"] == task.id
+
+    db.query(Task).filter(Task.id == task.id).update({Task.title: "Renew TLS certificates"})
+    db.commit()
+    assert search_tasks(db, WORKSPACE_ID, "rotate") == []
+    assert search_tasks(db, WORKSPACE_ID, "certificates")[0]["id"] == task.id
+
+    db.query(Task).filter(Task.id.in_([task.id, other.id])).delete()
+    db.commit()
+    assert search_tasks(db, WORKSPACE_ID, "certificates") == []
+
+def test_meeting_transcripts_are_searchable(db):
+    """Test compressed transcripts are indexed on create and reindexed on change"""
+    meeting = Meeting(workspace_id=WORKSPACE_ID, title="Billing sync", transcript_text="Sam: the invoice exporter drops refunds.")
+    db.add(meeting)
+    db.commit()
+    results = search_meetings(db, WORKSPACE_ID, "refunds")
+    assert results[0]["id"] == meeting.id and "<b>refunds</b>" in results[0]["snippet"]
+
+    meeting.transcript_text = "Sam: the ledger reconciliation is done."
+    db.commit()
+    assert search_meetings(db, WORKSPACE_ID, "refunds") == []
+    assert search_meetings(db, WORKSPACE_ID, "ledger")[0]["id"] == meeting.id
+    meeting.title = "Finance sync"
+    db.commit()
+    assert search_meetings(db, WORKSPACE_ID, "finance")[0]["id"] == meeting.id
+    assert search_meetings(db, WORKSPACE_ID, "ledger")[0]["id"] == meeting.id
+
+def test_find_task_needs_more_than_one_shared_word(db):
+    """Test a question resolves to the task it names, not to any task sharing a word"""
+    db.add_all([
+        Task(workspace_id=WORKSPACE_ID, title="Migrate reporting jobs to the new scheduler", status="todo"),
+        Task(workspace_id=WORKSPACE_ID, title="Update onboarding docs", status="in_progress")
+    ])
+    db.commit()
+    assert find_task(db, WORKSPACE_ID, "status of update onboarding docs?").title == "Update onboarding docs"
+    assert find_task(db, WORKSPACE_ID, "progress on migrating the reporting jobs scheduler").title.startswith("Migrate")
+    assert find_task(db, WORKSPACE_ID, "status of the new pricing page") is None
+
+def test_search_endpoint_and_chat_status(db):
+    """Test the search endpoint groups hits by type and the chat agent finds tasks by title"""
+    task = Task(workspace_id=WORKSPACE_ID, title="Audit billing webhooks", status="todo", progress=40)
+    db.add(task)
+    db.add(Meeting(workspace_id=WORKSPACE_ID, title="Weekly", transcript_text="Lee: webhook retries pile up at night."))
+    db.commit()
+
+    found = client.get(f"/search/?workspace_id={WORKSPACE_ID}&q=webhook").json()
+    assert [hit["id"] for hit in found["tasks"]] == [task.id]
+    assert len(found["meetings"]) == 1
+    assert client.get(f"/search/?workspace_id={WORKSPACE_ID}&q=webhook&type=meetings").json()["tasks"] == []
+
+    answer = client.post(f"/chat/query?workspace_id={WORKSPACE_ID}&question=What is the status of the billing webhooks audit?").json()
+    assert answer["data"]["id"] == task.id and "40% complete" in answer["response"]
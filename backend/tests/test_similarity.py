@@ -0,0 +1,172 @@
+"""Unit tests for the TF-IDF task similarity index and candidate deduplication"""
+import pytest
+from app.database import Base, engine, SessionLocal
+from app.models import Task, AgentSuggestion
+from app.ai.similarity import SimilarityIndex, task_indexes, tokenize
+from app.services import similarity_service
+from app.services.similarity_service import similar_tasks, create_task_suggestion, create_task_suggestions, index_task
+from app.services.agent_service import retract_suggestions
+
+WORKSPACE_ID = 903
+
+@pytest.fixture
+def db():
+    Base.metadata.create_all(bind=engine)
+    task_indexes.clear()
+    session = SessionLocal()
+    yield session
+    session.query(AgentSuggestion).filter(AgentSuggestion.workspace_id == WORKSPACE_ID).delete()
+    session.query(Task).filter(Task.workspace_id == WORKSPACE_ID).delete()
+    session.commit()
+    session.close()
+    task_indexes.clear()
+
+def test_tokenize_drops_stopwords_and_punctuation():
+    """Test tokens are lowercase content words"""
+    assert tokenize("I will fix the OAuth-login bug, ASAP!") == ["fix", "oauth", "login", "bug", "asap"]
+
+def test_query_ranks_closest_document_first():
+    """Test the most similar document wins and unrelated ones are not returned"""
+    index = SimilarityIndex()
+    index.add(1, "Fix the OAuth login redirect bug")
+    index.add(2, "Write release notes for version 2.3")
+    index.add(3, "Update OAuth client secrets in staging")
+    results = index.query("oauth login redirect is broken", k=3)
+    assert results[0][0] == 1
+    assert 2 not in [key for key, _ in results]
+    assert index.query("fix the oauth login redirect bug", k=1)[0][1] == pytest.approx(1.0)
+
+def test_reindex_and_discard():
+    """Test re-adding a key replaces its text and discard removes it"""
+    index = SimilarityIndex()
+    index.add(1, "Migrate the billing database")
+    index.add(1, "Design the onboarding email")
+    assert index.query("billing database") == []
+    assert index.query("onboarding email")[0][0] == 1
+    index.discard(1)
+    assert len(index) == 0 and index.query("onboarding email") == []
+
+def test_bulk_load_matches_incremental():
+    """Test add_many scores the same as adding documents one by one"""
+    documents = [(i, f"Task {i} update the {topic} service") for i, topic in enumerate(["billing", "auth", "search"] * 10)]
+    bulk = SimilarityIndex()
+    bulk.add_many(documents)
+    incremental = SimilarityIndex()
+    for key, text in documents:
+        incremental.add(key, text)
+    incremental._renormalize()
+    assert bulk.query("auth service task 4", k=3) == incremental.query("auth service task 4", k=3)
+
+def test_similar_tasks_syncs_incrementally(db):
+    """Test tasks added after the first query are picked up by the next one"""
+    db.add(Task(workspace_id=WORKSPACE_ID, title="Fix OAuth login redirect", status="todo"))
+    db.commit()
+    assert similar_tasks(db, WORKSPACE_ID, "oauth redirect")[0]["title"] == "Fix OAuth login redirect"
+
+    db.add(Task(workspace_id=WORKSPACE_ID, title="Rotate staging database credentials", status="todo"))
+    db.commit()
+    results = similar_tasks(db, WORKSPACE_ID, "staging database credentials")
+    assert results[0]["type"] == "task"
+    assert results[0]["title"] == "Rotate staging database credentials"
+
+def test_candidate_matching_task_is_skipped(db, monkeypatch):
+    """Test merge mode does not create a suggestion for work that already is a task"""
+    monkeypatch.setattr(similarity_service, "TASK_DEDUP_MODE", "merge")
+    task = Task(workspace_id=WORKSPACE_ID, title="Fix OAuth login redirect", description="Fix OAuth login redirect", status="todo")
+    db.add(task)
+    db.commit()
+    payload = {"title": "Fix the OAuth login redirect", "description": "Fix the OAuth login redirect"}
+    result = create_task_suggestion(db, WORKSPACE_ID, payload, 0.8)
+    assert result["suggestion_id"] is None
+    assert result["duplicate"]["type"] == "task" and result["duplicate"]["id"] == task.id
+
+def test_repeated_candidate_merges_into_pending_suggestion(db, monkeypatch):
+    """Test merge mode folds a repeat into the pending suggestion, filling gaps"""
+    monkeypatch.setattr(similarity_service, "TASK_DEDUP_MODE", "merge")
+    first = create_task_suggestion(db, WORKSPACE_ID, {"title": "Write the Q3 release notes", "description": "Write the Q3 release notes", "assignee": None}, 0.6)
+    second = create_task_suggestion(db, WORKSPACE_ID, {"title": "Write the Q3 release notes", "description": "Write the Q3 release notes", "assignee": "Lee"}, 0.9)
+    assert second["suggestion_id"] is None
+    suggestion = db.query(AgentSuggestion).filter(AgentSuggestion.id == first["suggestion_id"]).first()
+    assert suggestion.payload["assignee"] == "Lee"
+    assert suggestion.confidence == 0.9
+
+def test_flag_mode_marks_possible_duplicate(db, monkeypatch):
+    """Test flag mode still creates the suggestion but marks what it duplicates"""
+    monkeypatch.setattr(similarity_service, "TASK_DEDUP_MODE", "flag")
+    first = create_task_suggestion(db, WORKSPACE_ID, {"title": "Audit the billing webhooks", "description": "Audit the billing webhooks"}, 0.7)
+    second = create_task_suggestion(db, WORKSPACE_ID, {"title": "Audit the billing webhooks", "description": "Audit the billing webhooks"}, 0.7)
+    suggestion = db.query(AgentSuggestion).filter(AgentSuggestion.id == second["suggestion_id"]).first()
+    assert suggestion.payload["possible_duplicate"]["id"] == first["suggestion_id"]
+
+def test_resolved_suggestion_is_not_a_duplicate(db, monkeypatch):
+    """Test a suggestion rejected after indexing no longer blocks new candidates"""
+    monkeypatch.setattr(similarity_service, "TASK_DEDUP_MODE", "merge")
+    first = create_task_suggestion(db, WORKSPACE_ID, {"title": "Renew the TLS certificates", "description": "Renew the TLS certificates"}, 0.7)
+    db.query(AgentSuggestion).filter(AgentSuggestion.id == first["suggestion_id"]).update({AgentSuggestion.applied: True})
+    db.commit()
+    second = create_task_suggestion(db, WORKSPACE_ID, {"title": "Renew the TLS certificates", "description": "Renew the TLS certificates"}, 0.7)
+    assert second["suggestion_id"] is not None and second["duplicate"] is None
+
+def test_batch_dedups_within_itself(db, monkeypatch):
+    """Test repeats inside one batch merge into (or flag) the earlier candidate of the same batch"""
+    repeated = {"title": "Archive the 2023 audit logs", "description": "Archive the 2023 audit logs"}
+    other = {"title": "Draft the onboarding checklist", "description": "Draft the onboarding checklist"}
+
+    monkeypatch.setattr(similarity_service, "TASK_DEDUP_MODE", "merge")
+    merged = create_task_suggestions(db, WORKSPACE_ID, [({**repeated, "assignee": None}, 0.6), (other, 0.7), ({**repeated, "assignee": "Sam"}, 0.9)])
+    assert merged[0]["suggestion_id"] and merged[1]["suggestion_id"] and merged[2]["suggestion_id"] is None
+    assert merged[2]["duplicate"] == {"type": "suggestion", "id": merged[0]["suggestion_id"], "score": merged[2]["duplicate"]["score"]}
+    suggestion = db.query(AgentSuggestion).filter(AgentSuggestion.id == merged[0]["suggestion_id"]).first()
+    assert suggestion.payload["assignee"] == "Sam" and suggestion.confidence == 0.9
+
+    monkeypatch.setattr(similarity_service, "TASK_DEDUP_MODE", "flag")
+    fresh = {"title": "Rotate the Slack webhook secret", "description": "Rotate the Slack webhook secret"}
+    flagged = create_task_suggestions(db, WORKSPACE_ID, [(fresh, 0.6), (fresh, 0.6)])
+    second = db.query(AgentSuggestion).filter(AgentSuggestion.id == flagged[1]["suggestion_id"]).first()
+    assert second.payload["possible_duplicate"]["id"] == flagged[0]["suggestion_id"]
+    assert not any(key[0] == "candidate" for key in task_indexes.get(WORKSPACE_ID)._docs)
+
+def test_index_follows_only_committed_changes(db):
+    """Test re-indexing and retraction reach the in-process index on commit, and not at all after a rollback"""
+    task = Task(workspace_id=WORKSPACE_ID, title="Fix OAuth login redirect", status="todo")
+    db.add(task)
+    db.commit()
+    suggestion_id = create_task_suggestion(db, WORKSPACE_ID, {"title": "Renew the TLS certificates"}, 0.7)["suggestion_id"]
+    assert similar_tasks(db, WORKSPACE_ID, "oauth redirect")[0]["id"] == task.id
+
+    task.title = "Rotate staging database credentials"
+    index_task(db, task)
+    retract_suggestions(db, [suggestion_id], reason="Source removed", commit=False)
+    db.rollback()
+    assert similar_tasks(db, WORKSPACE_ID, "oauth redirect")[0]["id"] == task.id
+    assert similar_tasks(db, WORKSPACE_ID, "tls certificates")[0]["id"] == suggestion_id
+
+    task.title = "Rotate staging database credentials"
+    index_task(db, task)
+    retract_suggestions(db, [suggestion_id], reason="Source removed", commit=False)
+    db.commit()
+    assert similar_tasks(db, WORKSPACE_ID, "oauth redirect") == []
+    assert similar_tasks(db, WORKSPACE_ID, "tls certificates") == []
+
+def test_rolled_back_suggestions_stay_out_of_the_index(db, monkeypatch):
+    """Test suggestions inserted with commit=False reach the index only when the caller commits"""
+    monkeypatch.setattr(similarity_service, "TASK_DEDUP_MODE", "merge")
+    payload = {"title": "Migrate the billing cron jobs", "description": "Migrate the billing cron jobs"}
+    create_task_suggestions(db, WORKSPACE_ID, [(payload, 0.7)], commit=False)
+    db.rollback()
+    assert similar_tasks(db, WORKSPACE_ID, "billing cron jobs") == []
+
+    result = create_task_suggestion(db, WORKSPACE_ID, payload, 0.7)
+    assert similar_tasks(db, WORKSPACE_ID, "billing cron jobs")[0]["id"] == result["suggestion_id"]
+
+def test_index_rebuilds_after_changes_from_another_process(db):
+    """Test an edit that bypassed this process's index (as another worker's would) is seen once the version moves"""
+    task = Task(workspace_id=WORKSPACE_ID, title="Fix OAuth login redirect", status="todo")
+    db.add(task)
+    db.commit()
+    assert similar_tasks(db, WORKSPACE_ID, "oauth redirect")[0]["id"] == task.id
+
+    db.query(Task).filter(Task.id == task.id).update({Task.title: "Rotate staging database credentials"}, synchronize_session=False)
+    db.commit()
+    assert similar_tasks(db, WORKSPACE_ID, "oauth redirect") == []
+    assert similar_tasks(db, WORKSPACE_ID, "staging credentials")[0]["id"] == task.id
@@ -0,0 +1,49 @@
+"""Tests for the task indexes the hot query shapes rely on"""
+from datetime import datetime
+import pytest
+from sqlalchemy import event, func, text
+from app.database import Base, engine, SessionLocal
+from app.models import Task, ACTIVE_TASK
+
+WORKSPACE_ID = 911
+
+@pytest.fixture
+def db():
+    Base.metadata.create_all(bind=engine)
+    session = SessionLocal()
+    yield session
+    session.close()
+
+def plan(db, query) -> str:
+    """EXPLAIN QUERY PLAN of the statement query sends, with its parameters"""
+    sent = []
+    listener = lambda conn, cursor, statement, parameters, *rest: sent.append((statement, parameters))
+    event.listen(engine, "before_cursor_execute", listener)
+    try:
+        query.all()
+    finally:
+        event.remove(engine, "before_cursor_execute", listener)
+    statement, parameters = sent[-1]
+    return "; ".join(row[3] for row in db.connection().exec_driver_sql("EXPLAIN QUERY PLAN " + statement, parameters))
+
+def test_open_and_blocked_work_use_their_indexes(db):
+    """Test ACTIVE_TASK matches the partial index condition and blocked work has its own index"""
+    overdue = db.query(Task.id).filter(Task.workspace_id == WORKSPACE_ID, Task.due_date < datetime.utcnow(), ACTIVE_TASK)
+    assert "ix_tasks_active_due" in plan(db, overdue)
+    blocked = db.query(Task.id).filter(Task.workspace_id == WORKSPACE_ID, Task.is_blocked == True)
+    assert "ix_tasks_workspace_blocked" in plan(db, blocked)
+
+def test_workload_aggregate_reads_only_the_index(db):
+    """Test the per-assignee load query is answered from a covering index"""
+    load = db.query(Task.assignee_id, func.count(Task.id), func.sum(Task.story_points)).filter(
+        Task.workspace_id == WORKSPACE_ID, ACTIVE_TASK, Task.assignee_id.isnot(None)
+    ).group_by(Task.assignee_id)
+    assert "COVERING INDEX ix_tasks_workspace_assignee" in plan(db, load)
+
+def test_create_all_adds_indexes_missing_from_existing_tables(db):
+    """Test an index declared after the table was created is added on startup"""
+    with engine.begin() as connection:
+        connection.execute(text("DROP INDEX ix_tasks_active_due"))
+    Base.metadata.create_all(bind=engine)
+    with engine.connect() as connection:
+        assert connection.execute(text("SELECT count(*) FROM sqlite_master WHERE name = 'ix_tasks_active_due'")).scalar() == 1
@@ -0,0 +1,83 @@
+"""Tests for keyset pagination and field selection on task list endpoints"""
+from datetime import datetime, timedelta
+import pytest
+from fastapi.testclient import TestClient
+from app.main import app
+from app.database import Base, engine, SessionLocal
+from app.models import Task
+
+WORKSPACE_ID = 908
+USER_ID = 9081
+SPRINT_ID = 9082
+
+client = TestClient(app)
+
+@pytest.fixture
+def tasks():
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    start = datetime(2025, 3, 1)
+    # Pairs of tasks share a timestamp, so pages must break ties on id
+    rows = [
+        Task(
+            workspace_id=WORKSPACE_ID,
+            title=f"Task {i}",
+            description="x" * 200,
+            status="todo",
+            assignee_id=USER_ID if i % 2 else None,
+            sprint_id=SPRINT_ID if i % 3 == 0 else None,
+            is_blocked=i % 5 == 0,
+            created_at=start + timedelta(minutes=i // 2)
+        )
+        for i in range(25)
+    ]
+    db.add_all(rows)
+    db.commit()
+    expected = [task.id for task in sorted(rows, key=lambda task: (task.created_at, task.id), reverse=True)]
+    yield expected
+    db.query(Task).filter(Task.workspace_id == WORKSPACE_ID).delete()
+    db.commit()
+    db.close()
+
+def collect(url: str, limit: int):
+    """All pages of a list endpoint, following X-Next-Cursor"""
+    pages, cursor = [], None
+    while True:
+        response = client.get(url + f"&limit={limit}" + (f"&cursor={cursor}" if cursor else ""))
+        assert response.status_code == 200
+        pages.append(response.json())
+        cursor = response.headers.get("X-Next-Cursor")
+        if not cursor:
+            return pages
+
+def test_pages_cover_every_task_once_in_order(tasks):
+    """Test following cursors returns each task exactly once, newest first"""
+    pages = collect(f"/tasks/?workspace_id={WORKSPACE_ID}", limit=10)
+    assert [len(page) for page in pages] == [10, 10, 5]
+    assert [task["id"] for page in pages for task in page] == tasks
+
+def test_exact_multiple_has_no_empty_trailing_page(tasks):
+    """Test a last page that is exactly full carries no cursor"""
+    pages = collect(f"/tasks/?workspace_id={WORKSPACE_ID}", limit=25)
+    assert len(pages) == 1 and len(pages[0]) == 25
+
+def test_fields_selects_only_requested_columns(tasks):
+    """Test fields= limits the keys returned and rejects unknown columns"""
+    page = client.get(f"/tasks/?workspace_id={WORKSPACE_ID}&fields=id,title,status&limit=3").json()
+    assert [set(task) for task in page] == [{"id", "title", "status"}] * 3
+    assert page[0]["status"] == "todo"
+    assert client.get(f"/tasks/?workspace_id={WORKSPACE_ID}&fields=id,password").status_code == 400
+    assert client.get(f"/tasks/?workspace_id={WORKSPACE_ID}&cursor=not-a-cursor").status_code == 400
+
+def test_filtered_lists_paginate(tasks):
+    """Test /tasks/my, /tasks/blockers and /sprints/{id}/tasks page through their own subsets"""
+    mine = collect(f"/tasks/my?user_id={USER_ID}&fields=id,assignee_id", limit=5)
+    assert sum(len(page) for page in mine) == 12
+    assert all(task["assignee_id"] == USER_ID for page in mine for task in page)
+
+    blocked = collect(f"/tasks/blockers?workspace_id={WORKSPACE_ID}&fields=id,is_blocked", limit=2)
+    assert [task["id"] for page in blocked for task in page] == [id for id in tasks if id in {task["id"] for page in blocked for task in page}]
+    assert sum(len(page) for page in blocked) == 5
+
+    sprint = collect(f"/sprints/{SPRINT_ID}/tasks?fields=id", limit=4)
+    assert sum(len(page) for page in sprint) == 9
@@ -0,0 +1,272 @@
+"""Tests for transcript edits: turn diff, partial re-extraction and suggestion reconciliation"""
+import asyncio
+import re
+import time
+import pytest
+from fastapi.testclient import TestClient
+from app.main import app
+from app.database import Base, engine, SessionLocal
+from app.models import Meeting, MeetingLSHBucket, AgentSuggestion, Job
+from app.ai.similarity import task_indexes
+from app.services import meeting_service
+from app.services.meeting_service import diff_turns, edit_transcript, process_meeting, reextract_meeting, MeetingBusy
+from app.jobs.worker import WorkerPool
+
+WORKSPACE_ID = 907
+
+client = TestClient(app)
+
+TRANSCRIPT = (
+    "PM: Kickoff for the billing migration.\n"
+    "Sam: I will update the billing runbook by Friday.\n"
+    "Lee: I will review the export job tomorrow.\n"
+    "Ana: I will draft the customer announcement email."
+)
+
+@pytest.fixture
+def db():
+    Base.metadata.create_all(bind=engine)
+    task_indexes.clear()
+    session = SessionLocal()
+    yield session
+    meeting_ids = [id for (id,) in session.query(Meeting.id).filter(Meeting.workspace_id == WORKSPACE_ID)]
+    session.query(MeetingLSHBucket).filter(MeetingLSHBucket.meeting_id.in_(meeting_ids)).delete(synchronize_session=False)
+    for meeting in session.query(Meeting).filter(Meeting.workspace_id == WORKSPACE_ID):
+        session.delete(meeting)
+    session.query(AgentSuggestion).filter(AgentSuggestion.workspace_id == WORKSPACE_ID).delete()
+    session.query(Job).filter(Job.workspace_id == WORKSPACE_ID).delete()
+    session.commit()
+    session.close()
+    task_indexes.clear()
+
+@pytest.fixture
+def extractor(monkeypatch):
+    """Rule-based stand-in for the LLM: one candidate per "Name: I will ..." line, recording what it was sent"""
+    sent = []
+
+    async def extract(transcript, workspace_id=None):
+        sent.append(transcript)
+        return [
+            {"assignee": name, "description": action[0].upper() + action[1:], "confidence": 0.8, "priority": 5}
+            for name, action in re.findall(r"^(\w+): I will (.+?)\.?$", transcript, re.MULTILINE)
+        ]
+
+    async def analyze(transcript, workspace_id=None):
+        return {"candidates": await extract(transcript), "dependencies": [], "summary": "Billing migration kickoff"}
+
+    monkeypatch.setattr(meeting_service, "generate_tasks_from_transcript_async", extract)
+    monkeypatch.setattr(meeting_service, "analyze_meeting_async", analyze)
+    return sent
+
+# Long enough that one added turn keeps it a near-duplicate of TRANSCRIPT
+DISCUSSION = TRANSCRIPT + "".join(
+    f"\nPM: Note {i}: the {topic} cutover stays on the shared calendar and we revisit it at the next sync."
+    for i, topic in enumerate(["billing", "export", "email", "auth", "search", "audit"] * 3)
+)
+ADDED_TURN = "\nKim: I will rotate the staging keys."
+
+def suggestion(db, suggestion_id):
+    return db.query(AgentSuggestion).filter(AgentSuggestion.id == suggestion_id).first()
+
+def test_diff_turns_reports_edited_turns_on_both_sides():
+    """Test an edited turn is removed and added, unchanged and reflowed turns are not"""
+    edited = TRANSCRIPT.replace("by Friday", "by Monday").replace("Lee: I will review the export job tomorrow.\n", "")
+    edited = edited.replace("draft the customer", "draft the   customer") + "\nKim: I will rotate the staging keys."
+    removed, added = diff_turns(TRANSCRIPT, edited)
+    assert removed == ["Sam: I will update the billing runbook by Friday.", "Lee: I will review the export job tomorrow."]
+    assert added == ["Sam: I will update the billing runbook by Monday.", "Kim: I will rotate the staging keys."]
+    assert diff_turns(TRANSCRIPT, TRANSCRIPT + "\n") == ([], [])
+
+def test_edit_updates_retracts_and_adds_only_what_changed(db, extractor):
+    """Test only changed turns are re-extracted and each earlier suggestion is kept, updated or retracted"""
+    meeting = Meeting(workspace_id=WORKSPACE_ID, title="Kickoff", transcript_text=TRANSCRIPT)
+    db.add(meeting)
+    db.commit()
+    first = asyncio.run(process_meeting(db, meeting.id))
+    ids = {candidate["assignee"]: candidate["suggestion_id"] for candidate in first["candidates"]}
+    assert first["suggestions_created"] == 3 and all(ids.values())
+
+    edited = (
+        TRANSCRIPT.replace("by Friday", "by Monday").replace("Lee: I will review the export job tomorrow.\n", "")
+        + "\nKim: I will rotate the staging keys."
+    )
+    queued = edit_transcript(db, meeting.id, edited)
+    assert (queued["turns_removed"], queued["turns_added"]) == (2, 2)
+    with pytest.raises(MeetingBusy):
+        edit_transcript(db, meeting.id, edited + "\nPM: Thanks all.")
+
+    asyncio.run(WorkerPool(size=1).drain())
+    result = db.query(Job).filter(Job.id == queued["job_id"]).first().result
+
+    assert extractor[-1] == "Sam: I will update the billing runbook by Monday.\nKim: I will rotate the staging keys."
+    assert result["updated"] == [ids["Sam"]]
+    assert result["retracted"] == [ids["Lee"]]
+    assert len(result["added"]) == 1
+    assert {candidate["assignee"] for candidate in result["candidates"]} == {"Sam", "Ana", "Kim"}
+
+    db.expire_all()
+    assert suggestion(db, ids["Sam"]).payload["description"] == "Update the billing runbook by Monday"
+    assert suggestion(db, ids["Sam"]).applied is False
+    assert suggestion(db, ids["Lee"]).applied is True
+    assert suggestion(db, ids["Ana"]).payload["description"] == "Draft the customer announcement email"
+    assert suggestion(db, result["added"][0]).payload["assignee"] == "Kim"
+    assert db.query(Meeting).filter(Meeting.id == meeting.id).first().analysis["summary"] == "Billing migration kickoff"
+
+def test_failed_reextraction_keeps_the_extracted_version(db, extractor, monkeypatch):
+    """Test a failure while reconciling changes nothing, and the edit is then diffed against the extracted transcript"""
+    meeting = Meeting(workspace_id=WORKSPACE_ID, title="Kickoff", transcript_text=TRANSCRIPT)
+    db.add(meeting)
+    db.commit()
+    ids = {c["assignee"]: c["suggestion_id"] for c in asyncio.run(process_meeting(db, meeting.id))["candidates"]}
+    edited = TRANSCRIPT.replace("by Friday", "by Monday").replace("Lee: I will review the export job tomorrow.\n", "")
+
+    def locked(*args, **kwargs):
+        raise RuntimeError("database is locked")
+
+    create_task_suggestions = meeting_service.create_task_suggestions
+    monkeypatch.setattr(meeting_service, "create_task_suggestions", locked)
+    with pytest.raises(RuntimeError):
+        asyncio.run(reextract_meeting(db, meeting.id, edited))
+    db.rollback()
+    db.expire_all()
+    assert db.query(Meeting).filter(Meeting.id == meeting.id).first().transcript_text == TRANSCRIPT
+    assert suggestion(db, ids["Sam"]).payload["description"] == "Update the billing runbook by Friday"
+    assert suggestion(db, ids["Lee"]).applied is False
+
+    monkeypatch.setattr(meeting_service, "create_task_suggestions", create_task_suggestions)
+    queued = edit_transcript(db, meeting.id, edited + "\nKim: I will rotate the staging keys.")
+    assert (queued["turns_removed"], queued["turns_added"]) == (2, 2)
+    assert db.query(Meeting).filter(Meeting.id == meeting.id).first().transcript_text == TRANSCRIPT
+
+def test_transcript_endpoint_edit(db, extractor):
+    """Test the endpoint queues nothing for an unchanged transcript and 404s for unknown meetings"""
+    meeting = Meeting(workspace_id=WORKSPACE_ID, title="Kickoff", transcript_text=TRANSCRIPT)
+    db.add(meeting)
+    db.commit()
+    asyncio.run(process_meeting(db, meeting.id))
+
+    unchanged = client.put(f"/meetings/{meeting.id}/transcript", json={"transcript": TRANSCRIPT.replace(". ", ".  ")})
+    assert unchanged.status_code == 202 and unchanged.json()["job_id"] is None
+    edited = client.put(f"/meetings/{meeting.id}/transcript", json={"transcript": TRANSCRIPT + "\nKim: I will rotate the staging keys."})
+    assert edited.json()["turns_added"] == 1 and edited.json()["job_id"]
+    assert client.get(f"/meetings/{meeting.id}/transcript").json()["transcript"].endswith("staging keys.")
+    assert client.put("/meetings/999999/transcript", json={"transcript": "x"}).status_code == 404
+
+def test_retried_near_duplicate_suggests_only_new_candidates(db, extractor, monkeypatch):
+    """Test a retry after a failed suggestion step does not suggest the candidates reused from the earlier meeting"""
+    original = Meeting(workspace_id=WORKSPACE_ID, title="Kickoff", transcript_text=DISCUSSION)
+    db.add(original)
+    db.commit()
+    asyncio.run(process_meeting(db, original.id))
+
+    suggested = []
+    create_task_suggestions = meeting_service.create_task_suggestions
+
+    def fail_once(db, workspace_id, candidates, commit=True):
+        suggested.append([payload["description"] for payload, _ in candidates])
+        if len(suggested) == 1:
+            raise RuntimeError("database is locked")
+        return create_task_suggestions(db, workspace_id, candidates, commit)
+
+    monkeypatch.setattr(meeting_service, "create_task_suggestions", fail_once)
+    meeting = Meeting(workspace_id=WORKSPACE_ID, title="Kickoff (again)", transcript_text=DISCUSSION + ADDED_TURN)
+    db.add(meeting)
+    db.commit()
+    with pytest.raises(RuntimeError):
+        asyncio.run(process_meeting(db, meeting.id))
+    db.rollback()
+    result = asyncio.run(process_meeting(db, meeting.id))
+
+    assert result["duplicate_of"] == original.id
+    assert suggested == [["Rotate the staging keys"], ["Rotate the staging keys"]]
+    assert result["suggestions_created"] == 1
+    db.expire_all()
+    assert "pending" not in db.query(Meeting).filter(Meeting.id == meeting.id).first().analysis
+
+def test_stream_stores_analysis_and_fingerprint(db, extractor, monkeypatch):
+    """Test a streamed meeting is stored like a processed one, and a streamed near-duplicate only streams new candidates"""
+    async def stream(transcript, workspace_id=None):
+        for candidate in await meeting_service.generate_tasks_from_transcript_async(transcript):
+            yield candidate
+
+    async def dependencies(transcript, workspace_id=None):
+        return {"dependencies": []}
+
+    async def summarize(transcript, workspace_id=None):
+        return "Billing migration kickoff"
+
+    monkeypatch.setattr(meeting_service, "stream_tasks_from_transcript", stream)
+    monkeypatch.setattr(meeting_service, "detect_dependencies_async", dependencies)
+    monkeypatch.setattr(meeting_service, "summarize_meeting_async", summarize)
+
+    def post(transcript):
+        with client.stream("POST", "/meetings/process/stream", json={
+            "workspace_id": WORKSPACE_ID, "title": "Kickoff", "meeting_date": "2025-01-15T10:00:00", "transcript": transcript
+        }) as response:
+            body = "".join(response.iter_text())
+        meeting_id = int(re.search(r'"meeting_id": (\d+)', body).group(1))
+        return meeting_id, re.findall(r'"description": "([^"]+)"', body)
+
+    first_id, streamed = post(DISCUSSION)
+    assert len(streamed) == 3
+    db.expire_all()
+    first = db.query(Meeting).filter(Meeting.id == first_id).first()
+    assert first.summary == "Billing migration kickoff"
+    assert all(candidate["suggestion_id"] for candidate in first.analysis["candidates"])
+    assert db.query(MeetingLSHBucket).filter(MeetingLSHBucket.meeting_id == first_id).count() > 0
+
+    second_id, streamed = post(DISCUSSION + ADDED_TURN)
+    assert streamed == ["Rotate the staging keys"]
+    second = db.query(Meeting).filter(Meeting.id == second_id).first()
+    assert second.duplicate_of_id == first_id and len(second.analysis["candidates"]) == 4
+
+def test_processing_keeps_the_event_loop_free(db, extractor, monkeypatch):
+    """Test fingerprinting and the database work of process_meeting run off the event loop"""
+    fingerprint = meeting_service.transcript_fingerprint
+
+    def slow_fingerprint(transcript):
+        time.sleep(0.3)
+        return fingerprint(transcript)
+
+    monkeypatch.setattr(meeting_service, "transcript_fingerprint", slow_fingerprint)
+    meeting = Meeting(workspace_id=WORKSPACE_ID, title="Kickoff", transcript_text=TRANSCRIPT)
+    db.add(meeting)
+    db.commit()
+
+    async def scenario():
+        ticks = 0
+        session = SessionLocal()
+        try:
+            work = asyncio.ensure_future(process_meeting(session, meeting.id))
+            while not work.done():
+                await asyncio.sleep(0.01)
+                ticks += 1
+            return ticks, work.result()
+        finally:
+            session.close()
+
+    ticks, result = asyncio.run(scenario())
+    assert result["suggestions_created"] == 3
+    assert ticks >= 10
+
+def test_edit_suggests_candidates_left_pending_by_a_failed_run(db, extractor):
+    """Test an edit after a failed extraction suggests the kept pending candidates and drops the stale pending list"""
+    meeting = Meeting(workspace_id=WORKSPACE_ID, title="Kickoff", transcript_text=TRANSCRIPT)
+    db.add(meeting)
+    db.commit()
+    candidates = [dict(candidate) for candidate in asyncio.run(process_meeting(db, meeting.id))["candidates"]]
+    # As a run that stored the analysis but failed before suggesting Ana's candidate leaves it
+    position = next(i for i, candidate in enumerate(candidates) if candidate["assignee"] == "Ana")
+    db.query(AgentSuggestion).filter(AgentSuggestion.id == candidates[position].pop("suggestion_id")).delete()
+    meeting.analysis = {**meeting.analysis, "candidates": candidates, "pending": [position]}
+    db.commit()
+
+    edited = TRANSCRIPT.replace("Lee: I will review the export job tomorrow.\n", "")
+    result = asyncio.run(reextract_meeting(db, meeting.id, edited))
+
+    assert len(result["added"]) == 1
+    assert suggestion(db, result["added"][0]).payload["assignee"] == "Ana"
+    db.expire_all()
+    analysis = db.query(Meeting).filter(Meeting.id == meeting.id).first().analysis
+    assert "pending" not in analysis
+    assert all(candidate.get("suggestion_id") for candidate in analysis["candidates"])
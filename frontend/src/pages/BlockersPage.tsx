@@ -1,4 +1,5 @@
 import { useState, useEffect } from 'react';
+import { api } from '../services/api';
 
 export default function BlockersPage() {
   const [blockers, setBlockers] = useState([]);
@@ -10,9 +11,8 @@ export default function BlockersPage() {
 
   const fetchBlockers = async () => {
     try {
-      const response = await fetch('http://localhost:8000/tasks/blockers?workspace_id=1');
-      const data = await response.json();
-      setBlockers(data);
+      const data = await api.getBlockers(1);
+      setBlockers(data as any);
     } catch (error) {
       console.error('Failed to fetch blockers:', error);
     } finally {
@@ -16,7 +16,45 @@ export const api = {
       headers: { 'Content-Type': 'application/json' },
       body: JSON.stringify(data)
     });
-    return res.json();
+    const { job_id } = await res.json();
+    const job = await api.waitForJob(job_id);
+    if (job.status !== 'succeeded') throw new Error(job.error || 'Meeting processing failed');
+    return job.result;
+  },
+
+  async waitForJob(jobId: number, intervalMs = 1000) {
+    while (true) {
+      const res = await fetch(`${API_BASE}/jobs/${jobId}`);
+      const job = await res.json();
+      if (job.status === 'succeeded' || job.status === 'failed') return job;
+      await new Promise(resolve => setTimeout(resolve, intervalMs));
+    }
+  },
+
+  async processMeetingStream(data: any, onCandidate: (event: any) => void) {
+    const res = await fetch(`${API_BASE}/meetings/process/stream`, {
+      method: 'POST',
+      headers: { 'Content-Type': 'application/json' },
+      body: JSON.stringify(data)
+    });
+    const reader = res.body!.getReader();
+    const decoder = new TextDecoder();
+    let buffer = '';
+    let done: any = null;
+    while (true) {
+      const { value, done: finished } = await reader.read();
+      if (finished) break;
+      buffer += decoder.decode(value, { stream: true });
+      const events = buffer.split('\n\n');
+      buffer = events.pop() || '';
+      for (const raw of events) {
+        const event = raw.match(/^event: (.*)$/m)?.[1];
+        const payload = JSON.parse(raw.match(/^data: (.*)$/m)?.[1] || '{}');
+        if (event === 'candidate') onCandidate(payload);
+        if (event === 'done') done = payload;
+      }
+    }
+    return done;
   },
 
   async getReviewQueue(workspaceId: number) {
@@ -31,12 +69,28 @@ export const api = {
     return res.json();
   },
 
+  // Task lists come a page at a time; X-Next-Cursor is set while more follow
+  async getAllPages(url: string) {
+    const items: any[] = [];
+    let cursor: string | null = null;
+    do {
+      const res: Response = await fetch(cursor ? `${url}&cursor=${encodeURIComponent(cursor)}` : url);
+      if (!res.ok) throw new Error(`Request failed: ${res.status}`);
+      items.push(...await res.json());
+      cursor = res.headers.get('X-Next-Cursor');
+    } while (cursor);
+    return items;
+  },
+
   async getTasks(workspaceId: number, status?: string) {
     const url = status 
       ? `${API_BASE}/tasks/?workspace_id=${workspaceId}&status=${status}`
       : `${API_BASE}/tasks/?workspace_id=${workspaceId}`;
-    const res = await fetch(url);
-    return res.json();
+    return api.getAllPages(url);
+  },
+
+  async getBlockers(workspaceId: number) {
+    return api.getAllPages(`${API_BASE}/tasks/blockers?workspace_id=${workspaceId}`);
   },
 
   async getTask(taskId: number) {
@@ -94,8 +148,9 @@ export const api = {
     return res.json();
   },
 
-  async chatWithNova(message: string, context: string = '') {
-    const res = await fetch(`${API_BASE}/agent/chat?message=${encodeURIComponent(message)}&context=${encodeURIComponent(context)}`, {
+  async chatWithNova(message: string, context: string = '', workspaceId?: number) {
+    const workspace = workspaceId !== undefined ? `&workspace_id=${workspaceId}` : '';
+    const res = await fetch(`${API_BASE}/agent/chat?message=${encodeURIComponent(message)}&context=${encodeURIComponent(context)}${workspace}`, {
       method: 'POST'
     });
     return res.json();